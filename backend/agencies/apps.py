@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AgenciesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'agencies'
+
+    def ready(self):
+        """Initialize app when Django starts."""
+        import agencies.signals
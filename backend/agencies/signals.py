@@ -0,0 +1,27 @@
+# agencies/signals.py
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .versioning import bump_data_version
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_agency_data_version(sender, instance, **kwargs):
+    """
+    Bump the owning agency's data version when agency-scoped data changes.
+
+    Runs on commit so readers cannot cache pre-commit data under the new
+    version. Queryset ``update()``/``bulk_create()`` do not send signals;
+    callers using them should bump the version themselves, e.g. with
+    ``update_and_bump``.
+    Models holding bookkeeping rather than agency data opt out with
+    ``tracks_data_version = False``.
+    """
+    if not getattr(sender, 'tracks_data_version', True):
+        return
+    agency_id = getattr(instance, 'agency_id', None)
+    if agency_id:
+        transaction.on_commit(lambda: bump_data_version(agency_id))
@@ -1,3 +1,231 @@
-from django.test import TestCase
+import importlib
+import os
+import sys
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase, override_settings
+
+from config.cache import TieredCache
+
+from . import versioning
+from .throttling import AgencyTokenBucketThrottle
+
+
+def throttle_request(agency_id=1, user_id=1):
+    user = SimpleNamespace(pk=user_id, is_authenticated=True, profile=SimpleNamespace(agency_id=agency_id))
+    return SimpleNamespace(user=user, method='GET')
+
+
+VIEW = SimpleNamespace(action='list', throttle_costs={'list': 1})
+
+THROTTLE = {
+    'CACHE_ALIAS': 'throttle',
+    'AGENCY': {'CAPACITY': 10, 'REFILL_PER_SECOND': 0.001},
+    'USER': {'CAPACITY': 100, 'REFILL_PER_SECOND': 0.001},
+    'LOCK_WAIT': 5,
+}
+
+
+class AgencyTokenBucketThrottleTests(SimpleTestCase):
+    def burst(self, requests):
+        """Run ``requests`` throttle checks at once on separate threads; return how many passed."""
+        start = threading.Barrier(requests)
+        allowed = []
+
+        def worker(index):
+            throttle = AgencyTokenBucketThrottle()
+            start.wait()
+            if throttle.allow_request(throttle_request(user_id=index), VIEW):
+                allowed.append(index)
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(requests)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return len(allowed)
+
+    def slow_reads(self, backend):
+        """Widen the window between reading and writing a bucket."""
+        get_many = backend.get_many
+
+        def slow_get_many(cache, *args, **kwargs):
+            values = get_many(cache, *args, **kwargs)
+            time.sleep(0.005)
+            return values
+
+        return mock.patch.object(backend, 'get_many', slow_get_many)
+
+    @override_settings(
+        AGENCY_THROTTLE=THROTTLE,
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                'throttle': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                             'LOCATION': 'throttle-tests'}},
+    )
+    def test_concurrent_requests_cannot_overspend_the_agency_bucket(self):
+        caches['throttle'].clear()
+        with self.slow_reads(LocMemCache):
+            self.assertEqual(self.burst(30), 10)
+
+    def test_concurrent_requests_cannot_overspend_a_file_based_bucket(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(
+                AGENCY_THROTTLE=THROTTLE,
+                CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                        'throttle': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                                     'LOCATION': directory}},
+            ), self.slow_reads(FileBasedCache):
+                self.assertEqual(self.burst(30), 10)
+
+    @override_settings(
+        AGENCY_THROTTLE={**THROTTLE, 'AGENCY': {'CAPACITY': 1000, 'REFILL_PER_SECOND': 0.001}, 'LOCK_WAIT': 0.001},
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                'throttle': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                             'LOCATION': 'throttle-tests-contended'}},
+    )
+    def test_contended_requests_with_full_buckets_are_never_throttled(self):
+        caches['throttle'].clear()
+        with self.slow_reads(LocMemCache):
+            self.assertEqual(self.burst(30), 30)
+
+    @override_settings(
+        AGENCY_THROTTLE={**THROTTLE, 'LOCK_WAIT': 0.01},
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                'throttle': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                             'LOCATION': 'throttle-tests-busy'}},
+    )
+    def test_request_draws_without_a_lock_it_cannot_get(self):
+        caches['throttle'].clear()
+        caches['throttle'].add('throttle_agency_1_lock', 1, 2)
+        for _ in range(10):
+            self.assertTrue(AgencyTokenBucketThrottle().allow_request(throttle_request(), VIEW))
+
+        throttle = AgencyTokenBucketThrottle()
+        self.assertFalse(throttle.allow_request(throttle_request(), VIEW))
+        self.assertGreater(throttle.wait(), 1)
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'versioning-tests'},
+})
+class DataVersionTests(SimpleTestCase):
+    def setUp(self):
+        caches['shared'].clear()
+        # Two workers' default caches over one shared L2, with a long L1 window
+        self.workers = [
+            TieredCache(None, {'OPTIONS': {'L2_ALIAS': 'shared', 'STAMP_TTL': 60}}) for _ in range(2)
+        ]
+
+    def on(self, worker):
+        return mock.patch.object(versioning, 'cache', self.workers[worker])
+
+    def test_bumps_from_workers_with_a_stale_version_are_not_lost(self):
+        with self.on(0):
+            initial = versioning.get_data_version(1)
+        with self.on(1):
+            self.assertEqual(versioning.get_data_version(1), initial)
+
+        with self.on(0):
+            first = versioning.bump_data_version(1)
+        # Worker 1 still holds the initial version in L1 when it bumps
+        with self.on(1):
+            second = versioning.bump_data_version(1)
+
+        self.assertNotEqual(first, second)
+        self.workers[0].clear_local()
+        with self.on(0):
+            current = versioning.get_data_version(1)
+        self.assertEqual(current, second)
+        self.assertNotIn(current, (initial, first))
+
+    def test_bump_without_a_version_seeds_a_new_one(self):
+        with self.on(0):
+            bumped = versioning.bump_data_version(2)
+            self.assertEqual(versioning.get_data_version(2), bumped)
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tiered-cache-tests'},
+})
+class TieredCacheTests(SimpleTestCase):
+    def setUp(self):
+        caches['shared'].clear()
+
+    def worker(self, **options):
+        return TieredCache(None, {'OPTIONS': {'L2_ALIAS': 'shared', **options}})
+
+    def test_l2_writes_replace_stale_l1_entries_once_revalidated(self):
+        reader, writer = self.worker(STAMP_TTL=60), self.worker(STAMP_TTL=60)
+        writer.set('key', 'old')
+        self.assertEqual(reader.get('key'), 'old')
+        writer.set('key', 'new')
+
+        # Within STAMP_TTL the reader serves its local copy without asking L2
+        with mock.patch.object(caches['shared'], 'get', side_effect=AssertionError):
+            self.assertEqual(reader.get('key'), 'old')
+
+        later = time.monotonic() + 61
+        with mock.patch('config.cache.time.monotonic', return_value=later):
+            self.assertEqual(reader.get('key'), 'new')
+
+    def test_deletes_and_l2_evictions_reach_other_workers(self):
+        reader, writer = self.worker(STAMP_TTL=0), self.worker(STAMP_TTL=0)
+        writer.set('deleted', 1)
+        writer.set('evicted', 2)
+        self.assertEqual((reader.get('deleted'), reader.get('evicted')), (1, 2))
+
+        writer.delete('deleted')
+        caches['shared'].clear()
+
+        self.assertIsNone(reader.get('deleted'))
+        self.assertEqual(reader.get('evicted', 'gone'), 'gone')
+
+    def test_l1_is_bounded_and_falls_back_to_l2(self):
+        cache = self.worker(STAMP_TTL=60, L1_MAX_ENTRIES=2)
+        for key in ('a', 'b', 'c'):
+            cache.set(key, key.upper())
+
+        with mock.patch.object(caches['shared'], 'get', wraps=caches['shared'].get) as l2_get:
+            self.assertEqual([cache.get(key) for key in ('c', 'b', 'a')], ['C', 'B', 'A'])
+        self.assertEqual(l2_get.call_count, 1)
+
+
+def production_settings(**env):
+    """Import config.settings.production afresh with ``env`` set."""
+    with mock.patch.dict(os.environ, {'DJANGO_SECRET_KEY': 'production-test', **env}):
+        sys.modules.pop('config.settings.production', None)
+        try:
+            return importlib.import_module('config.settings.production')
+        finally:
+            sys.modules.pop('config.settings.production', None)
+
+
+class ProductionSettingsTests(SimpleTestCase):
+    def test_persistent_connections_by_default(self):
+        database = production_settings(DB_CONN_MAX_AGE='120').DATABASES['default']
+        self.assertEqual(database['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual(database['CONN_MAX_AGE'], 120)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+        self.assertFalse(database['DISABLE_SERVER_SIDE_CURSORS'])
+        self.assertNotIn('pool', database['OPTIONS'])
+        self.assertIn('statement_timeout=', database['OPTIONS']['options'])
+
+    def test_pool_mode_hands_connection_reuse_to_the_pool(self):
+        database = production_settings(DB_CONNECTION_MODE='pool', DB_POOL_MAX_SIZE='20').DATABASES['default']
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        self.assertEqual(database['OPTIONS']['pool']['max_size'], 20)
+
+    def test_pgbouncer_mode_avoids_session_state(self):
+        database = production_settings(DB_CONNECTION_MODE='pgbouncer').DATABASES['default']
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        self.assertTrue(database['DISABLE_SERVER_SIDE_CURSORS'])
+        self.assertNotIn('options', database['OPTIONS'])
@@ -0,0 +1,182 @@
+# agencies/throttling.py
+
+import hashlib
+import math
+import os
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from rest_framework.request import Request
+from rest_framework.throttling import BaseThrottle
+from rest_framework.views import View
+
+
+DEFAULT_AGENCY_THROTTLE = {
+    'CACHE_ALIAS': 'shared',
+    'AGENCY': {'CAPACITY': 300, 'REFILL_PER_SECOND': 5.0},
+    'USER': {'CAPACITY': 120, 'REFILL_PER_SECOND': 2.0},
+    'DEFAULT_COST': 1,
+    'ACTION_COSTS': {},
+    # Seconds to wait for a bucket another worker is updating before drawing
+    # without the lock, and at most how long a lock outlives a worker that
+    # died holding it
+    'LOCK_WAIT': 0.05,
+    'LOCK_TIMEOUT': 2,
+}
+
+
+@contextmanager
+def bucket_lock(cache, key: str, wait: float, timeout: int):
+    """
+    Hold an exclusive lock on ``key`` across workers; yields False if it is
+    not obtained within ``wait`` seconds.
+
+    ``cache.add`` is atomic on Redis, Memcached, database and local-memory
+    caches. The file-based cache implements it as a read then a write, so
+    there the lock is an ``flock`` on a file in the cache directory, which
+    covers every worker that can see that directory.
+    """
+    deadline = time.monotonic() + wait
+    if isinstance(cache, FileBasedCache):
+        import fcntl
+        os.makedirs(cache._dir, exist_ok=True)
+        path = os.path.join(cache._dir, hashlib.md5(key.encode()).hexdigest() + '.lock')
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        yield False
+                        return
+                    time.sleep(0.001)
+            try:
+                yield True
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+        return
+
+    lock_key = f'{key}_lock'
+    while not cache.add(lock_key, 1, timeout):
+        if time.monotonic() >= deadline:
+            yield False
+            return
+        time.sleep(0.001)
+    try:
+        yield True
+    finally:
+        cache.delete(lock_key)
+
+
+class AgencyTokenBucketThrottle(BaseThrottle):
+    """
+    Token-bucket throttle applied per agency and per user.
+
+    Each request draws ``cost`` tokens from both the agency's bucket and the
+    user's bucket; it is rejected (429 with ``Retry-After``) if either bucket
+    is short, and in that case no tokens are consumed. Buckets refill
+    continuously and live in the shared cache so all workers see one budget.
+
+    The cost of a request is looked up in this order:
+    - ``view.throttle_costs[view.action]`` on the view
+    - ``AGENCY_THROTTLE['ACTION_COSTS'][view.action]`` in settings
+    - ``AGENCY_THROTTLE['DEFAULT_COST']``
+
+    Throttles run in ``APIView.initial()``, before the handler touches the
+    database, so expensive endpoints are shed up front.
+
+    Reading and writing the buckets happens under ``bucket_lock`` on the
+    first bucket (the agency's, or the user's for users without one), so
+    concurrent requests on different workers cannot both spend the same
+    tokens. A request that cannot get the lock within ``LOCK_WAIT`` draws
+    without it rather than being rejected: contention only means the agency
+    is busy, not that it is out of tokens, so at worst requests racing past
+    a held lock may overspend the budget slightly.
+    """
+
+    def __init__(self):
+        self.config = {**DEFAULT_AGENCY_THROTTLE, **getattr(settings, 'AGENCY_THROTTLE', {})}
+        self.cache = caches[self.config['CACHE_ALIAS']]
+        self._wait = None
+
+    def get_cost(self, request: Request, view: View) -> int:
+        """Return the number of tokens this request costs."""
+        action = getattr(view, 'action', None) or request.method.lower()
+        view_costs = getattr(view, 'throttle_costs', {})
+        if action in view_costs:
+            return view_costs[action]
+        return self.config['ACTION_COSTS'].get(action, self.config['DEFAULT_COST'])
+
+    def get_agency_id(self, user) -> Optional[int]:
+        """Return the user's agency id without raising for users lacking a profile."""
+        try:
+            return user.profile.agency_id
+        except Exception:
+            return None
+
+    def get_buckets(self, request: Request):
+        """Return ``(cache_key, capacity, refill_per_second)`` for each bucket to draw from."""
+        buckets = []
+        agency_id = self.get_agency_id(request.user)
+        if agency_id:
+            agency = self.config['AGENCY']
+            buckets.append((
+                f'throttle_agency_{agency_id}',
+                agency['CAPACITY'],
+                agency['REFILL_PER_SECOND']
+            ))
+        user = self.config['USER']
+        buckets.append((
+            f'throttle_user_{request.user.pk}',
+            user['CAPACITY'],
+            user['REFILL_PER_SECOND']
+        ))
+        return buckets
+
+    def allow_request(self, request: Request, view: View) -> bool:
+        if not request.user or not request.user.is_authenticated:
+            return True
+
+        cost = self.get_cost(request, view)
+        if cost <= 0:
+            return True
+
+        buckets = self.get_buckets(request)
+        lock = bucket_lock(self.cache, buckets[0][0], self.config['LOCK_WAIT'], self.config['LOCK_TIMEOUT'])
+        with lock:
+            return self._draw(buckets, cost)
+
+    def _draw(self, buckets, cost: int) -> bool:
+        """Take ``cost`` tokens from every bucket, or from none if one is short."""
+        now = time.time()
+        states = self.cache.get_many([key for key, _, _ in buckets])
+
+        updated = {}
+        wait = 0.0
+        for key, capacity, refill in buckets:
+            tokens, last = states.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - last) * refill)
+            needed = min(cost, capacity)
+            if tokens < needed:
+                wait = max(wait, (needed - tokens) / refill)
+            updated[key] = (tokens - needed, now, capacity / refill)
+
+        if wait:
+            self._wait = wait
+            return False
+
+        # Keep idle buckets only as long as it takes them to refill completely
+        for key, (tokens, last, full_after) in updated.items():
+            self.cache.set(key, (tokens, last), math.ceil(full_after) + 1)
+        return True
+
+    def wait(self) -> Optional[float]:
+        return math.ceil(self._wait) if self._wait else None
@@ -0,0 +1,77 @@
+# agencies/versioning.py
+
+"""
+Per-agency data version.
+
+Every change to agency-scoped data bumps the agency's version (see
+agencies/signals.py). Cached aggregates include the version in their cache
+key, so they are invalidated by the next write instead of waiting out their
+timeout.
+
+A version is an opaque value: each bump writes a new one rather than
+incrementing the current one. Reading the current value first could see a
+stale copy (the default cache serves its in-process tier for up to
+``STAMP_TTL``), and two workers bumping from the same stale value would
+write the same version, losing the second invalidation.
+"""
+
+import secrets
+import time
+from typing import Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def _version_key(agency_id) -> str:
+    return f'agency_data_version_{agency_id}'
+
+
+def _new_version() -> int:
+    # Seeded from the clock so a lost key never reuses an old version; the
+    # random low bits keep bumps from different workers apart on coarse clocks
+    return time.time_ns() << 16 | secrets.randbits(16)
+
+
+def get_data_version(agency_id) -> int:
+    """Return the current data version for ``agency_id``."""
+    key = _version_key(agency_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_data_version(agency_id) -> int:
+    """Invalidate everything cached against the agency's current version."""
+    version = _new_version()
+    cache.set(_version_key(agency_id), version, None)
+    return version
+
+
+def bump_on_commit(agency_ids: Iterable) -> None:
+    """Bump each agency's data version once the current transaction commits."""
+    agency_ids = {agency_id for agency_id in agency_ids if agency_id}
+
+    def bump():
+        for agency_id in agency_ids:
+            bump_data_version(agency_id)
+
+    transaction.on_commit(bump)
+
+
+def update_and_bump(queryset, **changes) -> int:
+    """
+    ``queryset.update(**changes)``, bumping the version of every agency whose
+    rows it changes.
+
+    ``update()`` sends no ``post_save``, so agencies/signals.py never sees it.
+    The agencies are read before the update, which may change the rows out
+    of ``queryset``.
+    """
+    agency_ids = set(queryset.order_by().values_list('agency_id', flat=True).distinct())
+    updated = queryset.update(**changes)
+    if updated:
+        bump_on_commit(agency_ids)
+    return updated
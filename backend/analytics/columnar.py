@@ -0,0 +1,277 @@
+# analytics/columnar.py
+
+"""
+Columnar (Parquet) export of an agency's data for analytics.
+
+Each table (bookings, artists, promoters, venues, contacts) is written to
+its own Parquet file with typed columns: decimals keep their precision and
+scale, dates and times stay dates and times, UUIDs are 16-byte UUID values
+and foreign keys take the type of the key they point to. Rows are read in
+keyset-paginated chunks of ``ROW_GROUP_SIZE`` and each chunk becomes one
+row group, so memory use does not depend on table size.
+
+Exports are incremental. ``manifest.json`` in the agency's directory keeps
+a watermark per table; the next run only writes rows whose ``updated_at``
+is past it, as a ``delta-*`` file of upserts keyed by ``id``. Rows updated
+within ``WATERMARK_LAG`` seconds of the run are left to the next one, so
+transactions still in flight are not skipped. Queryset ``update()`` and
+``bulk_update()`` on these models set ``updated_at`` too (see
+config/models.py); writes in raw SQL must set it themselves or they are
+only picked up by a full export. Deletions only show up in a full export
+(``full=True``), which also resets the table's file list.
+
+pyarrow (in requirements.txt) is imported only when an export actually
+runs, so it stays out of web process startup.
+"""
+
+import json
+import os
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+TABLES = ('bookings', 'artists', 'promoters', 'venues', 'contacts')
+
+DEFAULT_ANALYTICS_EXPORT = {
+    'ROOT': None,
+    'ROW_GROUP_SIZE': 50000,
+    'WATERMARK_LAG': 300,
+}
+
+
+def get_export_config() -> Dict[str, Any]:
+    config = {**DEFAULT_ANALYTICS_EXPORT, **getattr(settings, 'ANALYTICS_EXPORT', {})}
+    if not config['ROOT']:
+        config['ROOT'] = os.path.join(settings.MEDIA_ROOT, 'analytics')
+    return config
+
+
+def table_model(table: str):
+    if table == 'bookings':
+        from bookings.models import Booking
+        return Booking
+    if table == 'artists':
+        from artists.models import Artist
+        return Artist
+    if table == 'promoters':
+        from promoters.models import Promoter
+        return Promoter
+    if table == 'venues':
+        from venues.models import Venue
+        return Venue
+    if table == 'contacts':
+        from contacts.models import Contact
+        return Contact
+    raise ValueError(f"Unknown table: {table}")
+
+
+def require_pyarrow():
+    """Return ``(pyarrow, pyarrow.parquet)`` or explain how to install them."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImproperlyConfigured('Columnar exports need pyarrow: pip install pyarrow')
+    return pyarrow, pyarrow.parquet
+
+
+def _uuid_type(pa):
+    # The canonical UUID extension type arrived in pyarrow 18
+    return pa.uuid() if hasattr(pa, 'uuid') else pa.binary(16)
+
+
+def arrow_type(pa, field: models.Field):
+    """The Arrow type of a model field's column."""
+    if field.is_relation:
+        return arrow_type(pa, field.target_field)
+    if isinstance(field, models.UUIDField):
+        return _uuid_type(pa)
+    if isinstance(field, models.DecimalField):
+        return pa.decimal128(field.max_digits, field.decimal_places)
+    if isinstance(field, models.DateTimeField):
+        return pa.timestamp('us', tz='UTC')
+    if isinstance(field, models.DateField):
+        return pa.date32()
+    if isinstance(field, models.TimeField):
+        return pa.time64('us')
+    if isinstance(field, models.BooleanField):
+        return pa.bool_()
+    if isinstance(field, (models.IntegerField, models.AutoField)):
+        return pa.int64()
+    if isinstance(field, models.FloatField):
+        return pa.float64()
+    return pa.string()
+
+
+def column_converter(field: models.Field) -> Optional[Callable[[Any], Any]]:
+    """Conversion from ``values_list()`` values to what Arrow expects, if any."""
+    target = field.target_field if field.is_relation else field
+    if isinstance(target, models.UUIDField):
+        return lambda value: value.bytes if isinstance(value, uuid.UUID) else value
+    if isinstance(target, models.JSONField):
+        return lambda value: None if value is None else json.dumps(value)
+    if isinstance(target, models.CharField):
+        # CountryField and friends can hand back objects rather than str
+        return lambda value: None if value is None else str(value)
+    return None
+
+
+def iter_chunks(queryset, attnames: List[str], size: int) -> Iterator[List[tuple]]:
+    """Yield ``values_list`` rows of ``queryset`` in primary key order, ``size`` at a time."""
+    pk_index = attnames.index(queryset.model._meta.pk.attname)
+    rows_query = queryset.order_by('pk').values_list(*attnames)
+    last_pk = None
+    while True:
+        chunk = rows_query if last_pk is None else rows_query.filter(pk__gt=last_pk)
+        rows = list(chunk[:size])
+        if not rows:
+            return
+        yield rows
+        last_pk = rows[-1][pk_index]
+
+
+class Manifest:
+    """Watermarks and file lists of one agency's export, kept as ``manifest.json``."""
+
+    def __init__(self, directory: str):
+        self.path = os.path.join(directory, 'manifest.json')
+        self.data = {'tables': {}}
+        if os.path.exists(self.path):
+            with open(self.path) as manifest_file:
+                self.data = json.load(manifest_file)
+
+    def table(self, name: str) -> Dict[str, Any]:
+        return self.data['tables'].setdefault(name, {'watermark': None, 'files': []})
+
+    def watermark(self, name: str) -> Optional[datetime]:
+        value = self.table(name)['watermark']
+        return parse_datetime(value) if value else None
+
+    def save(self) -> None:
+        temporary = f'{self.path}.tmp'
+        with open(temporary, 'w') as manifest_file:
+            json.dump(self.data, manifest_file, indent=2)
+        os.replace(temporary, self.path)
+
+
+def _write_parquet(path: str, model, queryset, row_group_size: int, metadata: Dict[str, str],
+                   progress: Optional[Callable[[int], None]] = None) -> int:
+    """Write ``queryset`` to ``path`` one row group per chunk; return the row count."""
+    pa, pq = require_pyarrow()
+    fields = list(model._meta.concrete_fields)
+    attnames = [field.attname for field in fields]
+    types = [arrow_type(pa, field) for field in fields]
+    converters = [column_converter(field) for field in fields]
+    schema = pa.schema(
+        [pa.field(field.attname, column_type, nullable=field.null) for field, column_type in zip(fields, types)],
+        metadata={key: str(value) for key, value in metadata.items()},
+    )
+
+    rows_written = 0
+    temporary = f'{path}.tmp'
+    with pq.ParquetWriter(temporary, schema, compression='zstd') as writer:
+        for rows in iter_chunks(queryset, attnames, row_group_size):
+            arrays = []
+            for index, (column_type, convert) in enumerate(zip(types, converters)):
+                values = [row[index] for row in rows]
+                if convert is not None:
+                    values = [convert(value) for value in values]
+                # pa.uuid() is a built-in extension type, not a pa.ExtensionType subclass
+                if isinstance(column_type, pa.BaseExtensionType):
+                    arrays.append(pa.ExtensionArray.from_storage(
+                        column_type, pa.array(values, type=column_type.storage_type)
+                    ))
+                else:
+                    arrays.append(pa.array(values, type=column_type))
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema), row_group_size=len(rows))
+            rows_written += len(rows)
+            if progress:
+                progress(rows_written)
+    os.replace(temporary, path)
+    return rows_written
+
+
+def export_agency(
+    agency_id,
+    tables: Optional[Iterable[str]] = None,
+    full: bool = False,
+    dry_run: bool = False,
+    root: Optional[str] = None,
+    row_group_size: Optional[int] = None,
+    progress: Optional[Callable[[str, int], None]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Export an agency's tables under ``<root>/agency_<id>/``.
+
+    Returns ``{table: {'mode', 'rows', 'file', 'watermark'}}``; with
+    ``dry_run`` only counts the rows that would be written.
+    """
+    if not dry_run:
+        require_pyarrow()
+    config = get_export_config()
+    root = root or config['ROOT']
+    row_group_size = row_group_size or config['ROW_GROUP_SIZE']
+    directory = os.path.join(root, f'agency_{agency_id}')
+    manifest = Manifest(directory)
+
+    # Everything updated up to here is exported now, the rest next time
+    upper = timezone.now() - timedelta(seconds=config['WATERMARK_LAG'])
+    stamp = upper.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+    report = {}
+    for table in tables or TABLES:
+        model = table_model(table)
+        watermark = None if full else manifest.watermark(table)
+        mode = 'delta' if watermark else 'full'
+        queryset = model.objects.filter(agency_id=agency_id, updated_at__lte=upper)
+        if watermark:
+            queryset = queryset.filter(updated_at__gt=watermark)
+
+        if dry_run:
+            report[table] = {'mode': mode, 'rows': queryset.count(), 'file': None, 'watermark': upper.isoformat()}
+            continue
+
+        os.makedirs(os.path.join(directory, table), exist_ok=True)
+        relative_path = os.path.join(table, f'{mode}-{stamp}.parquet')
+        rows = _write_parquet(
+            os.path.join(directory, relative_path),
+            model,
+            queryset,
+            row_group_size,
+            metadata={
+                'table': table,
+                'agency_id': agency_id,
+                'mode': mode,
+                'updated_after': watermark.isoformat() if watermark else '',
+                'updated_until': upper.isoformat(),
+            },
+            progress=(lambda count, table=table: progress(table, count)) if progress else None,
+        )
+
+        entry = manifest.table(table)
+        superseded = []
+        if rows == 0 and mode == 'delta':
+            # Nothing changed: keep the directory free of empty files
+            os.remove(os.path.join(directory, relative_path))
+            relative_path = None
+        elif mode == 'full':
+            superseded = [path for path in entry['files'] if path != relative_path]
+            entry['files'] = [relative_path]
+        else:
+            entry['files'].append(relative_path)
+        entry['watermark'] = upper.isoformat()
+        manifest.save()
+        # Only once the manifest no longer lists them
+        for path in superseded:
+            if os.path.exists(os.path.join(directory, path)):
+                os.remove(os.path.join(directory, path))
+
+        report[table] = {'mode': mode, 'rows': rows, 'file': relative_path, 'watermark': entry['watermark']}
+    return report
@@ -0,0 +1,136 @@
+import json
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from agencies.models import Agency
+from analytics.columnar import TABLES, export_agency, get_export_config
+
+
+class Command(BaseCommand):
+    """
+    Management command to export agency data as Parquet files for analytics.
+
+    Usage:
+        python manage.py export_analytics
+        python manage.py export_analytics --agency <id> --tables bookings,venues
+        python manage.py export_analytics --full --row-group-size 20000
+        python manage.py export_analytics --dry-run --json
+
+    Each run writes the rows changed since the previous one (per agency and
+    table, tracked in the agency's manifest.json); --full rewrites whole
+    tables, which is also how deletions reach the export. Needs pyarrow.
+    """
+
+    help = 'Export bookings, artists, promoters, venues and contacts as Parquet files'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--agency',
+            type=str,
+            help='Only export this agency ID',
+        )
+
+        parser.add_argument(
+            '--tables',
+            type=str,
+            default=','.join(TABLES),
+            help=f'Comma-separated tables to export (default: {",".join(TABLES)})',
+        )
+
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Export every row instead of the changes since the last export',
+        )
+
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count the rows that would be exported without writing files',
+        )
+
+        parser.add_argument(
+            '--output',
+            type=str,
+            help='Directory to write to (default: ANALYTICS_EXPORT["ROOT"])',
+        )
+
+        parser.add_argument(
+            '--row-group-size',
+            type=int,
+            help='Rows per query chunk and Parquet row group (default: ANALYTICS_EXPORT["ROW_GROUP_SIZE"])',
+        )
+
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Write a machine-readable JSON report instead of text',
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        agency_id = options.get('agency')
+        tables = [table.strip() for table in options['tables'].split(',') if table.strip()]
+        row_group_size = options['row_group_size']
+        as_json = options['json']
+
+        unknown = sorted(set(tables) - set(TABLES))
+        if unknown or not tables:
+            raise CommandError(f'Unknown tables: {", ".join(unknown)}; choose from {", ".join(TABLES)}')
+        if row_group_size is not None and row_group_size < 1:
+            raise CommandError('--row-group-size must be at least 1')
+
+        agencies = Agency.objects.order_by('id')
+        if agency_id:
+            try:
+                agencies = agencies.filter(id=agency_id)
+                if not agencies.exists():
+                    raise CommandError(f'Agency not found: {agency_id}')
+            except ValueError:
+                raise CommandError(f'Invalid agency ID: {agency_id}')
+
+        root = options['output'] or get_export_config()['ROOT']
+        started = time.monotonic()
+        report = {'root': root, 'dry_run': options['dry_run'], 'agencies': {}}
+        if options['dry_run'] and not as_json:
+            self.stdout.write(self.style.NOTICE('\n=== DRY RUN MODE - No files will be written ===\n'))
+
+        for agency in agencies.values_list('id', flat=True):
+            try:
+                result = export_agency(
+                    agency,
+                    tables=tables,
+                    full=options['full'],
+                    dry_run=options['dry_run'],
+                    root=root,
+                    row_group_size=row_group_size,
+                )
+            except ImproperlyConfigured as exc:
+                raise CommandError(str(exc))
+            report['agencies'][str(agency)] = result
+            if not as_json:
+                self._show(agency, result, options['dry_run'])
+
+        report['rows'] = sum(
+            table['rows'] for result in report['agencies'].values() for table in result.values()
+        )
+        report['duration_seconds'] = round(time.monotonic() - started, 3)
+
+        if as_json:
+            self.stdout.write(json.dumps(report, default=str))
+            return
+
+        verb = 'would be exported' if options['dry_run'] else 'exported'
+        self.stdout.write(
+            self.style.SUCCESS(f'\n✓ {report["rows"]} row(s) {verb} for {len(report["agencies"])} agency(ies) to {root}\n')
+        )
+
+    def _show(self, agency_id, result, dry_run):
+        self.stdout.write(f'Agency {agency_id}:')
+        for table, entry in result.items():
+            line = f'  {table}: {entry["rows"]} row(s) ({entry["mode"]})'
+            if not dry_run:
+                line += f' -> {entry["file"]}' if entry['file'] else ' - unchanged'
+            self.stdout.write(line)
@@ -0,0 +1,18 @@
+# analytics/periodic.py
+
+from agencies.models import Agency
+from scheduler.registry import periodic_job
+
+from .columnar import export_agency
+
+
+# Opt in with SCHEDULER['JOBS'] = {'export_analytics': {'enabled': True}}
+@periodic_job(interval=86400, jitter=1800, lease=7200, enabled=False)
+def export_analytics():
+    """Write each agency's changes since the last run as Parquet delta files."""
+    totals = {'agencies': 0, 'rows': 0}
+    for agency_id in Agency.objects.order_by('id').values_list('id', flat=True):
+        report = export_agency(agency_id)
+        totals['agencies'] += 1
+        totals['rows'] += sum(table['rows'] for table in report.values())
+    return totals
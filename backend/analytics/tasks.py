@@ -0,0 +1,21 @@
+# analytics/tasks.py
+
+from jobs.registry import task
+from .columnar import TABLES, export_agency
+
+
+@task('analytics.export', max_attempts=2, lease=3600)
+def export_tables(job, tables=None, full=False):
+    """Write the agency's tables as Parquet files; incremental unless ``full``."""
+    tables = tables or list(TABLES)
+    done = []
+
+    def progress(table, rows):
+        job.set_progress(len(done), total=len(tables), message=f'{table}: {rows} rows written')
+
+    report = {}
+    for table in tables:
+        report.update(export_agency(job.agency_id, tables=[table], full=full, progress=progress))
+        done.append(table)
+        job.set_progress(len(done), total=len(tables), message=f'{table}: {report[table]["rows"]} rows written')
+    return report
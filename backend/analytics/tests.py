@@ -0,0 +1,142 @@
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from agencies.models import Agency
+from authentication.models import User
+from bookings.models import Booking
+from venues.models import Venue
+
+from .columnar import Manifest, export_agency
+
+
+@override_settings(ANALYTICS_EXPORT={'WATERMARK_LAG': 0})
+class IncrementalExportTests(TestCase):
+    def setUp(self):
+        owner = User.objects.create(username='owner', email='owner@example.com')
+        self.agency = Agency.objects.create(name='Agency', owner=owner, timezone='UTC', slug='agency')
+        self.venues = [
+            Venue.objects.create(
+                agency=self.agency, venue_name=f'Venue {index}', venue_address='Street 1',
+                venue_city='Lisbon', venue_country='PT', capacity=500,
+            )
+            for index in range(3)
+        ]
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        # As if a previous export had covered everything written so far
+        directory = os.path.join(self.root, f'agency_{self.agency.id}')
+        os.makedirs(directory)
+        watermark = (timezone.now() + timedelta(microseconds=1)).isoformat()
+        with open(os.path.join(directory, 'manifest.json'), 'w') as manifest_file:
+            json.dump({'tables': {'venues': {'watermark': watermark, 'files': []}}}, manifest_file)
+
+    def delta_rows(self):
+        report = export_agency(self.agency.id, tables=['venues'], dry_run=True, root=self.root)
+        self.assertEqual(report['venues']['mode'], 'delta')
+        return report['venues']['rows']
+
+    def test_queryset_update_is_in_the_next_delta(self):
+        self.assertEqual(self.delta_rows(), 0)
+        Venue.objects.filter(pk=self.venues[0].pk).update(is_active=False)
+        self.assertEqual(self.delta_rows(), 1)
+
+    def test_bulk_update_is_in_the_next_delta(self):
+        for venue in self.venues[:2]:
+            venue.capacity = 800
+        Venue.objects.bulk_update(self.venues[:2], ['capacity'])
+        self.assertEqual(self.delta_rows(), 2)
+
+    def test_explicit_updated_at_is_kept(self):
+        earlier = timezone.now() - timedelta(days=1)
+        Venue.objects.filter(pk=self.venues[0].pk).update(is_active=False, updated_at=earlier)
+        self.assertEqual(Venue.objects.get(pk=self.venues[0].pk).updated_at, earlier)
+        self.assertEqual(self.delta_rows(), 0)
+
+
+@override_settings(ANALYTICS_EXPORT={'WATERMARK_LAG': 0})
+class ParquetExportTests(TestCase):
+    def setUp(self):
+        owner = User.objects.create(username='owner', email='owner@example.com')
+        self.agency = Agency.objects.create(name='Agency', owner=owner, timezone='UTC', slug='agency')
+        self.venue = Venue.objects.create(
+            agency=self.agency, venue_name='Coliseu', venue_address='Street 1',
+            venue_city='Lisbon', venue_country='PT', capacity=4000,
+        )
+        self.booking = Booking.objects.create(
+            agency=self.agency,
+            booking_date=timezone.now() + timedelta(days=30),
+            location_city='Lisbon',
+            location_country='PT',
+            venue_id=str(self.venue.pk),
+            venue_capacity=4000,
+            currency='EUR',
+            guarantee_amount=Decimal('12500.50'),
+            percentage_split=Decimal('80.00'),
+            artist_id=str(uuid.uuid4()),
+            promoter_id=str(uuid.uuid4()),
+        )
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.directory = os.path.join(self.root, f'agency_{self.agency.id}')
+
+    def export(self, **options):
+        return export_agency(self.agency.id, tables=['bookings', 'venues'], root=self.root, **options)
+
+    def read(self, relative_path):
+        return pq.read_table(os.path.join(self.directory, relative_path))
+
+    def test_full_export_keeps_column_types_and_values(self):
+        report = self.export()
+        self.assertEqual((report['bookings']['mode'], report['bookings']['rows']), ('full', 1))
+
+        table = self.read(report['bookings']['file'])
+        schema = table.schema
+        self.assertEqual(schema.field('id').type, pa.uuid())
+        self.assertEqual(schema.field('guarantee_amount').type, pa.decimal128(12, 2))
+        self.assertEqual(schema.field('booking_date').type, pa.timestamp('us', tz='UTC'))
+        self.assertEqual(schema.field('agency_id').type, pa.int64())
+        self.assertEqual(schema.metadata[b'mode'], b'full')
+
+        row = table.to_pylist()[0]
+        self.assertEqual(row['id'], self.booking.pk)
+        self.assertEqual(row['guarantee_amount'], Decimal('12500.50'))
+        self.assertEqual(row['location_country'], 'PT')
+        self.assertEqual(row['booking_date'], self.booking.booking_date)
+        self.assertIsNone(row['door_percentage'])
+
+    def test_delta_holds_only_changed_rows_and_full_export_replaces_files(self):
+        first = self.export()['bookings']['file']
+        self.assertIsNone(self.export()['bookings']['file'])
+
+        Booking.objects.filter(pk=self.booking.pk).update(guarantee_amount=Decimal('15000.00'))
+        report = self.export()
+        self.assertEqual((report['bookings']['mode'], report['bookings']['rows']), ('delta', 1))
+        self.assertEqual(report['venues']['rows'], 0)
+        delta = self.read(report['bookings']['file'])
+        self.assertEqual(delta.column('guarantee_amount').to_pylist(), [Decimal('15000.00')])
+        self.assertEqual(Manifest(self.directory).table('bookings')['files'], [first, report['bookings']['file']])
+
+        full = self.export(full=True)['bookings']['file']
+        self.assertEqual(Manifest(self.directory).table('bookings')['files'], [full])
+        self.assertEqual(sorted(os.listdir(os.path.join(self.directory, 'bookings'))), [os.path.basename(full)])
+
+    def test_rows_are_written_in_row_groups(self):
+        for index in range(4):
+            Venue.objects.create(
+                agency=self.agency, venue_name=f'Venue {index}', venue_address='Street 1',
+                venue_city='Porto', venue_country='PT', capacity=100,
+            )
+        report = self.export(row_group_size=2)
+        metadata = pq.ParquetFile(os.path.join(self.directory, report['venues']['file'])).metadata
+        self.assertEqual((metadata.num_rows, metadata.num_row_groups), (5, 3))
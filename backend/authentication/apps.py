@@ -6,6 +6,9 @@ class AuthenticationConfig(AppConfig):
     name = 'authentication'
 
     def ready(self):
-        """Initialize Firebase Admin SDK when Django starts"""
-        from config.firebase.firebase import initialize_firebase
-        initialize_firebase()
+        """
+        Firebase Admin SDK is initialized lazily on first token verification
+        (see config.firebase.firebase.initialize_firebase), keeping
+        firebase_admin and its dependencies out of startup for management
+        commands and worker forks.
+        """
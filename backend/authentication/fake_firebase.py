@@ -0,0 +1,75 @@
+# authentication/fake_firebase.py
+
+"""
+In-memory stand-in for the Firebase Admin API.
+
+Enable it with ``FIREBASE_ADMIN_BACKEND = 'authentication.fake_firebase.FakeFirebaseAdminBackend'``
+for tests and offline development. Users, artificial latency and failures are
+controlled through class-level state so tests can arrange them before the
+process-wide client is created.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+from firebase_admin import auth, exceptions as firebase_exceptions
+
+
+@dataclass
+class FakeUserRecord:
+    """Subset of ``firebase_admin.auth.UserRecord`` used by the views."""
+    uid: str
+    email: Optional[str] = None
+    email_verified: bool = False
+
+
+class FakeFirebaseAdminBackend:
+    """Local fake implementing the same methods as ``FirebaseAdminBackend``."""
+
+    users: Dict[str, FakeUserRecord] = {}
+    sent_links: List[Dict[str, str]] = []
+    latency: float = 0.0
+    unavailable: bool = False
+    _lock = threading.Lock()
+
+    @classmethod
+    def add_user(cls, uid: str, email: str, email_verified: bool = False) -> FakeUserRecord:
+        record = FakeUserRecord(uid=uid, email=email, email_verified=email_verified)
+        with cls._lock:
+            cls.users[uid] = record
+        return record
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls.users = {}
+            cls.sent_links = []
+        cls.latency = 0.0
+        cls.unavailable = False
+
+    def _simulate_upstream(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        if self.unavailable:
+            raise firebase_exceptions.UnavailableError("Fake Firebase is unavailable")
+
+    def get_user(self, uid: str) -> FakeUserRecord:
+        self._simulate_upstream()
+        with self._lock:
+            record = self.users.get(uid)
+        if record is None:
+            raise auth.UserNotFoundError(f"No user record found for the provided uid: {uid}")
+        return record
+
+    def generate_email_verification_link(self, email: str, continue_url: str) -> str:
+        self._simulate_upstream()
+        link = "https://fake-firebase.local/verify?" + urlencode({
+            'email': email,
+            'continueUrl': continue_url
+        })
+        with self._lock:
+            self.sent_links.append({'email': email, 'link': link})
+        return link
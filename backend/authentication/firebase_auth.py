@@ -1,7 +1,6 @@
-from firebase_admin import auth as firebase_auth
-from firebase_admin.auth import InvalidIdTokenError
 import logging
 from django.contrib.auth import get_user_model
+from config.firebase.firebase import initialize_firebase
 
 User = get_user_model()
 
@@ -11,7 +10,13 @@ def verify_firebase_token(id_token: str):
     """
     Verify Firebase ID token and return decoded token data.
     Raises exception if token is invalid.
+
+    Firebase is initialized lazily here, on the first token verification.
     """
+    initialize_firebase()
+    from firebase_admin import auth as firebase_auth
+    from firebase_admin.auth import InvalidIdTokenError
+
     try:
         return firebase_auth.verify_id_token(id_token)
     except InvalidIdTokenError as e:
@@ -0,0 +1,279 @@
+# authentication/firebase_client.py
+
+"""
+Resilient access to the Firebase Admin API.
+
+Admin calls run on a bounded worker pool with a per-call timeout and are
+guarded by a circuit breaker, so a slow or degraded upstream cannot tie up
+request threads. The concrete backend is selected with the
+``FIREBASE_ADMIN_BACKEND`` setting, which allows swapping in the local fake
+backend for tests and offline development.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from config.firebase.firebase import initialize_firebase
+
+logger = logging.getLogger(__name__)
+
+
+def upstream_failure_errors() -> tuple:
+    """
+    Upstream errors that indicate Firebase itself is degraded.
+
+    Client errors such as UserNotFoundError mean the upstream answered and do
+    not count against the circuit breaker. Imported lazily to keep the SDK
+    out of process startup.
+    """
+    from firebase_admin import exceptions as firebase_exceptions
+    return (
+        firebase_exceptions.UnavailableError,
+        firebase_exceptions.DeadlineExceededError,
+        firebase_exceptions.InternalError,
+        firebase_exceptions.UnknownError,
+    )
+
+
+class FirebaseUnavailableError(Exception):
+    """Raised when the Firebase Admin API cannot be reached in time."""
+
+    def __init__(self, message: str, retry_after: int = 30):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(FirebaseUnavailableError):
+    """Raised when calls are rejected because the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and all
+    calls fail fast for ``reset_timeout`` seconds. The first call after that
+    window is let through as a probe (half-open); its outcome closes or
+    re-opens the circuit.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def retry_after(self) -> int:
+        """Seconds until the circuit will allow a probe request."""
+        with self._lock:
+            remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+        return max(1, int(remaining + 0.999))
+
+    def allow_request(self) -> bool:
+        """Return True if a call may be attempted right now."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def release_probe(self) -> None:
+        """Give back a probe taken by ``allow_request`` for a call that was never made."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(
+                        f"Firebase circuit breaker opened after {self._failures} failure(s)"
+                    )
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+
+class FirebaseAdminBackend:
+    """Production backend delegating to ``firebase_admin.auth``."""
+
+    def get_user(self, uid: str):
+        initialize_firebase()
+        from firebase_admin import auth
+        return auth.get_user(uid)
+
+    def generate_email_verification_link(self, email: str, continue_url: str) -> str:
+        initialize_firebase()
+        from firebase_admin import auth
+        action_code_settings = auth.ActionCodeSettings(
+            url=continue_url,
+            handle_code_in_app=True
+        )
+        return auth.generate_email_verification_link(
+            email,
+            action_code_settings=action_code_settings
+        )
+
+
+class FirebaseAdminClient:
+    """
+    Executes backend calls on a bounded thread pool with timeouts.
+
+    At most ``max_workers`` calls run concurrently and at most ``max_pending``
+    more may wait for a worker; beyond that calls are shed immediately rather
+    than queueing behind a slow upstream.
+    """
+
+    def __init__(
+        self,
+        backend: Any,
+        max_workers: int = 4,
+        max_pending: int = 16,
+        timeout: float = 5.0,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        self.backend = backend
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='firebase-admin'
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+
+    def call(self, method_name: str, *args, **kwargs):
+        """Invoke ``backend.<method_name>`` with timeout and circuit breaking."""
+        # Take a slot first: a shed call must not hold the half-open probe
+        if not self._slots.acquire(blocking=False):
+            raise FirebaseUnavailableError("Firebase request queue is full.", retry_after=5)
+
+        if not self.breaker.allow_request():
+            self._slots.release()
+            raise CircuitOpenError(
+                "Firebase is temporarily unavailable.",
+                retry_after=self.breaker.retry_after()
+            )
+
+        try:
+            future = self._executor.submit(getattr(self.backend, method_name), *args, **kwargs)
+        except Exception:
+            self._slots.release()
+            self.breaker.release_probe()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            result = future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            self.breaker.record_failure()
+            logger.error(f"Firebase call {method_name} timed out after {self.timeout}s")
+            raise FirebaseUnavailableError(f"Firebase call {method_name} timed out.")
+        except Exception as e:
+            from firebase_admin import exceptions as firebase_exceptions
+            if (isinstance(e, firebase_exceptions.FirebaseError) and
+                    not isinstance(e, upstream_failure_errors())):
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+            raise
+
+        self.breaker.record_success()
+        return result
+
+    def get_user(self, uid: str):
+        return self.call('get_user', uid)
+
+    def generate_email_verification_link(self, email: str, continue_url: str) -> str:
+        return self.call('generate_email_verification_link', email, continue_url)
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_client: Optional[FirebaseAdminClient] = None
+_client_lock = threading.Lock()
+
+_background_executor: Optional[ThreadPoolExecutor] = None
+_background_lock = threading.Lock()
+
+
+def get_firebase_client() -> FirebaseAdminClient:
+    """Return the process-wide Firebase Admin client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                backend_class = import_string(settings.FIREBASE_ADMIN_BACKEND)
+                _client = FirebaseAdminClient(
+                    backend=backend_class(),
+                    max_workers=settings.FIREBASE_ADMIN_MAX_WORKERS,
+                    max_pending=settings.FIREBASE_ADMIN_MAX_PENDING,
+                    timeout=settings.FIREBASE_ADMIN_TIMEOUT,
+                    breaker=CircuitBreaker(
+                        failure_threshold=settings.FIREBASE_ADMIN_BREAKER_THRESHOLD,
+                        reset_timeout=settings.FIREBASE_ADMIN_BREAKER_RESET_TIMEOUT
+                    )
+                )
+    return _client
+
+
+def reset_firebase_client() -> None:
+    """Drop the cached client (used by tests after changing settings)."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.shutdown()
+        _client = None
+
+
+def submit_background(fn: Callable, *args, **kwargs):
+    """
+    Run ``fn`` on the background pool used for fire-and-forget admin work.
+
+    This pool is separate from the client pool so background jobs waiting on
+    admin calls can never starve those calls of workers.
+    """
+    global _background_executor
+    if _background_executor is None:
+        with _background_lock:
+            if _background_executor is None:
+                _background_executor = ThreadPoolExecutor(
+                    max_workers=settings.FIREBASE_ADMIN_MAX_WORKERS,
+                    thread_name_prefix='firebase-background'
+                )
+    return _background_executor.submit(fn, *args, **kwargs)
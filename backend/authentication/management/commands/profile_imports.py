@@ -0,0 +1,117 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    """
+    Management command to profile module import times during Django startup.
+
+    Usage:
+        python manage.py profile_imports
+        python manage.py profile_imports --limit 30 --sort self
+        python manage.py profile_imports --import config.urls
+        python manage.py profile_imports --command check_overdue_invoices
+
+    Startup is measured in a fresh interpreter using ``python -X importtime``,
+    so the numbers are not skewed by modules this process already loaded.
+    """
+
+    help = 'Report the slowest module imports during Django startup'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=20,
+            help='Number of modules to show (default: 20)',
+        )
+
+        parser.add_argument(
+            '--sort',
+            choices=['cumulative', 'self'],
+            default='cumulative',
+            help='Sort by cumulative time (including sub-imports) or self time',
+        )
+
+        parser.add_argument(
+            '--import',
+            dest='modules',
+            action='append',
+            default=[],
+            help='Extra module to import after django.setup() (repeatable), e.g. config.urls',
+        )
+
+        parser.add_argument(
+            '--command',
+            type=str,
+            help='Profile loading this management command instead of bare setup',
+        )
+
+    def build_script(self, modules, command_name):
+        """Return the Python snippet executed in the profiled interpreter."""
+        lines = ['import django', 'django.setup()']
+        for module in modules:
+            lines.append(f'import importlib; importlib.import_module({module!r})')
+        if command_name:
+            lines.append('from django.core.management import load_command_class, get_commands')
+            lines.append(f'load_command_class(get_commands()[{command_name!r}], {command_name!r})')
+        return '; '.join(lines)
+
+    def parse_importtime(self, output):
+        """Parse ``-X importtime`` stderr into (module, self_us, cumulative_us) tuples."""
+        rows = []
+        for line in output.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            try:
+                self_us, cumulative_us, module = line.split(':', 1)[1].split('|')
+                rows.append((module.strip(), int(self_us), int(cumulative_us)))
+            except ValueError:
+                continue
+        return rows
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        script = self.build_script(options['modules'], options.get('command'))
+
+        env = os.environ.copy()
+        env.setdefault('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE)
+
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', script],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            raise CommandError(
+                f'Profiled interpreter failed:\n{result.stderr.splitlines()[-1] if result.stderr else ""}'
+            )
+
+        rows = self.parse_importtime(result.stderr)
+        if not rows:
+            raise CommandError('No import timings were captured.')
+
+        # Self times add up to the total import cost
+        total_us = sum(self_us for _, self_us, _ in rows)
+        sort_index = 2 if options['sort'] == 'cumulative' else 1
+        rows.sort(key=lambda row: row[sort_index], reverse=True)
+
+        self.stdout.write(
+            f'\n{"cumulative ms":>14} {"self ms":>9}  module'
+        )
+        for module, self_us, cumulative_us in rows[:options['limit']]:
+            self.stdout.write(
+                f'{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {module}'
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n✓ {len(rows)} modules imported in {total_us / 1000:.1f} ms total\n'
+            )
+        )
@@ -1,3 +1,110 @@
-from django.test import TestCase
+import subprocess
+import sys
+import threading
+import time
 
-# Create your tests here.
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from .firebase_client import (
+    CircuitBreaker,
+    CircuitOpenError,
+    FirebaseAdminClient,
+    FirebaseUnavailableError,
+)
+
+
+class HangingBackend:
+    """Backend whose calls block until ``recover()`` is called."""
+
+    def __init__(self):
+        self.healthy = threading.Event()
+
+    def get_user(self, uid):
+        self.healthy.wait(5)
+        return {'uid': uid}
+
+    def recover(self):
+        self.healthy.set()
+
+
+class CircuitBreakerTests(SimpleTestCase):
+    def test_opens_after_threshold_and_probes_once_half_open(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow_request())
+        breaker.record_failure()
+        self.assertFalse(breaker.allow_request())
+
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_released_probe_can_be_taken_again(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow_request())
+        breaker.release_probe()
+        self.assertTrue(breaker.allow_request())
+
+
+class FirebaseAdminClientTests(SimpleTestCase):
+    def setUp(self):
+        self.backend = HangingBackend()
+        self.client = FirebaseAdminClient(
+            self.backend,
+            max_workers=1,
+            max_pending=0,
+            timeout=0.05,
+            breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0.05),
+        )
+
+    def tearDown(self):
+        self.backend.recover()
+        self.client.shutdown(wait=True)
+
+    def test_shed_call_does_not_keep_the_half_open_probe(self):
+        # The upstream hangs: the call times out, the circuit opens and the
+        # timed-out call keeps the only slot
+        with self.assertRaises(FirebaseUnavailableError):
+            self.client.get_user('a')
+        self.assertEqual(self.client.breaker.state, CircuitBreaker.OPEN)
+
+        # Half-open, but no slot is free: the call is shed
+        time.sleep(0.06)
+        with self.assertRaises(FirebaseUnavailableError) as shed:
+            self.client.get_user('b')
+        self.assertNotIsInstance(shed.exception, CircuitOpenError)
+        self.assertEqual(self.client.breaker.state, CircuitBreaker.HALF_OPEN)
+
+        # The upstream recovers; once the hung call returns its slot, the
+        # next call is the probe and closes the circuit
+        self.backend.recover()
+        self.client._executor.submit(lambda: None).result()
+        self.assertEqual(self.client.get_user('c'), {'uid': 'c'})
+        self.assertEqual(self.client.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_open_circuit_does_not_consume_slots(self):
+        self.client.breaker.record_failure()
+        for _ in range(3):
+            with self.assertRaises(CircuitOpenError):
+                self.client.get_user('a')
+        self.assertTrue(self.client._slots.acquire(blocking=False))
+        self.client._slots.release()
+
+
+class LazyFirebaseTests(SimpleTestCase):
+    def test_startup_does_not_import_the_firebase_sdk(self):
+        # A fresh interpreter, since this test process may already have used Firebase
+        script = (
+            'import sys, django; django.setup(); import config.urls; '
+            'print(sorted(name for name in sys.modules if name.split(".")[0] in ("firebase_admin", "grpc")))'
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', script], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=60, check=True,
+        )
+        self.assertEqual(result.stdout.strip(), '[]')
@@ -1,5 +1,8 @@
 from django.urls import path
-from .views import user_profile, register_user, verify_email, send_verification_email
+from .views import (
+    user_profile, register_user, verify_email, send_verification_email,
+    verification_email_status
+)
 
 
 urlpatterns = [
@@ -7,4 +10,9 @@ urlpatterns = [
     path("verify-email/", verify_email, name="verify_email"),
     path("user/profile/", user_profile, name="user_profile"),
     path("send-verification-email/", send_verification_email, name="send_verification_email"),
-]
\ No newline at end of file
+    path(
+        "send-verification-email/<str:job_id>/",
+        verification_email_status,
+        name="verification_email_status"
+    ),
+]
@@ -7,11 +7,12 @@ from rest_framework import status
 from .models import User
 from .firebase_auth import verify_firebase_token
 import logging
-from firebase_admin import auth
 from rest_framework import viewsets
 from rest_framework.views import APIView
-from django.db import transaction
+from django.db import transaction, connection
 from django.core.cache import cache
+import uuid
+from .firebase_client import get_firebase_client, submit_background, FirebaseUnavailableError
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -32,8 +33,8 @@ def register_user(request):
         )
 
     try:
-        # Verify Firebase token
-        decoded_token = auth.verify_id_token(token)
+        # Verify Firebase token (initializes Firebase on first use)
+        decoded_token = verify_firebase_token(token)
         firebase_uid = decoded_token["uid"]
         email = decoded_token.get("email")
         email_verified = decoded_token.get("email_verified", False)
@@ -153,81 +154,196 @@ def user_profile(request):
         )
 
 
-@api_view(['POST'])
-@permission_classes([IsAuthenticated])
-def send_verification_email(request):
+VERIFICATION_EMAIL_RATE_LIMIT = 60  # seconds
+VERIFICATION_JOB_TTL = 60 * 60  # seconds
+DEFAULT_VERIFY_CONTINUE_URL = 'http://localhost:3000/auth/verify-email'
+
+
+def _get_continue_url(request):
+    """Return the requested continue URL, falling back to the default for unsafe values."""
+    continue_url = request.data.get('continueUrl', DEFAULT_VERIFY_CONTINUE_URL)
+
+    # Validate URL format for security
+    if not continue_url.startswith(('http://localhost', 'https://localhost', 'https://')):
+        continue_url = DEFAULT_VERIFY_CONTINUE_URL
+    return continue_url
+
+
+def _send_verification_email(user_id, firebase_uid, continue_url, include_link):
     """
-    Send verification email to the user via Firebase
+    Send the verification email through the Firebase Admin client.
+
+    Returns a ``(payload, status_code)`` tuple so the same logic backs both the
+    synchronous response and background jobs.
     """
-    try:
-        # Rate limiting check - prevent spam
-        cache_key = f"verification_email_{request.user.id}"
-        last_sent = cache.get(cache_key)
+    # Imported here so firebase_admin stays out of Django startup
+    from firebase_admin import auth
 
-        if last_sent:
-            return Response({
-                "detail": "Verification email already sent recently. Please wait before requesting another.",
-                "retry_after": 60  # seconds
-            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
-        
-        # Get Firebase user
-        firebase_user = auth.get_user(request.user.firebase_uid)
+    client = get_firebase_client()
+
+    try:
+        firebase_user = client.get_user(firebase_uid)
 
         # Check if email is already verified
         if firebase_user.email_verified:
             # Update local database
-            User.objects.filter(id=request.user.id).update(is_email_verified=True)
-            
-            return Response({
+            User.objects.filter(id=user_id).update(is_email_verified=True)
+            cache.delete(f"user_profile_{user_id}")
+
+            return {
                 "message": "Email is already verified",
                 "is_verified": True
-            })
-        
-        # Validate continue URL
-        continue_url = request.data.get('continueUrl', 'http://localhost:3000/auth/verify-email')
-        
-        # Validate URL format for security
-        if not continue_url.startswith(('http://localhost', 'https://localhost', 'https://')):
-            continue_url = 'http://localhost:3000/auth/verify-email'
-
-        # Generate email verification link
-        action_code_settings = auth.ActionCodeSettings(
-            url=continue_url,
-            handle_code_in_app=True
-        )
-        
+            }, status.HTTP_200_OK
+
         # Send verification email
-        verification_link = auth.generate_email_verification_link(
+        verification_link = client.generate_email_verification_link(
             firebase_user.email,
-            action_code_settings=action_code_settings
+            continue_url
         )
 
-        # Set rate limit cache (1 minute)
-        cache.set(cache_key, True, 60)
-
         # Log the action for audit
-        logger.info(f"Verification email sent to user {request.user.id} ({firebase_user.email})")
-        
-        return Response({
+        logger.info(f"Verification email sent to user {user_id} ({firebase_user.email})")
+
+        return {
             "message": "Verification email sent successfully",
             "email": firebase_user.email,
-            "link": verification_link if request.user.is_staff else None  # Only show link to staff
-        })
+            "link": verification_link if include_link else None  # Only show link to staff
+        }, status.HTTP_200_OK
 
     except auth.UserNotFoundError:
-        logger.error(f"Firebase user not found for user {request.user.id}")
-        return Response({
+        logger.error(f"Firebase user not found for user {user_id}")
+        return {
             "detail": "User not found in Firebase. Please contact support."
-        }, status=status.HTTP_404_NOT_FOUND)
-        
+        }, status.HTTP_404_NOT_FOUND
+
+    except FirebaseUnavailableError as e:
+        logger.error(f"Firebase unavailable while sending verification email: {str(e)}")
+        return {
+            "detail": "Email service is temporarily unavailable. Please try again later.",
+            "retry_after": e.retry_after
+        }, status.HTTP_503_SERVICE_UNAVAILABLE
+
     except auth.FirebaseError as e:
         logger.error(f"Firebase error sending verification email: {str(e)}")
-        return Response({
+        return {
             "detail": "Failed to send verification email. Please try again later."
-        }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
-        
+        }, status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+def _run_verification_email_job(job_id, user_id, firebase_uid, continue_url, include_link):
+    """Background job body: send the email and store the outcome under the job id."""
+    job_key = f"verification_email_job_{job_id}"
+    try:
+        payload, status_code = _send_verification_email(
+            user_id, firebase_uid, continue_url, include_link
+        )
+        if status_code >= 400:
+            # Let the user retry straight away if the send did not go through
+            cache.delete(f"verification_email_{user_id}")
+        cache.set(job_key, {
+            "job_id": job_id,
+            "user_id": user_id,
+            "status": "succeeded" if status_code < 400 else "failed",
+            "status_code": status_code,
+            "result": payload
+        }, VERIFICATION_JOB_TTL)
+    except Exception as e:
+        logger.error(f"Verification email job {job_id} failed: {str(e)}")
+        cache.delete(f"verification_email_{user_id}")
+        cache.set(job_key, {
+            "job_id": job_id,
+            "user_id": user_id,
+            "status": "failed",
+            "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
+            "result": {"detail": "An unexpected error occurred. Please try again."}
+        }, VERIFICATION_JOB_TTL)
+    finally:
+        # Background threads own their DB connection
+        connection.close()
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def send_verification_email(request):
+    """
+    Send verification email to the user via Firebase.
+
+    Pass ``"background": true`` (or ``?background=true``) to enqueue the send and
+    receive 202 with a job id; poll ``send-verification-email/<job_id>/`` for the result.
+    """
+    try:
+        # Rate limiting check - prevent spam
+        cache_key = f"verification_email_{request.user.id}"
+        last_sent = cache.get(cache_key)
+
+        if last_sent:
+            return Response({
+                "detail": "Verification email already sent recently. Please wait before requesting another.",
+                "retry_after": VERIFICATION_EMAIL_RATE_LIMIT  # seconds
+            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+
+        continue_url = _get_continue_url(request)
+        background = (
+            str(request.data.get('background', '')).lower() == 'true' or
+            request.query_params.get('background', '').lower() == 'true'
+        )
+
+        if background:
+            job_id = uuid.uuid4().hex
+            cache.set(cache_key, True, VERIFICATION_EMAIL_RATE_LIMIT)
+            cache.set(f"verification_email_job_{job_id}", {
+                "job_id": job_id,
+                "user_id": request.user.id,
+                "status": "pending",
+                "status_code": None,
+                "result": None
+            }, VERIFICATION_JOB_TTL)
+            submit_background(
+                _run_verification_email_job,
+                job_id,
+                request.user.id,
+                request.user.firebase_uid,
+                continue_url,
+                request.user.is_staff
+            )
+            return Response({
+                "job_id": job_id,
+                "status": "pending"
+            }, status=status.HTTP_202_ACCEPTED)
+
+        payload, status_code = _send_verification_email(
+            request.user.id,
+            request.user.firebase_uid,
+            continue_url,
+            request.user.is_staff
+        )
+
+        if status_code == status.HTTP_200_OK and "email" in payload:
+            # Set rate limit cache (1 minute)
+            cache.set(cache_key, True, VERIFICATION_EMAIL_RATE_LIMIT)
+
+        response = Response(payload, status=status_code)
+        if "retry_after" in payload and status_code == status.HTTP_503_SERVICE_UNAVAILABLE:
+            response["Retry-After"] = str(payload["retry_after"])
+        return response
+
     except Exception as e:
         logger.error(f"Unexpected error sending verification email: {str(e)}")
         return Response({
             "detail": "An unexpected error occurred. Please try again."
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def verification_email_status(request, job_id):
+    """
+    Return the status of a background verification email job.
+    """
+    job = cache.get(f"verification_email_job_{job_id}")
+    if not job or job["user_id"] != request.user.id:
+        return Response(
+            {"detail": "Job not found"},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    return Response(job)
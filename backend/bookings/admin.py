@@ -1,9 +1,16 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.http import Http404
 from django.utils.html import format_html
-from django.urls import reverse
+from django.urls import path, reverse
 from django.utils.safestring import mark_safe
 from django import forms
+from agencies.versioning import update_and_bump
+from config.autocomplete import IdAutocompleteSelect, autocomplete_response
+from config.paginator import EstimatedCountPaginator
 from .models import Booking, BookingType
+from .prefetch import prefetch_booking_relations
 
 
 @admin.register(BookingType)
@@ -34,8 +41,29 @@ class BookingTypeAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at', 'updated_at']
 
 
+def _autocomplete_sources():
+    """Picker name -> (model, prefix-searched fields, ordering, option label)."""
+    from artists.models import Artist
+    from venues.models import Venue
+    from promoters.models import Promoter
+    from contacts.models import Contact
+    
+    return {
+        'artist': (Artist, ['artist_name'], ['artist_name'], lambda a: a.artist_name),
+        'venue': (Venue, ['venue_name'], ['venue_name'], lambda v: f"{v.venue_name} - {v.venue_city}"),
+        'promoter': (
+            Promoter, ['promoter_name', 'company_name'], ['promoter_name'],
+            lambda p: f"{p.promoter_name} ({p.company_name})" if p.company_name else p.promoter_name
+        ),
+        'promoter_contact': (
+            Contact, ['contact_name', 'contact_email'], ['contact_name'],
+            lambda c: f"{c.contact_name} <{c.contact_email}>" if c.contact_email else c.contact_name
+        ),
+    }
+
+
 class BookingAdminForm(forms.ModelForm):
-    """Custom form for Booking admin with searchable dropdowns."""
+    """Custom form for Booking admin with server-side autocomplete pickers."""
     
     artist = forms.ModelChoiceField(
         queryset=None,
@@ -71,12 +99,6 @@ class BookingAdminForm(forms.ModelForm):
         self.request = kwargs.pop('request', None)
         super().__init__(*args, **kwargs)
         
-        # Import models here to avoid circular imports
-        from artists.models import Artist
-        from venues.models import Venue
-        from promoters.models import Promoter
-        from contacts.models import Contact
-        
         # Get the agency from the instance, initial data, or request user
         agency = None
         if self.instance and self.instance.pk and hasattr(self.instance, 'agency'):
@@ -86,56 +108,23 @@ class BookingAdminForm(forms.ModelForm):
         elif self.request and hasattr(self.request, 'user') and hasattr(self.request.user, 'profile'):
             agency = self.request.user.profile.agency
         
-        # Set querysets based on agency
-        if agency:
-            self.fields['artist'].queryset = Artist.objects.filter(agency=agency).order_by('artist_name')
-            self.fields['venue'].queryset = Venue.objects.filter(agency=agency).order_by('venue_name')
-            self.fields['promoter'].queryset = Promoter.objects.filter(agency=agency).order_by('promoter_name')
-            self.fields['promoter_contact'].queryset = Contact.objects.filter(agency=agency).order_by('contact_name')
-        else:
-            self.fields['artist'].queryset = Artist.objects.none()
-            self.fields['venue'].queryset = Venue.objects.none()
-            self.fields['promoter'].queryset = Promoter.objects.none()
-            self.fields['promoter_contact'].queryset = Contact.objects.none()
-        
-        # Pre-populate fields if editing existing booking
-        if self.instance and self.instance.pk:
-            if self.instance.artist_id:
-                try:
-                    self.fields['artist'].initial = Artist.objects.get(
-                        id=self.instance.artist_id,
-                        agency=agency
-                    )
-                except (Artist.DoesNotExist, ValueError):
-                    # ValueError handles invalid UUID format
-                    pass
-            
-            if self.instance.venue_id:
-                try:
-                    self.fields['venue'].initial = Venue.objects.get(
-                        id=self.instance.venue_id,
-                        agency=agency
-                    )
-                except (Venue.DoesNotExist, ValueError):
-                    pass
-            
-            if self.instance.promoter_id:
-                try:
-                    self.fields['promoter'].initial = Promoter.objects.get(
-                        id=self.instance.promoter_id,
-                        agency=agency
-                    )
-                except (Promoter.DoesNotExist, ValueError):
-                    pass
+        # Pickers load their options from BookingAdmin.autocomplete_view, so
+        # only the selected row of each table is rendered
+        for name, (model, _search, ordering, label) in _autocomplete_sources().items():
+            field = self.fields[name]
+            url = reverse('admin:bookings_booking_autocomplete', args=[name])
+            if agency:
+                url = f"{url}?agency={getattr(agency, 'pk', agency)}"
+            field.widget = IdAutocompleteSelect(url)
+            field.widget.is_required = field.required
+            field.label_from_instance = label
+            field.queryset = (
+                model.objects.filter(agency=agency).order_by(*ordering) if agency else model.objects.none()
+            )
             
-            if self.instance.promoter_contact_id:
-                try:
-                    self.fields['promoter_contact'].initial = Contact.objects.get(
-                        id=self.instance.promoter_contact_id,
-                        agency=agency
-                    )
-                except (Contact.DoesNotExist, ValueError):
-                    pass
+            # Pre-populate fields if editing existing booking
+            if self.instance and self.instance.pk and getattr(self.instance, f'{name}_id'):
+                field.initial = getattr(self.instance, f'{name}_id')
         
         # Hide the original CharField fields
         if 'artist_id' in self.fields:
@@ -192,11 +181,33 @@ class BookingAdminForm(forms.ModelForm):
         return instance
 
 
+class BookingChangeList(ChangeList):
+    """Changelist that resolves the page's artists, promoters and venues in bulk."""
+    
+    def get_results(self, request):
+        super().get_results(request)
+        self.result_list = prefetch_booking_relations(
+            self.result_list, relations=('artist', 'promoter', 'venue')
+        )
+
+
+def related_link(obj, url_name, label, raw_id):
+    """Link to a resolved related object, or show its stored ID."""
+    if obj is not None:
+        return format_html('<a href="{}">{}</a>', reverse(url_name, args=[obj.id]), label)
+    return format_html(
+        '<span style="color: #999;">ID: {}</span>',
+        raw_id[:8] if raw_id else 'N/A'
+    )
+
+
 @admin.register(Booking)
 class BookingAdmin(admin.ModelAdmin):
     """Admin interface for Booking model."""
     
     form = BookingAdminForm
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     list_display = [
         'booking_reference',
@@ -408,65 +419,29 @@ class BookingAdmin(admin.ModelAdmin):
     
     def artist_display(self, obj):
         """Display artist name with link."""
-        try:
-            artist = obj.get_artist()
-            if artist:
-                return format_html(
-                    '<a href="{}">{}</a>',
-                    reverse('admin:artists_artist_change', args=[artist.id]),
-                    artist.name
-                )
-            return format_html(
-                '<span style="color: #999;">ID: {}</span>',
-                obj.artist_id[:8] if obj.artist_id else 'N/A'
-            )
-        except Exception as e:
-            return format_html(
-                '<span style="color: #dc3545;">Invalid: {}</span>',
-                obj.artist_id[:20] if obj.artist_id else 'N/A'
-            )
+        artist = obj.get_artist()
+        return related_link(
+            artist, 'admin:artists_artist_change',
+            artist.artist_name if artist else None, obj.artist_id
+        )
     artist_display.short_description = 'Artist'
     
     def promoter_display(self, obj):
         """Display promoter name with link."""
-        try:
-            promoter = obj.get_promoter()
-            if promoter:
-                return format_html(
-                    '<a href="{}">{}</a>',
-                    reverse('admin:promoters_promoter_change', args=[promoter.id]),
-                    promoter.name
-                )
-            return format_html(
-                '<span style="color: #999;">ID: {}</span>',
-                obj.promoter_id[:8] if obj.promoter_id else 'N/A'
-            )
-        except Exception as e:
-            return format_html(
-                '<span style="color: #dc3545;">Invalid: {}</span>',
-                obj.promoter_id[:20] if obj.promoter_id else 'N/A'
-            )
+        promoter = obj.get_promoter()
+        return related_link(
+            promoter, 'admin:promoters_promoter_change',
+            promoter.promoter_name if promoter else None, obj.promoter_id
+        )
     promoter_display.short_description = 'Promoter'
     
     def venue_display(self, obj):
         """Display venue name with link."""
-        try:
-            venue = obj.get_venue()
-            if venue:
-                return format_html(
-                    '<a href="{}">{}</a>',
-                    reverse('admin:venues_venue_change', args=[venue.id]),
-                    venue.name
-                )
-            return format_html(
-                '<span style="color: #999;">ID: {}</span>',
-                obj.venue_id[:8] if obj.venue_id else 'N/A'
-            )
-        except Exception as e:
-            return format_html(
-                '<span style="color: #dc3545;">Invalid: {}</span>',
-                obj.venue_id[:20] if obj.venue_id else 'N/A'
-            )
+        venue = obj.get_venue()
+        return related_link(
+            venue, 'admin:venues_venue_change',
+            venue.venue_name if venue else None, obj.venue_id
+        )
     venue_display.short_description = 'Venue'
     
     def location_display(self, obj):
@@ -547,13 +522,14 @@ class BookingAdmin(admin.ModelAdmin):
     
     def mark_as_confirmed(self, request, queryset):
         """Mark selected bookings as confirmed."""
-        updated = queryset.update(status=Booking.BookingStatus.CONFIRMED)
+        updated = update_and_bump(queryset, status=Booking.BookingStatus.CONFIRMED)
         self.message_user(request, f'{updated} booking(s) marked as confirmed.')
     mark_as_confirmed.short_description = 'Mark selected as Confirmed'
     
     def mark_as_cancelled(self, request, queryset):
         """Mark selected bookings as cancelled."""
-        updated = queryset.update(
+        updated = update_and_bump(
+            queryset,
             status=Booking.BookingStatus.CANCELLED,
             is_cancelled=True
         )
@@ -563,7 +539,8 @@ class BookingAdmin(admin.ModelAdmin):
     def send_contracts(self, request, queryset):
         """Mark contracts as sent."""
         from django.utils import timezone
-        updated = queryset.update(
+        updated = update_and_bump(
+            queryset,
             contract_status=Booking.ContractStatus.SENT,
             contract_sent_date=timezone.now()
         )
@@ -573,15 +550,59 @@ class BookingAdmin(admin.ModelAdmin):
     def mark_contracts_signed(self, request, queryset):
         """Mark contracts as signed."""
         from django.utils import timezone
-        updated = queryset.filter(
-            contract_status=Booking.ContractStatus.SENT
-        ).update(
+        updated = update_and_bump(
+            queryset.filter(contract_status=Booking.ContractStatus.SENT),
             contract_status=Booking.ContractStatus.SIGNED,
             contract_signed_date=timezone.now()
         )
         self.message_user(request, f'{updated} contract(s) marked as signed.')
     mark_contracts_signed.short_description = 'Mark contracts as Signed'
     
+    def get_changelist(self, request, **kwargs):
+        return BookingChangeList
+    
+    def get_urls(self):
+        urls = [
+            path(
+                'autocomplete/<str:source>/',
+                self.admin_site.admin_view(self.autocomplete_view),
+                name='bookings_booking_autocomplete'
+            ),
+        ]
+        return urls + super().get_urls()
+    
+    def autocomplete_view(self, request, source):
+        """
+        JSON options for the booking form's pickers, limited to one agency.
+        
+        Staff with an agency profile only ever see their own agency, and
+        staff without one see nothing; only superusers may pick the agency
+        with ?agency=.
+        """
+        if not (self.has_add_permission(request) or self.has_change_permission(request)):
+            raise PermissionDenied
+        sources = _autocomplete_sources()
+        if source not in sources:
+            raise Http404(f'Unknown autocomplete source: {source}')
+        model, search_fields, ordering, label = sources[source]
+        
+        profile = getattr(request.user, 'profile', None)
+        agency_id = getattr(profile, 'agency_id', None)
+        if request.user.is_superuser:
+            agency_id = request.GET.get('agency') or agency_id
+        
+        queryset = model.objects.none()
+        try:
+            if agency_id:
+                queryset = model.objects.filter(agency_id=agency_id).order_by(*ordering)
+        except (ValueError, ValidationError):
+            pass
+        try:
+            page = int(request.GET.get('page', 1))
+        except ValueError:
+            page = 1
+        return autocomplete_response(queryset, search_fields, request.GET.get('term', ''), page, label)
+    
     def get_form(self, request, obj=None, **kwargs):
         """Pass request to form so it can access user's agency."""
         form = super().get_form(request, obj, **kwargs)
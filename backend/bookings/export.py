@@ -0,0 +1,113 @@
+# bookings/export.py
+
+"""
+Streaming booking exports (CSV and XLSX).
+
+Rows are read with ``QuerySet.iterator(chunk_size=...)`` (a server-side
+cursor on PostgreSQL) and written out one chunk at a time. Artist, promoter
+and venue names are resolved per chunk with ``prefetch_booking_relations``,
+so an export costs a few queries per chunk whatever its size, and memory
+stays flat however many bookings are exported.
+"""
+
+import csv
+import datetime
+import io
+from itertools import islice
+from typing import Any, Callable, Iterator, List, Sequence, Tuple
+
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from config.xlsx import stream_xlsx
+
+from .models import Booking
+from .prefetch import prefetch_booking_relations
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_RELATIONS = ('artist', 'promoter', 'venue')
+
+
+def _name(obj, field):
+    return getattr(obj, field) if obj is not None else ''
+
+
+# (header, value for a booking whose relations are prefetched)
+EXPORT_COLUMNS: List[Tuple[str, Callable[[Booking], Any]]] = [
+    ('Reference', lambda b: b.booking_reference),
+    ('Date', lambda b: b.booking_date),
+    ('Status', lambda b: b.get_status_display()),
+    ('Event', lambda b: b.event_name),
+    ('Artist', lambda b: _name(b.get_artist(), 'artist_name')),
+    ('Promoter', lambda b: _name(b.get_promoter(), 'promoter_name')),
+    ('Venue', lambda b: _name(b.get_venue(), 'venue_name')),
+    ('City', lambda b: b.location_city),
+    ('Country', lambda b: b.location_country.code if b.location_country else ''),
+    ('Booking Type', lambda b: b.booking_type.name if b.booking_type else ''),
+    ('Deal Type', lambda b: b.get_deal_type_display()),
+    ('Currency', lambda b: b.currency),
+    ('Guarantee', lambda b: b.guarantee_amount),
+    ('Bonus', lambda b: b.bonus_amount),
+    ('Expenses', lambda b: b.expenses_amount),
+    ('Booking Fee', lambda b: b.booking_fee_amount),
+    ('Contract Status', lambda b: b.get_contract_status_display()),
+    ('Artist Fee Invoice', lambda b: b.get_artist_fee_invoice_status_display()),
+    ('Artist Fee Due', lambda b: b.artist_fee_invoice_due_date),
+    ('Booking Fee Invoice', lambda b: b.get_booking_fee_invoice_status_display()),
+    ('Booking Fee Due', lambda b: b.booking_fee_invoice_due_date),
+    ('Cancelled', lambda b: b.is_cancelled),
+]
+
+EXPORT_HEADER = [header for header, _ in EXPORT_COLUMNS]
+
+
+def export_batches(queryset: QuerySet, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[List[List[Any]]]:
+    """Yield the export rows of ``queryset`` in lists of up to ``chunk_size``."""
+    bookings = queryset.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(bookings, chunk_size))
+        if not chunk:
+            return
+        prefetch_booking_relations(chunk, relations=EXPORT_RELATIONS)
+        yield [[value(booking) for _, value in EXPORT_COLUMNS] for booking in chunk]
+
+
+# Spreadsheet apps run cells starting with these as formulas
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'yes' if value else 'no'
+    if isinstance(value, datetime.datetime):
+        return timezone.localtime(value).strftime('%Y-%m-%d %H:%M')
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(header: Sequence[str], batches) -> Iterator[str]:
+    """Yield CSV text for ``header`` and the rows of ``batches``, one batch at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # Lets Excel detect UTF-8
+    buffer.write('\ufeff')
+    writer.writerow(header)
+    for batch in batches:
+        writer.writerows([_csv_value(value) for value in row] for row in batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def stream_bookings_csv(queryset: QuerySet, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[str]:
+    return stream_csv(EXPORT_HEADER, export_batches(queryset, chunk_size))
+
+
+def stream_bookings_xlsx(queryset: QuerySet, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    return stream_xlsx(EXPORT_HEADER, export_batches(queryset, chunk_size), sheet_name='Bookings')
@@ -1,127 +1,229 @@
-from django.core.management.base import BaseCommand
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
 from django.utils import timezone
+
+from agencies.models import Agency
 from bookings.models import Booking
+from bookings.overdue import (
+    DEFAULT_BATCH_SIZE, INVOICES, init_worker, mark_overdue_invoices, overdue_q, overdue_summary,
+)
 
 
 class Command(BaseCommand):
     """
     Management command to check and update overdue invoice statuses.
-    
+
     Usage:
         python manage.py check_overdue_invoices
-        
+        python manage.py check_overdue_invoices --workers 4 --batch-size 5000
+        python manage.py check_overdue_invoices --dry-run --json
+
     This command should be run daily via cron job or scheduled task.
+    Agencies are processed in id order, each in chunks of --batch-size
+    bookings with one short transaction per chunk.
     """
-    
+
     help = 'Check and update overdue invoice statuses for all bookings'
-    
+
     def add_arguments(self, parser):
         parser.add_argument(
             '--dry-run',
             action='store_true',
             help='Show what would be updated without making changes',
         )
-        
+
         parser.add_argument(
             '--agency',
             type=str,
             help='Filter by specific agency ID',
         )
-    
+
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Bookings updated per transaction (default: {DEFAULT_BATCH_SIZE})',
+        )
+
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of processes to spread agencies over (default: 1)',
+        )
+
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Write a machine-readable JSON report instead of text',
+        )
+
+        parser.add_argument(
+            '--show',
+            type=int,
+            default=20,
+            help='In dry-run mode, list at most this many invoices of each kind (default: 20)',
+        )
+
     def handle(self, *args, **options):
         """Execute the command."""
         dry_run = options['dry_run']
         agency_id = options.get('agency')
-        
+        batch_size = options['batch_size']
+        workers = options['workers']
+        as_json = options['json']
+        self.verbosity = options['verbosity']
+
+        if batch_size < 1:
+            raise CommandError('--batch-size must be at least 1')
+        if workers < 1:
+            raise CommandError('--workers must be at least 1')
+
+        started = time.monotonic()
         today = timezone.now().date()
-        
-        # Build base queryset
+
         queryset = Booking.objects.all()
-        
+        agencies = Agency.objects.order_by('id')
         if agency_id:
-            queryset = queryset.filter(agency_id=agency_id)
-            self.stdout.write(f'Filtering by agency: {agency_id}')
-        
-        # Find overdue artist fee invoices
-        artist_overdue = queryset.filter(
-            artist_fee_invoice_status=Booking.InvoiceStatus.SENT,
-            artist_fee_invoice_due_date__lt=today
-        )
-        
-        # Find overdue booking fee invoices
-        booking_overdue = queryset.filter(
-            booking_fee_invoice_status=Booking.InvoiceStatus.SENT,
-            booking_fee_invoice_due_date__lt=today
-        )
-        
-        artist_count = artist_overdue.count()
-        booking_count = booking_overdue.count()
-        
-        self.stdout.write(
-            self.style.WARNING(
-                f'\nFound {artist_count} overdue artist fee invoice(s)'
-            )
-        )
-        self.stdout.write(
-            self.style.WARNING(
-                f'Found {booking_count} overdue booking fee invoice(s)'
-            )
-        )
-        
-        if dry_run:
-            self.stdout.write(
-                self.style.NOTICE('\n=== DRY RUN MODE - No changes will be made ===\n')
-            )
-            
-            # Show details of what would be updated
-            if artist_count > 0:
-                self.stdout.write('\nArtist Fee Invoices that would be marked overdue:')
-                for booking in artist_overdue:
-                    self.stdout.write(
-                        f'  - {booking.booking_reference}: '
-                        f'{booking.event_name or "No event name"} '
-                        f'(Due: {booking.artist_fee_invoice_due_date})'
-                    )
-            
-            if booking_count > 0:
-                self.stdout.write('\nBooking Fee Invoices that would be marked overdue:')
-                for booking in booking_overdue:
-                    self.stdout.write(
-                        f'  - {booking.booking_reference}: '
-                        f'{booking.event_name or "No event name"} '
-                        f'(Due: {booking.booking_fee_invoice_due_date})'
-                    )
-        else:
-            # Actually update the invoices
-            artist_updated = artist_overdue.update(
-                artist_fee_invoice_status=Booking.InvoiceStatus.OVERDUE
-            )
-            booking_updated = booking_overdue.update(
-                booking_fee_invoice_status=Booking.InvoiceStatus.OVERDUE
-            )
-            
+            try:
+                queryset = queryset.filter(agency_id=agency_id)
+                agencies = agencies.filter(id=agency_id)
+            except ValueError:
+                raise CommandError(f'Invalid agency ID: {agency_id}')
+            if not as_json:
+                self.stdout.write(f'Filtering by agency: {agency_id}')
+        agency_ids = list(agencies.values_list('id', flat=True))
+
+        # Due and overdue counts for both invoices, in a single query
+        summary = overdue_summary(queryset, today)
+
+        report = {
+            'date': today.isoformat(),
+            'dry_run': dry_run,
+            'agencies': len(agency_ids),
+            'batch_size': batch_size,
+            'workers': workers,
+        }
+
+        if not as_json:
             self.stdout.write(
-                self.style.SUCCESS(
-                    f'\n✓ Updated {artist_updated} artist fee invoice(s) to OVERDUE'
+                self.style.WARNING(
+                    f'\nFound {summary["artist_fee"]["due"]} overdue artist fee invoice(s)'
                 )
             )
             self.stdout.write(
-                self.style.SUCCESS(
-                    f'✓ Updated {booking_updated} booking fee invoice(s) to OVERDUE'
+                self.style.WARNING(
+                    f'Found {summary["booking_fee"]["due"]} overdue booking fee invoice(s)'
                 )
             )
-        
+
+        if dry_run:
+            report['invoices'] = {
+                invoice: {
+                    'would_update': summary[invoice]['due'],
+                    'total_overdue': summary[invoice]['overdue'] + summary[invoice]['due'],
+                }
+                for invoice in INVOICES
+            }
+            if not as_json:
+                self.stdout.write(
+                    self.style.NOTICE('\n=== DRY RUN MODE - No changes will be made ===\n')
+                )
+                self._show_due(queryset, today, summary, options['show'])
+        else:
+            results = self._run(agency_ids, today, batch_size, workers, as_json)
+            updated = {invoice: sum(r[invoice] for r in results) for invoice in INVOICES}
+            report['batches'] = sum(r['batches'] for r in results)
+            report['invoices'] = {
+                invoice: {
+                    'updated': updated[invoice],
+                    'total_overdue': summary[invoice]['overdue'] + updated[invoice],
+                }
+                for invoice in INVOICES
+            }
+            report['updated_agencies'] = [
+                r['agency_id'] for r in results if any(r[invoice] for invoice in INVOICES)
+            ]
+
+            if not as_json:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'\n✓ Updated {updated["artist_fee"]} artist fee invoice(s) to OVERDUE'
+                    )
+                )
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'✓ Updated {updated["booking_fee"]} booking fee invoice(s) to OVERDUE'
+                    )
+                )
+
+        report['total_overdue'] = sum(report['invoices'][invoice]['total_overdue'] for invoice in INVOICES)
+        report['duration_seconds'] = round(time.monotonic() - started, 3)
+
+        if as_json:
+            self.stdout.write(json.dumps(report, default=str))
+            return
+
         # Show summary of all overdue invoices
-        total_overdue = Booking.objects.filter(
-            artist_fee_invoice_status=Booking.InvoiceStatus.OVERDUE
-        ).count() + Booking.objects.filter(
-            booking_fee_invoice_status=Booking.InvoiceStatus.OVERDUE
-        ).count()
-        
+        scope = 'for agency' if agency_id else 'in system'
         self.stdout.write(
             self.style.WARNING(
-                f'\nTotal overdue invoices in system: {total_overdue}'
+                f'\nTotal overdue invoices {scope}: {report["total_overdue"]}'
             )
         )
-        
-        self.stdout.write(self.style.SUCCESS('\n✓ Command completed successfully\n'))
\ No newline at end of file
+
+        self.stdout.write(self.style.SUCCESS('\n✓ Command completed successfully\n'))
+
+    def _run(self, agency_ids, today, batch_size, workers, as_json):
+        """Mark overdue invoices for every agency, in this process or a pool."""
+        results = []
+        if workers == 1 or len(agency_ids) <= 1:
+            for agency_id in agency_ids:
+                results.append(mark_overdue_invoices(agency_id, today=today, batch_size=batch_size))
+                self._progress(results[-1], as_json)
+            return results
+
+        # Workers must open their own connections, never share the parent's
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+            futures = [
+                pool.submit(mark_overdue_invoices, agency_id, today, batch_size)
+                for agency_id in agency_ids
+            ]
+            for future in as_completed(futures):
+                results.append(future.result())
+                self._progress(results[-1], as_json)
+        results.sort(key=lambda r: r['agency_id'])
+        return results
+
+    def _progress(self, result, as_json):
+        if as_json or self.verbosity < 2:
+            return
+        self.stdout.write(
+            f'  Agency {result["agency_id"]}: '
+            f'{result["artist_fee"]} artist fee, {result["booking_fee"]} booking fee '
+            f'({result["batches"]} batch(es))'
+        )
+
+    def _show_due(self, queryset, today, summary, limit):
+        """List a sample of the invoices a real run would update."""
+        for invoice, title in (('artist_fee', 'Artist Fee'), ('booking_fee', 'Booking Fee')):
+            count = summary[invoice]['due']
+            if not count or limit <= 0:
+                continue
+            self.stdout.write(f'\n{title} Invoices that would be marked overdue:')
+            rows = queryset.filter(overdue_q(invoice, today)).order_by('id').values_list(
+                'booking_reference', 'event_name', f'{invoice}_invoice_due_date'
+            )[:limit]
+            for reference, event_name, due_date in rows:
+                self.stdout.write(
+                    f'  - {reference}: '
+                    f'{event_name or "No event name"} '
+                    f'(Due: {due_date})'
+                )
+            if count > limit:
+                self.stdout.write(f'  ... and {count - limit} more')
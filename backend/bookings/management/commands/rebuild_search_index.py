@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from bookings.models import Booking
+from bookings.search import BOOKING_SEARCH_INDEX
+
+
+class Command(BaseCommand):
+    """
+    Management command to rebuild the bookings full-text search index.
+
+    Usage:
+        python manage.py rebuild_search_index
+        python manage.py rebuild_search_index --batch-size 5000
+
+    Needed only after bulk changes that bypass model signals (queryset
+    update() or bulk_create() on searched columns) or a restore from backup.
+    """
+
+    help = 'Rebuild the bookings full-text search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Bookings indexed per batch (default: 2000)',
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        if not BOOKING_SEARCH_INDEX.is_available(Booking.objects.db):
+            self.stdout.write(
+                self.style.WARNING('No full-text index on this database; ?search= uses a LIKE scan')
+            )
+            return
+        count = BOOKING_SEARCH_INDEX.rebuild(Booking.objects.all(), batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'✓ Indexed {count} booking(s)'))
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-19 03:05
+
+from django.db import migrations
+
+from config.fulltext import FullTextIndex
+
+
+# The index as of this migration; bookings/search.py holds the current one
+BOOKING_SEARCH_INDEX = FullTextIndex('bookings_booking_search', [
+    ('booking_reference', 'A'),
+    ('event_name', 'A'),
+    ('location_city', 'B'),
+    ('notes', 'C'),
+])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0002_booking_booking_fee_percentage_and_more'),
+    ]
+
+    operations = [
+        BOOKING_SEARCH_INDEX.migration_operation('bookings', 'Booking'),
+    ]
@@ -497,8 +497,43 @@ class Booking(TimestampedModel):
     
     # === HELPER METHODS FOR CROSS-APP QUERIES ===
     
+    def _related_key(self, name):
+        if name == 'promoter_contact':
+            # The contact is only valid for the booking's promoter
+            return (self.promoter_contact_id, self.promoter_id)
+        return getattr(self, f'{name}_id')
+    
+    def set_related(self, name, obj):
+        """Memoize a resolved related object (see bookings.prefetch)."""
+        if not hasattr(self, '_related_objects'):
+            self._related_objects = {}
+        self._related_objects[name] = (self._related_key(name), obj)
+    
+    def _get_related(self, name, loader):
+        cached = getattr(self, '_related_objects', {}).get(name)
+        if cached is not None and cached[0] == self._related_key(name):
+            return cached[1]
+        obj = loader()
+        self.set_related(name, obj)
+        return obj
+    
     def get_artist(self):
         """Get the related artist object safely."""
+        return self._get_related('artist', self._load_artist)
+    
+    def get_promoter(self):
+        """Get the related promoter object safely."""
+        return self._get_related('promoter', self._load_promoter)
+    
+    def get_venue(self):
+        """Get the related venue object safely."""
+        return self._get_related('venue', self._load_venue)
+    
+    def get_promoter_contact(self):
+        """Get the related promoter contact safely."""
+        return self._get_related('promoter_contact', self._load_promoter_contact)
+    
+    def _load_artist(self):
         try:
             from artists.models import Artist
             return Artist.objects.filter(
@@ -508,8 +543,7 @@ class Booking(TimestampedModel):
         except ImportError:
             return None
     
-    def get_promoter(self):
-        """Get the related promoter object safely."""
+    def _load_promoter(self):
         try:
             from promoters.models import Promoter
             return Promoter.objects.filter(
@@ -519,8 +553,7 @@ class Booking(TimestampedModel):
         except ImportError:
             return None
     
-    def get_venue(self):
-        """Get the related venue object safely."""
+    def _load_venue(self):
         try:
             from venues.models import Venue
             return Venue.objects.filter(
@@ -530,8 +563,7 @@ class Booking(TimestampedModel):
         except ImportError:
             return None
     
-    def get_promoter_contact(self):
-        """Get the related promoter contact safely."""
+    def _load_promoter_contact(self):
         if not self.promoter_contact_id:
             return None
         try:
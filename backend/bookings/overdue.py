@@ -0,0 +1,105 @@
+# bookings/overdue.py
+
+"""
+Marking sent invoices as overdue once their due date has passed.
+
+Work is split per agency and, within an agency, into id-ordered chunks of
+bookings, each updated in its own short transaction. No single statement
+locks more than ``batch_size`` rows, so the nightly run can go through
+millions of bookings without blocking the API. Agencies are independent,
+which lets the management command spread them over worker processes.
+"""
+
+import datetime
+from typing import Any, Dict, Optional
+
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from agencies.versioning import bump_data_version
+from config.stats import compute_stats
+
+from .models import Booking
+
+
+DEFAULT_BATCH_SIZE = 1000
+
+# The two invoices on a booking, keyed by the prefix of their fields
+INVOICES = ('artist_fee', 'booking_fee')
+
+
+def overdue_q(invoice: str, today: datetime.date) -> Q:
+    """Sent invoices of kind ``invoice`` whose due date is before ``today``."""
+    return Q(**{
+        f'{invoice}_invoice_status': Booking.InvoiceStatus.SENT,
+        f'{invoice}_invoice_due_date__lt': today,
+    })
+
+
+def overdue_summary(queryset: QuerySet, today: datetime.date) -> Dict[str, Dict[str, int]]:
+    """
+    Count due and already overdue invoices of each kind in one query.
+
+    ``due`` invoices are the ones a run would mark overdue.
+    """
+    return compute_stats(queryset, {
+        invoice: {
+            'due': overdue_q(invoice, today),
+            'overdue': Q(**{f'{invoice}_invoice_status': Booking.InvoiceStatus.OVERDUE}),
+        }
+        for invoice in INVOICES
+    })
+
+
+def mark_overdue_invoices(
+    agency_id,
+    today: Optional[datetime.date] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """
+    Mark one agency's due invoices as overdue, ``batch_size`` bookings at a time.
+
+    Returns ``{'agency_id', 'artist_fee', 'booking_fee', 'batches'}`` with
+    the number of invoices updated of each kind.
+    """
+    today = today or timezone.now().date()
+    bookings = Booking.objects.filter(agency_id=agency_id)
+    due = Q()
+    for invoice in INVOICES:
+        due |= overdue_q(invoice, today)
+
+    result = {'agency_id': agency_id, 'batches': 0, **{invoice: 0 for invoice in INVOICES}}
+    last_id = None
+    while True:
+        # Keyset pagination on the primary key keeps each chunk an index range scan
+        chunk = bookings.filter(due)
+        if last_id is not None:
+            chunk = chunk.filter(id__gt=last_id)
+        ids = list(chunk.order_by('id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+
+        now = timezone.now()
+        with transaction.atomic():
+            for invoice in INVOICES:
+                result[invoice] += bookings.filter(overdue_q(invoice, today), id__in=ids).update(**{
+                    f'{invoice}_invoice_status': Booking.InvoiceStatus.OVERDUE,
+                    'updated_at': now,
+                })
+        result['batches'] += 1
+        last_id = ids[-1]
+
+    if any(result[invoice] for invoice in INVOICES):
+        # Queryset updates bypass the post_save signal that bumps the version
+        bump_data_version(agency_id)
+    return result
+
+
+def init_worker():
+    """Process pool initializer: make Django usable in a spawned worker."""
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
@@ -0,0 +1,37 @@
+# bookings/periodic.py
+
+from django.utils import timezone
+
+from agencies.models import Agency
+from scheduler.registry import periodic_job
+
+from .overdue import mark_overdue_invoices
+from .transitions import complete_past_bookings
+
+
+def _agency_ids():
+    return list(Agency.objects.order_by('id').values_list('id', flat=True))
+
+
+@periodic_job(interval=3600, jitter=300)
+def mark_overdue():
+    """Mark sent invoices past their due date as overdue."""
+    today = timezone.now().date()
+    totals = {'artist_fee': 0, 'booking_fee': 0, 'agencies': 0}
+    for agency_id in _agency_ids():
+        result = mark_overdue_invoices(agency_id, today=today)
+        totals['artist_fee'] += result['artist_fee']
+        totals['booking_fee'] += result['booking_fee']
+        totals['agencies'] += 1
+    return totals
+
+
+@periodic_job(interval=900, jitter=120)
+def complete_bookings():
+    """Complete past bookings that are signed and fully paid."""
+    now = timezone.now()
+    totals = {'completed': 0, 'agencies': 0}
+    for agency_id in _agency_ids():
+        totals['completed'] += complete_past_bookings(agency_id, now=now)['completed']
+        totals['agencies'] += 1
+    return totals
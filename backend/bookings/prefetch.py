@@ -0,0 +1,81 @@
+# bookings/prefetch.py
+
+"""
+Bulk resolution of the artists, promoters, venues and promoter contacts
+that bookings refer to.
+
+Bookings store these references as plain ID strings, so Django cannot
+prefetch them. ``prefetch_booking_relations`` loads every referenced object
+for a page of bookings in one ``id__in`` query per model and memoizes them
+on the instances, so ``Booking.get_artist()`` and friends no longer query
+per row.
+"""
+
+from typing import Iterable, List
+
+from django.core.exceptions import ValidationError
+
+from .models import Booking
+
+
+RELATIONS = ('artist', 'promoter', 'venue', 'promoter_contact')
+
+
+def _normalize_id(model, value) -> str:
+    """Return ``value`` as a canonical primary key string for ``model``, or None if invalid."""
+    if not value:
+        return None
+    try:
+        return str(model._meta.pk.to_python(value))
+    except (TypeError, ValueError, ValidationError):
+        return None
+
+
+def _model_for(name):
+    if name == 'artist':
+        from artists.models import Artist
+        return Artist
+    if name == 'promoter':
+        from promoters.models import Promoter
+        return Promoter
+    if name == 'venue':
+        from venues.models import Venue
+        return Venue
+    from contacts.models import Contact
+    return Contact
+
+
+def prefetch_booking_relations(
+    bookings: Iterable[Booking],
+    relations: Iterable[str] = RELATIONS
+) -> List[Booking]:
+    """
+    Resolve and memoize the related objects of every booking in ``bookings``.
+
+    Returns the bookings as a list. Issues at most one query per relation.
+    """
+    bookings = list(bookings)
+    if not bookings:
+        return bookings
+
+    agency_ids = {booking.agency_id for booking in bookings}
+    for name in relations:
+        model = _model_for(name)
+        attr = f'{name}_id'
+        ids = {_normalize_id(model, getattr(booking, attr)) for booking in bookings}
+        ids.discard(None)
+        objects = {}
+        if ids:
+            objects = {
+                (obj.agency_id, str(obj.pk)): obj
+                for obj in model.objects.filter(pk__in=ids, agency_id__in=agency_ids)
+            }
+
+        for booking in bookings:
+            obj = objects.get((booking.agency_id, _normalize_id(model, getattr(booking, attr))))
+            # Same rule as Booking.get_promoter_contact(): the contact must
+            # belong to the booking's promoter
+            if name == 'promoter_contact' and obj is not None and obj.promoter_id != booking.promoter_id:
+                obj = None
+            booking.set_related(name, obj)
+    return bookings
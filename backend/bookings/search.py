@@ -0,0 +1,24 @@
+# bookings/search.py
+
+"""
+Full-text index behind ``BookingViewSet``'s ``?search=`` (see config/fulltext.py).
+
+Kept current by the signals in bookings/signals.py. Queryset ``update()``
+and ``bulk_create()`` bypass them, so code changing these columns in bulk
+must call ``BOOKING_SEARCH_INDEX.update()`` itself, or run
+``manage.py rebuild_search_index`` afterwards.
+
+Changing the table or its columns needs a new migration that drops the old
+index and creates this one; 0003_booking_search_index keeps its own copy
+of the original definition.
+"""
+
+from config.fulltext import FullTextIndex
+
+
+BOOKING_SEARCH_INDEX = FullTextIndex('bookings_booking_search', [
+    ('booking_reference', 'A'),
+    ('event_name', 'A'),
+    ('location_city', 'B'),
+    ('notes', 'C'),
+])
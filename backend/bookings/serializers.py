@@ -4,6 +4,7 @@ from rest_framework import serializers
 from decimal import Decimal
 from django.utils import timezone
 from .models import Booking, BookingType
+from .prefetch import prefetch_booking_relations
 
 
 class BookingTypeSerializer(serializers.ModelSerializer):
@@ -46,6 +47,16 @@ class BookingTypeSerializer(serializers.ModelSerializer):
         return data
 
 
+class PrefetchedBookingListSerializer(serializers.ListSerializer):
+    """List serializer that resolves all referenced artists, promoters and venues up front."""
+    
+    def to_representation(self, data):
+        bookings = data.all() if hasattr(data, 'all') else data
+        return super().to_representation(
+            prefetch_booking_relations(bookings, relations=('artist', 'promoter', 'venue'))
+        )
+
+
 class BookingListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for listing bookings."""
     
@@ -62,6 +73,7 @@ class BookingListSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Booking
+        list_serializer_class = PrefetchedBookingListSerializer
         fields = [
             'id',
             'booking_reference',
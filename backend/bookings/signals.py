@@ -1,9 +1,10 @@
 # bookings/signals.py
 
-from django.db.models.signals import pre_save, post_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from django.utils import timezone
 from .models import Booking
+from .search import BOOKING_SEARCH_INDEX
 
 
 @receiver(pre_save, sender=Booking)
@@ -112,4 +113,18 @@ def sync_invoice_dates(sender, instance, **kwargs):
     if (instance.contract_status == Booking.ContractStatus.SIGNED and
         old_instance.contract_status != Booking.ContractStatus.SIGNED and
         not instance.contract_signed_date):
-        instance.contract_signed_date = timezone.now()
\ No newline at end of file
+        instance.contract_signed_date = timezone.now()
+
+
+@receiver(post_save, sender=Booking)
+def index_booking(sender, instance, using, update_fields=None, **kwargs):
+    """Keep the booking's full-text search document current."""
+    if update_fields is not None and not set(update_fields) & set(BOOKING_SEARCH_INDEX.column_names):
+        return
+    BOOKING_SEARCH_INDEX.update([instance], using=using)
+
+
+@receiver(post_delete, sender=Booking)
+def unindex_booking(sender, instance, using, **kwargs):
+    """Drop a deleted booking from the full-text search index."""
+    BOOKING_SEARCH_INDEX.remove(Booking, [instance.pk], using=using)
@@ -1,3 +1,448 @@
-from django.test import TestCase
+import csv
+import io
+import uuid
+import zipfile
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+from xml.etree import ElementTree
 
-# Create your tests here.
+from django.contrib.auth.models import Permission
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from django.utils import timezone
+
+from agencies.models import Agency, UserProfile
+from agencies.versioning import get_data_version
+from artists.models import Artist
+from authentication.models import User
+from config.paginator import EstimatedCountPaginator
+from config.renderers import XLSXRenderer
+from config.xlsx import stream_xlsx
+from contacts.models import Contact
+from promoters.models import Promoter
+from venues.models import Venue
+
+from .export import EXPORT_HEADER
+from .models import Booking
+from .overdue import mark_overdue_invoices
+from .prefetch import prefetch_booking_relations
+from .search import BOOKING_SEARCH_INDEX
+
+
+def create_booking(agency, **fields):
+    fields.setdefault('booking_date', timezone.now() + timedelta(days=30))
+    fields.setdefault('location_country', 'PT')
+    fields.setdefault('venue_id', str(uuid.uuid4()))
+    fields.setdefault('artist_id', str(uuid.uuid4()))
+    fields.setdefault('promoter_id', str(uuid.uuid4()))
+    return Booking.objects.create(agency=agency, venue_capacity=1000, **fields)
+
+
+class BookingSearchIndexTests(TestCase):
+    def setUp(self):
+        owner = User.objects.create(username='owner', email='owner@example.com')
+        self.agency = Agency.objects.create(name='Agency', owner=owner, timezone='UTC', slug='agency')
+
+    def booking(self, **fields):
+        return create_booking(self.agency, **fields)
+
+    def search(self, *terms):
+        return list(BOOKING_SEARCH_INDEX.search(Booking.objects.all(), terms).values_list('pk', flat=True))
+
+    def test_migration_creates_the_index(self):
+        self.assertTrue(BOOKING_SEARCH_INDEX.is_available(connection.alias))
+
+    def test_saved_bookings_are_found_by_prefix_and_ranked(self):
+        city = self.booking(location_city='Lisboa', event_name='Summer Tour')
+        title = self.booking(location_city='Porto', event_name='Lisboa Nights')
+        self.booking(location_city='Porto', event_name='Winter Tour')
+
+        self.assertEqual(self.search('lisb'), [title.pk, city.pk])
+        self.assertEqual(self.search('summer', 'lisboa'), [city.pk])
+
+    def test_changes_and_deletions_reach_the_index(self):
+        booking = self.booking(location_city='Porto', event_name='Summer Tour')
+        booking.event_name = 'Autumn Tour'
+        booking.save()
+        self.assertEqual(self.search('summer'), [])
+        self.assertEqual(self.search('autumn'), [booking.pk])
+
+        booking.delete()
+        self.assertEqual(self.search('autumn'), [])
+
+
+class BookingAutocompleteTests(TestCase):
+    def setUp(self):
+        owner = User.objects.create(username='owner', email='owner@example.com')
+        other_owner = User.objects.create(username='other', email='other@example.com')
+        self.agency = Agency.objects.create(name='Agency', owner=owner, timezone='UTC', slug='agency')
+        self.other = Agency.objects.create(name='Other', owner=other_owner, timezone='UTC', slug='other')
+        self.artist = Artist.objects.create(agency=self.agency, artist_name='Ours', email='ours@example.com')
+        self.rival = Artist.objects.create(agency=self.other, artist_name='Theirs', email='theirs@example.com')
+        self.url = reverse('admin:bookings_booking_autocomplete', args=['artist'])
+
+    def staff(self, username, **fields):
+        user = User.objects.create(username=username, email=f'{username}@example.com', is_staff=True, **fields)
+        user.user_permissions.add(Permission.objects.get(codename='change_booking'))
+        return user
+
+    def options(self, user, **params):
+        self.client.force_login(user)
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [result['id'] for result in response.json()['results']]
+
+    def test_staff_only_see_their_own_agency(self):
+        user = self.staff('agent')
+        UserProfile.objects.create(user=user, agency=self.agency)
+        self.assertEqual(self.options(user), [str(self.artist.pk)])
+        self.assertEqual(self.options(user, agency=self.other.pk), [str(self.artist.pk)])
+
+    def test_staff_without_a_profile_cannot_pick_an_agency(self):
+        user = self.staff('stranger')
+        self.assertEqual(self.options(user), [])
+        self.assertEqual(self.options(user, agency=self.other.pk), [])
+
+    def test_superusers_pick_the_agency(self):
+        user = self.staff('root', is_superuser=True)
+        self.assertEqual(self.options(user), [])
+        self.assertEqual(self.options(user, agency=self.other.pk), [str(self.rival.pk)])
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'booking-tests'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'booking-tests-shared'},
+})
+class BookingAdminActionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='root', email='root@example.com', is_staff=True, is_superuser=True)
+        self.bookings = []
+        for name in ('first', 'second'):
+            owner = User.objects.create(username=name, email=f'{name}@example.com')
+            agency = Agency.objects.create(name=name, owner=owner, timezone='UTC', slug=name)
+            self.bookings.append(create_booking(agency))
+        self.client.force_login(self.user)
+
+    def test_bulk_action_bumps_every_affected_agency(self):
+        versions = [get_data_version(booking.agency_id) for booking in self.bookings]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('admin:bookings_booking_changelist'), {
+                'action': 'mark_as_confirmed',
+                '_selected_action': [booking.pk for booking in self.bookings],
+            })
+
+        for booking, version in zip(self.bookings, versions):
+            booking.refresh_from_db()
+            self.assertEqual(booking.status, Booking.BookingStatus.CONFIRMED)
+            self.assertNotEqual(get_data_version(booking.agency_id), version)
+
+
+
+class BookingRelationsTestCase(TestCase):
+    def setUp(self):
+        owner = User.objects.create(username='owner', email='owner@example.com')
+        self.agency = Agency.objects.create(name='Agency', owner=owner, timezone='UTC', slug='agency')
+        self.profile = UserProfile.objects.create(user=owner, agency=self.agency, role='agency_owner')
+        other_owner = User.objects.create(username='other', email='other@example.com')
+        self.other = Agency.objects.create(name='Other', owner=other_owner, timezone='UTC', slug='other')
+
+    def related(self, name, agency=None):
+        agency = agency or self.agency
+        artist = Artist.objects.create(agency=agency, artist_name=name, email=f'{name.lower()}@example.com')
+        promoter = Promoter.objects.create(agency=agency, promoter_name=name, company_name=name)
+        venue = Venue.objects.create(
+            agency=agency, venue_name=name, venue_address='Street 1', venue_city='Lisbon',
+            venue_country='PT', capacity=500,
+        )
+        return artist, promoter, venue
+
+    def booking(self, artist, promoter, venue, **fields):
+        return create_booking(
+            self.agency, artist_id=str(artist.pk), promoter_id=str(promoter.pk), venue_id=str(venue.pk), **fields
+        )
+
+
+class BookingPrefetchTests(BookingRelationsTestCase):
+    def test_relations_load_with_one_query_per_model(self):
+        artist, promoter, venue = self.related('Ours')
+        contact = Contact.objects.create(
+            agency=self.agency, contact_name='Pat', contact_email='pat@example.com', country='PT',
+            reference_type=Contact.ReferenceType.PROMOTER, promoter_id=str(promoter.pk), created_by=self.profile,
+        )
+        stranger = Contact.objects.create(
+            agency=self.agency, contact_name='Sam', contact_email='sam@example.com', country='PT',
+            reference_type=Contact.ReferenceType.AGENCY, created_by=self.profile,
+        )
+        foreign_artist, foreign_promoter, foreign_venue = self.related('Theirs', agency=self.other)
+        ours = self.booking(artist, promoter, venue, promoter_contact_id=str(contact.pk))
+        mismatched = self.booking(artist, promoter, venue, promoter_contact_id=str(stranger.pk))
+        foreign = self.booking(foreign_artist, foreign_promoter, foreign_venue, promoter_contact_id='not-a-uuid')
+        bookings = list(Booking.objects.filter(pk__in=[ours.pk, mismatched.pk, foreign.pk]).order_by('created_at'))
+
+        with self.assertNumQueries(4):
+            prefetch_booking_relations(bookings)
+        with self.assertNumQueries(0):
+            resolved = [
+                (b.get_artist(), b.get_promoter(), b.get_venue(), b.get_promoter_contact()) for b in bookings
+            ]
+
+        self.assertEqual(resolved, [
+            (artist, promoter, venue, contact),
+            (artist, promoter, venue, None),
+            (None, None, None, None),
+        ])
+
+
+class BookingChangelistTests(BookingRelationsTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(
+            User.objects.create(username='root', email='root@example.com', is_staff=True, is_superuser=True)
+        )
+
+    def add_bookings(self, count):
+        for n in range(Booking.objects.count(), Booking.objects.count() + count):
+            self.booking(*self.related(f'Name{n}'))
+
+    def changelist_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin:bookings_booking_changelist'))
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_changelist_queries_do_not_grow_with_the_page(self):
+        self.add_bookings(1)
+        _response, few = self.changelist_queries()
+        self.add_bookings(5)
+        response, many = self.changelist_queries()
+
+        self.assertEqual(many, few)
+        for n in range(6):
+            self.assertContains(response, f'>Name{n}</a>', count=3)
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        owner = User.objects.create(username='owner', email='owner@example.com')
+        self.agency = Agency.objects.create(name='Agency', owner=owner, timezone='UTC', slug='agency')
+        for _ in range(3):
+            create_booking(self.agency)
+
+    def postgres(self, reltuples):
+        """Pretend the bookings table lives on PostgreSQL with ``reltuples`` estimated rows."""
+        fake = mock.MagicMock(vendor='postgresql')
+        cursor = fake.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = (reltuples,)
+        return mock.patch('config.paginator.connections', {'default': fake}), cursor
+
+    def test_sqlite_gets_an_exact_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            count = EstimatedCountPaginator(Booking.objects.all(), 10).count
+        self.assertEqual(count, 3)
+        self.assertNotIn('pg_class', ' '.join(query['sql'] for query in queries))
+
+    def test_large_unfiltered_tables_use_the_planner_estimate(self):
+        patch, cursor = self.postgres(2_000_000)
+        with patch:
+            self.assertEqual(EstimatedCountPaginator(Booking.objects.all(), 10).count, 2_000_000)
+        self.assertIn('pg_class', cursor.execute.call_args.args[0])
+
+    def test_small_tables_and_filtered_querysets_get_an_exact_count(self):
+        for reltuples in (-1, 40_000):
+            patch, _cursor = self.postgres(reltuples)
+            with patch:
+                self.assertEqual(EstimatedCountPaginator(Booking.objects.all(), 10).count, 3)
+
+        patch, cursor = self.postgres(2_000_000)
+        with patch:
+            queryset = Booking.objects.filter(agency=self.agency)
+            self.assertEqual(EstimatedCountPaginator(queryset, 10).count, 3)
+        cursor.execute.assert_not_called()
+
+
+SHEET_NS = {'s': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+
+
+def read_xlsx(content):
+    """The sheet of an XLSX workbook as rows of ``(type, style, value)`` cells."""
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        assert archive.testzip() is None
+        for part in ('[Content_Types].xml', '_rels/.rels', 'xl/workbook.xml',
+                     'xl/_rels/workbook.xml.rels', 'xl/styles.xml'):
+            ElementTree.fromstring(archive.read(part))
+        sheet = ElementTree.fromstring(archive.read('xl/worksheets/sheet1.xml'))
+    rows = []
+    for row in sheet.iterfind('s:sheetData/s:row', SHEET_NS):
+        cells = []
+        for cell in row:
+            kind = cell.get('t')
+            if kind == 'inlineStr':
+                value = cell.find('s:is/s:t', SHEET_NS).text or ''
+            else:
+                value = cell.findtext('s:v', None, SHEET_NS)
+            cells.append((kind, cell.get('s'), value))
+        rows.append(cells)
+    return rows
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'booking-export-tests'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'booking-export-shared'},
+})
+class BookingExportTests(TestCase):
+    def setUp(self):
+        user = User.objects.create(username='owner', email='owner@example.com')
+        self.agency = Agency.objects.create(name='Agency', owner=user, timezone='UTC', slug='agency')
+        UserProfile.objects.create(user=user, agency=self.agency, role='agency_owner')
+        other_owner = User.objects.create(username='other', email='other@example.com')
+        self.other = Agency.objects.create(name='Other', owner=other_owner, timezone='UTC', slug='other')
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def export(self, export_format):
+        response = self.client.get('/api/v1/bookings/export/', {'format': export_format})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn(f'.{export_format}"', response['Content-Disposition'])
+        return response, b''.join(response.streaming_content)
+
+    def test_csv_escapes_values_and_exports_only_the_agency(self):
+        artist = Artist.objects.create(agency=self.agency, artist_name='The "Band", Live', email='band@example.com')
+        create_booking(
+            self.agency, event_name='Rock & <Roll>\nNight', artist_id=str(artist.pk),
+            guarantee_amount=Decimal('1500.00'),
+        )
+        create_booking(self.agency, event_name='=HYPERLINK("http://example.com")')
+        create_booking(self.other, event_name='Not ours')
+
+        response, content = self.export('csv')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertTrue(content.startswith('\ufeff'.encode()))
+        rows = list(csv.reader(io.StringIO(content.decode('utf-8-sig'))))
+
+        self.assertEqual(rows[0], EXPORT_HEADER)
+        exported = {row[EXPORT_HEADER.index('Event')]: row for row in rows[1:]}
+        self.assertCountEqual(exported, ['Rock & <Roll>\nNight', "'=HYPERLINK(\"http://example.com\")"])
+        row = exported['Rock & <Roll>\nNight']
+        self.assertEqual(row[EXPORT_HEADER.index('Artist')], 'The "Band", Live')
+        self.assertEqual(row[EXPORT_HEADER.index('Guarantee')], '1500.00')
+        self.assertEqual(row[EXPORT_HEADER.index('Cancelled')], 'no')
+
+    def test_xlsx_is_a_valid_workbook_with_escaped_text(self):
+        create_booking(
+            self.agency, event_name='Rock & <Roll> "Live"\x01\x0b\ttab', guarantee_amount=Decimal('1500.00'),
+        )
+        create_booking(self.other, event_name='Not ours')
+
+        response, content = self.export('xlsx')
+        self.assertEqual(response['Content-Type'], XLSXRenderer.media_type)
+        header, *rows = read_xlsx(content)
+
+        self.assertEqual([value for _kind, _style, value in header], EXPORT_HEADER)
+        self.assertEqual({style for _kind, style, _value in header}, {'3'})
+        self.assertEqual(len(rows), 1)
+        cells = dict(zip(EXPORT_HEADER, rows[0]))
+        self.assertEqual(cells['Event'], ('inlineStr', None, 'Rock & <Roll> "Live"\ttab'))
+        self.assertEqual(cells['Guarantee'], (None, None, '1500.00'))
+        self.assertEqual(cells['Cancelled'], ('b', None, '0'))
+        kind, style, serial = cells['Date']
+        self.assertEqual((kind, style), (None, '2'))
+        self.assertGreater(float(serial), 45000)
+
+    def test_empty_exports_hold_only_the_header(self):
+        create_booking(self.other, event_name='Not ours')
+
+        _response, content = self.export('csv')
+        self.assertEqual(list(csv.reader(io.StringIO(content.decode('utf-8-sig')))), [EXPORT_HEADER])
+        _response, content = self.export('xlsx')
+        self.assertEqual(len(read_xlsx(content)), 1)
+
+    def test_xlsx_is_written_while_batches_are_produced(self):
+        consumed = []
+
+        def batches():
+            for index in range(4):
+                consumed.append(index)
+                yield [[uuid.uuid4().hex for _ in range(5)] for _ in range(500)]
+
+        progress = []
+        chunks = []
+        for chunk in stream_xlsx(['a', 'b', 'c', 'd', 'e'], batches()):
+            progress.append(len(consumed))
+            chunks.append(chunk)
+
+        # Output starts before the last batch has been produced
+        self.assertLess(progress[0], 4)
+        self.assertEqual(len(read_xlsx(b''.join(chunks))), 2001)
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client.get('/api/v1/bookings/export/', {'format': 'pdf'})
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'booking-overdue-tests'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'booking-overdue-shared'},
+})
+class OverdueInvoiceTests(TestCase):
+    def setUp(self):
+        owner = User.objects.create(username='owner', email='owner@example.com')
+        self.agency = Agency.objects.create(name='Agency', owner=owner, timezone='UTC', slug='agency')
+        other_owner = User.objects.create(username='other', email='other@example.com')
+        self.other = Agency.objects.create(name='Other', owner=other_owner, timezone='UTC', slug='other')
+        self.today = timezone.now().date()
+
+    def booking(self, agency=None, invoice='artist_fee', status=Booking.InvoiceStatus.SENT, due_in_days=-1):
+        booking = create_booking(agency or self.agency)
+        # Saving marks past-due invoices itself, so set them up behind its back
+        Booking.objects.filter(pk=booking.pk).update(**{
+            f'{invoice}_invoice_status': status,
+            f'{invoice}_invoice_due_date': self.today + timedelta(days=due_in_days),
+        })
+        return booking
+
+    def status(self, booking, invoice='artist_fee'):
+        return getattr(Booking.objects.get(pk=booking.pk), f'{invoice}_invoice_status')
+
+    def test_due_invoices_are_marked_in_id_ordered_batches(self):
+        due = [self.booking() for _ in range(4)] + [self.booking(invoice='booking_fee')]
+        not_due = self.booking(due_in_days=0)
+        paid = self.booking(status=Booking.InvoiceStatus.PAID)
+        foreign = self.booking(agency=self.other)
+        version = get_data_version(self.agency.pk)
+        other_version = get_data_version(self.other.pk)
+
+        with CaptureQueriesContext(connection) as queries:
+            result = mark_overdue_invoices(self.agency.pk, today=self.today, batch_size=2)
+
+        self.assertEqual(
+            result, {'agency_id': self.agency.pk, 'batches': 3, 'artist_fee': 4, 'booking_fee': 1}
+        )
+        for booking in due[:4]:
+            self.assertEqual(self.status(booking), Booking.InvoiceStatus.OVERDUE)
+        self.assertEqual(self.status(due[4], 'booking_fee'), Booking.InvoiceStatus.OVERDUE)
+        self.assertEqual(self.status(not_due), Booking.InvoiceStatus.SENT)
+        self.assertEqual(self.status(paid), Booking.InvoiceStatus.PAID)
+        self.assertEqual(self.status(foreign), Booking.InvoiceStatus.SENT)
+        self.assertNotEqual(get_data_version(self.agency.pk), version)
+        self.assertEqual(get_data_version(self.other.pk), other_version)
+
+        # Each chunk after the first starts past the last id of the previous one
+        selects = [query['sql'] for query in queries if query['sql'].startswith('SELECT')]
+        self.assertEqual(len(selects), 4)
+        self.assertTrue(all('LIMIT 2' in sql for sql in selects))
+        self.assertEqual(['"id" >' in sql for sql in selects], [False, True, True, True])
+
+    def test_run_without_due_invoices_keeps_the_data_version(self):
+        self.booking(status=Booking.InvoiceStatus.OVERDUE)
+        version = get_data_version(self.agency.pk)
+
+        result = mark_overdue_invoices(self.agency.pk, today=self.today)
+
+        self.assertEqual(result, {'agency_id': self.agency.pk, 'batches': 0, 'artist_fee': 0, 'booking_fee': 0})
+        self.assertEqual(get_data_version(self.agency.pk), version)
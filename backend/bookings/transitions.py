@@ -0,0 +1,74 @@
+# bookings/transitions.py
+
+"""
+Time-driven booking status transitions applied in bulk.
+
+``auto_complete_booking`` (bookings/signals.py) only completes a booking when
+it happens to be saved after its date. ``complete_past_bookings`` applies the
+same rule to every matching booking with set-based UPDATEs, in id-ordered
+chunks with one short transaction each, like bookings/overdue.py.
+"""
+
+import datetime
+from typing import Any, Dict, Optional
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from agencies.versioning import bump_data_version
+
+from .models import Booking
+from .overdue import DEFAULT_BATCH_SIZE
+
+
+def completable_q(now: datetime.datetime) -> Q:
+    """Bookings ``auto_complete_booking`` would mark completed at ``now``."""
+    return (
+        Q(
+            booking_date__lt=now,
+            contract_status=Booking.ContractStatus.SIGNED,
+            artist_fee_invoice_status=Booking.InvoiceStatus.PAID,
+            booking_fee_invoice_status=Booking.InvoiceStatus.PAID,
+            is_cancelled=False,
+        ) &
+        ~Q(status=Booking.BookingStatus.COMPLETED)
+    )
+
+
+def complete_past_bookings(
+    agency_id,
+    now: Optional[datetime.datetime] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Dict[str, Any]:
+    """
+    Mark one agency's past, signed and fully paid bookings as completed.
+
+    Returns ``{'agency_id', 'completed', 'batches'}``.
+    """
+    now = now or timezone.now()
+    bookings = Booking.objects.filter(agency_id=agency_id)
+
+    result = {'agency_id': agency_id, 'completed': 0, 'batches': 0}
+    last_id = None
+    while True:
+        chunk = bookings.filter(completable_q(now))
+        if last_id is not None:
+            chunk = chunk.filter(id__gt=last_id)
+        ids = list(chunk.order_by('id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+
+        with transaction.atomic():
+            # Re-check the rule so rows changed since the id scan are left alone
+            result['completed'] += bookings.filter(completable_q(now), id__in=ids).update(
+                status=Booking.BookingStatus.COMPLETED,
+                updated_at=timezone.now(),
+            )
+        result['batches'] += 1
+        last_id = ids[-1]
+
+    if result['completed']:
+        # Queryset updates bypass the post_save signal that bumps the version
+        bump_data_version(agency_id)
+    return result
@@ -4,6 +4,8 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from django.http import StreamingHttpResponse
 from django.db.models import Q, Sum, Avg, Count, Case, When, IntegerField
 from django.utils import timezone
 from datetime import timedelta
@@ -11,6 +13,10 @@ from decimal import Decimal
 from django_filters.rest_framework import DjangoFilterBackend
 
 from .models import Booking, BookingType
+from .export import stream_bookings_csv, stream_bookings_xlsx
+from .search import BOOKING_SEARCH_INDEX
+from config.fulltext import FullTextSearchFilter
+from config.renderers import CSVRenderer, XLSXRenderer
 from .serializers import (
     BookingTypeSerializer,
     BookingListSerializer,
@@ -76,6 +82,7 @@ class BookingViewSet(viewsets.ModelViewSet):
     - GET /api/bookings/stats/ - Get booking statistics
     - GET /api/bookings/upcoming/ - List upcoming bookings
     - GET /api/bookings/calendar/ - Calendar view of bookings
+    - GET /api/bookings/export/?format=csv|xlsx - Download the filtered bookings
     - GET /api/bookings/{id}/timeline/ - Booking timeline/history
     - POST /api/bookings/{id}/confirm/ - Confirm booking
     - POST /api/bookings/{id}/cancel/ - Cancel booking
@@ -90,9 +97,11 @@ class BookingViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter
+        filters.OrderingFilter,
+        FullTextSearchFilter
     ]
+    # Served by the full-text index; search_fields is the fallback without one
+    search_index = BOOKING_SEARCH_INDEX
     search_fields = [
         'booking_reference',
         'event_name',
@@ -171,6 +180,40 @@ class BookingViewSet(viewsets.ModelViewSet):
         """Set agency from user profile on creation."""
         serializer.save(agency=self.request.user.profile.agency)
     
+    @action(detail=False, methods=['get'], renderer_classes=[JSONRenderer, CSVRenderer, XLSXRenderer])
+    def export(self, request):
+        """
+        Download the bookings as a CSV or XLSX file.
+        
+        Query Parameters:
+        - format: 'csv' (default) or 'xlsx'
+        - Every list filter, search and ordering parameter
+        
+        The file is streamed while it is generated, so exports of any size
+        use constant memory.
+        """
+        export_format = request.query_params.get('format', 'csv')
+        if export_format not in ('csv', 'xlsx'):
+            return Response(
+                {'error': "format must be 'csv' or 'xlsx'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        if export_format == 'xlsx':
+            response = StreamingHttpResponse(
+                stream_bookings_xlsx(queryset),
+                content_type=XLSXRenderer.media_type
+            )
+        else:
+            response = StreamingHttpResponse(
+                stream_bookings_csv(queryset),
+                content_type='text/csv; charset=utf-8'
+            )
+        filename = f"bookings-{timezone.localdate():%Y%m%d}.{export_format}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+    
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """
@@ -192,6 +235,10 @@ class BookingViewSet(viewsets.ModelViewSet):
         if date_to:
             queryset = queryset.filter(booking_date__lte=date_to)
         
+        return Response(self.get_stats_data(queryset))
+    
+    def get_stats_data(self, queryset):
+        """Calculate the booking statistics for ``queryset``."""
         # Calculate statistics
         stats = queryset.aggregate(
             total_bookings=Count('id'),
@@ -245,22 +292,26 @@ class BookingViewSet(viewsets.ModelViewSet):
         ).count()
         
         serializer = BookingStatsSerializer(stats)
-        return Response(serializer.data)
+        return serializer.data
     
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
         """Get upcoming bookings (next 90 days by default)."""
         days = int(request.query_params.get('days', 90))
+        queryset = self.get_upcoming_queryset(days)
+        
+        serializer = BookingListSerializer(queryset, many=True)
+        return Response(serializer.data)
+    
+    def get_upcoming_queryset(self, days=90):
+        """Bookings in the next ``days`` days that are not cancelled."""
         upcoming_date = timezone.now() + timedelta(days=days)
         
-        queryset = self.get_queryset().filter(
+        return self.get_queryset().filter(
             booking_date__gte=timezone.now(),
             booking_date__lte=upcoming_date,
             is_cancelled=False
         ).order_by('booking_date')
-        
-        serializer = BookingListSerializer(queryset, many=True)
-        return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
     def calendar(self, request):
@@ -0,0 +1,130 @@
+"""
+Admin autocomplete for references stored as plain ID strings.
+
+Django's ``autocomplete_fields`` only works on real relations, while
+bookings and contacts store artist/promoter/venue/contact IDs in
+CharFields. ``IdAutocompleteSelect`` reuses the admin's select2 widget but
+points it at a custom JSON endpoint and renders only the selected option,
+and ``autocomplete_response`` serves that endpoint with a limited,
+prefix-matched query, so a form's size no longer depends on table size.
+"""
+from typing import Callable, Sequence
+
+from django import forms
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+from django.http import JsonResponse
+
+AUTOCOMPLETE_PAGE_SIZE = 20
+
+
+class IdAutocompleteSelect(AutocompleteSelect):
+    """select2 widget for a ModelChoiceField, loading options from ``url``."""
+
+    def __init__(self, url: str, attrs=None, choices=(), using=None):
+        self.url = url
+        super().__init__(field=None, admin_site=None, attrs=attrs, choices=choices, using=using)
+
+    def get_url(self):
+        return self.url
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        # Skip AutocompleteMixin.build_attrs, which needs a model relation
+        attrs = forms.Select.build_attrs(self, base_attrs, extra_attrs=extra_attrs)
+        attrs['class'] = ' '.join(filter(None, [attrs.get('class', ''), 'admin-autocomplete']))
+        attrs.update({
+            'data-ajax--cache': 'true',
+            'data-ajax--delay': 250,
+            'data-ajax--type': 'GET',
+            'data-ajax--url': self.get_url(),
+            'data-theme': 'admin-autocomplete',
+            'data-allow-clear': 'false' if self.is_required else 'true',
+            'data-placeholder': '',
+            'lang': self.i18n_name,
+        })
+        return attrs
+
+    def optgroups(self, name, value, attr=None):
+        """Render only the selected options, looked up by primary key."""
+        default = (None, [], 0)
+        field = self.choices.field
+        pk_field = field.queryset.model._meta.pk
+        selected = set()
+        for v in value:
+            if str(v) in field.empty_values:
+                continue
+            try:
+                selected.add(pk_field.to_python(v))
+            except ValidationError:
+                # A stale or malformed stored ID simply renders as unselected
+                pass
+        if not self.is_required:
+            default[1].append(self.create_option(name, '', '', False, 0))
+        if selected:
+            for obj in field.queryset.using(self.db).filter(pk__in=selected):
+                default[1].append(self.create_option(
+                    name, str(obj.pk), field.label_from_instance(obj), True, len(default[1])
+                ))
+        return [default]
+
+
+def autocomplete_response(
+    queryset: QuerySet,
+    search_fields: Sequence[str],
+    term: str,
+    page: int,
+    label: Callable[[object], str],
+) -> JsonResponse:
+    """
+    Return one page of select2 results for ``term``.
+
+    Matches are case-insensitive prefixes of any of ``search_fields``; one
+    extra row is fetched to tell select2 whether more pages exist.
+    """
+    term = (term or '').strip()
+    if term:
+        match = Q()
+        for field in search_fields:
+            match |= Q(**{f'{field}__istartswith': term})
+        queryset = queryset.filter(match)
+
+    page = max(page, 1)
+    start = (page - 1) * AUTOCOMPLETE_PAGE_SIZE
+    rows = list(queryset[start:start + AUTOCOMPLETE_PAGE_SIZE + 1])
+    return JsonResponse({
+        'results': [{'id': str(obj.pk), 'text': label(obj)} for obj in rows[:AUTOCOMPLETE_PAGE_SIZE]],
+        'pagination': {'more': len(rows) > AUTOCOMPLETE_PAGE_SIZE},
+    })
+
+
+def prefix_search_indexes(table: str, columns: Sequence[str]):
+    """
+    Migration operation adding PostgreSQL indexes for ``istartswith`` search.
+
+    Django compiles ``istartswith`` to ``UPPER(col::text) LIKE UPPER(...)``,
+    which only an expression index with ``text_pattern_ops`` can serve. The
+    indexes lead with ``agency_id`` since every lookup is tenant-scoped.
+    Other databases are left unchanged.
+    """
+    from django.db import migrations
+
+    def index_name(column):
+        return f'{table}_{column}_prefix'[:63]
+
+    def forwards(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for column in columns:
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS "{index_name(column)}" '
+                f'ON "{table}" ("agency_id", UPPER("{column}"::text) text_pattern_ops)'
+            )
+
+    def backwards(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for column in columns:
+            schema_editor.execute(f'DROP INDEX IF EXISTS "{index_name(column)}"')
+
+    return migrations.RunPython(forwards, backwards)
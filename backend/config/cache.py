@@ -0,0 +1,179 @@
+"""
+Two-tier cache backend.
+
+A small in-process LRU (L1) sits in front of a shared cache (L2) configured
+as another entry in ``CACHES``. Every value written through this backend is
+stored in L2 together with a version stamp, and the stamp is also kept under
+its own small key. L1 entries remember the stamp they were loaded with and are
+revalidated against L2 once they are older than ``STAMP_TTL`` seconds, so hot
+keys are served from memory while writes from other workers become visible
+within that window (immediately with ``STAMP_TTL = 0``).
+
+Example::
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'config.cache.TieredCache',
+            'OPTIONS': {'L2_ALIAS': 'shared', 'L1_MAX_ENTRIES': 1000, 'STAMP_TTL': 1},
+        },
+        'shared': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': '/var/tmp/django_cache',
+        },
+    }
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+_MISSING = object()
+
+
+class _LocalLRU:
+    """Thread-safe bounded LRU mapping key -> (value, stamp, expires_at, checked_at)."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+
+    def set(self, key, value, stamp, expires_at, checked_at):
+        with self._lock:
+            self._data[key] = (value, stamp, expires_at, checked_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def touch(self, key, checked_at):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data[key] = entry[:3] + (checked_at,)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class TieredCache(BaseCache):
+    """In-process LRU (L1) in front of a shared cache alias (L2)."""
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._l2_alias = options.get('L2_ALIAS', 'shared')
+        self._stamp_ttl = float(options.get('STAMP_TTL', 1))
+        self._l1 = _LocalLRU(int(options.get('L1_MAX_ENTRIES', 1000)))
+
+    @property
+    def l2(self):
+        return caches[self._l2_alias]
+
+    # Keys are passed through make_key here so KEY_PREFIX/VERSION apply once;
+    # L2 applies its own prefix on top.
+
+    def _stamp_key(self, key):
+        return f'{key}:stamp'
+
+    def _expires_at(self, timeout):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        return None if timeout is None else time.monotonic() + timeout
+
+    def _new_stamp(self):
+        return uuid.uuid4().hex[:12]
+
+    def _remember(self, key, value, stamp, timeout):
+        now = time.monotonic()
+        self._l1.set(key, value, stamp, self._expires_at(timeout), now)
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.monotonic()
+        entry = self._l1.get(key)
+
+        if entry is not None:
+            value, stamp, expires_at, checked_at = entry
+            if expires_at is not None and expires_at <= now:
+                self._l1.pop(key)
+            elif now - checked_at < self._stamp_ttl:
+                return value
+            elif self.l2.get(self._stamp_key(key)) == stamp:
+                self._l1.touch(key, now)
+                return value
+
+        stored = self.l2.get(key, _MISSING)
+        if stored is _MISSING:
+            self._l1.pop(key)
+            return default
+
+        stamp, value = stored
+        # The L2 entry's remaining lifetime is unknown; bound the local copy by
+        # the default timeout and rely on stamp checks for coherence.
+        self._remember(key, value, stamp, DEFAULT_TIMEOUT)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        stamp = self._new_stamp()
+        self.l2.set_many({key: (stamp, value), self._stamp_key(key): stamp}, timeout)
+        self._remember(key, value, stamp, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        stamp = self._new_stamp()
+        if not self.l2.add(key, (stamp, value), timeout):
+            return False
+        self.l2.set(self._stamp_key(key), stamp, timeout)
+        self._remember(key, value, stamp, timeout)
+        return True
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        touched = self.l2.touch(key, timeout)
+        if touched:
+            self.l2.touch(self._stamp_key(key), timeout)
+            # Force a revalidation so the local expiry is recomputed
+            self._l1.pop(key)
+        return touched
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._l1.pop(key)
+        existed = self.l2.get(key, _MISSING) is not _MISSING
+        self.l2.delete_many([key, self._stamp_key(key)])
+        return existed
+
+    def has_key(self, key, version=None):
+        return self.get(key, _MISSING, version=version) is not _MISSING
+
+    def incr(self, key, delta=1, version=None):
+        value = self.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            raise ValueError("Key '%s' not found" % key)
+        new_value = value + delta
+        self.set(key, new_value, version=version)
+        return new_value
+
+    def clear(self):
+        self._l1.clear()
+        self.l2.clear()
+
+    def clear_local(self):
+        """Drop this worker's L1 entries (L2 is untouched)."""
+        self._l1.clear()
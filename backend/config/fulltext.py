@@ -0,0 +1,273 @@
+"""
+Full-text search indexes maintained alongside a model's table.
+
+``SearchFilter`` compiles ``?search=`` to ``LIKE '%term%'`` on every
+search field, which scans the whole table for each keystroke. A
+``FullTextIndex`` keeps a separate, indexed copy of those columns:
+
+- SQLite: an FTS5 virtual table (``unicode61`` tokenizer, accents folded),
+  ranked with ``bm25``;
+- PostgreSQL: a side table with a weighted ``tsvector`` column under a GIN
+  index, ranked with ``ts_rank``.
+
+Documents are written from model signals by ``update()`` and ``remove()``,
+in the same transaction as the row itself. Every search term is matched as
+a prefix, and all terms must match. ``FullTextSearchFilter`` plugs an index
+into the existing ``?search=`` parameter of a view. On databases without an
+index it falls back to ``SearchFilter``, as it does before the migration
+creating the index has run.
+"""
+import hashlib
+import logging
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.db import OperationalError, connections
+from django.db.models import Case, IntegerField, QuerySet, Value, When
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import OrderingFilter, SearchFilter
+
+logger = logging.getLogger(__name__)
+
+# Ranked results ordered by relevance; the rest follow in the view's ordering
+RANKED_RESULTS = 500
+
+# bm25 column weights for the tsvector weight classes
+_SQLITE_WEIGHTS = {'A': 10.0, 'B': 4.0, 'C': 2.0, 'D': 1.0}
+
+# Letters and digits; the FTS5 and 'simple' tokenizers split on everything else
+_TOKEN = re.compile(r'[^\W_]+')
+
+
+def search_tokens(terms: Iterable[str]) -> List[str]:
+    return [token for term in terms for token in _TOKEN.findall(term.lower())]
+
+
+class FullTextIndex:
+    """
+    A full-text index over ``columns`` of one model, stored in ``table``.
+
+    ``columns`` are ``(column, weight)`` pairs, weight being ``'A'`` (most
+    relevant) to ``'D'``. Documents are keyed by the model's primary key.
+    """
+
+    def __init__(self, table: str, columns: Sequence[Tuple[str, str]]):
+        self.table = table
+        self.columns = list(columns)
+        self._available: Dict[str, bool] = {}
+
+    @property
+    def column_names(self) -> List[str]:
+        return [column for column, _ in self.columns]
+
+    # Schema
+
+    def create(self, schema_editor, model) -> bool:
+        """Create the index table for ``model``; False if the database cannot hold one."""
+        connection = schema_editor.connection
+        quoted = [connection.ops.quote_name(column) for column in self.column_names]
+        if connection.vendor == 'sqlite':
+            try:
+                schema_editor.execute(
+                    f'CREATE VIRTUAL TABLE IF NOT EXISTS "{self.table}" USING fts5('
+                    f'{", ".join(quoted)}, "key" UNINDEXED, '
+                    "tokenize = 'unicode61 remove_diacritics 2')"
+                )
+            except OperationalError:
+                logger.warning('SQLite was built without FTS5; %s is not created', self.table)
+                return False
+        elif connection.vendor == 'postgresql':
+            key_type = model._meta.pk.db_type(connection)
+            schema_editor.execute(
+                f'CREATE TABLE IF NOT EXISTS "{self.table}" '
+                f'("key" {key_type} PRIMARY KEY, "document" tsvector NOT NULL)'
+            )
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS "{self.table}_document" '
+                f'ON "{self.table}" USING GIN ("document")'
+            )
+        else:
+            return False
+        self._available.pop(connection.alias, None)
+        return True
+
+    def drop(self, schema_editor) -> None:
+        if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+            schema_editor.execute(f'DROP TABLE IF EXISTS "{self.table}"')
+        self._available.pop(schema_editor.connection.alias, None)
+
+    def migration_operation(self, app_label: str, model_name: str, batch_size: int = 2000):
+        """Migration operation creating the index and filling it from existing rows."""
+        from django.db import migrations
+
+        def forwards(apps, schema_editor):
+            model = apps.get_model(app_label, model_name)
+            if self.create(schema_editor, model):
+                self.rebuild(model._default_manager.using(schema_editor.connection.alias), batch_size)
+
+        def backwards(apps, schema_editor):
+            self.drop(schema_editor)
+
+        return migrations.RunPython(forwards, backwards)
+
+    def is_available(self, using: str) -> bool:
+        if using not in self._available:
+            connection = connections[using]
+            self._available[using] = (
+                connection.vendor in ('sqlite', 'postgresql')
+                and self.table in connection.introspection.table_names()
+            )
+        return self._available[using]
+
+    # Documents
+
+    @staticmethod
+    def _key(model, pk, connection):
+        return model._meta.pk.get_db_prep_value(pk, connection)
+
+    @staticmethod
+    def _rowid(key) -> int:
+        # FTS5 rows are addressed by an integer rowid: 63 bits of a hash of the
+        # key. A collision would need billions of rows to become likely.
+        digest = hashlib.blake2b(str(key).encode(), digest_size=8).digest()
+        return int.from_bytes(digest, 'big') >> 1
+
+    def update(self, instances: Sequence, using: Optional[str] = None) -> None:
+        """Write (or rewrite) the documents of ``instances``."""
+        if not instances:
+            return
+        model = type(instances[0])
+        using = using or instances[0]._state.db or 'default'
+        if not self.is_available(using):
+            return
+        connection = connections[using]
+        rows = [
+            (self._key(model, instance.pk, connection),
+             [getattr(instance, column) or '' for column in self.column_names])
+            for instance in instances
+        ]
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.executemany(
+                    f'DELETE FROM "{self.table}" WHERE rowid = %s',
+                    [(self._rowid(key),) for key, _ in rows]
+                )
+                placeholders = ', '.join(['%s'] * (len(self.columns) + 2))
+                cursor.executemany(
+                    f'INSERT INTO "{self.table}" (rowid, {", ".join(self.column_names)}, "key") '
+                    f'VALUES ({placeholders})',
+                    [(self._rowid(key), *values, key) for key, values in rows]
+                )
+            else:
+                document = ' || '.join(
+                    f"setweight(to_tsvector('simple', %s), '{weight}')" for _, weight in self.columns
+                )
+                cursor.executemany(
+                    f'INSERT INTO "{self.table}" ("key", "document") VALUES (%s, {document}) '
+                    'ON CONFLICT ("key") DO UPDATE SET "document" = EXCLUDED."document"',
+                    [(key, *values) for key, values in rows]
+                )
+
+    def remove(self, model, pks: Sequence, using: str = 'default') -> None:
+        if not pks or not self.is_available(using):
+            return
+        connection = connections[using]
+        keys = [self._key(model, pk, connection) for pk in pks]
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.executemany(
+                    f'DELETE FROM "{self.table}" WHERE rowid = %s', [(self._rowid(key),) for key in keys]
+                )
+            else:
+                cursor.executemany(f'DELETE FROM "{self.table}" WHERE "key" = %s', [(key,) for key in keys])
+
+    def rebuild(self, queryset: QuerySet, batch_size: int = 2000) -> int:
+        """Replace the index contents with the documents of ``queryset``; return their count."""
+        using = queryset.db
+        if not self.is_available(using):
+            return 0
+        with connections[using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM "{self.table}"')
+        pk_name = queryset.model._meta.pk.name
+        rows = queryset.order_by('pk').only(pk_name, *self.column_names)
+        count = 0
+        batch = []
+        for instance in rows.iterator(chunk_size=batch_size):
+            batch.append(instance)
+            if len(batch) == batch_size:
+                self.update(batch, using=using)
+                count += len(batch)
+                batch = []
+        self.update(batch, using=using)
+        return count + len(batch)
+
+    # Queries
+
+    def _match(self, vendor: str, tokens: Sequence[str]) -> Tuple[str, str, list]:
+        """``(condition, rank expression, params)`` matching all ``tokens``; lower ranks first."""
+        if vendor == 'sqlite':
+            weights = ', '.join(str(_SQLITE_WEIGHTS[weight]) for _, weight in self.columns)
+            query = ' '.join(f'"{token}"*' for token in tokens)
+            return f'"{self.table}" MATCH %s', f'bm25("{self.table}", {weights}, 0.0)', [query]
+        query = ' & '.join(f'{token}:*' for token in tokens)
+        return (
+            "\"document\" @@ to_tsquery('simple', %s)",
+            "-ts_rank(\"document\", to_tsquery('simple', %s))",
+            [query],
+        )
+
+    def search(self, queryset: QuerySet, terms: Iterable[str], rank: bool = True) -> QuerySet:
+        """
+        Narrow ``queryset`` to rows matching every term (as a prefix).
+
+        With ``rank``, the ``RANKED_RESULTS`` most relevant rows come first
+        and the rest keep the queryset's existing ordering.
+        """
+        tokens = search_tokens(terms)
+        if not tokens:
+            return queryset
+        connection = connections[queryset.db]
+        condition, rank_expression, params = self._match(connection.vendor, tokens)
+        queryset = queryset.filter(pk__in=RawSQL(f'SELECT "key" FROM "{self.table}" WHERE {condition}', params))
+        if not rank:
+            return queryset
+
+        # Rank only among the rows the (already filtered) queryset returns
+        candidates, candidate_params = queryset.order_by().values('pk').query.sql_with_params()
+        rank_params = params if '%s' in rank_expression else []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT "key" FROM "{self.table}" WHERE {condition} AND "key" IN ({candidates}) '
+                f'ORDER BY {rank_expression} LIMIT {RANKED_RESULTS}',
+                [*params, *candidate_params, *rank_params]
+            )
+            pk_field = queryset.model._meta.pk
+            ranked = [pk_field.to_python(row[0]) for row in cursor.fetchall()]
+        if not ranked:
+            return queryset
+        relevance = Case(
+            *[When(pk=pk, then=Value(position)) for position, pk in enumerate(ranked)],
+            default=Value(len(ranked)),
+            output_field=IntegerField(),
+        )
+        return queryset.order_by(relevance, *queryset.query.order_by)
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    ``?search=`` served from the view's ``search_index`` (a ``FullTextIndex``).
+
+    List it after ``OrderingFilter``: without ``?ordering=`` results come in
+    order of relevance, with the view's ordering breaking ties. Views or
+    databases without an index get ``SearchFilter``'s ``search_fields`` scan.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        index = getattr(view, 'search_index', None)
+        if index is None or not index.is_available(queryset.db):
+            return super().filter_queryset(request, queryset, view)
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        ordering_param = getattr(OrderingFilter, 'ordering_param', 'ordering')
+        return index.search(queryset, terms, rank=not request.query_params.get(ordering_param))
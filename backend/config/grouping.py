@@ -0,0 +1,215 @@
+"""
+Helpers for "grouped by X" list endpoints.
+
+Instead of running a count and a filtered query for every group, rows are
+fetched once ordered by the group key and bucketed in a single pass, and the
+group sizes come from one GROUP BY query.
+"""
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.db.models import CharField, Count, F, QuerySet, Value, Window
+from django.db.models.functions import NullIf, RowNumber
+from django.utils import translation
+from django_countries import countries
+from rest_framework.exceptions import ValidationError
+
+# Members returned per group when a grouped endpoint is paginated
+DEFAULT_GROUP_PAGE_SIZE = 25
+
+UNKNOWN_COUNTRY = 'Unknown'
+
+
+def _parse_non_negative(request, param: str, default: Optional[int]) -> Optional[int]:
+    value = request.query_params.get(param)
+    if value in (None, ''):
+        return default
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValidationError({param: 'Must be a non-negative integer.'})
+    if number < 0:
+        raise ValidationError({param: 'Must be a non-negative integer.'})
+    return number
+
+
+def parse_group_limit(request, param: str = 'limit') -> Optional[int]:
+    """Read the optional per-group item limit from the query string."""
+    return _parse_non_negative(request, param, None)
+
+
+def parse_group_page(request) -> Tuple[bool, int, int]:
+    """
+    Read ``(include_members, limit, offset)`` for a paginated grouped endpoint.
+
+    ``?members=false`` returns counts only; otherwise each group holds at most
+    ``?limit=`` members (default ``DEFAULT_GROUP_PAGE_SIZE``) from ``?offset=``.
+    """
+    include_members = request.query_params.get('members', 'true').lower() not in ('false', '0', 'no')
+    limit = _parse_non_negative(request, 'limit', DEFAULT_GROUP_PAGE_SIZE)
+    offset = _parse_non_negative(request, 'offset', 0)
+    return include_members, limit, offset
+
+
+@lru_cache(maxsize=None)
+def _country_names(language: Optional[str]) -> Dict[str, str]:
+    with translation.override(language):
+        return {code: str(name) for code, name in countries}
+
+
+def country_name_table() -> Dict[str, str]:
+    """Return the ``{code: name}`` table for the active language, built once per language."""
+    return _country_names(translation.get_language())
+
+
+def count_by(queryset: QuerySet, field: str) -> Dict[Any, int]:
+    """Return ``{value: row count}`` for ``field`` using a single GROUP BY."""
+    return dict(
+        queryset.order_by().values(field).annotate(total=Count('pk')).values_list(field, 'total')
+    )
+
+
+def limit_per_group(
+    queryset: QuerySet,
+    field: str,
+    limit: Optional[int],
+    offset: int = 0
+) -> QuerySet:
+    """
+    Restrict ``queryset`` to rows ``offset``..``offset + limit`` of each ``field`` value.
+
+    Uses ROW_NUMBER() partitioned by the group key so every group is trimmed
+    in the same query, preserving the queryset's ordering within each group.
+    """
+    ordering = list(queryset.query.order_by or queryset.model._meta.ordering or ['pk'])
+    queryset = queryset.annotate(
+        _group_row=Window(RowNumber(), partition_by=F(field), order_by=ordering)
+    ).filter(_group_row__gt=offset)
+    if limit is not None:
+        queryset = queryset.filter(_group_row__lte=offset + limit)
+    return queryset
+
+
+def fetch_grouped(
+    queryset: QuerySet,
+    field: str,
+    limit: Optional[int] = None,
+    offset: int = 0
+) -> Tuple[Dict[Any, int], Dict[Any, List[Any]]]:
+    """
+    Fetch the rows of ``queryset`` bucketed by ``field``.
+
+    Returns ``(counts, members)`` where counts holds the full size of every
+    group and members holds at most ``limit`` instances per group, starting
+    at ``offset``. Both are keyed by the raw database value of ``field``.
+    """
+    counts = count_by(queryset, field)
+
+    members: Dict[Any, List[Any]] = {}
+    if limit == 0:
+        return counts, members
+
+    ordering = list(queryset.query.order_by or queryset.model._meta.ordering or ['pk'])
+    rows = queryset.annotate(_group_key=F(field))
+    if limit is not None or offset:
+        rows = limit_per_group(rows, field, limit, offset)
+    for obj in rows.order_by(field, *ordering):
+        members.setdefault(obj._group_key, []).append(obj)
+    return counts, members
+
+
+def _serialize_groups(
+    keys: Iterable[Any],
+    members: Dict[Any, List[Any]],
+    serialize: Callable[[List[Any]], List[Dict[str, Any]]]
+) -> Dict[Any, List[Dict[str, Any]]]:
+    """Serialize the members of every group with one ``serialize`` call."""
+    ordered = []
+    bounds = {}
+    for key in keys:
+        group = members.get(key, [])
+        bounds[key] = (len(ordered), len(ordered) + len(group))
+        ordered.extend(group)
+    data = serialize(ordered) if ordered else []
+    return {key: data[start:end] for key, (start, end) in bounds.items()}
+
+
+def _page_info(count: int, limit: Optional[int], offset: int) -> Dict[str, Any]:
+    end = offset + limit if limit is not None else count
+    return {'offset': offset, 'next_offset': end if end < count else None}
+
+
+def group_by_choices(
+    queryset: QuerySet,
+    field: str,
+    choices: Iterable[Tuple[Any, str]],
+    serialize: Callable[[List[Any]], List[Dict[str, Any]]],
+    items_key: str,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    include_members: bool = True,
+    paginated: bool = False
+) -> Dict[Any, Dict[str, Any]]:
+    """
+    Build ``{value: {'label', 'count', items_key}}`` for every choice.
+
+    ``field`` may be a model field or an annotation on ``queryset``.
+    ``serialize`` is called once with all fetched rows (e.g. a ``many=True``
+    serializer), so serializer setup is not repeated per group. With
+    ``paginated`` each group also reports its ``offset`` and ``next_offset``.
+    """
+    choices = list(choices)
+    if include_members:
+        counts, members = fetch_grouped(queryset, field, limit, offset)
+    else:
+        counts, members = count_by(queryset, field), {}
+    data = _serialize_groups([value for value, _label in choices], members, serialize)
+
+    groups = {}
+    for value, label in choices:
+        count = counts.get(value, 0)
+        groups[value] = {'label': label, 'count': count}
+        if include_members:
+            groups[value][items_key] = data[value]
+            if paginated:
+                groups[value].update(_page_info(count, limit, offset))
+    return groups
+
+
+def group_by_country(
+    queryset: QuerySet,
+    field: str,
+    serialize: Callable[[List[Any]], List[Dict[str, Any]]],
+    items_key: str,
+    limit: Optional[int] = DEFAULT_GROUP_PAGE_SIZE,
+    offset: int = 0,
+    include_members: bool = True
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Build ``{country name: {'code', 'count', items_key, 'offset', 'next_offset'}}``.
+
+    Grouping happens on the stored country code; names come from the
+    precomputed code table instead of a translation lookup per row. Rows
+    without a country are reported under ``'Unknown'``.
+    """
+    # NULL and '' both mean "no country"; fold them into one key before
+    # grouping so they are counted and paginated as a single group. The key
+    # is a plain string rather than CountryField's Country object.
+    queryset = queryset.annotate(_country=NullIf(field, Value(''), output_field=CharField()))
+    if include_members:
+        counts, members = fetch_grouped(queryset, '_country', limit, offset)
+    else:
+        counts, members = count_by(queryset, '_country'), {}
+
+    names = country_name_table()
+    codes = sorted(counts, key=lambda code: (code is None, names.get(code, code or '')))
+    data = _serialize_groups(codes, members, serialize)
+
+    groups = {}
+    for code in codes:
+        name = names.get(code, code) if code else UNKNOWN_COUNTRY
+        groups[name] = {'code': code, 'count': counts[code]}
+        if include_members:
+            groups[name][items_key] = data[code]
+            groups[name].update(_page_info(counts[code], limit, offset))
+    return groups
@@ -1,4 +1,29 @@
 from django.db import models
+from django.utils import timezone
+
+
+class TimestampedQuerySet(models.QuerySet):
+    """
+    Bulk writes that keep ``updated_at`` current, as ``save()`` does.
+
+    ``auto_now`` only applies in ``save()``, but incremental consumers such
+    as the analytics export find changed rows by ``updated_at``. Raw SQL
+    writes must set it themselves.
+    """
+
+    def update(self, **kwargs):
+        kwargs.setdefault('updated_at', timezone.now())
+        return super().update(**kwargs)
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        objs = list(objs)
+        now = timezone.now()
+        for obj in objs:
+            obj.updated_at = now
+        if 'updated_at' not in fields:
+            fields = [*fields, 'updated_at']
+        return super().bulk_update(objs, fields, batch_size=batch_size)
+
 
 class TimestampedModel(models.Model):
     """
@@ -7,5 +32,7 @@ class TimestampedModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TimestampedQuerySet.as_manager()
+
     class Meta:
-        abstract = True 
\ No newline at end of file
+        abstract = True
@@ -0,0 +1,41 @@
+"""
+Admin paginator that avoids exact ``COUNT(*)`` on large tables.
+
+On PostgreSQL an unfiltered changelist takes its total from the planner's
+row estimate in ``pg_class`` instead of counting every row. Filtered
+querysets, small tables and other databases still get an exact count.
+Use with ``show_full_result_count = False`` so the admin does not issue a
+second, unfiltered count of its own.
+"""
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    # Below this estimate an exact count is cheap enough
+    estimate_threshold = 50000
+
+    def _estimated_count(self):
+        queryset = self.object_list
+        query = getattr(queryset, 'query', None)
+        if query is None or query.where or query.distinct or query.combinator or query.is_sliced:
+            return None
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 for a table that has never been analyzed
+        if not row or row[0] < self.estimate_threshold:
+            return None
+        return int(row[0])
+
+    @cached_property
+    def count(self):
+        estimate = self._estimated_count()
+        return estimate if estimate is not None else super().count
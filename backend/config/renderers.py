@@ -0,0 +1,32 @@
+"""
+Renderers for views that stream files.
+
+Such views return a ``StreamingHttpResponse`` themselves; these renderers
+only let DRF's content negotiation accept ``?format=csv``/``?format=xlsx``
+(which it would otherwise answer with 404) and render error responses of
+those views as JSON.
+"""
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+from .xlsx import CONTENT_TYPE as XLSX_CONTENT_TYPE
+
+
+class PassthroughRenderer(BaseRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, (bytes, str)):
+            return data
+        return json.dumps(data).encode()
+
+
+class CSVRenderer(PassthroughRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class XLSXRenderer(PassthroughRenderer):
+    media_type = XLSX_CONTENT_TYPE
+    format = 'xlsx'
+    charset = None
+    render_style = 'binary'
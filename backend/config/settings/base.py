@@ -31,6 +31,11 @@ INSTALLED_APPS = [
     'promoters',
     'venues',
     'bookings',
+    'dashboard',
+    'scheduler',
+    'jobs',
+    'analytics',
+    'search',
 ]
 
 MIDDLEWARE = [
@@ -129,9 +134,148 @@ REST_FRAMEWORK = {
     ],
     'UNAUTHENTICATED_USER': None,
     'UNAUTHENTICATED_TOKEN': None,
+    'DEFAULT_THROTTLE_CLASSES': [
+        'agencies.throttling.AgencyTokenBucketThrottle',
+    ],
+}
+
+# Per-agency and per-user token buckets (see agencies/throttling.py).
+# Heavy aggregate and unpaginated endpoints cost more tokens per request.
+AGENCY_THROTTLE = {
+    'CACHE_ALIAS': 'shared',
+    'AGENCY': {
+        'CAPACITY': int(os.getenv('THROTTLE_AGENCY_CAPACITY', '300')),
+        'REFILL_PER_SECOND': float(os.getenv('THROTTLE_AGENCY_REFILL', '5')),
+    },
+    'USER': {
+        'CAPACITY': int(os.getenv('THROTTLE_USER_CAPACITY', '120')),
+        'REFILL_PER_SECOND': float(os.getenv('THROTTLE_USER_REFILL', '2')),
+    },
+    'DEFAULT_COST': 1,
+    'ACTION_COSTS': {
+        'list': 3,
+        'active': 3,
+        'upcoming': 3,
+        'calendar': 3,
+        'primary_contacts': 3,
+        'emergency_contacts': 3,
+        'stats': 5,
+        'dashboard_stats': 5,
+        'by_type': 5,
+        'by_country': 5,
+        'by_capacity': 5,
+        'by_reference': 5,
+        'nearby': 5,
+        'tags': 5,
+        'bulk_import': 20,
+        'export': 20,
+        'duplicates': 20,
+    },
+}
+
+
+# Composite dashboard (see dashboard/views.py)
+# Sections run concurrently; MAX_WORKERS = 0 computes them on the request thread.
+DASHBOARD = {
+    'MAX_WORKERS': int(os.getenv('DASHBOARD_MAX_WORKERS', '6')),
+    'SECTION_TIMEOUT': float(os.getenv('DASHBOARD_SECTION_TIMEOUT', '5')),
+    'CACHE_TIMEOUT': int(os.getenv('DASHBOARD_CACHE_TIMEOUT', '60')),
+    # Sections warmed by the scheduler are keyed by data version, so they can live longer
+    'WARM_CACHE_TIMEOUT': int(os.getenv('DASHBOARD_WARM_CACHE_TIMEOUT', '900')),
+    'WARM_ACTIVE_DAYS': int(os.getenv('DASHBOARD_WARM_ACTIVE_DAYS', '7')),
 }
 
 
+# Periodic jobs (see scheduler/). Run `manage.py run_scheduler` on one or more
+# nodes; database leases make sure each job runs on only one of them at a time.
+# JOBS overrides 'interval', 'jitter', 'lease' or 'enabled' per job name.
+SCHEDULER = {
+    'POLL_INTERVAL': float(os.getenv('SCHEDULER_POLL_INTERVAL', '30')),
+    'HISTORY_DAYS': int(os.getenv('SCHEDULER_HISTORY_DAYS', '14')),
+    'JOBS': {},
+}
+
+
+# Background jobs (see jobs/). Run `manage.py run_worker` on one or more nodes.
+# Uploads handed to jobs go through the default storage, which must be shared
+# between web and worker nodes (a common volume or an object store).
+JOBS = {
+    'CONCURRENCY': int(os.getenv('JOBS_CONCURRENCY', '2')),
+    'POLL_INTERVAL': float(os.getenv('JOBS_POLL_INTERVAL', '2')),
+    'HISTORY_DAYS': int(os.getenv('JOBS_HISTORY_DAYS', '30')),
+    'UPLOAD_DIR': 'job-uploads',
+}
+
+MEDIA_ROOT = os.getenv('MEDIA_ROOT', str(BASE_DIR / 'media'))
+
+
+# Global search (see search/). An entry matches when it contains MIN_COVERAGE of
+# the query's trigrams; lower it for more typo tolerance, raise it for precision.
+GLOBAL_SEARCH = {
+    'MIN_COVERAGE': float(os.getenv('GLOBAL_SEARCH_MIN_COVERAGE', '0.5')),
+    'DEFAULT_LIMIT': 20,
+    'MAX_LIMIT': 50,
+}
+
+# Entity picker typeahead (see search/autocomplete.py). Each process keeps up to
+# MAX_INDEXES (agency, type) prefix indexes in memory, rebuilt when the agency's
+# data version changes.
+AUTOCOMPLETE = {
+    'MAX_INDEXES': int(os.getenv('AUTOCOMPLETE_MAX_INDEXES', '200')),
+    'DEFAULT_LIMIT': 10,
+    'MAX_LIMIT': 50,
+}
+
+
+# Columnar analytics exports (see analytics/), written with pyarrow. ROOT
+# defaults to MEDIA_ROOT/analytics; rows updated in the last WATERMARK_LAG
+# seconds wait for the next incremental export.
+ANALYTICS_EXPORT = {
+    'ROOT': os.getenv('ANALYTICS_EXPORT_ROOT'),
+    'ROW_GROUP_SIZE': int(os.getenv('ANALYTICS_EXPORT_ROW_GROUP_SIZE', '50000')),
+    'WATERMARK_LAG': int(os.getenv('ANALYTICS_EXPORT_WATERMARK_LAG', '300')),
+}
+
+
+# Cache
+# Two tiers: a per-process LRU ('default') in front of a shared cache ('shared').
+# The file-based L2 works offline; point CACHE_L2_BACKEND/CACHE_L2_LOCATION at
+# Redis or Memcached to share it between hosts.
+CACHES = {
+    'default': {
+        'BACKEND': 'config.cache.TieredCache',
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'L2_ALIAS': 'shared',
+            'L1_MAX_ENTRIES': int(os.getenv('CACHE_L1_MAX_ENTRIES', '1000')),
+            'STAMP_TTL': float(os.getenv('CACHE_L1_STAMP_TTL', '1')),
+        },
+    },
+    'shared': {
+        'BACKEND': os.getenv(
+            'CACHE_L2_BACKEND',
+            'django.core.cache.backends.filebased.FileBasedCache'
+        ),
+        'LOCATION': os.getenv('CACHE_L2_LOCATION', str(BASE_DIR / '.cache' / 'django')),
+        'TIMEOUT': 300,
+    },
+}
+
+
+# Firebase Admin API
+# Admin calls run on a bounded worker pool with timeouts and a circuit breaker.
+# Use 'authentication.fake_firebase.FakeFirebaseAdminBackend' for tests/offline work.
+FIREBASE_ADMIN_BACKEND = os.getenv(
+    'FIREBASE_ADMIN_BACKEND',
+    'authentication.firebase_client.FirebaseAdminBackend'
+)
+FIREBASE_ADMIN_TIMEOUT = float(os.getenv('FIREBASE_ADMIN_TIMEOUT', '5'))
+FIREBASE_ADMIN_MAX_WORKERS = int(os.getenv('FIREBASE_ADMIN_MAX_WORKERS', '4'))
+FIREBASE_ADMIN_MAX_PENDING = int(os.getenv('FIREBASE_ADMIN_MAX_PENDING', '16'))
+FIREBASE_ADMIN_BREAKER_THRESHOLD = int(os.getenv('FIREBASE_ADMIN_BREAKER_THRESHOLD', '5'))
+FIREBASE_ADMIN_BREAKER_RESET_TIMEOUT = float(os.getenv('FIREBASE_ADMIN_BREAKER_RESET_TIMEOUT', '30'))
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 LANGUAGE_CODE = 'en-us'
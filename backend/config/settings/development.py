@@ -3,6 +3,7 @@ Development Django settings for config project.
 This inherits from base.py and adds development-specific settings.
 """
 import os
+import sys
 from dotenv import load_dotenv
 from .base import *
 
@@ -14,6 +15,8 @@ SECRET_KEY = os.getenv('DJANGO_SECRET_KEY')
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
+TESTING = 'test' in sys.argv[1:2]
+
 ALLOWED_HOSTS = os.getenv("ALLOWED_HOSTS", "").split(",")
 
 # Database
@@ -22,15 +25,22 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+        # On disk rather than in memory: the queue and scheduler tests claim
+        # from several threads, which shared-cache memory databases reject
+        # with "table is locked" instead of waiting
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
     }
 }
 
-# Debug Toolbar Settings
-INSTALLED_APPS += [
-    'debug_toolbar',
-]
+# Debug Toolbar Settings (left out of `manage.py test`, which runs with DEBUG off)
+if not TESTING:
+    INSTALLED_APPS += [
+        'debug_toolbar',
+    ]
 
-MIDDLEWARE = ['debug_toolbar.middleware.DebugToolbarMiddleware'] + MIDDLEWARE
+    MIDDLEWARE = ['debug_toolbar.middleware.DebugToolbarMiddleware'] + MIDDLEWARE
 
 # Debug toolbar is shown only if your IP is listed in INTERNAL_IPS
 INTERNAL_IPS = [
@@ -0,0 +1,99 @@
+"""
+Production Django settings for config project.
+This inherits from base.py and adds production-specific settings.
+
+Select it with DJANGO_ENV=production (or DJANGO_SETTINGS_MODULE=config.settings.production).
+"""
+import os
+from dotenv import load_dotenv
+from .base import *
+
+load_dotenv()
+
+SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+
+DEBUG = False
+
+ALLOWED_HOSTS = [host for host in os.getenv("ALLOWED_HOSTS", "").split(",") if host]
+
+CORS_ALLOW_ALL_ORIGINS = False
+CORS_ALLOWED_ORIGINS = [
+    origin for origin in os.getenv("CORS_ALLOWED_ORIGINS", "").split(",") if origin
+]
+
+# Database
+# https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+#
+# Connection reuse is selected with DB_CONNECTION_MODE:
+# - 'persistent' (default): each worker thread keeps its connection open for
+#   DB_CONN_MAX_AGE seconds, with a health check before reuse.
+# - 'pool': psycopg 3 connection pool shared by the threads of a worker
+#   process (Django requires CONN_MAX_AGE = 0 in this mode).
+# - 'pgbouncer': short-lived connections to a transaction-pooling PgBouncer;
+#   server-side cursors are disabled because they cannot span transactions there.
+DB_CONNECTION_MODE = os.getenv('DB_CONNECTION_MODE', 'persistent')
+
+# Per-statement timeout (ms) so a runaway query cannot hold a connection forever
+DB_STATEMENT_TIMEOUT = int(os.getenv('DB_STATEMENT_TIMEOUT', '30000'))
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.getenv('POSTGRES_DB', 'artist_bookings'),
+        'USER': os.getenv('POSTGRES_USER', 'postgres'),
+        'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+        'HOST': os.getenv('POSTGRES_HOST', 'localhost'),
+        'PORT': os.getenv('POSTGRES_PORT', '5432'),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '300')),
+        'CONN_HEALTH_CHECKS': True,
+        # Server-side cursors let QuerySet.iterator() stream rows in chunks
+        # instead of loading the whole result set into memory.
+        'DISABLE_SERVER_SIDE_CURSORS': False,
+        'OPTIONS': {
+            'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', '5')),
+            'options': f'-c statement_timeout={DB_STATEMENT_TIMEOUT}',
+            'application_name': os.getenv('DB_APPLICATION_NAME', 'artist-bookings'),
+            'sslmode': os.getenv('POSTGRES_SSLMODE', 'prefer'),
+        },
+    }
+}
+
+if DB_CONNECTION_MODE == 'pool':
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+        'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+        'timeout': int(os.getenv('DB_POOL_TIMEOUT', '10')),
+        'max_idle': int(os.getenv('DB_POOL_MAX_IDLE', '300')),
+    }
+elif DB_CONNECTION_MODE == 'pgbouncer':
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+    # PgBouncer in transaction mode rejects startup parameters like
+    # statement_timeout; set it on the database role instead.
+    DATABASES['default']['OPTIONS'].pop('options')
+
+# Security
+SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
+SECURE_SSL_REDIRECT = os.getenv('SECURE_SSL_REDIRECT', 'true').lower() == 'true'
+SESSION_COOKIE_SECURE = True
+CSRF_COOKIE_SECURE = True
+SECURE_HSTS_SECONDS = int(os.getenv('SECURE_HSTS_SECONDS', '31536000'))
+SECURE_HSTS_INCLUDE_SUBDOMAINS = True
+SECURE_CONTENT_TYPE_NOSNIFF = True
+
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'root': {
+        'handlers': ['console'],
+        'level': os.getenv('LOG_LEVEL', 'INFO'),
+    },
+}
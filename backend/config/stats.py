@@ -0,0 +1,91 @@
+"""
+Declarative dashboard statistics.
+
+A viewset describes its metrics as a (possibly nested) dict and gets them all
+back from a single ``aggregate()`` with one ``Count(filter=Q(...))`` per
+metric, instead of issuing a separate ``count()`` for every number::
+
+    stats = {
+        'total': Q(),
+        'active': Q(is_active=True),
+        'type_breakdown': Breakdown('venue_type', Venue.VenueType.choices),
+        'capacity_breakdown': {'small': Q(capacity__lt=500), ...},
+        'recent_additions': Recent(days=30),
+    }
+    compute_stats(queryset, stats)
+
+Leaves are ``Q`` objects (``Q()`` counts every row), ``Recent`` date
+windows or ``Breakdown`` choice groupings; dicts nest and keep their shape
+in the result.
+"""
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from django.db.models import Count, Q, QuerySet
+from django.utils import timezone
+
+
+@dataclass(frozen=True)
+class Recent:
+    """Rows whose ``field`` falls within the last ``days`` days."""
+    days: int
+    field: str = 'created_at'
+
+    def as_q(self) -> Q:
+        return Q(**{f'{self.field}__gte': timezone.now() - timedelta(days=self.days)})
+
+
+@dataclass(frozen=True)
+class Breakdown:
+    """Per-choice counts, returned as ``{value: {'label': ..., 'count': ...}}``."""
+    field: str
+    choices: Tuple[Tuple[Any, str], ...]
+
+    def __init__(self, field: str, choices: Iterable[Tuple[Any, str]]):
+        object.__setattr__(self, 'field', field)
+        object.__setattr__(self, 'choices', tuple(choices))
+
+
+def _count(q: Optional[Q]) -> Count:
+    return Count('pk', filter=q) if q else Count('pk')
+
+
+def _add(aggregates: Dict[str, Count], q: Optional[Q]) -> str:
+    alias = f'stat_{len(aggregates)}'
+    aggregates[alias] = _count(q)
+    return alias
+
+
+def _compile(node: Any, path: str, aggregates: Dict[str, Count]) -> Callable[[Dict[str, int]], Any]:
+    """Register the aggregates for ``node`` and return a builder for its result."""
+    if isinstance(node, dict):
+        builders = {
+            key: _compile(child, f'{path}.{key}' if path else str(key), aggregates)
+            for key, child in node.items()
+        }
+        return lambda results: {key: build(results) for key, build in builders.items()}
+
+    if isinstance(node, Breakdown):
+        builders = {}
+        for value, label in node.choices:
+            builders[value] = (label, _add(aggregates, Q(**{node.field: value})))
+        return lambda results: {
+            value: {'label': label, 'count': results[alias]}
+            for value, (label, alias) in builders.items()
+        }
+
+    if isinstance(node, Recent):
+        node = node.as_q()
+    if not isinstance(node, Q):
+        raise TypeError(f"Unsupported stats metric at '{path}': {node!r}")
+
+    alias = _add(aggregates, node)
+    return lambda results: results[alias]
+
+
+def compute_stats(queryset: QuerySet, spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Evaluate every metric in ``spec`` against ``queryset`` in one query."""
+    aggregates: Dict[str, Count] = {}
+    build = _compile(spec, '', aggregates)
+    return build(queryset.order_by().aggregate(**aggregates))
@@ -27,6 +27,9 @@ urlpatterns = [
     path('api/v1/', include('promoters.urls')),
     path('api/v1/', include('venues.urls')),
     path('api/v1/', include('bookings.urls')),
+    path('api/v1/', include('dashboard.urls')),
+    path('api/v1/', include('jobs.urls')),
+    path('api/v1/', include('search.urls')),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,188 @@
+"""
+Streaming XLSX writer.
+
+Writes a single-sheet workbook as a stream of bytes while rows are still
+being produced, so exports of any size run in constant memory. The zip
+archive is written to an unseekable buffer (``zipfile`` then uses data
+descriptors) that is drained after every batch of rows; strings are
+written inline rather than through a shared strings table, which would
+have to be held in memory until the end.
+
+    response = StreamingHttpResponse(stream_xlsx(header, row_batches))
+
+Cells may be ``None`` (left empty), ``bool``, numbers (``int``, ``float``,
+``Decimal``), ``date``/``datetime`` (written as dates Excel formats) or
+anything else, written as text.
+"""
+import datetime
+import re
+import zipfile
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, List, Sequence
+from xml.sax.saxutils import escape
+
+from django.utils import timezone
+
+CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+_EXCEL_EPOCH = datetime.datetime(1899, 12, 30)
+
+# Style indexes in _STYLES
+_DATE_STYLE = 1
+_DATETIME_STYLE = 2
+
+# Characters XML 1.0 does not allow, even escaped
+_ILLEGAL_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+# Cell styles: 0 default, 1 date (built-in format 14), 2 date and time (22)
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="4">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="22" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '</cellXfs>'
+    '</styleSheet>'
+)
+_HEADER_STYLE = 3
+
+_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetViews><sheetView workbookViewId="0">'
+    '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+    '</sheetView></sheetViews>'
+    '<sheetData>'
+)
+_SHEET_END = '</sheetData></worksheet>'
+
+
+class _StreamBuffer:
+    """Unseekable sink for ``ZipFile``; ``drain()`` hands over what was written so far."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _text(value: str) -> str:
+    return escape(_ILLEGAL_XML.sub('', value))
+
+
+def _serial(value) -> float:
+    if isinstance(value, datetime.datetime):
+        if timezone.is_aware(value):
+            value = timezone.make_naive(value)
+        delta = value - _EXCEL_EPOCH
+        return delta.days + delta.seconds / 86400 + delta.microseconds / 86400e6
+    return (value - _EXCEL_EPOCH.date()).days
+
+
+def _cell(value: Any, style: int = 0) -> str:
+    if value is None:
+        return '<c/>'
+    if isinstance(value, bool):
+        return f'<c t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, Decimal)):
+        return f'<c><v>{value}</v></c>'
+    if isinstance(value, datetime.datetime):
+        return f'<c s="{_DATETIME_STYLE}"><v>{_serial(value)}</v></c>'
+    if isinstance(value, datetime.date):
+        return f'<c s="{_DATE_STYLE}"><v>{_serial(value)}</v></c>'
+    style_attr = f' s="{style}"' if style else ''
+    return f'<c t="inlineStr"{style_attr}><is><t xml:space="preserve">{_text(str(value))}</t></is></c>'
+
+
+def _row(values: Iterable[Any], style: int = 0) -> str:
+    return '<row>' + ''.join(_cell(value, style) for value in values) + '</row>'
+
+
+def stream_xlsx(
+    header: Sequence[str],
+    batches: Iterable[Iterable[Sequence[Any]]],
+    sheet_name: str = 'Sheet1',
+) -> Iterator[bytes]:
+    """
+    Yield an XLSX workbook with ``header`` and the rows of ``batches``.
+
+    Output is flushed after each batch, so a batch is the unit of memory use.
+    """
+    buffer = _StreamBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        archive.writestr('_rels/.rels', _ROOT_RELS)
+        archive.writestr('xl/workbook.xml', _WORKBOOK.format(name=_text(sheet_name[:31])))
+        archive.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS)
+        archive.writestr('xl/styles.xml', _STYLES)
+
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write((_SHEET_START + _row(header, _HEADER_STYLE)).encode())
+            for batch in batches:
+                sheet.write(''.join(_row(row) for row in batch).encode())
+                data = buffer.drain()
+                if data:
+                    yield data
+            sheet.write(_SHEET_END.encode())
+    yield buffer.drain()
@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django import forms
+from agencies.versioning import update_and_bump
 from .models import Contact
 
 
@@ -271,41 +272,43 @@ class ContactAdmin(admin.ModelAdmin):
     
     def mark_active(self, request, queryset):
         """Mark selected contacts as active."""
-        updated = queryset.update(is_active=True)
+        updated = update_and_bump(queryset, is_active=True)
         self.message_user(request, f'{updated} contacts marked as active.')
     mark_active.short_description = "✅ Mark selected contacts as active"
     
     def mark_inactive(self, request, queryset):
         """Mark selected contacts as inactive."""
-        updated = queryset.update(is_active=False)
+        updated = update_and_bump(queryset, is_active=False)
         self.message_user(request, f'{updated} contacts marked as inactive.')
     mark_inactive.short_description = "❌ Mark selected contacts as inactive"
     
     def set_as_primary(self, request, queryset):
-        """Set selected contacts as primary (be careful - this could create conflicts)."""
-        updated = queryset.update(is_primary=True)
-        self.message_user(
-            request, 
-            f'{updated} contacts set as primary. Note: This may create multiple primary contacts for the same entity.',
-            level='warning'
-        )
+        """Set selected contacts as primary, demoting each entity's current primary."""
+        contacts = list(queryset)
+        for contact in contacts:
+            contact.make_primary()
+        entities = {(c.agency_id, c.reference_type, c.promoter_id, c.venue_id) for c in contacts}
+        message = f'{len(contacts)} contacts set as primary.'
+        if len(entities) < len(contacts):
+            message += ' Where several were selected for the same entity, only the last one stays primary.'
+        self.message_user(request, message, level='warning' if len(entities) < len(contacts) else 'info')
     set_as_primary.short_description = "⭐ Set as primary contact"
     
     def unset_primary(self, request, queryset):
         """Unset primary status for selected contacts."""
-        updated = queryset.update(is_primary=False)
+        updated = update_and_bump(queryset, is_primary=False)
         self.message_user(request, f'{updated} contacts removed from primary status.')
     unset_primary.short_description = "⭐ Remove primary status"
     
     def mark_emergency(self, request, queryset):
         """Mark selected contacts as emergency contacts."""
-        updated = queryset.update(is_emergency=True)
+        updated = update_and_bump(queryset, is_emergency=True)
         self.message_user(request, f'{updated} contacts marked as emergency contacts.')
     mark_emergency.short_description = "🚨 Mark as emergency contact"
     
     def unmark_emergency(self, request, queryset):
         """Remove emergency status from selected contacts."""
-        updated = queryset.update(is_emergency=False)
+        updated = update_and_bump(queryset, is_emergency=False)
         self.message_user(request, f'{updated} contacts removed from emergency status.')
     unmark_emergency.short_description = "🚨 Remove emergency status"
     
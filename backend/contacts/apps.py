@@ -8,7 +8,5 @@ class ContactsConfig(AppConfig):
     
     def ready(self):
         """Initialize app when Django starts."""
-        # Import signals if we add any later
-        # import contacts.signals
-        pass
+        import contacts.signals
 
@@ -0,0 +1,269 @@
+# contacts/dedupe.py
+
+"""
+Duplicate contact detection and merging.
+
+Comparing every contact with every other is quadratic, so candidates are
+found by blocking: each contact gets a few cheap keys (normalized email,
+trailing phone digits, name tokens) and only contacts that share a key are
+scored against each other. Blocks larger than ``MAX_BLOCK_SIZE`` are
+skipped, which keeps the run near-linear even for very common names.
+
+Pairs scoring at or above the threshold are clustered with union-find and
+reported as duplicate groups. ``merge_contacts`` folds duplicates into a
+surviving contact and repoints bookings at it with set-based updates.
+"""
+
+import re
+import unicodedata
+import uuid
+from collections import defaultdict
+from difflib import SequenceMatcher
+from itertools import combinations
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from search.index import index_objects
+from .models import Contact
+from .tags import sync_contact_tags
+
+
+DEFAULT_MIN_SCORE = 0.6
+MAX_BLOCK_SIZE = 50
+
+# Score contributions; a total of 1.0 or more is capped
+EMAIL_WEIGHT = 0.6
+PHONE_WEIGHT = 0.35
+NAME_WEIGHT = 0.45
+SAME_ENTITY_WEIGHT = 0.15
+
+DEDUPE_FIELDS = [
+    'id', 'contact_name', 'contact_email', 'contact_phone', 'whatsapp',
+    'reference_type', 'promoter_id', 'venue_id',
+]
+
+# Fields copied from duplicates onto the survivor when the survivor's are blank
+MERGE_FILL_FIELDS = [
+    'contact_phone', 'job_title', 'department', 'address', 'city', 'country',
+    'whatsapp', 'linkedin', 'timezone', 'working_hours',
+]
+
+_NON_WORD = re.compile(r'[^\w\s]')
+_NON_DIGIT = re.compile(r'\D')
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, strip accents and punctuation, and collapse whitespace."""
+    name = unicodedata.normalize('NFKD', name or '')
+    name = ''.join(ch for ch in name if not unicodedata.combining(ch))
+    return ' '.join(_NON_WORD.sub(' ', name.lower()).split())
+
+
+def normalize_email(email: str) -> str:
+    """Lowercase and drop ``+tag`` suffixes from the local part."""
+    email = (email or '').strip().lower()
+    if '@' not in email:
+        return email
+    local, domain = email.rsplit('@', 1)
+    return f"{local.split('+', 1)[0]}@{domain}"
+
+
+def phone_digits(phone: str) -> str:
+    """Return the last 9 digits, which ignores country and trunk prefixes."""
+    digits = _NON_DIGIT.sub('', phone or '')
+    return digits[-9:] if len(digits) >= 7 else ''
+
+
+class _Candidate:
+    __slots__ = ('id', 'name', 'email', 'phones', 'entity', 'data')
+
+    def __init__(self, row: Dict[str, Any]):
+        self.id = str(row['id'])
+        # Token order is ignored so "Smith, Jonathan" matches "Jonathan Smith"
+        self.name = ' '.join(sorted(normalize_name(row['contact_name']).split()))
+        self.email = normalize_email(row['contact_email'])
+        self.phones = {p for p in (phone_digits(row['contact_phone']), phone_digits(row['whatsapp'])) if p}
+        self.entity = (row['reference_type'], row['promoter_id'] or row['venue_id'])
+        self.data = row
+
+    def blocking_keys(self) -> Set[str]:
+        keys = set()
+        if self.email:
+            keys.add(f'e:{self.email}')
+        for phone in self.phones:
+            keys.add(f'p:{phone}')
+        tokens = self.name.split()
+        if tokens:
+            # Exact tokens in any order, and 3-letter prefixes for spelling variants
+            keys.add('n:' + ' '.join(tokens))
+            keys.add('n3:' + ' '.join(sorted(token[:3] for token in tokens)))
+        return keys
+
+
+def score_pair(a: _Candidate, b: _Candidate) -> Tuple[float, List[str]]:
+    """Return ``(score, reasons)`` for two contacts."""
+    score = 0.0
+    reasons = []
+    if a.email and a.email == b.email:
+        score += EMAIL_WEIGHT
+        reasons.append('email')
+    if a.phones & b.phones:
+        score += PHONE_WEIGHT
+        reasons.append('phone')
+    if a.name and b.name:
+        similarity = SequenceMatcher(None, a.name, b.name).ratio()
+        score += NAME_WEIGHT * similarity
+        if similarity >= 0.85:
+            reasons.append('name')
+    if a.entity[1] and a.entity == b.entity:
+        score += SAME_ENTITY_WEIGHT
+        reasons.append('same_entity')
+    return min(1.0, round(score, 3)), reasons
+
+
+def find_duplicates(
+    rows: Iterable[Dict[str, Any]],
+    min_score: float = DEFAULT_MIN_SCORE,
+    max_block_size: int = MAX_BLOCK_SIZE
+) -> List[Dict[str, Any]]:
+    """
+    Group likely duplicates among ``rows`` (dicts with ``DEDUPE_FIELDS``).
+
+    Returns groups sorted by their best pair score, each as
+    ``{'score', 'contacts': [...], 'pairs': [...]}``.
+    """
+    candidates: Dict[str, _Candidate] = {}
+    blocks: Dict[str, List[str]] = defaultdict(list)
+    for row in rows:
+        candidate = _Candidate(row)
+        candidates[candidate.id] = candidate
+        for key in candidate.blocking_keys():
+            blocks[key].append(candidate.id)
+
+    scored: Dict[Tuple[str, str], Tuple[float, List[str]]] = {}
+    for members in blocks.values():
+        if len(members) < 2 or len(members) > max_block_size:
+            continue
+        for a, b in combinations(members, 2):
+            pair = (a, b) if a < b else (b, a)
+            if pair not in scored:
+                scored[pair] = score_pair(candidates[a], candidates[b])
+
+    # Union-find over the matching pairs
+    parent: Dict[str, str] = {}
+
+    def find(x: str) -> str:
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    matches = [(pair, result) for pair, result in scored.items() if result[0] >= min_score]
+    for (a, b), _ in matches:
+        parent[find(a)] = find(b)
+
+    groups: Dict[str, Dict[str, Any]] = {}
+    for (a, b), (score, reasons) in matches:
+        group = groups.setdefault(find(a), {'score': 0.0, 'ids': set(), 'pairs': []})
+        group['ids'].update((a, b))
+        group['score'] = max(group['score'], score)
+        group['pairs'].append({'a': a, 'b': b, 'score': score, 'reasons': reasons})
+
+    report = []
+    for group in groups.values():
+        report.append({
+            'score': group['score'],
+            'contacts': [
+                {field: candidates[cid].data[field] for field in DEDUPE_FIELDS}
+                for cid in sorted(group['ids'])
+            ],
+            'pairs': sorted(group['pairs'], key=lambda pair: -pair['score']),
+        })
+    report.sort(key=lambda group: -group['score'])
+    return report
+
+
+def find_agency_duplicates(agency, **kwargs) -> List[Dict[str, Any]]:
+    """Run ``find_duplicates`` over all of an agency's contacts."""
+    rows = Contact.objects.filter(agency=agency).order_by().values(*DEDUPE_FIELDS)
+    return find_duplicates(
+        ({**row, 'id': str(row['id'])} for row in rows.iterator(chunk_size=2000)),
+        **kwargs
+    )
+
+
+def merge_contacts(survivor: Contact, duplicate_ids: List[str], updated_by=None) -> Dict[str, Any]:
+    """
+    Merge the duplicate contacts into ``survivor`` and delete them.
+
+    Blank fields on the survivor are filled from the duplicates, tags are
+    combined, and bookings pointing at a duplicate are repointed at the
+    survivor in a single UPDATE.
+    """
+    from bookings.models import Booking
+
+    requested = [str(pk) for pk in duplicate_ids if str(pk) != str(survivor.pk)]
+    duplicate_ids = []
+    for pk in requested:
+        try:
+            duplicate_ids.append(str(uuid.UUID(pk)))
+        except ValueError:
+            pass
+
+    with transaction.atomic():
+        duplicates = list(
+            Contact.objects.select_for_update()
+            .filter(agency_id=survivor.agency_id, id__in=duplicate_ids)
+            .order_by('created_at')
+        )
+        found = {str(contact.id) for contact in duplicates}
+        missing = [pk for pk in requested if pk not in found and pk.lower() not in found]
+        if missing:
+            raise Contact.DoesNotExist(f"Contacts not found: {', '.join(missing)}")
+
+        for duplicate in duplicates:
+            for field in MERGE_FILL_FIELDS:
+                if not getattr(survivor, field) and getattr(duplicate, field):
+                    setattr(survivor, field, getattr(duplicate, field))
+            survivor.tags = list(dict.fromkeys((survivor.tags or []) + (duplicate.tags or [])))
+            survivor.is_emergency = survivor.is_emergency or duplicate.is_emergency
+            if duplicate.notes and duplicate.notes not in survivor.notes:
+                survivor.notes = '\n\n'.join(filter(None, [survivor.notes, duplicate.notes]))
+
+        # Inherit primary status for the same entity once the duplicates are gone
+        inherit_primary = any(
+            duplicate.is_primary and
+            (duplicate.reference_type, duplicate.promoter_id, duplicate.venue_id) ==
+            (survivor.reference_type, survivor.promoter_id, survivor.venue_id)
+            for duplicate in duplicates
+        )
+
+        bookings_updated = Booking.objects.filter(
+            agency_id=survivor.agency_id,
+            promoter_contact_id__in=duplicate_ids
+        ).update(promoter_contact_id=str(survivor.pk))
+
+        Contact.objects.filter(id__in=[contact.id for contact in duplicates]).delete()
+
+        if inherit_primary:
+            survivor.is_primary = True
+        if updated_by is not None:
+            survivor.updated_by = updated_by
+        survivor.updated_at = timezone.now()
+
+        # Every merged value comes from an already-valid row, so write the
+        # survivor directly rather than through save()'s full_clean()
+        changed = MERGE_FILL_FIELDS + ['tags', 'is_emergency', 'notes', 'is_primary', 'updated_by', 'updated_at']
+        Contact.objects.filter(pk=survivor.pk).update(
+            **{field: getattr(survivor, field) for field in changed}
+        )
+        sync_contact_tags([survivor])
+        index_objects([survivor])
+
+    return {
+        'merged': len(duplicates),
+        'bookings_updated': bookings_updated,
+    }
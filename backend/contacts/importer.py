@@ -0,0 +1,375 @@
+# contacts/importer.py
+
+"""
+Bulk contact import from CSV and vCard files.
+
+``Contact.save()`` runs ``full_clean()`` (including uniqueness queries) for
+every row and the serializer adds its own email and primary-contact checks,
+so importing thousands of contacts row by row costs several queries each.
+The importer instead:
+
+- streams the uploaded file row by row,
+- validates each row's fields in memory (``full_clean`` without the
+  uniqueness checks),
+- checks email uniqueness, primary contacts and promoter/venue references
+  against indexes preloaded with one query each,
+- inserts valid rows with ``bulk_create`` in chunks.
+
+Rows that fail validation are reported with their row number and errors;
+they do not stop the import.
+"""
+
+import codecs
+import csv
+import logging
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django_countries import countries
+
+from agencies.versioning import bump_data_version
+from config.grouping import country_name_table
+from search.index import index_objects
+from .models import Contact
+from .tags import sync_contact_tags
+
+logger = logging.getLogger(__name__)
+
+
+IMPORT_CHUNK_SIZE = 500
+
+# Cap the size of the error report for badly malformed files
+MAX_REPORTED_ERRORS = 1000
+
+IMPORT_FIELDS = [
+    'contact_name', 'contact_email', 'contact_phone', 'contact_type',
+    'job_title', 'department', 'reference_type', 'promoter_id', 'venue_id',
+    'preferred_contact_method', 'address', 'city', 'country', 'whatsapp',
+    'linkedin', 'is_primary', 'is_emergency', 'notes', 'tags', 'timezone',
+    'working_hours',
+]
+
+# Common alternative CSV headers
+COLUMN_ALIASES = {
+    'name': 'contact_name',
+    'full_name': 'contact_name',
+    'email': 'contact_email',
+    'phone': 'contact_phone',
+    'type': 'contact_type',
+    'title': 'job_title',
+}
+
+BOOLEAN_FIELDS = {'is_primary', 'is_emergency'}
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'x'}
+
+
+def _text_stream(uploaded_file) -> Iterator[str]:
+    """Decode an uploaded file line by line without reading it into memory."""
+    uploaded_file.seek(0)
+    reader = codecs.getreader('utf-8-sig')(uploaded_file, errors='replace')
+    for line in reader:
+        yield line
+
+
+def parse_csv(uploaded_file) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield ``(row number, values)`` for every data row of a CSV file."""
+    reader = csv.DictReader(_text_stream(uploaded_file))
+    for row in reader:
+        values = {}
+        for column, value in row.items():
+            if column is None:
+                continue
+            key = column.strip().lower().replace(' ', '_')
+            key = COLUMN_ALIASES.get(key, key)
+            if key in IMPORT_FIELDS:
+                values[key] = (value or '').strip()
+        yield reader.line_num, values
+
+
+def _unfold_vcard(lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """Join RFC 6350 folded lines, yielding ``(line number, logical line)``."""
+    current = None
+    start = 0
+    for number, line in enumerate(lines, start=1):
+        line = line.rstrip('\r\n')
+        if line[:1] in (' ', '\t') and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield start, current
+        current, start = line, number
+    if current is not None:
+        yield start, current
+
+
+def _vcard_value(value: str) -> str:
+    return (
+        value.replace('\\n', '\n').replace('\\N', '\n')
+        .replace('\\,', ',').replace('\\;', ';').replace('\\\\', '\\')
+        .strip()
+    )
+
+
+def parse_vcard(uploaded_file) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield ``(line number of BEGIN:VCARD, values)`` for every card in a vCard file."""
+    values: Optional[Dict[str, Any]] = None
+    start = 0
+    for number, line in _unfold_vcard(_text_stream(uploaded_file)):
+        if ':' not in line:
+            continue
+        name, value = line.split(':', 1)
+        prop, *params = name.split(';')
+        prop = prop.split('.')[-1].upper()
+        params = [param.upper() for param in params]
+
+        if prop == 'BEGIN' and value.strip().upper() == 'VCARD':
+            values, start = {}, number
+        elif values is None:
+            continue
+        elif prop == 'END':
+            yield start, values
+            values = None
+        elif prop == 'FN':
+            values['contact_name'] = _vcard_value(value)
+        elif prop == 'N' and 'contact_name' not in values:
+            parts = [_vcard_value(part) for part in value.split(';')]
+            values['contact_name'] = ' '.join(p for p in [*parts[1:2], *parts[:1]] if p)
+        elif prop == 'EMAIL' and 'contact_email' not in values:
+            values['contact_email'] = _vcard_value(value)
+        elif prop == 'TEL':
+            number_value = _vcard_value(value)
+            if number_value.lower().startswith('tel:'):
+                number_value = number_value[4:]
+            if 'contact_phone' not in values:
+                values['contact_phone'] = number_value
+            elif any('CELL' in param for param in params) and 'whatsapp' not in values:
+                values['whatsapp'] = number_value
+        elif prop == 'TITLE':
+            values['job_title'] = _vcard_value(value)
+        elif prop == 'ORG':
+            values['department'] = _vcard_value(value.split(';')[1]) if ';' in value else ''
+        elif prop == 'ADR':
+            parts = [_vcard_value(part) for part in value.split(';')]
+            parts += [''] * (7 - len(parts))
+            values['address'] = ', '.join(p for p in parts[:3] + parts[5:6] if p)
+            values['city'] = parts[3]
+            values['country'] = parts[6]
+        elif prop == 'NOTE':
+            values['notes'] = _vcard_value(value)
+        elif prop == 'CATEGORIES':
+            values['tags'] = _vcard_value(value)
+        elif prop == 'URL' and 'linkedin.com' in value:
+            values['linkedin'] = _vcard_value(value)
+
+
+PARSERS = {
+    'csv': parse_csv,
+    'vcard': parse_vcard,
+}
+
+
+def detect_format(filename: str) -> Optional[str]:
+    name = (filename or '').lower()
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.vcf', '.vcard')):
+        return 'vcard'
+    return None
+
+
+class ContactImporter:
+    """
+    Validate and insert contacts for one agency.
+
+    ``defaults`` supplies values (e.g. ``reference_type``/``promoter_id``)
+    for columns missing from the file. ``progress`` is called with the
+    number of rows read after every inserted chunk.
+    """
+
+    def __init__(
+        self,
+        agency,
+        created_by=None,
+        defaults: Optional[Dict[str, Any]] = None,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+        dry_run: bool = False,
+        progress: Optional[Callable[[int], None]] = None
+    ):
+        self.agency = agency
+        self.created_by = created_by
+        self.defaults = {key: value for key, value in (defaults or {}).items() if key in IMPORT_FIELDS}
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.progress = progress
+
+        self.rows = 0
+        self.created = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+        self._pending: List[Tuple[int, Contact]] = []
+        self._load_indexes()
+
+    def _load_indexes(self) -> None:
+        """Preload everything uniqueness and reference checks need, one query each."""
+        from promoters.models import Promoter
+        from venues.models import Venue
+
+        contacts = Contact.objects.filter(agency=self.agency)
+        self.emails = {
+            email.lower() for email in contacts.values_list('contact_email', flat=True)
+        }
+        self.primary_keys = {
+            self._primary_key(reference_type, promoter_id, venue_id)
+            for reference_type, promoter_id, venue_id in contacts.filter(is_primary=True)
+            .values_list('reference_type', 'promoter_id', 'venue_id')
+        }
+        self.promoter_ids = {
+            str(pk) for pk in Promoter.objects.filter(agency=self.agency).values_list('id', flat=True)
+        }
+        self.venue_ids = {
+            str(pk) for pk in Venue.objects.filter(agency=self.agency).values_list('id', flat=True)
+        }
+
+    @staticmethod
+    def _primary_key(reference_type, promoter_id, venue_id):
+        if reference_type == Contact.ReferenceType.PROMOTER:
+            return (reference_type, promoter_id)
+        if reference_type == Contact.ReferenceType.VENUE:
+            return (reference_type, venue_id)
+        return (reference_type, None)
+
+    def _coerce(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        data = {**self.defaults, **{key: value for key, value in values.items() if value != ''}}
+        for field in BOOLEAN_FIELDS:
+            if field in data and isinstance(data[field], str):
+                data[field] = data[field].strip().lower() in TRUE_VALUES
+        if isinstance(data.get('tags'), str):
+            separator = ';' if ';' in data['tags'] else ','
+            data['tags'] = [tag.strip() for tag in data['tags'].split(separator) if tag.strip()]
+        country = data.get('country')
+        if isinstance(country, str) and len(country) > 2:
+            data['country'] = countries.by_name(country) or country
+        if isinstance(data.get('country'), str):
+            data['country'] = data['country'].upper()
+        data.setdefault('reference_type', Contact.ReferenceType.AGENCY)
+        for field in ('promoter_id', 'venue_id'):
+            if data.get(field):
+                data[field] = str(data[field]).strip().lower()
+        return data
+
+    def validate_row(self, values: Dict[str, Any]) -> Tuple[Optional[Contact], Dict[str, Any]]:
+        """Return ``(contact, {})`` for a valid row or ``(None, errors)``."""
+        data = self._coerce(values)
+        contact = Contact(agency=self.agency, created_by=self.created_by, **data)
+        errors: Dict[str, Any] = {}
+
+        try:
+            # Field validators and Contact.clean(); uniqueness is checked below.
+            # CountryField.validate walks every translated country name, so
+            # the code is checked against the cached table instead.
+            contact.full_clean(
+                exclude=['agency', 'created_by', 'updated_by', 'country'],
+                validate_unique=False,
+                validate_constraints=False
+            )
+        except DjangoValidationError as e:
+            errors.update({
+                field: list(dict.fromkeys(messages))
+                for field, messages in e.message_dict.items()
+            })
+
+        if contact.country and contact.country.code not in country_name_table():
+            errors['country'] = [f"'{contact.country.code}' is not a valid country."]
+
+        email = (contact.contact_email or '').lower()
+        if email and email in self.emails:
+            errors.setdefault('contact_email', []).append(
+                'A contact with this email already exists in your agency.'
+            )
+
+        if contact.reference_type == Contact.ReferenceType.PROMOTER and contact.promoter_id:
+            if contact.promoter_id not in self.promoter_ids:
+                errors.setdefault('promoter_id', []).append(
+                    'The specified promoter does not exist or does not belong to your agency.'
+                )
+        elif contact.reference_type == Contact.ReferenceType.VENUE and contact.venue_id:
+            if contact.venue_id not in self.venue_ids:
+                errors.setdefault('venue_id', []).append(
+                    'The specified venue does not exist or does not belong to your agency.'
+                )
+
+        primary_key = self._primary_key(contact.reference_type, contact.promoter_id, contact.venue_id)
+        if contact.is_primary and primary_key in self.primary_keys:
+            errors.setdefault('is_primary', []).append(
+                'There is already a primary contact for this entity.'
+            )
+
+        if errors:
+            return None, errors
+
+        # Later rows in the same file must not duplicate this one
+        self.emails.add(email)
+        if contact.is_primary:
+            self.primary_keys.add(primary_key)
+        return contact, {}
+
+    def _record_error(self, row: int, errors: Dict[str, Any]) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row, 'errors': errors})
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        if self.dry_run:
+            self.created += len(pending)
+            return
+
+        try:
+            with transaction.atomic():
+                Contact.objects.bulk_create([contact for _, contact in pending])
+                sync_contact_tags(contact for _, contact in pending)
+                index_objects(contact for _, contact in pending)
+            self.created += len(pending)
+        except IntegrityError:
+            # A concurrent write conflicted with a row; insert one by one to find it
+            for row, contact in pending:
+                try:
+                    with transaction.atomic():
+                        Contact.objects.bulk_create([contact])
+                        sync_contact_tags([contact])
+                        index_objects([contact])
+                    self.created += 1
+                except IntegrityError as e:
+                    logger.warning(f"Contact import row {row} rejected by the database: {str(e)}")
+                    self._record_error(row, {'non_field_errors': ['Conflicts with an existing contact.']})
+
+    def run(self, rows: Iterable[Tuple[int, Dict[str, Any]]]) -> Dict[str, Any]:
+        """Import ``rows`` and return the import report."""
+        for row, values in rows:
+            self.rows += 1
+            contact, errors = self.validate_row(values)
+            if errors:
+                self._record_error(row, errors)
+                continue
+            self._pending.append((row, contact))
+            if len(self._pending) >= self.chunk_size:
+                self._flush()
+                if self.progress:
+                    self.progress(self.rows)
+        self._flush()
+
+        if self.created and not self.dry_run:
+            # bulk_create does not send post_save, hence the explicit search
+            # indexing above and this version bump
+            bump_data_version(self.agency.id)
+
+        return {
+            'created': self.created,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+            'dry_run': self.dry_run,
+        }
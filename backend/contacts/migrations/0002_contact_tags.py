@@ -0,0 +1,81 @@
+# Generated by Django 5.2.4 on 2026-10-19 01:01
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+def backfill_contact_tags(apps, schema_editor):
+    """Copy existing ``Contact.tags`` lists into the tag tables."""
+    Contact = apps.get_model('contacts', 'Contact')
+    Tag = apps.get_model('contacts', 'Tag')
+    ContactTag = apps.get_model('contacts', 'ContactTag')
+
+    tags = {}
+    links = []
+    rows = Contact.objects.exclude(tags=[]).values_list('id', 'agency_id', 'tags')
+    for contact_id, agency_id, names in rows.iterator(chunk_size=2000):
+        if not isinstance(names, list):
+            continue
+        for name in names:
+            name = ' '.join(str(name).split())[:100]
+            if not name:
+                continue
+            key = (agency_id, name.casefold())
+            if key not in tags:
+                tags[key] = Tag(id=uuid.uuid4(), agency_id=agency_id, name=name, key=key[1])
+            links.append((contact_id, tags[key].id))
+
+    Tag.objects.bulk_create(tags.values(), batch_size=1000)
+    ContactTag.objects.bulk_create(
+        [ContactTag(contact_id=contact_id, tag_id=tag_id) for contact_id, tag_id in dict.fromkeys(links)],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agencies', '0002_alter_agency_options_and_more'),
+        ('contacts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(help_text='Display name, as first used', max_length=100)),
+                ('key', models.CharField(help_text='Case-folded name used for matching', max_length=100)),
+                ('agency', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='contact_tags', to='agencies.agency')),
+            ],
+            options={
+                'verbose_name': 'Contact Tag',
+                'verbose_name_plural': 'Contact Tags',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ContactTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('contact', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='contacts.contact')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='contact_links', to='contacts.tag')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='tag',
+            constraint=models.UniqueConstraint(fields=('agency', 'key'), name='unique_contact_tag_per_agency'),
+        ),
+        migrations.AddIndex(
+            model_name='contacttag',
+            index=models.Index(fields=['tag', 'contact'], name='contacts_co_tag_id_223078_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='contacttag',
+            constraint=models.UniqueConstraint(fields=('contact', 'tag'), name='unique_contact_tag_link'),
+        ),
+        migrations.RunPython(backfill_contact_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.4 on 2026-10-19 01:05
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+def demote_extra_primaries(apps, schema_editor):
+    """Keep only the most recently updated primary contact per entity."""
+    Contact = apps.get_model('contacts', 'Contact')
+    seen = set()
+    extra = []
+    rows = (
+        Contact.objects.filter(is_primary=True)
+        .order_by('-updated_at')
+        .values_list('id', 'agency_id', 'reference_type', 'promoter_id', 'venue_id')
+    )
+    for contact_id, agency_id, reference_type, promoter_id, venue_id in rows.iterator(chunk_size=2000):
+        key = (agency_id, reference_type, promoter_id or '', venue_id or '')
+        if key in seen:
+            extra.append(contact_id)
+        else:
+            seen.add(key)
+    for start in range(0, len(extra), 1000):
+        Contact.objects.filter(id__in=extra[start:start + 1000]).update(is_primary=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agencies', '0002_alter_agency_options_and_more'),
+        ('contacts', '0002_contact_tags'),
+    ]
+
+    operations = [
+        migrations.RunPython(demote_extra_primaries, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='contact',
+            constraint=models.UniqueConstraint(models.F('agency'), models.F('reference_type'), django.db.models.functions.comparison.Coalesce('promoter_id', models.Value('')), django.db.models.functions.comparison.Coalesce('venue_id', models.Value('')), condition=models.Q(('is_primary', True)), name='unique_primary_contact', violation_error_code='primary_exists', violation_error_message='There is already a primary contact for this entity.'),
+        ),
+    ]
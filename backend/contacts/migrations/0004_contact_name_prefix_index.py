@@ -0,0 +1,16 @@
+# Generated by Django 5.2.4 on 2026-10-19 02:10
+
+from django.db import migrations
+
+from config.autocomplete import prefix_search_indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contacts', '0003_unique_primary_contact'),
+    ]
+
+    operations = [
+        prefix_search_indexes('contacts_contact', ['contact_name', 'contact_email']),
+    ]
@@ -1,10 +1,14 @@
 # contacts/models.py
 
 import uuid
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Q, Value
+from django.db.models.functions import Coalesce
 from django.core.validators import validate_email
+from django.utils import timezone
 from django_countries.fields import CountryField
 from agencies.models import Agency, UserProfile
+from agencies.versioning import bump_data_version
 from config.models import TimestampedModel
 
 
@@ -175,6 +179,19 @@ class Contact(TimestampedModel):
             models.Index(fields=['is_primary']),
             models.Index(fields=['created_at']),
         ]
+        constraints = [
+            # One primary contact per entity; NULL and '' references count as the same
+            models.UniqueConstraint(
+                'agency',
+                'reference_type',
+                Coalesce('promoter_id', Value('')),
+                Coalesce('venue_id', Value('')),
+                condition=Q(is_primary=True),
+                name='unique_primary_contact',
+                violation_error_code='primary_exists',
+                violation_error_message='There is already a primary contact for this entity.',
+            ),
+        ]
         ordering = ['contact_name']
         unique_together = ['agency', 'contact_email']
         verbose_name = 'Contact'
@@ -242,11 +259,75 @@ class Contact(TimestampedModel):
             info.append(f"WhatsApp: {self.whatsapp}")
         return " | ".join(info)
     
+    def primary_scope(self) -> Q:
+        """Contacts competing with this one for primary status."""
+        scope = Q(agency_id=self.agency_id, reference_type=self.reference_type)
+        for field in ('promoter_id', 'venue_id'):
+            value = getattr(self, field)
+            if value:
+                scope &= Q(**{field: value})
+            else:
+                scope &= Q(**{f'{field}__isnull': True}) | Q(**{field: ''})
+        return scope
+    
+    def make_primary(self, updated_by=None, attempts=3):
+        """
+        Make this the primary contact for its entity, demoting the current one.
+        
+        Runs as two set-based UPDATEs in one transaction; the unique
+        constraint rejects a concurrent swap, which is then retried.
+        """
+        now = timezone.now()
+        scope = Contact.objects.filter(self.primary_scope())
+        promote = {'is_primary': True, 'updated_at': now}
+        if updated_by is not None:
+            promote['updated_by'] = updated_by
+        
+        for attempt in range(attempts):
+            try:
+                with transaction.atomic():
+                    # Demote first: unique indexes are checked row by row, so
+                    # flipping both rows in one UPDATE could fail transiently
+                    scope.filter(is_primary=True).exclude(pk=self.pk).update(
+                        is_primary=False, updated_at=now
+                    )
+                    scope.filter(pk=self.pk).update(**promote)
+                break
+            except IntegrityError:
+                if attempt == attempts - 1:
+                    raise
+        
+        self.is_primary = True
+        self.updated_at = now
+        if updated_by is not None:
+            self.updated_by = updated_by
+        # Queryset updates do not send post_save
+        agency_id = self.agency_id
+        transaction.on_commit(lambda: bump_data_version(agency_id))
+    
+    def _related_entity_key(self):
+        return (self.reference_type, self.promoter_id, self.venue_id)
+    
+    def set_related_entity(self, entity):
+        """Memoize the related entity (see contacts.prefetch)."""
+        self._related_entity = (self._related_entity_key(), entity)
+    
     def get_related_entity(self):
         """
         Helper method to get the actual related entity object.
         Returns None if entity doesn't exist or imports fail.
+        
+        The result is memoized on the instance until the reference changes.
         """
+        cached = getattr(self, '_related_entity', None)
+        if cached is not None and cached[0] == self._related_entity_key():
+            return cached[1]
+        
+        entity = self._load_related_entity()
+        self.set_related_entity(entity)
+        return entity
+    
+    def _load_related_entity(self):
         try:
             if self.reference_type == self.ReferenceType.PROMOTER and self.promoter_id:
                 from promoters.models import Promoter
@@ -269,4 +350,52 @@ class Contact(TimestampedModel):
             # If the related app isn't available yet, return None
             pass
         
-        return None
\ No newline at end of file
+        return None
+
+class Tag(TimestampedModel):
+    """
+    A contact tag, unique per agency by its normalized ``key``.
+    
+    ``Contact.tags`` stays the source of the API's tag list; this table and
+    ``ContactTag`` mirror it so tags can be filtered and counted by index
+    (see contacts.tags).
+    """
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    agency = models.ForeignKey(
+        Agency,
+        on_delete=models.CASCADE,
+        related_name='contact_tags'
+    )
+    name = models.CharField(max_length=100, help_text="Display name, as first used")
+    key = models.CharField(max_length=100, help_text="Case-folded name used for matching")
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['agency', 'key'], name='unique_contact_tag_per_agency'),
+        ]
+        ordering = ['name']
+        verbose_name = 'Contact Tag'
+        verbose_name_plural = 'Contact Tags'
+    
+    def __str__(self):
+        return self.name
+
+
+class ContactTag(models.Model):
+    """Through table linking contacts to their tags."""
+    
+    contact = models.ForeignKey(Contact, on_delete=models.CASCADE, related_name='tag_links')
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='contact_links')
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['contact', 'tag'], name='unique_contact_tag_link'),
+        ]
+        indexes = [
+            # The unique constraint covers lookups by contact; this one serves tag filters
+            models.Index(fields=['tag', 'contact']),
+        ]
+    
+    def __str__(self):
+        return f"{self.contact_id} - {self.tag_id}"
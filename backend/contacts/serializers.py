@@ -1,10 +1,19 @@
 # contacts/serializers.py
 
 from rest_framework import serializers
-from django.db import transaction
-from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError as DjangoValidationError
 from typing import Dict, Any
 from .models import Contact
+from .prefetch import prefetch_related_entities
+
+
+class ContactListSerializer(serializers.ListSerializer):
+    """List serializer that resolves all referenced promoters and venues up front."""
+    
+    def to_representation(self, data):
+        contacts = data.all() if hasattr(data, 'all') else data
+        return super().to_representation(prefetch_related_entities(contacts))
 
 
 class ContactSerializer(serializers.ModelSerializer):
@@ -31,6 +40,7 @@ class ContactSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Contact
+        list_serializer_class = ContactListSerializer
         fields = [
             'id', 'contact_name', 'contact_email', 'contact_phone',
             'contact_type', 'job_title', 'department',
@@ -185,51 +195,45 @@ class ContactSerializer(serializers.ModelSerializer):
                     'venue_id': 'Venues functionality is not available.'
                 })
     
-    def validate_primary_contact_logic(self, data):
-        """Ensure primary contact logic makes sense."""
-        is_primary = data.get('is_primary', False)
-        reference_type = data.get('reference_type')
-        promoter_id = data.get('promoter_id')
-        venue_id = data.get('venue_id')
+    def primary_conflict_error(self, reference_type) -> serializers.ValidationError:
+        """Error for a second primary contact, raised by the unique_primary_contact constraint."""
+        entity_name = "this entity"
+        if reference_type == Contact.ReferenceType.AGENCY:
+            entity_name = "your agency"
+        elif reference_type == Contact.ReferenceType.PROMOTER:
+            entity_name = "this promoter"
+        elif reference_type == Contact.ReferenceType.VENUE:
+            entity_name = "this venue"
         
-        # If setting as primary, check for existing primary contacts
-        if is_primary:
-            agency = self.context['request'].user.profile.agency
-            existing_primary = Contact.objects.filter(
-                agency=agency,
-                reference_type=reference_type,
-                is_primary=True
-            )
-            
-            if reference_type == Contact.ReferenceType.PROMOTER:
-                existing_primary = existing_primary.filter(promoter_id=promoter_id)
-            elif reference_type == Contact.ReferenceType.VENUE:
-                existing_primary = existing_primary.filter(venue_id=venue_id)
-            
-            # Exclude current instance if updating
-            if self.instance:
-                existing_primary = existing_primary.exclude(pk=self.instance.pk)
-            
-            if existing_primary.exists():
-                entity_name = "this entity"
-                if reference_type == Contact.ReferenceType.AGENCY:
-                    entity_name = "your agency"
-                elif reference_type == Contact.ReferenceType.PROMOTER:
-                    entity_name = "this promoter"
-                elif reference_type == Contact.ReferenceType.VENUE:
-                    entity_name = "this venue"
-                
-                raise serializers.ValidationError({
-                    'is_primary': f'There is already a primary contact for {entity_name}. '
-                                f'Please unset the existing primary contact first.'
-                })
+        return serializers.ValidationError({
+            'is_primary': f'There is already a primary contact for {entity_name}. '
+                        f'Please unset the existing primary contact first.'
+        })
+    
+    def save_checking_primary(self, save, reference_type):
+        """
+        Run ``save`` and report a primary-contact conflict as a validation error.
+        
+        The database constraint is the check, so there is no separate lookup
+        and concurrent requests cannot both create a primary contact.
+        """
+        try:
+            return save()
+        except DjangoValidationError as e:
+            errors = getattr(e, 'error_dict', {}).get(NON_FIELD_ERRORS, [])
+            if any(error.code == 'primary_exists' for error in errors):
+                raise self.primary_conflict_error(reference_type)
+            raise
+        except IntegrityError as e:
+            if 'unique_primary_contact' in str(e):
+                raise self.primary_conflict_error(reference_type)
+            raise
     
     def validate(self, data):
         """Cross-field validation."""
         # Run all validation checks
         self.validate_reference_consistency(data)
         self.validate_related_entity_exists(data)
-        self.validate_primary_contact_logic(data)
         
         # Ensure at least basic contact info
         contact_email = data.get('contact_email')
@@ -245,9 +249,15 @@ class ContactSerializer(serializers.ModelSerializer):
     def create(self, validated_data: Dict[str, Any]) -> Contact:
         """Create contact with proper agency and audit info."""
         # Agency and created_by are set in the viewset's perform_create
-        return super().create(validated_data)
+        return self.save_checking_primary(
+            lambda: super(ContactSerializer, self).create(validated_data),
+            validated_data.get('reference_type')
+        )
     
     def update(self, instance: Contact, validated_data: Dict[str, Any]) -> Contact:
         """Update contact with audit info."""
         # updated_by is set in the viewset's perform_update
-        return super().update(instance, validated_data)
\ No newline at end of file
+        return self.save_checking_primary(
+            lambda: super(ContactSerializer, self).update(instance, validated_data),
+            validated_data.get('reference_type', instance.reference_type)
+        )
\ No newline at end of file
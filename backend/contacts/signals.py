@@ -0,0 +1,17 @@
+# contacts/signals.py
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Contact
+from .tags import sync_contact_tags
+
+
+@receiver(post_save, sender=Contact)
+def sync_tags_on_save(sender, instance, created, update_fields=None, **kwargs):
+    """Mirror ``Contact.tags`` into the indexed tag tables."""
+    if update_fields is not None and 'tags' not in update_fields:
+        return
+    if created and not instance.tags:
+        return
+    sync_contact_tags([instance])
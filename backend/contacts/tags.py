@@ -0,0 +1,203 @@
+# contacts/tags.py
+
+"""
+Indexed contact tags.
+
+The API keeps exposing ``Contact.tags`` as a JSON list of names. Each write
+to that list is mirrored into the per-agency ``Tag`` table and the
+``ContactTag`` through table by ``sync_contact_tags``, which lets tag
+filters and tag counts use indexed joins instead of scanning JSON.
+
+Tags are matched case-insensitively by their ``key`` (case-folded, with
+whitespace collapsed); the first spelling used in an agency becomes the
+tag's display name.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from django.db import transaction
+from django.db.models import Count, QuerySet
+from django.utils import timezone
+
+from agencies.versioning import bump_data_version
+from .models import Contact, ContactTag, Tag
+
+
+MAX_TAG_LENGTH = Tag._meta.get_field('name').max_length
+
+
+def clean_tag(name: Any) -> str:
+    """Collapse whitespace and trim a tag name to the stored length."""
+    return ' '.join(str(name).split())[:MAX_TAG_LENGTH]
+
+
+def tag_key(name: Any) -> str:
+    return clean_tag(name).casefold()
+
+
+def parse_tags(value: Any) -> List[str]:
+    """Parse a list or comma-separated string into cleaned tag names."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    return [tag for tag in (clean_tag(item) for item in value) if tag]
+
+
+def contact_tag_names(contact: Contact) -> Dict[str, str]:
+    """Return ``{key: name}`` for a contact's JSON tags, in order."""
+    tags = contact.tags if isinstance(contact.tags, list) else []
+    names: Dict[str, str] = {}
+    for tag in parse_tags(tags):
+        names.setdefault(tag.casefold(), tag)
+    return names
+
+
+def get_or_create_tags(agency_id, names: Dict[str, str]) -> Dict[str, Tag]:
+    """Return ``{key: Tag}`` for ``names`` (``{key: name}``), creating missing tags."""
+    if not names:
+        return {}
+    tags = {tag.key: tag for tag in Tag.objects.filter(agency_id=agency_id, key__in=list(names))}
+    missing = [key for key in names if key not in tags]
+    if missing:
+        # ignore_conflicts covers a concurrent insert of the same tag
+        Tag.objects.bulk_create(
+            [Tag(agency_id=agency_id, key=key, name=names[key]) for key in missing],
+            ignore_conflicts=True
+        )
+        tags.update({tag.key: tag for tag in Tag.objects.filter(agency_id=agency_id, key__in=missing)})
+    return tags
+
+
+def sync_contact_tags(contacts: Iterable[Contact]) -> None:
+    """
+    Make the ``ContactTag`` links of ``contacts`` match their ``tags`` lists.
+
+    Works on a batch at a time: a few queries per agency, regardless of the
+    number of contacts.
+    """
+    contacts = [contact for contact in contacts if contact.pk]
+    if not contacts:
+        return
+
+    wanted: Dict[Any, Dict[str, str]] = {}
+    by_agency: Dict[Any, Dict[str, str]] = {}
+    for contact in contacts:
+        names = contact_tag_names(contact)
+        wanted[contact.pk] = names
+        agency_names = by_agency.setdefault(contact.agency_id, {})
+        for key, name in names.items():
+            agency_names.setdefault(key, name)
+
+    tag_ids: Dict[Any, Dict[str, Any]] = {
+        agency_id: {key: tag.pk for key, tag in get_or_create_tags(agency_id, names).items()}
+        for agency_id, names in by_agency.items()
+    }
+
+    desired = set()
+    for contact in contacts:
+        agency_tags = tag_ids[contact.agency_id]
+        desired.update((contact.pk, agency_tags[key]) for key in wanted[contact.pk])
+
+    existing = ContactTag.objects.filter(contact_id__in=list(wanted)).values_list('id', 'contact_id', 'tag_id')
+    stale = []
+    current = set()
+    for link_id, contact_id, tag_id in existing:
+        if (contact_id, tag_id) in desired:
+            current.add((contact_id, tag_id))
+        else:
+            stale.append(link_id)
+
+    if stale:
+        ContactTag.objects.filter(id__in=stale).delete()
+    if desired - current:
+        ContactTag.objects.bulk_create(
+            [ContactTag(contact_id=contact_id, tag_id=tag_id) for contact_id, tag_id in desired - current],
+            ignore_conflicts=True
+        )
+
+
+def filter_any_tag(queryset: QuerySet, names: Sequence[str]) -> QuerySet:
+    """Contacts carrying at least one of ``names``."""
+    keys = [name.casefold() for name in names]
+    return queryset.filter(
+        id__in=ContactTag.objects.filter(tag__key__in=keys).values('contact_id')
+    )
+
+
+def filter_all_tags(queryset: QuerySet, names: Sequence[str]) -> QuerySet:
+    """Contacts carrying every one of ``names``."""
+    keys = set(name.casefold() for name in names)
+    if not keys:
+        return queryset
+    matching = (
+        ContactTag.objects.filter(tag__key__in=keys)
+        .values('contact_id')
+        .annotate(matched=Count('tag_id'))
+        .filter(matched=len(keys))
+        .values('contact_id')
+    )
+    return queryset.filter(id__in=matching)
+
+
+def tag_cloud(agency, active_only: bool = False, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Return ``[{'name', 'count'}]`` for the agency's tags in use, most used first."""
+    links = ContactTag.objects.filter(tag__agency=agency)
+    if active_only:
+        links = links.filter(contact__is_active=True)
+    rows = (
+        links.values('tag__name')
+        .annotate(count=Count('contact_id'))
+        .order_by('-count', 'tag__name')
+    )
+    if limit is not None:
+        rows = rows[:limit]
+    return [{'name': row['tag__name'], 'count': row['count']} for row in rows]
+
+
+def bulk_change_tags(
+    agency,
+    contact_ids: Sequence[Any],
+    add: Sequence[str] = (),
+    remove: Sequence[str] = (),
+    updated_by=None
+) -> int:
+    """
+    Add and remove tags on many contacts at once; return how many changed.
+
+    Tags in ``remove`` are matched case-insensitively. The JSON lists and the
+    through table are both updated, in bulk.
+    """
+    add = parse_tags(add)
+    remove_keys = {tag.casefold() for tag in parse_tags(remove)}
+    now = timezone.now()
+
+    with transaction.atomic():
+        contacts = list(
+            Contact.objects.select_for_update()
+            .filter(agency=agency, id__in=contact_ids)
+            .only('id', 'agency_id', 'tags')
+        )
+        changed = []
+        for contact in contacts:
+            names = contact_tag_names(contact)
+            tags = [name for key, name in names.items() if key not in remove_keys]
+            keys = {tag.casefold() for tag in tags}
+            for tag in add:
+                if tag.casefold() not in keys:
+                    keys.add(tag.casefold())
+                    tags.append(tag)
+            if tags != contact.tags:
+                contact.tags = tags
+                contact.updated_at = now
+                contact.updated_by = updated_by
+                changed.append(contact)
+
+        if changed:
+            fields = ['tags', 'updated_at'] + (['updated_by'] if updated_by is not None else [])
+            Contact.objects.bulk_update(changed, fields, batch_size=500)
+            sync_contact_tags(changed)
+            # bulk_update does not send post_save
+            transaction.on_commit(lambda: bump_data_version(agency.id))
+
+    return len(changed)
@@ -0,0 +1,46 @@
+# contacts/tasks.py
+
+"""
+Background versions of the heavy contact endpoints (see jobs/).
+"""
+
+from django.core.files.storage import default_storage
+
+from agencies.models import UserProfile
+from jobs.registry import task
+from .dedupe import DEFAULT_MIN_SCORE, find_agency_duplicates
+from .importer import ContactImporter, PARSERS
+
+
+# Not retried: a failed import may already have inserted some of its rows
+@task('contacts.import', max_attempts=1, lease=1800)
+def import_contacts(job, file_path, file_format, defaults=None, dry_run=False):
+    """Import an uploaded file saved to ``file_path`` by ``ContactViewSet.bulk_import``."""
+    created_by = None
+    if job.created_by_id:
+        created_by = UserProfile.objects.filter(pk=job.created_by_id).first()
+
+    importer = ContactImporter(
+        agency=job.agency,
+        created_by=created_by,
+        defaults=defaults,
+        dry_run=dry_run,
+        progress=lambda rows: job.set_progress(rows, message=f'{rows} rows read')
+    )
+    try:
+        with default_storage.open(file_path, 'rb') as uploaded_file:
+            report = importer.run(PARSERS[file_format](uploaded_file))
+    finally:
+        default_storage.delete(file_path)
+    job.set_progress(importer.rows, total=importer.rows, message=f'{importer.rows} rows read')
+    return report
+
+
+@task('contacts.find_duplicates')
+def find_duplicates(job, min_score=DEFAULT_MIN_SCORE, limit=100):
+    """Scan the agency's contacts for likely duplicates."""
+    groups = find_agency_duplicates(job.agency, min_score=min_score)
+    return {
+        'count': len(groups),
+        'groups': groups[:limit]
+    }
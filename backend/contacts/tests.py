@@ -1,3 +1,543 @@
-from django.test import TestCase
+import io
+import uuid
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from agencies.models import Agency, UserProfile
+from agencies.versioning import get_data_version
+from authentication.models import User
+from bookings.models import Booking
+from promoters.models import Promoter
+from venues.models import Venue
+
+from .dedupe import find_agency_duplicates, merge_contacts
+from .importer import ContactImporter, parse_csv, parse_vcard
+from .models import Contact, ContactTag, Tag
+from .prefetch import prefetch_related_entities
+from .tags import bulk_change_tags, filter_all_tags, filter_any_tag, tag_cloud
+
+
+LOCAL_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'contact-tests'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'contact-tests-shared'},
+}
+
+
+class ContactTestMixin:
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create(username='owner', email='owner@example.com')
+        self.agency = Agency.objects.create(name='Agency', owner=self.user, timezone='UTC', slug='agency')
+        self.profile = UserProfile.objects.create(user=self.user, agency=self.agency, role='agency_owner')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def contact(self, name, email=None, **fields):
+        fields.setdefault('reference_type', Contact.ReferenceType.AGENCY)
+        fields.setdefault('country', 'PT')
+        fields.setdefault('created_by', self.profile)
+        fields.setdefault('updated_by', self.profile)
+        return Contact.objects.create(
+            agency=self.agency,
+            contact_name=name,
+            contact_email=email or f"{name.lower().replace(' ', '.')}@example.com",
+            **fields,
+        )
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class ContactBulkStatusTests(ContactTestMixin, TestCase):
+    def test_bulk_status_change_bumps_the_data_version(self):
+        contact = self.contact('Ana Silva')
+        version = get_data_version(self.agency.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                '/api/v1/contacts/bulk_update_status/',
+                {'contact_ids': [str(contact.pk)], 'is_active': False},
+                format='json',
+            )
+
+        self.assertEqual(response.json()['updated_count'], 1)
+        self.assertFalse(Contact.objects.get(pk=contact.pk).is_active)
+        self.assertNotEqual(get_data_version(self.agency.pk), version)
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class PrimaryContactTests(ContactTestMixin, TestCase):
+    def create(self, name, **data):
+        return self.client.post('/api/v1/contacts/', {
+            'contact_name': name,
+            'contact_email': f'{name.lower()}@example.com',
+            'reference_type': Contact.ReferenceType.AGENCY,
+            'country': 'PT',
+            **data,
+        }, format='json')
+
+    def test_second_primary_for_an_entity_is_a_validation_error(self):
+        self.assertEqual(self.create('Ana', is_primary=True).status_code, 201)
+
+        response = self.create('Bruno', is_primary=True)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('is_primary', response.json())
+
+        bruno = self.create('Bruno').json()
+        response = self.client.patch(f"/api/v1/contacts/{bruno['id']}/", {
+            'is_primary': True, 'contact_email': bruno['contact_email'],
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('is_primary', response.json())
+        self.assertEqual(Contact.objects.filter(is_primary=True).count(), 1)
+
+    def test_constraint_violation_that_skipped_validation_is_a_validation_error(self):
+        # As when a concurrent request commits its primary after this one validated
+        self.contact('Ana', is_primary=True)
+        with mock.patch.object(Contact, 'full_clean'):
+            response = self.create('Bruno', is_primary=True)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('is_primary', response.json())
+
+    def test_primary_contacts_of_different_entities_coexist(self):
+        self.contact('Ana', is_primary=True)
+        self.contact('Bruno', is_primary=True, reference_type=Contact.ReferenceType.PROMOTER, promoter_id='p-1')
+        self.contact('Carla', is_primary=True, reference_type=Contact.ReferenceType.PROMOTER, promoter_id='p-2')
+        self.assertEqual(Contact.objects.filter(is_primary=True).count(), 3)
+
+    def test_make_primary_swaps_the_primary_contact(self):
+        ana = self.contact('Ana', is_primary=True)
+        bruno = self.contact('Bruno')
+        other_entity = self.contact(
+            'Carla', is_primary=True, reference_type=Contact.ReferenceType.PROMOTER, promoter_id='p-1'
+        )
+        version = get_data_version(self.agency.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bruno.make_primary(updated_by=self.profile)
+
+        self.assertTrue(bruno.is_primary)
+        self.assertEqual(
+            set(Contact.objects.filter(is_primary=True).values_list('pk', flat=True)),
+            {bruno.pk, other_entity.pk},
+        )
+        ana.refresh_from_db()
+        self.assertFalse(ana.is_primary)
+        self.assertNotEqual(get_data_version(self.agency.pk), version)
+
+
+class PrimaryContactMigrationTests(TransactionTestCase):
+    before = [('contacts', '0002_contact_tags')]
+    after = [('contacts', '0003_unique_primary_contact')]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        self.apps = executor.loader.project_state(self.before).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_duplicate_primaries_are_demoted_to_the_latest(self):
+        # Only the contacts app is migrated back; the others are current
+        owner = User.objects.create(username='owner', email='owner@example.com')
+        agency = Agency.objects.create(name='Agency', owner=owner, timezone='UTC', slug='agency')
+        profile = UserProfile.objects.create(user=owner, agency=agency)
+        Contact = self.apps.get_model('contacts', 'Contact')
+
+        def contact(name, age_days, **fields):
+            created = Contact.objects.create(
+                agency_id=agency.pk, contact_name=name, contact_email=f'{name}@example.com',
+                is_primary=True, created_by_id=profile.pk, **fields,
+            )
+            Contact.objects.filter(pk=created.pk).update(updated_at=timezone.now() - timezone.timedelta(days=age_days))
+            return created.pk
+
+        # NULL and '' references are the same entity
+        oldest = contact('oldest', 3, reference_type='agency', promoter_id=None)
+        latest = contact('latest', 1, reference_type='agency', promoter_id='')
+        older = contact('older', 2, reference_type='agency')
+        promoter = contact('promoter', 5, reference_type='promoter', promoter_id='p-1')
+
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+
+        Contact = executor.loader.project_state(self.after).apps.get_model('contacts', 'Contact')
+        primaries = set(Contact.objects.filter(is_primary=True).values_list('pk', flat=True))
+        self.assertEqual(primaries, {latest, promoter})
+        self.assertFalse(Contact.objects.filter(pk__in=[oldest, older], is_primary=True).exists())
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class ContactGroupingTests(ContactTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.contact('Ana', contact_type='manager', is_primary=True, whatsapp='+351')
+        self.contact('Bruno', contact_type='manager', reference_type='promoter', promoter_id='p-1')
+        self.contact('Carla', contact_type='owner', reference_type='venue', venue_id='v-1', is_emergency=True)
+        self.contact('Duarte', contact_type='lawyer', is_active=False, linkedin='https://linkedin.com/in/d')
+        self.contacts = list(Contact.objects.filter(agency=self.agency).order_by('contact_name'))
+
+    def test_by_reference_and_by_type_match_grouping_in_python(self):
+        for endpoint, field, choices in (('by_reference', 'reference_type', Contact.ReferenceType.choices),
+                                         ('by_type', 'contact_type', Contact.ContactType.choices)):
+            expected = {
+                value: {
+                    'label': label,
+                    'count': len([c for c in self.contacts if getattr(c, field) == value]),
+                    'contacts': [str(c.pk) for c in self.contacts if getattr(c, field) == value],
+                }
+                for value, label in choices
+            }
+            groups = self.client.get(f'/api/v1/contacts/{endpoint}/').json()
+            self.assertEqual({
+                key: {**group, 'contacts': [item['id'] for item in group['contacts']]}
+                for key, group in groups.items()
+            }, expected)
+
+        limited = self.client.get('/api/v1/contacts/by_type/', {'limit': 1}).json()['manager']
+        self.assertEqual((limited['count'], len(limited['contacts'])), (2, 1))
+
+    def test_dashboard_stats_match_separate_counts(self):
+        contacts = self.contacts
+        expected = {
+            'total_contacts': 4,
+            'active_contacts': 3,
+            'inactive_contacts': 1,
+            'reference_breakdown': {
+                value: {'label': label, 'count': len([c for c in contacts if c.reference_type == value])}
+                for value, label in Contact.ReferenceType.choices
+            },
+            'type_breakdown': {
+                value: {'label': label, 'count': len([c for c in contacts if c.contact_type == value])}
+                for value, label in Contact.ContactType.choices[:5]
+            },
+            'primary_contacts': 1,
+            'emergency_contacts': 1,
+            'communication_channels': {'has_whatsapp': 1, 'has_linkedin': 1},
+            'recent_additions': 4,
+        }
+        self.assertEqual(self.client.get('/api/v1/contacts/dashboard_stats/').json(), expected)
+
+
+def csv_file(*lines):
+    return io.BytesIO('\n'.join(lines).encode())
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class ContactImporterTests(ContactTestMixin, TestCase):
+    def importer(self, **kwargs):
+        return ContactImporter(self.agency, created_by=self.profile, **kwargs)
+
+    def test_csv_rows_are_validated_and_inserted(self):
+        self.contact('Existing', 'taken@example.com')
+        version = get_data_version(self.agency.pk)
+        upload = csv_file(
+            'Name,Email,Type,Country,Tags,Is Primary',
+            'Ana Silva,ana@example.com,manager,Portugal,VIP; Jazz,yes',
+            'Taken,TAKEN@example.com,manager,PT,,',
+            'Bruno,bruno@example.com,manager,XX,,',
+            'Ana Again,ana@example.com,manager,PT,,',
+            'Carla,carla@example.com,owner,PT,,x',
+        )
+
+        report = self.importer().run(parse_csv(upload))
+
+        self.assertEqual((report['created'], report['failed']), (1, 4))
+        self.assertEqual(
+            {error['row']: sorted(error['errors']) for error in report['errors']},
+            {3: ['contact_email'], 4: ['country'], 5: ['contact_email'], 6: ['is_primary']},
+        )
+        ana = Contact.objects.get(contact_email='ana@example.com')
+        self.assertEqual((ana.contact_name, ana.country.code, ana.is_primary), ('Ana Silva', 'PT', True))
+        self.assertEqual(ana.tags, ['VIP', 'Jazz'])
+        self.assertEqual(
+            set(ContactTag.objects.filter(contact=ana).values_list('tag__key', flat=True)), {'vip', 'jazz'}
+        )
+        self.assertNotEqual(get_data_version(self.agency.pk), version)
+
+    def test_rows_are_checked_against_the_agencys_promoters(self):
+        upload = csv_file(
+            'name,email,reference_type,promoter_id',
+            f'Dora,dora@example.com,promoter,{uuid.uuid4()}',
+        )
+
+        report = self.importer().run(parse_csv(upload))
+
+        self.assertEqual(report['created'], 0)
+        self.assertEqual(list(report['errors'][0]['errors']), ['promoter_id'])
+
+    def test_vcard_cards_are_parsed(self):
+        upload = io.BytesIO(
+            b'BEGIN:VCARD\r\n'
+            b'VERSION:3.0\r\n'
+            b'N:Silva;Ana;;;\r\n'
+            b'EMAIL;TYPE=work:ana@example.com\r\n'
+            b'TEL;TYPE=work:+351 210 000 000\r\n'
+            b'TEL;TYPE=CELL:+351 910 000 000\r\n'
+            b'ADR;TYPE=work:;;Rua Augusta 1;Lisboa;;1100-048;Portugal\r\n'
+            b'NOTE:Prefers calls\\, not email\r\n'
+            b'  after 10am\r\n'
+            b'CATEGORIES:VIP,Jazz\r\n'
+            b'END:VCARD\r\n'
+            b'BEGIN:VCARD\r\n'
+            b'FN:Bruno Costa\r\n'
+            b'END:VCARD\r\n'
+        )
+
+        cards = list(parse_vcard(upload))
+
+        self.assertEqual([row for row, _values in cards], [1, 12])
+        self.assertEqual(cards[0][1], {
+            'contact_name': 'Ana Silva',
+            'contact_email': 'ana@example.com',
+            'contact_phone': '+351 210 000 000',
+            'whatsapp': '+351 910 000 000',
+            'address': 'Rua Augusta 1, 1100-048',
+            'city': 'Lisboa',
+            'country': 'Portugal',
+            'notes': 'Prefers calls, not email after 10am',
+            'tags': 'VIP,Jazz',
+        })
+        self.assertEqual(cards[1][1], {'contact_name': 'Bruno Costa'})
+
+    def test_rows_are_flushed_in_chunks(self):
+        lines = [f'Contact {n},contact{n}@example.com,PT' for n in range(5)]
+        progress = []
+
+        report = self.importer(chunk_size=2, progress=progress.append).run(
+            parse_csv(csv_file('name,email,country', *lines))
+        )
+
+        self.assertEqual(report['created'], 5)
+        self.assertEqual(progress, [2, 4])
+        self.assertEqual(Contact.objects.filter(agency=self.agency).count(), 5)
+
+    def test_dry_run_inserts_nothing(self):
+        report = self.importer(dry_run=True).run(
+            parse_csv(csv_file('name,email,country', 'Ana,ana@example.com,PT'))
+        )
+
+        self.assertEqual((report['created'], report['dry_run']), (1, True))
+        self.assertFalse(Contact.objects.filter(contact_email='ana@example.com').exists())
+
+    def test_row_conflicting_with_a_concurrent_write_is_reported_alone(self):
+        importer = self.importer()
+        # Written after the importer loaded its indexes, as another request would
+        self.contact('Late', 'late@example.com')
+
+        with self.assertLogs('contacts.importer', 'WARNING'):
+            report = importer.run(parse_csv(csv_file(
+                'name,email,country,tags',
+                'Ana,ana@example.com,PT,VIP',
+                'Late,late@example.com,PT,',
+                'Bruno,bruno@example.com,PT,',
+            )))
+
+        self.assertEqual((report['created'], report['failed']), (2, 1))
+        self.assertEqual(report['errors'], [
+            {'row': 3, 'errors': {'non_field_errors': ['Conflicts with an existing contact.']}},
+        ])
+        self.assertEqual(
+            set(Contact.objects.filter(agency=self.agency).values_list('contact_name', flat=True)),
+            {'Late', 'Ana', 'Bruno'},
+        )
+        ana = Contact.objects.get(contact_email='ana@example.com')
+        self.assertEqual(list(ContactTag.objects.filter(contact=ana).values_list('tag__key', flat=True)), ['vip'])
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class ContactMergeTests(ContactTestMixin, TestCase):
+    def booking(self, contact, agency=None):
+        return Booking.objects.create(
+            agency=agency or self.agency,
+            booking_date=timezone.now() + timedelta(days=30),
+            location_country='PT',
+            venue_id=str(uuid.uuid4()),
+            venue_capacity=1000,
+            artist_id=str(uuid.uuid4()),
+            promoter_id=str(uuid.uuid4()),
+            promoter_contact_id=str(contact.pk),
+        )
+
+    def test_duplicates_are_folded_into_the_survivor(self):
+        survivor = self.contact('Ana Silva', tags=['VIP', 'Jazz'], notes='Call first')
+        duplicate = self.contact(
+            'Ana M. Silva', 'ana.m@example.com', tags=['Jazz', 'Rock'], notes='Vegan',
+            contact_phone='+351 910 000 000', is_primary=True, is_emergency=True,
+        )
+        other = self.contact('Bruno', tags=['Rock'])
+        moved = self.booking(duplicate)
+        kept = self.booking(other)
+
+        result = merge_contacts(survivor, [str(duplicate.pk)], updated_by=self.profile)
+
+        self.assertEqual(result, {'merged': 1, 'bookings_updated': 1})
+        self.assertFalse(Contact.objects.filter(pk=duplicate.pk).exists())
+        survivor = Contact.objects.get(pk=survivor.pk)
+        self.assertEqual(survivor.tags, ['VIP', 'Jazz', 'Rock'])
+        self.assertEqual(survivor.notes, 'Call first\n\nVegan')
+        self.assertEqual(survivor.contact_phone, '+351 910 000 000')
+        self.assertTrue(survivor.is_primary)
+        self.assertTrue(survivor.is_emergency)
+        self.assertEqual(
+            set(ContactTag.objects.filter(contact=survivor).values_list('tag__key', flat=True)),
+            {'vip', 'jazz', 'rock'},
+        )
+        self.assertEqual(Booking.objects.get(pk=moved.pk).promoter_contact_id, str(survivor.pk))
+        self.assertEqual(Booking.objects.get(pk=kept.pk).promoter_contact_id, str(other.pk))
+
+    def test_primary_of_another_entity_is_not_inherited(self):
+        survivor = self.contact('Ana Silva')
+        duplicate = self.contact(
+            'Ana Silva', 'ana.promoter@example.com', reference_type='promoter', promoter_id='p-1', is_primary=True,
+        )
+
+        merge_contacts(survivor, [str(duplicate.pk)])
+
+        self.assertFalse(Contact.objects.get(pk=survivor.pk).is_primary)
+
+    def test_unknown_duplicate_aborts_the_merge(self):
+        survivor = self.contact('Ana Silva')
+        duplicate = self.contact('Ana M. Silva', 'ana.m@example.com')
+
+        with self.assertRaises(Contact.DoesNotExist):
+            merge_contacts(survivor, [str(duplicate.pk), str(uuid.uuid4())])
+
+        self.assertTrue(Contact.objects.filter(pk=duplicate.pk).exists())
+
+    def test_contacts_sharing_an_email_or_name_are_grouped(self):
+        self.contact('Jonathan Smith', 'jon@example.com')
+        self.contact('Smith, Jonathan', 'jon+bookings@example.com')
+        self.contact('Maria Lopes', 'maria@example.com', contact_phone='+351 910 000 000')
+        self.contact('M. Lopes', 'lopes@example.org', contact_phone='910000000')
+        self.contact('Unrelated Person')
+
+        groups = find_agency_duplicates(self.agency)
+
+        self.assertEqual(
+            [sorted(contact['contact_name'] for contact in group['contacts']) for group in groups],
+            [['Jonathan Smith', 'Smith, Jonathan'], ['M. Lopes', 'Maria Lopes']],
+        )
+        self.assertEqual(groups[0]['pairs'][0]['reasons'], ['email', 'name'])
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class ContactTagTests(ContactTestMixin, TestCase):
+    def keys(self, contact):
+        return set(ContactTag.objects.filter(contact=contact).values_list('tag__key', flat=True))
+
+    def test_saved_tags_are_mirrored_case_insensitively(self):
+        ana = self.contact('Ana', tags=['Jazz', 'jazz ', 'Rock   Band'])
+        bruno = self.contact('Bruno', tags=['JAZZ'])
+
+        self.assertEqual(self.keys(ana), {'jazz', 'rock band'})
+        self.assertEqual(
+            list(Tag.objects.filter(agency=self.agency).order_by('key').values_list('name', flat=True)),
+            ['Jazz', 'Rock Band'],
+        )
+
+        ana.tags = ['Rock Band']
+        ana.save()
+        self.assertEqual(self.keys(ana), {'rock band'})
+        self.assertEqual(self.keys(bruno), {'jazz'})
+
+    def test_tag_filters_and_counts(self):
+        ana = self.contact('Ana', tags=['Jazz', 'Rock'])
+        bruno = self.contact('Bruno', tags=['jazz'])
+        self.contact('Carla', tags=['Jazz'], is_active=False)
+        contacts = Contact.objects.filter(agency=self.agency)
+
+        self.assertEqual(set(filter_any_tag(contacts, ['ROCK', 'Pop'])), {ana})
+        self.assertEqual(set(filter_all_tags(contacts, ['jazz', 'rock'])), {ana})
+        self.assertEqual(filter_all_tags(contacts, []).count(), 3)
+        self.assertEqual(tag_cloud(self.agency), [{'name': 'Jazz', 'count': 3}, {'name': 'Rock', 'count': 1}])
+        self.assertEqual(tag_cloud(self.agency, active_only=True, limit=1), [{'name': 'Jazz', 'count': 2}])
+        self.assertIn(bruno, filter_any_tag(contacts, ['Jazz']))
+
+    def test_bulk_change_tags(self):
+        ana = self.contact('Ana', tags=['VIP', 'Jazz'])
+        bruno = self.contact('Bruno', tags=['Rock'])
+        owner = User.objects.create(username='other', email='other@example.com')
+        other_agency = Agency.objects.create(name='Other', owner=owner, timezone='UTC', slug='other')
+        other_profile = UserProfile.objects.create(user=owner, agency=other_agency, role='agency_owner')
+        outsider = Contact.objects.create(
+            agency=other_agency, contact_name='Outsider', contact_email='outsider@example.com',
+            reference_type=Contact.ReferenceType.AGENCY, country='PT', tags=['Jazz'], created_by=other_profile,
+        )
+        version = get_data_version(self.agency.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            changed = bulk_change_tags(
+                self.agency, [ana.pk, bruno.pk, outsider.pk], add=['Rock'], remove=['jazz'], updated_by=self.profile,
+            )
+
+        self.assertEqual(changed, 1)
+        self.assertEqual(Contact.objects.get(pk=ana.pk).tags, ['VIP', 'Rock'])
+        self.assertEqual(self.keys(ana), {'vip', 'rock'})
+        self.assertEqual(Contact.objects.get(pk=bruno.pk).tags, ['Rock'])
+        self.assertEqual(Contact.objects.get(pk=outsider.pk).tags, ['Jazz'])
+        self.assertNotEqual(get_data_version(self.agency.pk), version)
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class ContactPrefetchTests(ContactTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.promoters = [
+            Promoter.objects.create(agency=self.agency, promoter_name=name, company_name=name)
+            for name in ('Pro One', 'Pro Two')
+        ]
+        self.venues = [
+            Venue.objects.create(
+                agency=self.agency, venue_name=name, venue_address='Street 1', venue_city='Lisbon',
+                venue_country='PT', capacity=500,
+            )
+            for name in ('Hall One', 'Hall Two')
+        ]
+
+    def add_contacts(self, count):
+        start = Contact.objects.filter(agency=self.agency).count()
+        for n in range(start, start + count):
+            self.contact(f'Promoter Contact {n}', reference_type='promoter',
+                         promoter_id=str(self.promoters[n % 2].pk).upper())
+            self.contact(f'Venue Contact {n}', reference_type='venue', venue_id=str(self.venues[n % 2].pk))
+
+    def test_related_entities_load_with_one_query_per_model(self):
+        self.add_contacts(2)
+        self.contact('Agency Contact')
+        self.contact('Bad Reference', reference_type='venue', venue_id='not-a-uuid')
+        owner = User.objects.create(username='other', email='other@example.com')
+        other_agency = Agency.objects.create(name='Other', owner=owner, timezone='UTC', slug='other')
+        foreign = Promoter.objects.create(agency=other_agency, promoter_name='Theirs', company_name='Theirs')
+        self.contact('Foreign Reference', reference_type='promoter', promoter_id=str(foreign.pk))
+        contacts = list(Contact.objects.filter(agency=self.agency))
+
+        with self.assertNumQueries(3):
+            prefetch_related_entities(contacts)
+        with self.assertNumQueries(0):
+            entities = {contact.contact_name: contact.get_related_entity() for contact in contacts}
+
+        self.assertEqual(entities['Promoter Contact 1'], self.promoters[1])
+        self.assertEqual(entities['Venue Contact 0'], self.venues[0])
+        self.assertEqual(entities['Agency Contact'], self.agency)
+        self.assertIsNone(entities['Bad Reference'])
+        self.assertIsNone(entities['Foreign Reference'])
+
+    def test_contact_list_queries_do_not_grow_with_the_page(self):
+        def list_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/api/v1/contacts/')
+            self.assertEqual(response.status_code, 200)
+            return len(queries)
+
+        self.add_contacts(1)
+        few = list_queries()
+        self.add_contacts(5)
+        self.assertEqual(list_queries(), few)
@@ -1,20 +1,30 @@
 # contacts/views.py
 
 import logging
+import uuid
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser, FormParser
 from django.db.models import QuerySet, Q, Count
 from django.db import transaction
+from django.core.files.storage import default_storage
 from django_filters import rest_framework as django_filters
 from typing import Any, Dict
-from datetime import datetime, timedelta
 
 from .models import Contact
+from config.stats import Breakdown, Recent, compute_stats
+from config.grouping import group_by_choices, parse_group_limit
 from .serializers import ContactSerializer
+from .importer import ContactImporter, PARSERS, detect_format
+from .dedupe import DEFAULT_MIN_SCORE, find_agency_duplicates, merge_contacts
+from .tags import bulk_change_tags, filter_all_tags, filter_any_tag, parse_tags, tag_cloud
 from agencies.permissions import StandardAgencyPermissions
+from agencies.versioning import bump_data_version
+from jobs.queue import enqueue, get_jobs_config
+from jobs.views import accepted_response, async_requested
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +43,8 @@ class ContactFilter(django_filters.FilterSet):
     has_phone = django_filters.BooleanFilter(method='filter_has_phone')
     has_whatsapp = django_filters.BooleanFilter(method='filter_has_whatsapp')
     has_linkedin = django_filters.BooleanFilter(method='filter_has_linkedin')
+    tag = django_filters.CharFilter(method='filter_tag')
+    tags_all = django_filters.CharFilter(method='filter_tags_all')
     
     class Meta:
         model = Contact
@@ -58,6 +70,15 @@ class ContactFilter(django_filters.FilterSet):
         if value:
             return queryset.exclude(linkedin='')
         return queryset.filter(linkedin='')
+    
+    def filter_tag(self, queryset, name, value):
+        """Filter contacts having any of the comma-separated tags."""
+        tags = parse_tags(value)
+        return filter_any_tag(queryset, tags) if tags else queryset
+    
+    def filter_tags_all(self, queryset, name, value):
+        """Filter contacts having all of the comma-separated tags."""
+        return filter_all_tags(queryset, parse_tags(value))
 
 
 class ContactQueryMixin:
@@ -123,6 +144,23 @@ class ContactViewSet(ContactQueryMixin, viewsets.ModelViewSet):
     ordering_fields = ['contact_name', 'contact_email', 'contact_type', 'created_at', 'is_primary']
     ordering = ['contact_name']
     
+    # Metrics for dashboard_stats, computed in a single aggregate query
+    dashboard_stats_spec = {
+        'total_contacts': Q(),
+        'active_contacts': Q(is_active=True),
+        'inactive_contacts': Q(is_active=False),
+        'reference_breakdown': Breakdown('reference_type', Contact.ReferenceType.choices),
+        # Limit to top 5 for dashboard
+        'type_breakdown': Breakdown('contact_type', Contact.ContactType.choices[:5]),
+        'primary_contacts': Q(is_primary=True),
+        'emergency_contacts': Q(is_emergency=True),
+        'communication_channels': {
+            'has_whatsapp': ~Q(whatsapp=''),
+            'has_linkedin': ~Q(linkedin=''),
+        },
+        'recent_additions': Recent(days=30),
+    }
+    
     def get_queryset(self) -> QuerySet:
         """Get the queryset filtered by the user's agency with optimized joins."""
         return self.get_contact_queryset()
@@ -203,26 +241,7 @@ class ContactViewSet(ContactQueryMixin, viewsets.ModelViewSet):
             )
         
         try:
-            with transaction.atomic():
-                # First, unset any existing primary contact for the same entity
-                existing_primary = Contact.objects.filter(
-                    agency=contact.agency,
-                    reference_type=contact.reference_type,
-                    is_primary=True
-                )
-                
-                if contact.reference_type == Contact.ReferenceType.PROMOTER:
-                    existing_primary = existing_primary.filter(promoter_id=contact.promoter_id)
-                elif contact.reference_type == Contact.ReferenceType.VENUE:
-                    existing_primary = existing_primary.filter(venue_id=contact.venue_id)
-                
-                existing_primary.exclude(pk=contact.pk).update(is_primary=False)
-                
-                # Set this contact as primary
-                contact.is_primary = True
-                contact.updated_by = request.user.profile
-                contact.save(update_fields=['is_primary', 'updated_by', 'updated_at'])
-                
+            contact.make_primary(updated_by=request.user.profile)
         except Exception as e:
             return Response(
                 {'error': f'Failed to set primary contact: {str(e)}'},
@@ -232,6 +251,138 @@ class ContactViewSet(ContactQueryMixin, viewsets.ModelViewSet):
         serializer = self.get_serializer(contact)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'])
+    def duplicates(self, request):
+        """
+        Report groups of likely duplicate contacts.
+        
+        Query Parameters:
+        - min_score: Minimum pair score between 0 and 1 (default: 0.6)
+        - limit: Maximum number of groups to return (default: 100)
+        - async: 'true' to scan in the background; returns 202 with the
+          job's status URL, and the report becomes the job's result
+        """
+        try:
+            min_score = float(request.query_params.get('min_score', DEFAULT_MIN_SCORE))
+            limit = int(request.query_params.get('limit', 100))
+        except ValueError:
+            return Response(
+                {'error': 'min_score must be a number and limit an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if async_requested(request):
+            job = enqueue(
+                'contacts.find_duplicates',
+                {'min_score': min_score, 'limit': limit},
+                agency=request.user.profile.agency,
+                created_by=request.user.profile
+            )
+            return accepted_response(request, job)
+        
+        groups = find_agency_duplicates(request.user.profile.agency, min_score=min_score)
+        return Response({
+            'count': len(groups),
+            'groups': groups[:limit]
+        })
+    
+    @action(detail=True, methods=['post'])
+    def merge(self, request, pk=None):
+        """
+        Merge duplicate contacts into this one.
+        
+        Body: {"duplicate_ids": [...]}. Bookings referencing a duplicate are
+        repointed at this contact and the duplicates are deleted.
+        """
+        contact = self.get_object()
+        duplicate_ids = request.data.get('duplicate_ids', [])
+        
+        if not duplicate_ids:
+            return Response(
+                {'error': 'duplicate_ids is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            result = merge_contacts(contact, duplicate_ids, updated_by=request.user.profile)
+        except Contact.DoesNotExist as e:
+            return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+        
+        logger.info(
+            f"Merged {result['merged']} contacts into {contact.id}, "
+            f"{result['bookings_updated']} bookings updated"
+        )
+        return Response({
+            **result,
+            'contact': self.get_serializer(contact).data
+        })
+    
+    @action(detail=False, methods=['post'], parser_classes=[MultiPartParser, FormParser])
+    def bulk_import(self, request):
+        """
+        Import contacts from an uploaded CSV or vCard file.
+        
+        Form fields:
+        - file: The CSV (header row with contact field names) or .vcf file
+        - format: 'csv' or 'vcard' (default: from the file name)
+        - reference_type, promoter_id, venue_id, contact_type: Defaults for
+          rows that do not set them
+        - dry_run: 'true' to validate without saving
+        - async: 'true' to import in the background; returns 202 with the
+          job's status URL, and the report becomes the job's result
+        
+        Valid rows are inserted; invalid rows are reported with their row
+        number and errors.
+        """
+        uploaded_file = request.FILES.get('file')
+        if not uploaded_file:
+            return Response(
+                {'error': 'file is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        file_format = request.data.get('format') or detect_format(uploaded_file.name)
+        if file_format not in PARSERS:
+            return Response(
+                {'error': "format must be 'csv' or 'vcard'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        defaults = {
+            key: request.data.get(key)
+            for key in ('reference_type', 'promoter_id', 'venue_id', 'contact_type')
+            if request.data.get(key)
+        }
+        dry_run = str(request.data.get('dry_run', 'false')).lower() == 'true'
+        
+        if async_requested(request):
+            # The worker may run on another machine; it reads the file from storage
+            file_path = default_storage.save(
+                f"{get_jobs_config()['UPLOAD_DIR']}/{uuid.uuid4().hex}_{uploaded_file.name}",
+                uploaded_file
+            )
+            job = enqueue(
+                'contacts.import',
+                {'file_path': file_path, 'file_format': file_format, 'defaults': defaults, 'dry_run': dry_run},
+                agency=request.user.profile.agency,
+                created_by=request.user.profile
+            )
+            return accepted_response(request, job)
+        
+        importer = ContactImporter(
+            agency=request.user.profile.agency,
+            created_by=request.user.profile,
+            defaults=defaults,
+            dry_run=dry_run
+        )
+        report = importer.run(PARSERS[file_format](uploaded_file))
+        
+        logger.info(
+            f"Contact import for agency {request.user.profile.agency_id}: "
+            f"{report['created']} created, {report['failed']} failed"
+        )
+        return Response(report)
+    
     @action(detail=False, methods=['post'])
     def bulk_update_status(self, request):
         """Bulk update contact status."""
@@ -244,12 +395,65 @@ class ContactViewSet(ContactQueryMixin, viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        agency_id = request.user.profile.agency_id
         with transaction.atomic():
             updated_count = Contact.objects.filter(
                 id__in=contact_ids,
-                agency=request.user.profile.agency
+                agency_id=agency_id
             ).update(is_active=is_active)
+            # update() sends no post_save, so bump the version ourselves
+            transaction.on_commit(lambda: bump_data_version(agency_id))
+        
+        return Response({
+            'message': f'Updated {updated_count} contacts',
+            'updated_count': updated_count
+        })
+    
+    @action(detail=False, methods=['get'])
+    def tags(self, request):
+        """
+        Get the agency's tags with the number of contacts using each.
+        
+        Query Parameters:
+        - active: 'true' to count active contacts only
+        - limit: Maximum number of tags to return
+        """
+        cloud = tag_cloud(
+            request.user.profile.agency,
+            active_only=request.query_params.get('active', 'false').lower() == 'true',
+            limit=parse_group_limit(request)
+        )
+        return Response({'count': len(cloud), 'tags': cloud})
+    
+    @action(detail=False, methods=['post'])
+    def bulk_tag(self, request):
+        """
+        Add and/or remove tags on many contacts.
         
+        Body: {"contact_ids": [...], "add": [...], "remove": [...]}
+        """
+        contact_ids = request.data.get('contact_ids', [])
+        add = request.data.get('add', [])
+        remove = request.data.get('remove', [])
+        
+        if not contact_ids:
+            return Response(
+                {'error': 'contact_ids is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not add and not remove:
+            return Response(
+                {'error': 'add or remove is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        updated_count = bulk_change_tags(
+            request.user.profile.agency,
+            contact_ids,
+            add=add,
+            remove=remove,
+            updated_by=request.user.profile
+        )
         return Response({
             'message': f'Updated {updated_count} contacts',
             'updated_count': updated_count
@@ -271,37 +475,31 @@ class ContactViewSet(ContactQueryMixin, viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def by_type(self, request):
-        """Get contacts grouped by contact type."""
-        queryset = self.get_queryset()
-        
-        type_groups = {}
-        for choice in Contact.ContactType.choices:
-            contact_type = choice[0]
-            type_queryset = queryset.filter(contact_type=contact_type)
-            type_groups[contact_type] = {
-                'label': choice[1],
-                'count': type_queryset.count(),
-                'contacts': self.get_serializer(type_queryset, many=True).data
-            }
+        """Get contacts grouped by contact type, with an optional per-group ``limit``."""
+        groups = group_by_choices(
+            self.get_queryset(),
+            'contact_type',
+            Contact.ContactType.choices,
+            lambda rows: self.get_serializer(rows, many=True).data,
+            items_key='contacts',
+            limit=parse_group_limit(request)
+        )
         
-        return Response(type_groups)
+        return Response(groups)
     
     @action(detail=False, methods=['get'])
     def by_reference(self, request):
-        """Get contacts grouped by reference type."""
-        queryset = self.get_queryset()
-        
-        reference_groups = {}
-        for choice in Contact.ReferenceType.choices:
-            reference_type = choice[0]
-            ref_queryset = queryset.filter(reference_type=reference_type)
-            reference_groups[reference_type] = {
-                'label': choice[1],
-                'count': ref_queryset.count(),
-                'contacts': self.get_serializer(ref_queryset, many=True).data
-            }
+        """Get contacts grouped by reference type, with an optional per-group ``limit``."""
+        groups = group_by_choices(
+            self.get_queryset(),
+            'reference_type',
+            Contact.ReferenceType.choices,
+            lambda rows: self.get_serializer(rows, many=True).data,
+            items_key='contacts',
+            limit=parse_group_limit(request)
+        )
         
-        return Response(reference_groups)
+        return Response(groups)
     
     @action(detail=False, methods=['get'])
     def promoter_contacts(self, request):
@@ -376,51 +574,4 @@ class ContactViewSet(ContactQueryMixin, viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def dashboard_stats(self, request):
         """Get contact statistics for dashboard."""
-        queryset = self.get_queryset()
-        
-        total_contacts = queryset.count()
-        active_contacts = queryset.filter(is_active=True).count()
-        inactive_contacts = total_contacts - active_contacts
-        
-        # Group by reference type
-        reference_breakdown = {}
-        for choice in Contact.ReferenceType.choices:
-            reference_breakdown[choice[0]] = {
-                'label': choice[1],
-                'count': queryset.filter(reference_type=choice[0]).count()
-            }
-        
-        # Group by contact type (top 5)
-        type_breakdown = {}
-        for choice in Contact.ContactType.choices[:5]:  # Limit to top 5 for dashboard
-            type_breakdown[choice[0]] = {
-                'label': choice[1],
-                'count': queryset.filter(contact_type=choice[0]).count()
-            }
-        
-        # Special categories
-        primary_contacts = queryset.filter(is_primary=True).count()
-        emergency_contacts = queryset.filter(is_emergency=True).count()
-        
-        # Communication channels
-        has_whatsapp = queryset.exclude(whatsapp='').count()
-        has_linkedin = queryset.exclude(linkedin='').count()
-        
-        # Recent additions
-        last_30_days = datetime.now() - timedelta(days=30)
-        recent_additions = queryset.filter(created_at__gte=last_30_days).count()
-        
-        return Response({
-            'total_contacts': total_contacts,
-            'active_contacts': active_contacts,
-            'inactive_contacts': inactive_contacts,
-            'reference_breakdown': reference_breakdown,
-            'type_breakdown': type_breakdown,
-            'primary_contacts': primary_contacts,
-            'emergency_contacts': emergency_contacts,
-            'communication_channels': {
-                'has_whatsapp': has_whatsapp,
-                'has_linkedin': has_linkedin
-            },
-            'recent_additions': recent_additions
-        })
\ No newline at end of file
+        return Response(compute_stats(self.get_queryset(), self.dashboard_stats_spec))
\ No newline at end of file
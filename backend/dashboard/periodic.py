@@ -0,0 +1,17 @@
+# dashboard/periodic.py
+
+from scheduler.registry import periodic_job
+
+from .warmup import LIST_SECTIONS, STATS_SECTIONS, warm_dashboards
+
+
+@periodic_job(interval=300, jitter=60)
+def refresh_rollups():
+    """Recompute the dashboard stats of agencies whose data changed."""
+    return warm_dashboards(STATS_SECTIONS)
+
+
+@periodic_job(interval=600, jitter=120)
+def warm_caches():
+    """Pre-render the dashboard artist and upcoming booking lists."""
+    return warm_dashboards(LIST_SECTIONS)
@@ -0,0 +1,230 @@
+# dashboard/views.py
+
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from agencies.versioning import get_data_version
+from artists.views import ArtistViewSet
+from bookings.serializers import BookingListSerializer
+from bookings.views import BookingViewSet
+from config.stats import compute_stats
+from contacts.views import ContactViewSet
+from promoters.views import PromoterViewSet
+from venues.views import VenueViewSet
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_DASHBOARD = {
+    'MAX_WORKERS': 6,
+    'SECTION_TIMEOUT': 5.0,
+    'CACHE_TIMEOUT': 60,
+    # Sections pre-computed by the scheduler (see dashboard/warmup.py)
+    'WARM_CACHE_TIMEOUT': 900,
+    'WARM_ACTIVE_DAYS': 7,
+}
+
+# Query parameters that control the dashboard itself rather than its sections
+CONTROL_PARAMS = {'sections', 'refresh'}
+
+
+def _viewset(viewset_class, request: Request, action: str):
+    """Instantiate a viewset for ``request`` to reuse its querysets and serializers."""
+    return viewset_class(request=request, action=action, format_kwarg=None, args=(), kwargs={})
+
+
+def booking_stats(request: Request) -> Dict[str, Any]:
+    view = _viewset(BookingViewSet, request, 'stats')
+    return view.get_stats_data(view.get_queryset())
+
+
+def upcoming_bookings(request: Request) -> list:
+    view = _viewset(BookingViewSet, request, 'upcoming')
+    days = int(request.query_params.get('days', 90))
+    return BookingListSerializer(view.get_upcoming_queryset(days), many=True).data
+
+
+def promoter_stats(request: Request) -> Dict[str, Any]:
+    view = _viewset(PromoterViewSet, request, 'dashboard_stats')
+    return compute_stats(view.get_queryset(), view.dashboard_stats_spec)
+
+
+def venue_stats(request: Request) -> Dict[str, Any]:
+    view = _viewset(VenueViewSet, request, 'dashboard_stats')
+    return compute_stats(view.get_queryset(), view.dashboard_stats_spec)
+
+
+def contact_stats(request: Request) -> Dict[str, Any]:
+    view = _viewset(ContactViewSet, request, 'dashboard_stats')
+    return compute_stats(view.get_queryset(), view.dashboard_stats_spec)
+
+
+def artists(request: Request) -> list:
+    view = _viewset(ArtistViewSet, request, 'list')
+    return view.get_serializer(view.get_queryset(), many=True).data
+
+
+# Section name -> function computing its data for a request
+SECTIONS: Dict[str, Callable[[Request], Any]] = {
+    'booking_stats': booking_stats,
+    'promoter_stats': promoter_stats,
+    'venue_stats': venue_stats,
+    'contact_stats': contact_stats,
+    'artists': artists,
+    'upcoming_bookings': upcoming_bookings,
+}
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def section_cache_key(agency_id, version: int, name: str, params) -> str:
+    """Cache key of a section computed with the sorted query ``params``."""
+    digest = hashlib.md5(repr(params).encode()).hexdigest()[:12]
+    return f'dashboard_{agency_id}_{version}_{name}_{digest}'
+
+
+def get_dashboard_config() -> Dict[str, Any]:
+    return {**DEFAULT_DASHBOARD, **getattr(settings, 'DASHBOARD', {})}
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide pool used to compute dashboard sections."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=get_dashboard_config()['MAX_WORKERS'],
+                    thread_name_prefix='dashboard'
+                )
+    return _executor
+
+
+def _run_section(fn: Callable[[Request], Any], request: Request) -> Any:
+    """Run a section on a pool thread, which manages its own DB connection."""
+    close_old_connections()
+    try:
+        return fn(request)
+    finally:
+        close_old_connections()
+
+
+class DashboardView(APIView):
+    """
+    Composite agency dashboard.
+
+    GET /api/v1/dashboard/ returns booking stats, promoter/venue/contact
+    dashboard stats, the artist list and upcoming bookings in one response.
+
+    Sections are computed concurrently on a bounded thread pool. A section
+    that fails or exceeds ``DASHBOARD['SECTION_TIMEOUT']`` comes back as
+    ``null`` and is listed in ``meta.errors``; the others are still returned.
+    Each section is cached on its own, keyed by the agency's data version, so
+    any write to the agency's data invalidates it.
+
+    Query Parameters:
+    - sections: Comma-separated subset of sections to compute
+    - refresh: 'true' to bypass the cache
+    - days, date_from, date_to, ...: passed through to the sections
+    """
+
+    permission_classes = [IsAuthenticated]
+    throttle_costs = {'get': 10}
+
+    def get(self, request):
+        if not hasattr(request.user, 'profile'):
+            return Response(
+                {'error': 'User has no agency profile'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        requested = request.query_params.get('sections')
+        names = [name.strip() for name in requested.split(',') if name.strip()] if requested else list(SECTIONS)
+        unknown = [name for name in names if name not in SECTIONS]
+        if unknown:
+            return Response(
+                {'error': f"Unknown sections: {', '.join(unknown)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        config = get_dashboard_config()
+        agency_id = request.user.profile.agency_id
+        version = get_data_version(agency_id)
+        params = sorted(
+            (key, value) for key, value in request.query_params.items()
+            if key not in CONTROL_PARAMS
+        )
+        keys = {name: section_cache_key(agency_id, version, name, params) for name in names}
+
+        data: Dict[str, Any] = {}
+        cached = []
+        if request.query_params.get('refresh', 'false').lower() != 'true':
+            hits = cache.get_many(list(keys.values()))
+            for name in names:
+                if keys[name] in hits:
+                    data[name] = hits[keys[name]]
+                    cached.append(name)
+
+        pending = [name for name in names if name not in data]
+        errors = self.compute_sections(request, pending, data, config)
+
+        fresh = {keys[name]: data[name] for name in pending if name not in errors}
+        if fresh:
+            cache.set_many(fresh, config['CACHE_TIMEOUT'])
+
+        response = {name: data.get(name) for name in names}
+        response['meta'] = {
+            'errors': errors,
+            'cached': cached,
+            'data_version': version,
+        }
+        return Response(response)
+
+    def compute_sections(self, request, names, data, config) -> Dict[str, str]:
+        """Compute ``names`` into ``data``; return ``{section: error}`` for failures."""
+        errors = {}
+        if not names:
+            return errors
+
+        # MAX_WORKERS = 0 computes sections inline on the request thread
+        if config['MAX_WORKERS'] <= 0:
+            for name in names:
+                try:
+                    data[name] = SECTIONS[name](request)
+                except Exception as e:
+                    logger.exception(f"Dashboard section {name} failed: {str(e)}")
+                    errors[name] = 'error'
+            return errors
+
+        # Resolve the agency once so worker threads share the cached profile
+        request.user.profile.agency
+
+        executor = get_executor()
+        futures = {name: executor.submit(_run_section, SECTIONS[name], request) for name in names}
+        deadline = time.monotonic() + config['SECTION_TIMEOUT']
+        for name, future in futures.items():
+            try:
+                data[name] = future.result(timeout=max(0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                future.cancel()
+                logger.warning(f"Dashboard section {name} timed out after {config['SECTION_TIMEOUT']}s")
+                errors[name] = 'timeout'
+            except Exception as e:
+                logger.exception(f"Dashboard section {name} failed: {str(e)}")
+                errors[name] = 'error'
+        return errors
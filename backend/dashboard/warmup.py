@@ -0,0 +1,90 @@
+# dashboard/warmup.py
+
+"""
+Pre-computing dashboard sections off the request path.
+
+The scheduler (see dashboard/periodic.py) calls ``warm_dashboards`` so the
+first dashboard load after a write finds its sections already cached under
+the agency's new data version. Sections are computed the way the dashboard
+shows them without query parameters, for agencies with a recently active
+user. Sections still cached for the current version are skipped, so an
+agency without new writes costs one cache lookup.
+"""
+
+import logging
+from datetime import timedelta
+from typing import Any, Dict, Iterable
+
+from django.core.cache import cache
+from django.http import HttpRequest
+from django.utils import timezone
+from rest_framework.request import Request
+
+from agencies.models import UserProfile
+from agencies.versioning import get_data_version
+
+from .views import SECTIONS, get_dashboard_config, section_cache_key
+
+logger = logging.getLogger(__name__)
+
+
+# Aggregated counts, cheap to keep fresh
+STATS_SECTIONS = ('booking_stats', 'promoter_stats', 'venue_stats', 'contact_stats')
+# Serialized lists, larger and refreshed less often
+LIST_SECTIONS = ('artists', 'upcoming_bookings')
+
+
+def _request_for(user) -> Request:
+    http_request = HttpRequest()
+    http_request.method = 'GET'
+    request = Request(http_request)
+    request.user = user
+    return request
+
+
+def warm_agency(profile: UserProfile, sections: Iterable[str]) -> int:
+    """Compute and cache ``sections`` missing for the profile's agency; return how many."""
+    config = get_dashboard_config()
+    agency_id = profile.agency_id
+    version = get_data_version(agency_id)
+    keys = {name: section_cache_key(agency_id, version, name, []) for name in sections}
+    hits = cache.get_many(list(keys.values()))
+    missing = [name for name, key in keys.items() if key not in hits]
+    if not missing:
+        return 0
+
+    request = _request_for(profile.user)
+    fresh = {}
+    for name in missing:
+        try:
+            fresh[keys[name]] = SECTIONS[name](request)
+        except Exception as e:
+            logger.exception(f"Warming dashboard section {name} for agency {agency_id} failed: {str(e)}")
+    if fresh:
+        cache.set_many(fresh, config['WARM_CACHE_TIMEOUT'])
+    return len(fresh)
+
+
+def warm_dashboards(sections: Iterable[str]) -> Dict[str, Any]:
+    """Warm ``sections`` for every agency with a user active in the last ``WARM_ACTIVE_DAYS`` days."""
+    config = get_dashboard_config()
+    sections = list(sections)
+    since = timezone.now() - timedelta(days=config['WARM_ACTIVE_DAYS'])
+
+    # One active profile per agency, read with its user and agency in one query
+    profiles = UserProfile.objects.filter(
+        is_active=True,
+        user__is_active=True,
+        user__last_login__gte=since,
+    ).select_related('user', 'agency').order_by('agency_id', '-user__last_login')
+
+    agencies = 0
+    computed = 0
+    seen = set()
+    for profile in profiles.iterator():
+        if profile.agency_id in seen:
+            continue
+        seen.add(profile.agency_id)
+        agencies += 1
+        computed += warm_agency(profile, sections)
+    return {'agencies': agencies, 'sections_computed': computed}
@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['task', 'status', 'agency', 'attempts', 'progress_done', 'progress_total', 'created_at', 'finished_at']
+    list_filter = ['status', 'task', 'created_at']
+    search_fields = ['id', 'task', 'agency__name']
+    raw_id_fields = ['agency', 'created_by']
+    readonly_fields = [
+        'locked_by', 'locked_until', 'attempts', 'progress_done', 'progress_total', 'progress_message',
+        'result', 'error', 'started_at', 'finished_at', 'created_at', 'updated_at'
+    ]
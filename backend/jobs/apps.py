@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'jobs'
+    verbose_name = 'Background Jobs'
+
+    def ready(self):
+        """Import every installed app's ``tasks`` module to register its tasks."""
+        from django.utils.module_loading import autodiscover_modules
+        autodiscover_modules('tasks')
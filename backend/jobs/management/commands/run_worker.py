@@ -0,0 +1,119 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+
+from jobs.queue import claim, execute, get_jobs_config, requeue_stale, worker_id
+
+
+class Command(BaseCommand):
+    """
+    Management command processing queued background jobs.
+
+    Usage:
+        python manage.py run_worker
+        python manage.py run_worker --concurrency 4
+        python manage.py run_worker --burst
+
+    Runs --concurrency jobs at a time on worker threads. Any number of
+    workers can run against the same database. Tasks are mostly I/O and
+    database bound; for CPU-heavy tasks run more worker processes instead
+    of more threads. Stops cleanly on SIGINT/SIGTERM after the jobs in
+    progress.
+    """
+
+    help = 'Process queued background jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            help='Number of jobs run at a time (default: JOBS["CONCURRENCY"])',
+        )
+
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Exit once the queue is empty',
+        )
+
+        parser.add_argument(
+            '--poll',
+            type=float,
+            help='Seconds an idle worker waits before checking the queue again (default: JOBS["POLL_INTERVAL"])',
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        config = get_jobs_config()
+        concurrency = options['concurrency'] or config['CONCURRENCY']
+        poll = options['poll'] or config['POLL_INTERVAL']
+        burst = options['burst']
+        if concurrency < 1:
+            raise CommandError('--concurrency must be at least 1')
+
+        self.stop = threading.Event()
+        self.stats_lock = threading.Lock()
+        self.stats = {'succeeded': 0, 'failed': 0, 'retried': 0}
+
+        def request_stop(signum, frame):
+            self.stdout.write(self.style.NOTICE('\nStopping after the jobs in progress...'))
+            self.stop.set()
+
+        signal.signal(signal.SIGINT, request_stop)
+        signal.signal(signal.SIGTERM, request_stop)
+
+        requeue_stale()
+        self.stdout.write(
+            self.style.SUCCESS(f'✓ Worker {worker_id()} started with concurrency {concurrency}')
+        )
+
+        threads = [
+            threading.Thread(target=self.work, args=(number, poll, burst), name=f'job-worker-{number}')
+            for number in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+
+        # Every tenth poll, sweep for jobs abandoned by dead workers
+        polls = 0
+        while any(thread.is_alive() for thread in threads):
+            if self.stop.wait(poll):
+                break
+            polls += 1
+            if polls % 10 == 0:
+                close_old_connections()
+                requeue_stale()
+        for thread in threads:
+            thread.join()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✓ Worker stopped: {self.stats["succeeded"]} succeeded, '
+                f'{self.stats["failed"]} failed, {self.stats["retried"]} retried'
+            )
+        )
+
+    def work(self, number, poll, burst):
+        """Claim and run jobs on one thread until stopped (or, in burst mode, idle)."""
+        worker = worker_id(number)
+        try:
+            while not self.stop.is_set():
+                close_old_connections()
+                job = claim(worker)
+                if job is None:
+                    if burst:
+                        return
+                    self.stop.wait(poll)
+                    continue
+
+                execute(job)
+                outcome = {'succeeded': 'succeeded', 'failed': 'failed', 'queued': 'retried'}.get(job.status)
+                if outcome:
+                    with self.stats_lock:
+                        self.stats[outcome] += 1
+                style = self.style.SUCCESS if job.status == job.Status.SUCCEEDED else self.style.WARNING
+                self.stdout.write(style(f'  {job.task} {job.pk}: {job.status} (attempt {job.attempts})'))
+        finally:
+            connection.close()
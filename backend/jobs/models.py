@@ -0,0 +1,107 @@
+import uuid
+
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from agencies.models import Agency, UserProfile
+from config.models import TimestampedModel
+
+
+class Job(TimestampedModel):
+    """
+    A background task queued in the database.
+
+    Workers (``manage.py run_worker``) claim queued jobs, run the registered
+    task and record its result. Rows are written with queryset updates so
+    progress reports stay cheap; see jobs/queue.py.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = 'queued', 'Queued'
+        RUNNING = 'running', 'Running'
+        SUCCEEDED = 'succeeded', 'Succeeded'
+        FAILED = 'failed', 'Failed'
+        CANCELLED = 'cancelled', 'Cancelled'
+
+    # Queue bookkeeping is not agency data; don't invalidate the agency's caches
+    tracks_data_version = False
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    agency = models.ForeignKey(
+        Agency,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='jobs'
+    )
+    created_by = models.ForeignKey(
+        UserProfile,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='created_jobs'
+    )
+
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    priority = models.SmallIntegerField(default=0, help_text='Higher runs first')
+    run_at = models.DateTimeField(default=timezone.now, help_text='Not run before this time')
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+
+    progress_done = models.PositiveIntegerField(default=0)
+    progress_total = models.PositiveIntegerField(null=True, blank=True)
+    progress_message = models.CharField(max_length=255, blank=True)
+
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Job'
+        verbose_name_plural = 'Jobs'
+        indexes = [
+            # Dequeue order over queued jobs only
+            models.Index(
+                fields=['-priority', 'run_at'],
+                condition=Q(status='queued'),
+                name='job_queued_idx'
+            ),
+            # Finding running jobs whose worker died
+            models.Index(
+                fields=['locked_until'],
+                condition=Q(status='running'),
+                name='job_running_lease_idx'
+            ),
+            models.Index(fields=['agency', '-created_at']),
+            models.Index(fields=['status', 'finished_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.task} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.Status.SUCCEEDED, self.Status.FAILED, self.Status.CANCELLED)
+
+    @property
+    def progress_percent(self):
+        if self.status == self.Status.SUCCEEDED:
+            return 100
+        if not self.progress_total:
+            return None
+        return min(100, int(self.progress_done * 100 / self.progress_total))
+
+    def set_progress(self, done: int, total: int = None, message: str = None) -> None:
+        """Report progress from inside a task; also renews the worker's lease."""
+        from .queue import report_progress
+        report_progress(self, done, total=total, message=message)
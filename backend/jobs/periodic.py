@@ -0,0 +1,11 @@
+# jobs/periodic.py
+
+from scheduler.registry import periodic_job
+
+from .queue import get_jobs_config, prune_finished
+
+
+@periodic_job(interval=86400, jitter=3600)
+def prune_jobs():
+    """Delete background jobs finished more than JOBS['HISTORY_DAYS'] days ago."""
+    return {'deleted': prune_finished(get_jobs_config()['HISTORY_DAYS'])}
@@ -0,0 +1,241 @@
+# jobs/queue.py
+
+"""
+Enqueueing, claiming and running background jobs.
+
+Claiming uses ``SELECT ... FOR UPDATE SKIP LOCKED`` where the database
+supports it, so concurrent workers never block on, or hand out, the same
+job. Elsewhere (SQLite) a worker claims a candidate with a conditional
+UPDATE and moves on to the next one if another worker got there first.
+
+A claimed job carries a lease (``locked_until``) that progress reports
+renew. Jobs whose lease expires, because their worker died, are requeued
+or failed by ``requeue_stale``.
+"""
+
+import json
+import logging
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+from .registry import Task, get_task
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_JOBS = {
+    'CONCURRENCY': 2,
+    'POLL_INTERVAL': 2.0,
+    'HISTORY_DAYS': 30,
+    'UPLOAD_DIR': 'job-uploads',
+}
+
+# Queued jobs a worker tries to claim per attempt without SKIP LOCKED
+CLAIM_CANDIDATES = 10
+
+# Progress reports closer together than this are not written
+PROGRESS_INTERVAL = 1.0
+
+DEFAULT_LEASE = 600
+
+
+def get_jobs_config() -> Dict[str, Any]:
+    return {**DEFAULT_JOBS, **getattr(settings, 'JOBS', {})}
+
+
+def worker_id(thread: int = 0) -> str:
+    """Identify a worker thread in job locks."""
+    return f'{socket.gethostname()}:{os.getpid()}:{thread}'
+
+
+def enqueue(
+    task_name: str,
+    payload: Optional[Dict[str, Any]] = None,
+    agency=None,
+    created_by=None,
+    priority: int = 0,
+    run_at=None,
+) -> Job:
+    """
+    Queue ``task_name`` to run with ``payload`` as keyword arguments.
+
+    Inside a transaction the job becomes visible to workers on commit.
+    """
+    task = get_task(task_name)
+    if task is None:
+        raise ValueError(f"Unknown task: {task_name}")
+    payload = payload or {}
+    # Fail in the caller rather than in the worker
+    json.dumps(payload)
+    return Job.objects.create(
+        agency=agency,
+        created_by=created_by,
+        task=task_name,
+        payload=payload,
+        priority=priority,
+        run_at=run_at or timezone.now(),
+        max_attempts=task.max_attempts,
+    )
+
+
+def _lease_seconds(task_name: str) -> int:
+    task = get_task(task_name)
+    return task.lease if task else DEFAULT_LEASE
+
+
+def _mark_claimed(job: Job, worker: str, now) -> Dict[str, Any]:
+    return {
+        'status': Job.Status.RUNNING,
+        'locked_by': worker,
+        'locked_until': now + timedelta(seconds=_lease_seconds(job.task)),
+        'started_at': now,
+        'updated_at': now,
+    }
+
+
+def claim(worker: str) -> Optional[Job]:
+    """Claim the next ready job for ``worker``, or return None if there is none."""
+    now = timezone.now()
+    ready = Job.objects.filter(status=Job.Status.QUEUED, run_at__lte=now).order_by('-priority', 'run_at')
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            job = ready.select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            changes = _mark_claimed(job, worker, now)
+            Job.objects.filter(pk=job.pk).update(attempts=F('attempts') + 1, **changes)
+    else:
+        for job in ready[:CLAIM_CANDIDATES]:
+            changes = _mark_claimed(job, worker, now)
+            if Job.objects.filter(pk=job.pk, status=Job.Status.QUEUED).update(
+                attempts=F('attempts') + 1, **changes
+            ):
+                break
+        else:
+            return None
+
+    for field, value in changes.items():
+        setattr(job, field, value)
+    job.attempts += 1
+    return job
+
+
+def report_progress(job: Job, done: int, total: int = None, message: str = None) -> None:
+    """Record ``job``'s progress and renew its lease, at most once per ``PROGRESS_INTERVAL``."""
+    job.progress_done = done
+    if total is not None:
+        job.progress_total = total
+    if message is not None:
+        job.progress_message = message[:255]
+
+    now = time.monotonic()
+    last = getattr(job, '_progress_written_at', 0)
+    finished = job.progress_total is not None and done >= job.progress_total
+    if now - last < PROGRESS_INTERVAL and not finished:
+        return
+    job._progress_written_at = now
+
+    updated_at = timezone.now()
+    Job.objects.filter(pk=job.pk, status=Job.Status.RUNNING, locked_by=job.locked_by).update(
+        progress_done=job.progress_done,
+        progress_total=job.progress_total,
+        progress_message=job.progress_message,
+        locked_until=updated_at + timedelta(seconds=_lease_seconds(job.task)),
+        updated_at=updated_at,
+    )
+
+
+def _finish(job: Job, **changes) -> bool:
+    """Apply ``changes`` if ``job`` is still held by its worker; False if the lease was lost."""
+    now = timezone.now()
+    changes.setdefault('updated_at', now)
+    updated = Job.objects.filter(pk=job.pk, status=Job.Status.RUNNING, locked_by=job.locked_by).update(
+        locked_by='',
+        locked_until=None,
+        **changes
+    )
+    if not updated:
+        logger.warning(f"Job {job.pk} ({job.task}) lost its lease before finishing")
+    for field, value in changes.items():
+        setattr(job, field, value)
+    return bool(updated)
+
+
+def execute(job: Job) -> Job:
+    """Run a claimed job's task and record success, a scheduled retry or failure."""
+    task: Optional[Task] = get_task(job.task)
+    if task is None:
+        _finish(job, status=Job.Status.FAILED, error=f'Unknown task: {job.task}', finished_at=timezone.now())
+        return job
+
+    try:
+        result = task.func(job, **job.payload)
+        # Fail here, not in the UPDATE, if the task returned something unstorable
+        json.dumps(result)
+    except Exception as e:
+        error = traceback.format_exc()
+        now = timezone.now()
+        if job.attempts < job.max_attempts:
+            delay = task.retry_delay(job.attempts)
+            logger.warning(
+                f"Job {job.pk} ({job.task}) attempt {job.attempts} failed, retrying in {delay:.0f}s: {str(e)}"
+            )
+            _finish(job, status=Job.Status.QUEUED, run_at=now + timedelta(seconds=delay), error=error)
+        else:
+            logger.exception(f"Job {job.pk} ({job.task}) failed after {job.attempts} attempt(s): {str(e)}")
+            _finish(job, status=Job.Status.FAILED, error=error, finished_at=now)
+        return job
+
+    changes = {'status': Job.Status.SUCCEEDED, 'result': result, 'error': '', 'finished_at': timezone.now()}
+    if job.progress_total is not None:
+        changes['progress_done'] = job.progress_total
+    _finish(job, **changes)
+    return job
+
+
+def requeue_stale() -> int:
+    """Requeue running jobs whose worker stopped renewing their lease; fail them if out of attempts."""
+    now = timezone.now()
+    stale = Job.objects.filter(status=Job.Status.RUNNING, locked_until__lt=now)
+    error = 'The worker running this job stopped responding.'
+    requeued = stale.filter(attempts__lt=F('max_attempts')).update(
+        status=Job.Status.QUEUED, locked_by='', locked_until=None, run_at=now, error=error, updated_at=now
+    )
+    failed = stale.update(
+        status=Job.Status.FAILED, locked_by='', locked_until=None, error=error, finished_at=now, updated_at=now
+    )
+    if requeued or failed:
+        logger.warning(f"Requeued {requeued} and failed {failed} job(s) abandoned by their worker")
+    return requeued + failed
+
+
+def cancel(job: Job) -> bool:
+    """Cancel ``job`` if it has not started yet."""
+    now = timezone.now()
+    cancelled = Job.objects.filter(pk=job.pk, status=Job.Status.QUEUED).update(
+        status=Job.Status.CANCELLED, finished_at=now, updated_at=now
+    )
+    if cancelled:
+        job.status = Job.Status.CANCELLED
+        job.finished_at = now
+    return bool(cancelled)
+
+
+def prune_finished(days: int) -> int:
+    """Delete jobs that finished more than ``days`` days ago."""
+    deleted, _ = Job.objects.filter(
+        status__in=[Job.Status.SUCCEEDED, Job.Status.FAILED, Job.Status.CANCELLED],
+        finished_at__lt=timezone.now() - timedelta(days=days),
+    ).delete()
+    return deleted
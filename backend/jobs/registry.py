@@ -0,0 +1,66 @@
+# jobs/registry.py
+
+"""
+Registry of background tasks.
+
+Apps register tasks in a ``tasks.py`` module, which the jobs app imports at
+startup::
+
+    @task('contacts.find_duplicates', max_attempts=3)
+    def find_duplicates(job, min_score=0.6):
+        ...
+        job.set_progress(done, total)
+        return {'count': n}
+
+A task receives its ``Job`` and the job's payload as keyword arguments and
+returns a JSON-serializable result. Raising retries the job with
+exponential backoff until ``max_attempts`` is reached; tasks that are not
+safe to repeat should use ``max_attempts=1``.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+
+@dataclass(frozen=True)
+class Task:
+    name: str
+    func: Callable[..., Any]
+    max_attempts: int = 3
+    # Retry delay in seconds: backoff * 2 ** (attempt - 1), capped at max_backoff
+    backoff: int = 30
+    max_backoff: int = 3600
+    # Seconds a worker holds a job between progress reports before it counts as lost
+    lease: int = 600
+
+    def retry_delay(self, attempts: int) -> float:
+        """Delay before retrying after ``attempts`` failed attempts, with full jitter."""
+        delay = min(self.backoff * 2 ** max(attempts - 1, 0), self.max_backoff)
+        return random.uniform(delay / 2, delay)
+
+
+_tasks: Dict[str, Task] = {}
+
+
+def task(name: Optional[str] = None, *, max_attempts: int = 3, backoff: int = 30,
+         max_backoff: int = 3600, lease: int = 600):
+    """Register the decorated function as a background task."""
+    def decorator(func):
+        task_name = name or f'{func.__module__}.{func.__name__}'
+        if task_name in _tasks and _tasks[task_name].func is not func:
+            raise ValueError(f"Task '{task_name}' is already registered")
+        _tasks[task_name] = Task(
+            name=task_name,
+            func=func,
+            max_attempts=max_attempts,
+            backoff=backoff,
+            max_backoff=max_backoff,
+            lease=lease,
+        )
+        return func
+    return decorator
+
+
+def get_task(name: str) -> Optional[Task]:
+    return _tasks.get(name)
@@ -0,0 +1,33 @@
+# jobs/serializers.py
+
+from rest_framework import serializers
+
+from .models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """Status of a background job as reported to its creator."""
+
+    progress = serializers.SerializerMethodField()
+    error = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'task', 'status', 'progress', 'attempts', 'max_attempts',
+            'result', 'error', 'run_at', 'created_at', 'started_at', 'finished_at'
+        ]
+        read_only_fields = fields
+
+    def get_progress(self, obj):
+        return {
+            'done': obj.progress_done,
+            'total': obj.progress_total,
+            'percent': obj.progress_percent,
+            'message': obj.progress_message,
+        }
+
+    def get_error(self, obj):
+        # Only the exception line; the traceback stays in the admin
+        lines = obj.error.strip().splitlines()
+        return lines[-1] if lines else None
@@ -0,0 +1,176 @@
+import threading
+import unittest
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from . import queue, registry
+from .models import Job
+from .queue import claim, enqueue, execute, requeue_stale
+from .registry import Task
+
+
+def fail(job):
+    raise RuntimeError('boom')
+
+
+TASKS = {
+    'tests.noop': Task('tests.noop', lambda job: {'ok': True}),
+    'tests.fail': Task('tests.fail', fail, max_attempts=3, backoff=30, max_backoff=3600),
+}
+
+
+class QueueTestMixin:
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.dict(registry._tasks, TASKS)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class ClaimTests(QueueTestMixin, TestCase):
+    def test_claims_by_priority_then_run_at_and_skips_future_jobs(self):
+        now = timezone.now()
+        later = enqueue('tests.noop', run_at=now - timedelta(seconds=1))
+        urgent = enqueue('tests.noop', priority=5, run_at=now)
+        earlier = enqueue('tests.noop', run_at=now - timedelta(seconds=2))
+        enqueue('tests.noop', run_at=now + timedelta(hours=1))
+
+        claimed = [claim('worker') for _ in range(4)]
+        self.assertEqual([job.pk if job else None for job in claimed], [urgent.pk, earlier.pk, later.pk, None])
+        job = Job.objects.get(pk=urgent.pk)
+        self.assertEqual((job.status, job.locked_by, job.attempts), (Job.Status.RUNNING, 'worker', 1))
+        self.assertIsNotNone(job.locked_until)
+
+    @unittest.skipIf(connection.features.has_select_for_update_skip_locked, 'claims use SKIP LOCKED here')
+    def test_worker_beaten_to_a_candidate_takes_the_next_one(self):
+        first = enqueue('tests.noop', run_at=timezone.now() - timedelta(seconds=2))
+        second = enqueue('tests.noop', run_at=timezone.now() - timedelta(seconds=1))
+        mark_claimed = queue._mark_claimed
+        rivals = []
+
+        def rival_claims_first(job, worker, now):
+            # worker-b claims between worker-a reading candidates and updating one
+            if worker == 'worker-a' and not rivals:
+                rivals.append(claim('worker-b'))
+            return mark_claimed(job, worker, now)
+
+        with mock.patch.object(queue, '_mark_claimed', rival_claims_first):
+            job = claim('worker-a')
+
+        self.assertEqual(rivals[0].pk, first.pk)
+        self.assertEqual(job.pk, second.pk)
+        self.assertEqual(Job.objects.get(pk=first.pk).locked_by, 'worker-b')
+        self.assertEqual(Job.objects.get(pk=first.pk).attempts, 1)
+        self.assertEqual(Job.objects.get(pk=second.pk).locked_by, 'worker-a')
+
+
+class ExecuteTests(QueueTestMixin, TestCase):
+    def test_success_records_result_and_releases_the_job(self):
+        enqueue('tests.noop')
+        job = execute(claim('worker'))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result, job.locked_by), (Job.Status.SUCCEEDED, {'ok': True}, ''))
+        self.assertIsNone(job.locked_until)
+
+    def test_failure_is_retried_with_exponential_backoff(self):
+        enqueue('tests.fail')
+        with self.assertLogs('jobs.queue', 'WARNING'):
+            for attempt, (low, high) in enumerate([(15, 30), (30, 60)], start=1):
+                before = timezone.now()
+                execute(claim('worker'))
+                job = Job.objects.get()
+                self.assertEqual((job.status, job.attempts), (Job.Status.QUEUED, attempt))
+                self.assertIn('boom', job.error)
+                self.assertGreaterEqual(job.run_at, before + timedelta(seconds=low))
+                self.assertLessEqual(job.run_at, timezone.now() + timedelta(seconds=high))
+                # Not claimable until its backoff has passed
+                self.assertIsNone(claim('worker'))
+                Job.objects.update(run_at=timezone.now())
+
+            execute(claim('worker'))
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (Job.Status.FAILED, 3))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_worker_that_lost_its_lease_does_not_overwrite_the_job(self):
+        enqueue('tests.noop')
+        job = claim('worker-a')
+        Job.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        requeue_stale()
+        self.assertEqual(claim('worker-b').pk, job.pk)
+
+        with self.assertLogs('jobs.queue', 'WARNING'):
+            execute(job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by, job.attempts), (Job.Status.RUNNING, 'worker-b', 2))
+
+
+class RequeueStaleTests(QueueTestMixin, TestCase):
+    def running(self, attempts, max_attempts=3, expired=True):
+        now = timezone.now()
+        return Job.objects.create(
+            task='tests.noop',
+            status=Job.Status.RUNNING,
+            attempts=attempts,
+            max_attempts=max_attempts,
+            locked_by='dead-worker',
+            locked_until=now + timedelta(seconds=-1 if expired else 600),
+            started_at=now,
+        )
+
+    def test_stale_job_is_requeued_while_it_has_attempts_left(self):
+        job = self.running(attempts=1)
+        self.assertEqual(requeue_stale(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), (Job.Status.QUEUED, ''))
+        self.assertIsNone(job.locked_until)
+        self.assertEqual(claim('worker').pk, job.pk)
+
+    def test_stale_job_out_of_attempts_is_failed(self):
+        job = self.running(attempts=3)
+        self.assertEqual(requeue_stale(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertIsNotNone(job.finished_at)
+        self.assertIsNone(claim('worker'))
+
+    def test_live_lease_is_left_alone(self):
+        job = self.running(attempts=1, expired=False)
+        self.assertEqual(requeue_stale(), 0)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), (Job.Status.RUNNING, 'dead-worker'))
+
+
+class ConcurrentClaimTests(QueueTestMixin, TransactionTestCase):
+    def test_concurrent_workers_never_claim_the_same_job(self):
+        Job.objects.bulk_create([Job(task='tests.noop') for _ in range(40)])
+        claimed, errors = [], []
+        start = threading.Barrier(8)
+
+        def worker(index):
+            start.wait()
+            try:
+                while True:
+                    job = claim(f'worker-{index}')
+                    if job is None:
+                        break
+                    claimed.append(job.pk)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(claimed), 40)
+        self.assertEqual(len(set(claimed)), 40)
+        self.assertFalse(Job.objects.exclude(attempts=1).exists())
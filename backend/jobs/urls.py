@@ -0,0 +1,11 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from . import views
+
+# Create a router for the job status endpoints
+router = DefaultRouter()
+router.register(r'jobs', views.JobViewSet, basename='job')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -0,0 +1,75 @@
+# jobs/views.py
+
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from django.urls import reverse
+
+from .models import Job
+from .queue import cancel
+from .serializers import JobSerializer
+
+
+def async_requested(request) -> bool:
+    """Whether the client asked for a long operation to run as a background job."""
+    value = request.query_params.get('async') or request.data.get('async') or 'false'
+    return str(value).lower() == 'true'
+
+
+def accepted_response(request, job: Job) -> Response:
+    """202 response pointing the client at the status endpoint of ``job``."""
+    status_url = request.build_absolute_uri(reverse('job-detail', args=[job.pk]))
+    return Response(
+        {
+            'job_id': str(job.pk),
+            'status': job.status,
+            'status_url': status_url,
+        },
+        status=status.HTTP_202_ACCEPTED,
+        headers={'Location': status_url}
+    )
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Status of the agency's background jobs.
+
+    GET /jobs/{id}/ reports status, progress and, once finished, the
+    result. Endpoints that hand long operations to the queue answer 202
+    with this URL.
+
+    Query Parameters (list):
+    - status: Only jobs with this status
+    - task: Only jobs of this task
+    """
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """Filter jobs by user's agency."""
+        if not hasattr(self.request.user, 'profile'):
+            return Job.objects.none()
+
+        queryset = Job.objects.filter(agency=self.request.user.profile.agency)
+        if self.action == 'list':
+            job_status = self.request.query_params.get('status')
+            if job_status:
+                queryset = queryset.filter(status=job_status)
+            task = self.request.query_params.get('task')
+            if task:
+                queryset = queryset.filter(task=task)
+            # No pagination is configured; keep the list to recent jobs
+            queryset = queryset.order_by('-created_at')[:100]
+        return queryset
+
+    @action(detail=True, methods=['post'])
+    def cancel(self, request, pk=None):
+        """Cancel a job that has not started yet."""
+        job = self.get_object()
+        if not cancel(job):
+            return Response(
+                {'error': f'Job is {job.status} and can no longer be cancelled'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(self.get_serializer(job).data)
@@ -6,7 +6,10 @@ import sys
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+    os.environ.setdefault(
+        'DJANGO_SETTINGS_MODULE',
+        f"config.settings.{os.getenv('DJANGO_ENV', 'development')}"
+    )
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -4,6 +4,7 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
+from agencies.versioning import update_and_bump
 from .models import Promoter
 
 
@@ -98,12 +99,12 @@ class PromoterAdmin(admin.ModelAdmin):
     
     def mark_active(self, request, queryset):
         """Mark selected promoters as active."""
-        updated = queryset.update(is_active=True)
+        updated = update_and_bump(queryset, is_active=True)
         self.message_user(request, f'{updated} promoters marked as active.')
     mark_active.short_description = "Mark selected promoters as active"
     
     def mark_inactive(self, request, queryset):
         """Mark selected promoters as inactive."""
-        updated = queryset.update(is_active=False)
+        updated = update_and_bump(queryset, is_active=False)
         self.message_user(request, f'{updated} promoters marked as inactive.')
     mark_inactive.short_description = "Mark selected promoters as inactive"
\ No newline at end of file
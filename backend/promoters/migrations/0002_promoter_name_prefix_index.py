@@ -0,0 +1,16 @@
+# Generated by Django 5.2.4 on 2026-10-19 02:10
+
+from django.db import migrations
+
+from config.autocomplete import prefix_search_indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('promoters', '0001_initial'),
+    ]
+
+    operations = [
+        prefix_search_indexes('promoters_promoter', ['promoter_name', 'company_name']),
+    ]
@@ -1,3 +1,120 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from agencies.models import Agency, UserProfile
+from agencies.versioning import get_data_version
+from authentication.models import User
+from config.grouping import group_by_country
+
+from .models import Promoter
+
+
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'promoter-tests'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'promoter-tests-shared'},
+}
+
+
+def names(promoters):
+    return [promoter.promoter_name for promoter in promoters]
+
+
+@override_settings(CACHES=CACHES)
+class PromoterViewTestCase(TestCase):
+    def setUp(self):
+        user = User.objects.create(username='owner', email='owner@example.com')
+        self.agency = Agency.objects.create(name='Agency', owner=user, timezone='UTC', slug='agency')
+        UserProfile.objects.create(user=user, agency=self.agency, role='agency_owner')
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def promoter(self, name, **fields):
+        fields.setdefault('company_name', name)
+        return Promoter.objects.create(agency=self.agency, promoter_name=name, **fields)
+
+
+class PromoterBulkStatusTests(PromoterViewTestCase):
+    def test_bulk_status_change_bumps_the_data_version(self):
+        promoter = self.promoter('Pro')
+        version = get_data_version(self.agency.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                '/api/v1/promoters/bulk_update_status/',
+                {'promoter_ids': [str(promoter.pk)], 'is_active': False},
+                format='json',
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['updated_count'], 1)
+        self.assertFalse(Promoter.objects.get(pk=promoter.pk).is_active)
+        self.assertNotEqual(get_data_version(self.agency.pk), version)
+
+
+class PromoterByCountryTests(PromoterViewTestCase):
+    def test_blank_and_missing_countries_page_as_one_group(self):
+        # Interleave NULL and '' so each page mixes both
+        for index in range(7):
+            self.promoter(f'Unknown {index}', company_country=None if index % 2 else '')
+        self.promoter('Lisbon', company_country='PT')
+
+        seen = []
+        offset = 0
+        while offset is not None:
+            groups = group_by_country(
+                Promoter.objects.all(), 'company_country', names, 'promoters', limit=3, offset=offset
+            )
+            unknown = groups['Unknown']
+            self.assertEqual((unknown['code'], unknown['count'], unknown['offset']), (None, 7, offset))
+            self.assertLessEqual(len(unknown['promoters']), 3)
+            seen.extend(unknown['promoters'])
+            offset = unknown['next_offset']
+
+        self.assertEqual(seen, [f'Unknown {index}' for index in range(7)])
+        self.assertEqual(groups['Portugal']['code'], 'PT')
+
+
+class PromoterGroupingTests(PromoterViewTestCase):
+    def setUp(self):
+        super().setUp()
+        for name, promoter_type, country, active in [
+            ('Ana', 'festival', 'PT', True), ('Bruno', 'club', 'ES', True),
+            ('Carla', 'festival', 'PT', False), ('Duarte', 'club', 'PT', True),
+        ]:
+            self.promoter(name, promoter_type=promoter_type, company_country=country, is_active=active)
+        self.promoters = list(Promoter.objects.filter(agency=self.agency))
+
+    def test_by_type_and_by_country_match_grouping_in_python(self):
+        expected = {
+            value: {
+                'label': label,
+                'count': len([p for p in self.promoters if p.promoter_type == value]),
+                'promoters': [str(p.pk) for p in self.promoters if p.promoter_type == value],
+            }
+            for value, label in Promoter.PromoterType.choices
+        }
+        groups = self.client.get('/api/v1/promoters/by_type/').json()
+        self.assertEqual({
+            key: {**group, 'promoters': [item['id'] for item in group['promoters']]}
+            for key, group in groups.items()
+        }, expected)
+
+        groups = self.client.get('/api/v1/promoters/by_country/').json()
+        self.assertEqual(list(groups), ['Portugal', 'Spain'])
+        self.assertEqual(
+            [item['id'] for item in groups['Portugal']['promoters']],
+            [str(p.pk) for p in self.promoters if p.company_country == 'PT'],
+        )
+        self.assertEqual((groups['Portugal']['count'], groups['Portugal']['next_offset']), (3, None))
+
+    def test_dashboard_stats_match_separate_counts(self):
+        self.assertEqual(self.client.get('/api/v1/promoters/dashboard_stats/').json(), {
+            'total_promoters': 4,
+            'active_promoters': 3,
+            'inactive_promoters': 1,
+            'type_breakdown': {
+                value: {'label': label, 'count': len([p for p in self.promoters if p.promoter_type == value])}
+                for value, label in Promoter.PromoterType.choices
+            },
+            'recent_additions': 4,
+        })
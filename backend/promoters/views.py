@@ -10,10 +10,12 @@ from django.db.models import QuerySet, Q, Count
 from django.db import transaction
 from django_filters import rest_framework as django_filters
 from typing import Any, Dict
-from datetime import datetime, timedelta
 
 from .models import Promoter
+from config.stats import Breakdown, Recent, compute_stats
+from config.grouping import group_by_choices, group_by_country, parse_group_limit, parse_group_page
 from .serializers import PromoterSerializer
+from agencies.versioning import bump_data_version
 from agencies.permissions import (
     IsAgencyMember,
     IsAgencyManagerOrOwner,
@@ -183,6 +185,15 @@ class PromoterViewSet(PromoterQueryMixin, viewsets.ModelViewSet):
     ordering_fields = ['promoter_name', 'company_name', 'company_city', 'created_at', 'promoter_type']
     ordering = ['company_name', 'promoter_name']
     
+    # Metrics for dashboard_stats, computed in a single aggregate query
+    dashboard_stats_spec = {
+        'total_promoters': Q(),
+        'active_promoters': Q(is_active=True),
+        'inactive_promoters': Q(is_active=False),
+        'type_breakdown': Breakdown('promoter_type', Promoter.PromoterType.choices),
+        'recent_additions': Recent(days=30),
+    }
+    
     def get_queryset(self) -> QuerySet:
         """Get the queryset filtered by the user's agency with optimized joins."""
         return self.get_promoter_queryset()
@@ -309,11 +320,14 @@ class PromoterViewSet(PromoterQueryMixin, viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        agency_id = request.user.profile.agency_id
         with transaction.atomic():
             updated_count = Promoter.objects.filter(
                 id__in=promoter_ids,
-                agency=request.user.profile.agency
+                agency_id=agency_id
             ).update(is_active=is_active)
+            # update() sends no post_save, so bump the version ourselves
+            transaction.on_commit(lambda: bump_data_version(agency_id))
         
         return Response({
             'message': f'Updated {updated_count} promoters',
@@ -336,68 +350,43 @@ class PromoterViewSet(PromoterQueryMixin, viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def by_type(self, request):
-        """Get promoters grouped by type."""
-        queryset = self.get_queryset()
-        
-        type_groups = {}
-        for choice in Promoter.PromoterType.choices:
-            promoter_type = choice[0]
-            type_queryset = queryset.filter(promoter_type=promoter_type)
-            type_groups[promoter_type] = {
-                'label': choice[1],
-                'count': type_queryset.count(),
-                'promoters': self.get_serializer(type_queryset, many=True).data
-            }
+        """Get promoters grouped by type, with an optional per-group ``limit``."""
+        groups = group_by_choices(
+            self.get_queryset(),
+            'promoter_type',
+            Promoter.PromoterType.choices,
+            lambda rows: self.get_serializer(rows, many=True).data,
+            items_key='promoters',
+            limit=parse_group_limit(request)
+        )
         
-        return Response(type_groups)
+        return Response(groups)
     
     @action(detail=False, methods=['get'])
     def by_country(self, request):
-        """Get promoters grouped by country."""
-        queryset = self.get_queryset()
+        """
+        Get promoters grouped by country.
         
-        # Group by country
-        countries = {}
-        for promoter in queryset:
-            country = str(promoter.company_country.name) if promoter.company_country else 'Unknown'
-            if country not in countries:
-                countries[country] = []
-            countries[country].append(promoter)
-        
-        country_data = {}
-        for country, promoters in countries.items():
-            country_data[country] = {
-                'count': len(promoters),
-                'promoters': self.get_serializer(promoters, many=True).data
-            }
+        Members are paginated per group: each group holds at most ``?limit=``
+        promoters (default 25, ``DEFAULT_GROUP_PAGE_SIZE``) from ``?offset=``
+        (default 0), and reports ``offset`` and ``next_offset``, the offset
+        of its next page or null on the last one. ``?members=false`` returns
+        counts only.
+        """
+        include_members, limit, offset = parse_group_page(request)
+        groups = group_by_country(
+            self.get_queryset(),
+            'company_country',
+            lambda rows: self.get_serializer(rows, many=True).data,
+            items_key='promoters',
+            limit=limit,
+            offset=offset,
+            include_members=include_members
+        )
         
-        return Response(country_data)
+        return Response(groups)
     
     @action(detail=False, methods=['get'])
     def dashboard_stats(self, request):
         """Get promoter statistics for dashboard."""
-        queryset = self.get_queryset()
-        
-        total_promoters = queryset.count()
-        active_promoters = queryset.filter(is_active=True).count()
-        inactive_promoters = total_promoters - active_promoters
-        
-        # Group by type
-        type_breakdown = {}
-        for choice in Promoter.PromoterType.choices:
-            type_breakdown[choice[0]] = {
-                'label': choice[1],
-                'count': queryset.filter(promoter_type=choice[0]).count()
-            }
-        
-        # Recent additions
-        last_30_days = datetime.now() - timedelta(days=30)
-        recent_additions = queryset.filter(created_at__gte=last_30_days).count()
-        
-        return Response({
-            'total_promoters': total_promoters,
-            'active_promoters': active_promoters,
-            'inactive_promoters': inactive_promoters,
-            'type_breakdown': type_breakdown,
-            'recent_additions': recent_additions
-        })
\ No newline at end of file
+        return Response(compute_stats(self.get_queryset(), self.dashboard_stats_spec))
\ No newline at end of file
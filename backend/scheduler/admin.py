@@ -0,0 +1,32 @@
+from django.contrib import admin
+
+from .models import JobRun, ScheduledJob
+
+
+@admin.register(ScheduledJob)
+class ScheduledJobAdmin(admin.ModelAdmin):
+    list_display = [
+        'name', 'next_run_at', 'last_status', 'last_started_at', 'last_duration_ms',
+        'run_count', 'failure_count', 'lease_owner'
+    ]
+    list_filter = ['last_status']
+    search_fields = ['name']
+    readonly_fields = [
+        'name', 'lease_owner', 'lease_expires_at', 'last_started_at', 'last_finished_at',
+        'last_status', 'last_duration_ms', 'run_count', 'failure_count', 'total_duration_ms',
+        'created_at', 'updated_at'
+    ]
+
+
+@admin.register(JobRun)
+class JobRunAdmin(admin.ModelAdmin):
+    list_display = ['job_name', 'status', 'started_at', 'duration_ms', 'owner']
+    list_filter = ['status', 'job_name']
+    search_fields = ['job_name', 'owner']
+    date_hierarchy = 'started_at'
+    readonly_fields = [
+        'job_name', 'owner', 'status', 'started_at', 'finished_at', 'duration_ms', 'result', 'error'
+    ]
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class SchedulerConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'scheduler'
+    verbose_name = 'Periodic Jobs'
+
+    def ready(self):
+        """Import every installed app's ``periodic`` module to register its jobs."""
+        from django.utils.module_loading import autodiscover_modules
+        autodiscover_modules('periodic')
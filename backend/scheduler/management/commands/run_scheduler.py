@@ -0,0 +1,149 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+
+from scheduler.models import ScheduledJob
+from scheduler.registry import get_job, get_jobs, get_scheduler_config
+from scheduler.runner import next_due_at, node_id, run_job, sync_jobs
+
+
+class Command(BaseCommand):
+    """
+    Management command running the registered periodic jobs.
+
+    Usage:
+        python manage.py run_scheduler
+        python manage.py run_scheduler --once
+        python manage.py run_scheduler --job mark_overdue
+        python manage.py run_scheduler --list
+
+    Run it as a long-lived process on one or more nodes; database leases
+    make sure each job runs on only one node at a time. Stops cleanly on
+    SIGINT/SIGTERM after the job in progress.
+    """
+
+    help = 'Run registered periodic jobs (overdue invoices, booking completion, dashboard warmup)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run the jobs that are due, then exit',
+        )
+
+        parser.add_argument(
+            '--job',
+            type=str,
+            help='Run this job now, whether or not it is due, then exit',
+        )
+
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help='List jobs with their schedule and metrics, then exit',
+        )
+
+        parser.add_argument(
+            '--poll',
+            type=float,
+            help='Maximum seconds between checks for due jobs (default: SCHEDULER["POLL_INTERVAL"])',
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        if options['list']:
+            self.list_jobs()
+            return
+
+        owner = node_id()
+        if options['job']:
+            job = get_job(options['job'])
+            if job is None:
+                raise CommandError(f"Unknown job: {options['job']}")
+            sync_jobs([job])
+            run = run_job(job, owner, force=True)
+            if run is None:
+                raise CommandError(f'{job.name} is running on another node')
+            self.report(run)
+            return
+
+        jobs = get_jobs()
+        if not jobs:
+            self.stdout.write(self.style.WARNING('No periodic jobs are enabled'))
+            return
+        sync_jobs(jobs)
+
+        if options['once']:
+            self.run_due(jobs, owner)
+            return
+
+        poll = options['poll'] or get_scheduler_config()['POLL_INTERVAL']
+        stop = threading.Event()
+
+        def request_stop(signum, frame):
+            self.stdout.write(self.style.NOTICE('\nStopping after the current job...'))
+            stop.set()
+
+        signal.signal(signal.SIGINT, request_stop)
+        signal.signal(signal.SIGTERM, request_stop)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✓ Scheduler {owner} started with {len(jobs)} job(s)')
+        )
+        while not stop.is_set():
+            close_old_connections()
+            self.run_due(jobs, owner, stop)
+            next_run_at = next_due_at(jobs)
+            wait = poll
+            if next_run_at is not None:
+                wait = min(poll, max((next_run_at - timezone.now()).total_seconds(), 0))
+            # Never spin: another node may hold a job that is already due
+            stop.wait(max(wait, 1))
+
+        self.stdout.write(self.style.SUCCESS('✓ Scheduler stopped'))
+
+    def run_due(self, jobs, owner, stop=None):
+        for job in jobs:
+            if stop is not None and stop.is_set():
+                return
+            run = run_job(job, owner)
+            if run is not None:
+                self.report(run)
+
+    def report(self, run):
+        if run.status == run.Status.SUCCEEDED:
+            self.stdout.write(
+                self.style.SUCCESS(f'✓ {run.job_name} ({run.duration_ms} ms): {run.result}')
+            )
+        else:
+            self.stdout.write(
+                self.style.ERROR(f'✗ {run.job_name} failed after {run.duration_ms} ms')
+            )
+
+    def list_jobs(self):
+        jobs = get_jobs(include_disabled=True)
+        schedules = {row.name: row for row in ScheduledJob.objects.filter(name__in=[job.name for job in jobs])}
+        for job in jobs:
+            row = schedules.get(job.name)
+            state = 'enabled' if job.enabled else 'disabled'
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n{job.name}') + f' ({state}, every {job.interval}s)')
+            if job.description:
+                self.stdout.write(f'  {job.description}')
+            if row is None:
+                self.stdout.write('  Never scheduled')
+                continue
+            self.stdout.write(f'  Next run: {row.next_run_at:%Y-%m-%d %H:%M:%S}')
+            if row.lease_owner:
+                self.stdout.write(f'  Running on: {row.lease_owner} (lease until {row.lease_expires_at:%H:%M:%S})')
+            if row.run_count:
+                self.stdout.write(
+                    f'  Last run: {row.last_started_at:%Y-%m-%d %H:%M:%S} {row.last_status} '
+                    f'in {row.last_duration_ms} ms'
+                )
+                self.stdout.write(
+                    f'  Runs: {row.run_count}, failures: {row.failure_count}, '
+                    f'average: {row.average_duration_ms} ms'
+                )
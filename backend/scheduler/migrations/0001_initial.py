@@ -0,0 +1,58 @@
+# Generated by Django 5.2.4 on 2026-10-19 01:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduledJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('next_run_at', models.DateTimeField(db_index=True)),
+                ('lease_owner', models.CharField(blank=True, max_length=255)),
+                ('lease_expires_at', models.DateTimeField(blank=True, null=True)),
+                ('last_started_at', models.DateTimeField(blank=True, null=True)),
+                ('last_finished_at', models.DateTimeField(blank=True, null=True)),
+                ('last_status', models.CharField(blank=True, choices=[('succeeded', 'Succeeded'), ('failed', 'Failed')], max_length=20)),
+                ('last_duration_ms', models.PositiveIntegerField(blank=True, null=True)),
+                ('run_count', models.PositiveIntegerField(default=0)),
+                ('failure_count', models.PositiveIntegerField(default=0)),
+                ('total_duration_ms', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Scheduled Job',
+                'verbose_name_plural': 'Scheduled Jobs',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_name', models.CharField(max_length=100)),
+                ('owner', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='running', max_length=20)),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('duration_ms', models.PositiveIntegerField(blank=True, null=True)),
+                ('result', models.JSONField(blank=True, default=dict)),
+                ('error', models.TextField(blank=True)),
+            ],
+            options={
+                'verbose_name': 'Job Run',
+                'verbose_name_plural': 'Job Runs',
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['job_name', '-started_at'], name='scheduler_j_job_nam_92301d_idx'), models.Index(fields=['started_at'], name='scheduler_j_started_4bf3b2_idx')],
+            },
+        ),
+    ]
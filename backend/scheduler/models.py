@@ -0,0 +1,75 @@
+from django.db import models
+
+from config.models import TimestampedModel
+
+
+class ScheduledJob(TimestampedModel):
+    """
+    Schedule, lease and running metrics of one registered periodic job.
+
+    A node runs a job only after taking its lease with a conditional UPDATE
+    (see scheduler/runner.py), so each job runs on one node at a time.
+    """
+
+    class Status(models.TextChoices):
+        SUCCEEDED = 'succeeded', 'Succeeded'
+        FAILED = 'failed', 'Failed'
+
+    name = models.CharField(max_length=100, unique=True)
+    next_run_at = models.DateTimeField(db_index=True)
+
+    lease_owner = models.CharField(max_length=255, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+
+    last_started_at = models.DateTimeField(null=True, blank=True)
+    last_finished_at = models.DateTimeField(null=True, blank=True)
+    last_status = models.CharField(max_length=20, choices=Status.choices, blank=True)
+    last_duration_ms = models.PositiveIntegerField(null=True, blank=True)
+
+    run_count = models.PositiveIntegerField(default=0)
+    failure_count = models.PositiveIntegerField(default=0)
+    total_duration_ms = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        ordering = ['name']
+        verbose_name = 'Scheduled Job'
+        verbose_name_plural = 'Scheduled Jobs'
+
+    def __str__(self):
+        return self.name
+
+    @property
+    def average_duration_ms(self):
+        if not self.run_count:
+            return None
+        return self.total_duration_ms // self.run_count
+
+
+class JobRun(models.Model):
+    """One execution of a periodic job."""
+
+    class Status(models.TextChoices):
+        RUNNING = 'running', 'Running'
+        SUCCEEDED = 'succeeded', 'Succeeded'
+        FAILED = 'failed', 'Failed'
+
+    job_name = models.CharField(max_length=100)
+    owner = models.CharField(max_length=255)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.RUNNING)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration_ms = models.PositiveIntegerField(null=True, blank=True)
+    result = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['-started_at']
+        verbose_name = 'Job Run'
+        verbose_name_plural = 'Job Runs'
+        indexes = [
+            models.Index(fields=['job_name', '-started_at']),
+            models.Index(fields=['started_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.job_name} at {self.started_at:%Y-%m-%d %H:%M:%S} ({self.status})"
@@ -0,0 +1,10 @@
+# scheduler/periodic.py
+
+from .registry import get_scheduler_config, periodic_job
+from .runner import prune_history
+
+
+@periodic_job(interval=86400, jitter=3600)
+def prune_job_runs():
+    """Delete run history older than SCHEDULER['HISTORY_DAYS'] days."""
+    return {'deleted': prune_history(get_scheduler_config()['HISTORY_DAYS'])}
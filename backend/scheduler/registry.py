@@ -0,0 +1,95 @@
+# scheduler/registry.py
+
+"""
+Registry of periodic jobs.
+
+Apps register jobs in a ``periodic.py`` module, which the scheduler app
+imports at startup::
+
+    @periodic_job(interval=900, jitter=120)
+    def complete_bookings():
+        ...
+        return {'completed': n}
+
+A job takes no arguments and may return a JSON-serializable dict, stored as
+the result of its run. ``SCHEDULER['JOBS']`` overrides ``interval``,
+``jitter``, ``lease`` or ``enabled`` per job name.
+"""
+
+import random
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+
+
+DEFAULT_SCHEDULER = {
+    'POLL_INTERVAL': 30,
+    'HISTORY_DAYS': 14,
+    'JOBS': {},
+}
+
+
+@dataclass(frozen=True)
+class PeriodicJob:
+    name: str
+    func: Callable[[], Optional[Dict[str, Any]]]
+    # Seconds between the starts of consecutive runs
+    interval: int
+    # Up to this many seconds are added to each interval, so nodes and jobs drift apart
+    jitter: int = 0
+    # Seconds a node holds the job; must exceed the job's longest run
+    lease: int = 1800
+    enabled: bool = True
+    description: str = ''
+
+    def next_run_at(self, started_at: datetime) -> datetime:
+        return started_at + timedelta(seconds=self.interval + random.uniform(0, self.jitter))
+
+
+_jobs: Dict[str, PeriodicJob] = {}
+
+
+def get_scheduler_config() -> Dict[str, Any]:
+    return {**DEFAULT_SCHEDULER, **getattr(settings, 'SCHEDULER', {})}
+
+
+def periodic_job(name: Optional[str] = None, *, interval: int, jitter: int = 0, lease: int = 1800,
+                 enabled: bool = True):
+    """Register the decorated function as a periodic job; ``enabled=False`` jobs are opt-in."""
+    def decorator(func):
+        job_name = name or func.__name__
+        if job_name in _jobs and _jobs[job_name].func is not func:
+            raise ValueError(f"Periodic job '{job_name}' is already registered")
+        _jobs[job_name] = PeriodicJob(
+            name=job_name,
+            func=func,
+            interval=interval,
+            jitter=jitter,
+            lease=lease,
+            enabled=enabled,
+            description=(func.__doc__ or '').strip().split('\n')[0],
+        )
+        return func
+    return decorator
+
+
+def get_jobs(include_disabled: bool = False) -> List[PeriodicJob]:
+    """Registered jobs with ``SCHEDULER['JOBS']`` overrides applied, by name."""
+    overrides = get_scheduler_config()['JOBS']
+    jobs = []
+    for name in sorted(_jobs):
+        job = _jobs[name]
+        if name in overrides:
+            job = replace(job, **overrides[name])
+        if job.enabled or include_disabled:
+            jobs.append(job)
+    return jobs
+
+
+def get_job(name: str) -> Optional[PeriodicJob]:
+    for job in get_jobs(include_disabled=True):
+        if job.name == name:
+            return job
+    return None
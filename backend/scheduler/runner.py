@@ -0,0 +1,118 @@
+# scheduler/runner.py
+
+"""
+Running periodic jobs under database leases.
+
+Every node running ``manage.py run_scheduler`` polls the same
+``ScheduledJob`` rows. Taking a lease is a single conditional UPDATE that
+only succeeds while the job is due and nobody else holds an unexpired
+lease, so however many nodes poll, each run happens exactly once. A node
+that dies mid-run loses its lease when it expires and another node takes
+over.
+"""
+
+import logging
+import os
+import random
+import socket
+import time
+import traceback
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from django.db.models import F, Min, Q
+from django.utils import timezone
+
+from .models import JobRun, ScheduledJob
+from .registry import PeriodicJob
+
+logger = logging.getLogger(__name__)
+
+
+def node_id() -> str:
+    """Identify this scheduler process in leases and run history."""
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def sync_jobs(jobs: Iterable[PeriodicJob]) -> None:
+    """Create schedule rows for newly registered jobs, first due after a random part of their jitter."""
+    now = timezone.now()
+    ScheduledJob.objects.bulk_create(
+        [
+            ScheduledJob(name=job.name, next_run_at=now + timedelta(seconds=random.uniform(0, job.jitter)))
+            for job in jobs
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def acquire_lease(job: PeriodicJob, owner: str, force: bool = False) -> bool:
+    """Take the job's lease if it is due (or ``force``) and not held by a live node."""
+    now = timezone.now()
+    available = Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lte=now)
+    queryset = ScheduledJob.objects.filter(available, name=job.name)
+    if not force:
+        queryset = queryset.filter(next_run_at__lte=now)
+    return queryset.update(
+        lease_owner=owner,
+        lease_expires_at=now + timedelta(seconds=job.lease),
+        updated_at=now,
+    ) == 1
+
+
+def run_job(job: PeriodicJob, owner: str, force: bool = False) -> Optional[JobRun]:
+    """
+    Run ``job`` if this node gets its lease, and record the run.
+
+    Returns the ``JobRun``, or None when the job was not due or another node
+    holds it. Exceptions raised by the job are recorded, not propagated.
+    """
+    if not acquire_lease(job, owner, force=force):
+        return None
+
+    started_at = timezone.now()
+    run = JobRun.objects.create(job_name=job.name, owner=owner, started_at=started_at)
+    start = time.monotonic()
+    try:
+        run.result = job.func() or {}
+        run.status = JobRun.Status.SUCCEEDED
+    except Exception as e:
+        logger.exception(f"Periodic job {job.name} failed: {str(e)}")
+        run.status = JobRun.Status.FAILED
+        run.error = traceback.format_exc()
+
+    run.duration_ms = int((time.monotonic() - start) * 1000)
+    run.finished_at = timezone.now()
+    run.save(update_fields=['status', 'result', 'error', 'duration_ms', 'finished_at'])
+
+    failed = run.status == JobRun.Status.FAILED
+    ScheduledJob.objects.filter(name=job.name, lease_owner=owner).update(
+        # A run longer than the interval is followed by the next one straight away
+        next_run_at=max(job.next_run_at(started_at), run.finished_at),
+        lease_owner='',
+        lease_expires_at=None,
+        last_started_at=started_at,
+        last_finished_at=run.finished_at,
+        last_status=ScheduledJob.Status.FAILED if failed else ScheduledJob.Status.SUCCEEDED,
+        last_duration_ms=run.duration_ms,
+        run_count=F('run_count') + 1,
+        failure_count=F('failure_count') + int(failed),
+        total_duration_ms=F('total_duration_ms') + run.duration_ms,
+        updated_at=run.finished_at,
+    )
+    return run
+
+
+def next_due_at(jobs: Iterable[PeriodicJob]) -> Optional[datetime]:
+    """Earliest time one of ``jobs`` is due."""
+    return ScheduledJob.objects.filter(
+        name__in=[job.name for job in jobs]
+    ).aggregate(next_run_at=Min('next_run_at'))['next_run_at']
+
+
+def prune_history(days: int) -> int:
+    """Delete job runs that started more than ``days`` days ago."""
+    deleted, _ = JobRun.objects.filter(
+        started_at__lt=timezone.now() - timedelta(days=days)
+    ).delete()
+    return deleted
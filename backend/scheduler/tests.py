@@ -0,0 +1,101 @@
+import threading
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from .models import JobRun, ScheduledJob
+from .registry import PeriodicJob
+from .runner import acquire_lease, run_job, sync_jobs
+
+
+def periodic(func=None, **options):
+    return PeriodicJob(name='test_job', func=func or (lambda: None), interval=3600, **options)
+
+
+class LeaseTests(TestCase):
+    def setUp(self):
+        self.job = periodic()
+        sync_jobs([self.job])
+
+    def test_only_one_node_holds_the_lease(self):
+        self.assertTrue(acquire_lease(self.job, 'node-a'))
+        self.assertFalse(acquire_lease(self.job, 'node-b'))
+        self.assertFalse(acquire_lease(self.job, 'node-b', force=True))
+        self.assertEqual(ScheduledJob.objects.get(name='test_job').lease_owner, 'node-a')
+
+    def test_expired_lease_is_taken_over(self):
+        self.assertTrue(acquire_lease(self.job, 'node-a'))
+        ScheduledJob.objects.filter(name='test_job').update(
+            lease_expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertTrue(acquire_lease(self.job, 'node-b'))
+        self.assertEqual(ScheduledJob.objects.get(name='test_job').lease_owner, 'node-b')
+
+    def test_job_that_is_not_due_runs_only_when_forced(self):
+        ScheduledJob.objects.filter(name='test_job').update(next_run_at=timezone.now() + timedelta(hours=1))
+        self.assertIsNone(run_job(self.job, 'node-a'))
+        self.assertIsNotNone(run_job(self.job, 'node-a', force=True))
+
+    def test_due_job_runs_once_under_two_lease_holders(self):
+        attempts = []
+
+        def func():
+            # node-b polls while node-a is running the job
+            if not attempts:
+                attempts.append(run_job(job, 'node-b'))
+            return {'ran': True}
+
+        job = periodic(func)
+        run = run_job(job, 'node-a')
+        # ...and again once node-a has finished
+        self.assertIsNone(run_job(job, 'node-b'))
+
+        self.assertEqual(attempts, [None])
+        self.assertEqual(run.status, JobRun.Status.SUCCEEDED)
+        self.assertEqual(JobRun.objects.filter(job_name='test_job').count(), 1)
+        scheduled = ScheduledJob.objects.get(name='test_job')
+        self.assertEqual(scheduled.run_count, 1)
+        self.assertEqual(scheduled.lease_owner, '')
+        self.assertGreater(scheduled.next_run_at, run.started_at + timedelta(minutes=59))
+
+    def test_failed_run_is_recorded_and_releases_the_lease(self):
+        def func():
+            raise RuntimeError('boom')
+
+        run = run_job(periodic(func), 'node-a')
+        self.assertEqual(run.status, JobRun.Status.FAILED)
+        self.assertIn('boom', run.error)
+        scheduled = ScheduledJob.objects.get(name='test_job')
+        self.assertEqual((scheduled.failure_count, scheduled.lease_owner), (1, ''))
+        self.assertIsNone(scheduled.lease_expires_at)
+
+
+class ConcurrentLeaseTests(TransactionTestCase):
+    def test_due_job_runs_once_across_concurrent_nodes(self):
+        ran = []
+        job = periodic(lambda: ran.append(1))
+        sync_jobs([job])
+        start = threading.Barrier(8)
+        errors = []
+
+        def node(index):
+            start.wait()
+            try:
+                run_job(job, f'node-{index}')
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=node, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(ran), 1)
+        self.assertEqual(JobRun.objects.count(), 1)
+        self.assertEqual(ScheduledJob.objects.get(name='test_job').run_count, 1)
@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from .models import SearchEntry
+
+
+@admin.register(SearchEntry)
+class SearchEntryAdmin(admin.ModelAdmin):
+    list_display = ['title', 'entity_type', 'entity_id', 'agency', 'gram_count', 'updated_at']
+    list_filter = ['entity_type']
+    search_fields = ['title', 'entity_id']
+    raw_id_fields = ['agency']
+    readonly_fields = ['entity_type', 'entity_id', 'title', 'subtitle', 'gram_count', 'updated_at']
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'search'
+    verbose_name = 'Global Search'
+
+    def ready(self):
+        """Initialize app when Django starts."""
+        import search.signals
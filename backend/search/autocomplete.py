@@ -0,0 +1,152 @@
+# search/autocomplete.py
+
+"""
+In-process prefix index behind ``GET /api/v1/autocomplete/``.
+
+Each worker process keeps, per agency and entity type, the names of every
+artist, promoter, venue or contact as sorted arrays of normalised keys
+(lower-cased, accents stripped). A lookup is a binary search for the typed
+prefix followed by a short scan, so it never touches the database:
+
+- names starting with the prefix come first ("lis" -> "Lisboa Live");
+- then names with a later word starting with it ("rec" -> "Coliseu dos
+  Recreios"), and words of the ``extra`` fields (a promoter's company).
+
+An index is built on first use and tagged with the agency's data version
+(agencies/versioning.py). Any write to the agency's data bumps the version,
+and the next lookup rebuilds the index with one query. At most
+``MAX_INDEXES`` indexes are kept, least recently used first out.
+"""
+
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.apps import apps
+from django.conf import settings
+
+from agencies.versioning import get_data_version
+from .index import words
+
+
+DEFAULT_AUTOCOMPLETE = {
+    'MAX_INDEXES': 200,
+    'DEFAULT_LIMIT': 10,
+    'MAX_LIMIT': 50,
+}
+
+
+def get_autocomplete_config() -> Dict[str, Any]:
+    return {**DEFAULT_AUTOCOMPLETE, **getattr(settings, 'AUTOCOMPLETE', {})}
+
+
+@dataclass(frozen=True)
+class Picker:
+    model_label: str
+    name_field: str
+    # Other fields whose words also find the row
+    extra: Tuple[str, ...] = ()
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+
+PICKERS: Dict[str, Picker] = {
+    'artist': Picker('artists.Artist', 'artist_name'),
+    'promoter': Picker('promoters.Promoter', 'promoter_name', extra=('company_name',)),
+    'venue': Picker('venues.Venue', 'venue_name'),
+    'contact': Picker('contacts.Contact', 'contact_name', extra=('contact_email',)),
+}
+
+
+def normalize(text: str) -> str:
+    return ' '.join(words(text))
+
+
+class PrefixIndex:
+    """Immutable sorted-array prefix index of ``(id, name)`` pairs."""
+
+    def __init__(self, rows: Iterable[Tuple[Any, str, Sequence[str]]]):
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        starts, later = [], []
+        for position, (pk, name, extra) in enumerate(rows):
+            self.ids.append(str(pk))
+            self.names.append(name or '')
+            name_words = words(name or '')
+            starts.append((' '.join(name_words), position))
+            later.extend((' '.join(name_words[i:]), position) for i in range(1, len(name_words)))
+            for text in extra:
+                extra_words = words(text or '')
+                later.extend((' '.join(extra_words[i:]), position) for i in range(len(extra_words)))
+        starts.sort()
+        later.sort()
+        self._starts = ([key for key, _ in starts], [position for _, position in starts])
+        self._later = ([key for key, _ in later], [position for _, position in later])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def lookup(self, query: str, limit: int) -> List[Dict[str, str]]:
+        prefix = normalize(query)
+        found: List[int] = []
+        seen = set()
+        for keys, positions in (self._starts, self._later):
+            index = bisect_left(keys, prefix)
+            while index < len(keys) and len(found) < limit and keys[index].startswith(prefix):
+                if positions[index] not in seen:
+                    seen.add(positions[index])
+                    found.append(positions[index])
+                index += 1
+            if len(found) >= limit:
+                break
+        return [{'id': self.ids[position], 'name': self.names[position]} for position in found]
+
+
+_indexes: 'OrderedDict[Tuple[Any, str], Tuple[int, PrefixIndex]]' = OrderedDict()
+_indexes_lock = threading.Lock()
+_build_locks: Dict[Tuple[Any, str], threading.Lock] = {}
+
+
+def build_index(agency_id, entity_type: str) -> PrefixIndex:
+    picker = PICKERS[entity_type]
+    fields = [picker.name_field, *picker.extra]
+    rows = picker.model.objects.filter(agency_id=agency_id).values_list('pk', *fields)
+    return PrefixIndex((row[0], row[1], row[2:]) for row in rows.iterator(chunk_size=5000))
+
+
+def get_index(agency_id, entity_type: str) -> PrefixIndex:
+    """The agency's index for ``entity_type``, rebuilt if the agency's data changed."""
+    key = (agency_id, entity_type)
+    version = get_data_version(agency_id)
+    with _indexes_lock:
+        cached = _indexes.get(key)
+        if cached is not None and cached[0] == version:
+            _indexes.move_to_end(key)
+            return cached[1]
+        build_lock = _build_locks.setdefault(key, threading.Lock())
+
+    # One thread rebuilds; the others wait for its result instead of querying too
+    with build_lock:
+        with _indexes_lock:
+            cached = _indexes.get(key)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+        index = build_index(agency_id, entity_type)
+        with _indexes_lock:
+            _indexes[key] = (version, index)
+            _indexes.move_to_end(key)
+            while len(_indexes) > get_autocomplete_config()['MAX_INDEXES']:
+                evicted, _ = _indexes.popitem(last=False)
+                _build_locks.pop(evicted, None)
+    return index
+
+
+def autocomplete(agency_id, entity_type: str, query: str, limit: Optional[int] = None) -> List[Dict[str, str]]:
+    """Up to ``limit`` ``{'id', 'name'}`` pairs of ``entity_type`` whose name matches ``query``."""
+    config = get_autocomplete_config()
+    limit = min(limit or config['DEFAULT_LIMIT'], config['MAX_LIMIT'])
+    return get_index(agency_id, entity_type).lookup(query, limit)
@@ -0,0 +1,373 @@
+# search/index.py
+
+"""
+Per-agency trigram index behind ``GET /api/v1/search/``.
+
+Every artist, promoter, venue, contact and booking has a ``SearchEntry``
+and one ``SearchGram`` row per distinct trigram of its searchable text
+(words lower-cased, accents stripped, padded like pg_trgm: ``"  w"``,
+``" wo"``, ``"wor"``, ``"ord"``, ``"rd "``).
+
+A search is one query. Candidate entries come from the postings of the
+query's rarest trigrams, read from the (agency, gram, entry_size, entry)
+index; when those are too common to take whole, the shortest entries are
+taken first, as exact matches of a short query are short. Each
+candidate's matched trigrams are then counted on the (entry, gram) index,
+so common trigrams never cost a scan of their postings. Entries holding at
+least ``MIN_COVERAGE`` of the query's trigrams are ranked by that count,
+then by the share of the entry's own trigrams matched, so shorter and
+closer names come first. Trigram frequencies, which decide what is rare,
+come from a small capped probe and are cached. A typo only costs the trigrams around it, so
+"lisbn" still finds "Lisbon". The last query word is matched as a prefix
+(no closing trigram), because it may still be being typed.
+
+Rows that existed when the app was installed are indexed by migration
+0003. Entries are kept current by the signals in search/signals.py. Bulk writes
+that bypass signals must call ``index_objects``/``remove_objects``, or be
+followed by ``manage.py rebuild_global_search``.
+"""
+
+import math
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import SearchEntry, SearchGram
+
+
+DEFAULT_GLOBAL_SEARCH = {
+    # Share of the query's trigrams an entry must contain to match
+    'MIN_COVERAGE': 0.5,
+    'DEFAULT_LIMIT': 20,
+    'MAX_LIMIT': 50,
+    # Entries scored per search; bounds the cost of very common trigrams
+    'MAX_CANDIDATES': 2000,
+    # Gram frequencies are counted up to this; the rarest grams pick the candidates
+    'FREQUENCY_CAP': 20000,
+    'FREQUENCY_CACHE_TIMEOUT': 3600,
+}
+
+ENTRY_TABLE = SearchEntry._meta.db_table
+GRAM_TABLE = SearchGram._meta.db_table
+
+_WORD = re.compile(r'[^\W_]+')
+
+
+def get_search_config() -> Dict[str, Any]:
+    return {**DEFAULT_GLOBAL_SEARCH, **getattr(settings, 'GLOBAL_SEARCH', {})}
+
+
+@dataclass(frozen=True)
+class Source:
+    """How one model is indexed."""
+    entity_type: str
+    model_label: str
+    # Text fields, the first being the entry's title
+    fields: Tuple[str, ...]
+    subtitle: Callable[[Any], str]
+    title: Optional[Callable[[Any], str]] = None
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def get_title(self, obj) -> str:
+        return self.title(obj) if self.title else getattr(obj, self.fields[0])
+
+    def text(self, obj) -> str:
+        return ' '.join(str(getattr(obj, field) or '') for field in self.fields)
+
+
+def _join(*parts) -> str:
+    return ', '.join(str(part) for part in parts if part)
+
+
+SOURCES: Dict[str, Source] = {
+    source.entity_type: source for source in [
+        Source(
+            'artist', 'artists.Artist',
+            fields=('artist_name',),
+            subtitle=lambda a: _join(a.get_artist_type_display(), a.country.code if a.country else ''),
+        ),
+        Source(
+            'promoter', 'promoters.Promoter',
+            fields=('promoter_name', 'company_name', 'company_city'),
+            subtitle=lambda p: _join(p.company_name, p.company_city),
+        ),
+        Source(
+            'venue', 'venues.Venue',
+            fields=('venue_name', 'venue_city'),
+            subtitle=lambda v: _join(v.venue_city, v.venue_country.code if v.venue_country else ''),
+        ),
+        Source(
+            'contact', 'contacts.Contact',
+            fields=('contact_name', 'contact_email', 'city'),
+            subtitle=lambda c: _join(c.job_title or c.get_contact_type_display(), c.city),
+        ),
+        Source(
+            'booking', 'bookings.Booking',
+            fields=('event_name', 'booking_reference', 'location_city'),
+            title=lambda b: b.event_name or b.booking_reference,
+            subtitle=lambda b: _join(b.booking_reference, b.booking_date.date().isoformat(), b.location_city),
+        ),
+    ]
+}
+
+
+def source_for(model) -> Optional[Source]:
+    label = model._meta.label
+    for source in SOURCES.values():
+        if source.model_label == label:
+            return source
+    return None
+
+
+# Trigrams
+
+def words(text: str) -> List[str]:
+    """Lower-cased words of ``text`` with accents stripped."""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return _WORD.findall(''.join(char for char in decomposed if not unicodedata.combining(char)))
+
+
+def word_trigrams(word: str, prefix: bool = False) -> List[str]:
+    padded = f'  {word}' if prefix else f'  {word} '
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def document_trigrams(text: str) -> Set[str]:
+    return {gram for word in words(text) for gram in word_trigrams(word)}
+
+
+def query_trigrams(query: str) -> Set[str]:
+    """Trigrams of ``query``, its last word matched as a prefix."""
+    query_words = words(query)
+    grams = set()
+    for position, word in enumerate(query_words):
+        grams.update(word_trigrams(word, prefix=position == len(query_words) - 1))
+    return grams
+
+
+# Maintenance
+
+def index_objects(objects: Iterable, registry=None) -> int:
+    """
+    Write the search entries of ``objects`` (any indexed models); return how many.
+
+    ``registry`` is the app registry to take the search models from, the
+    historical one when called from a migration.
+    """
+    registry = registry or apps
+    entry_model = registry.get_model('search', 'SearchEntry')
+    gram_model = registry.get_model('search', 'SearchGram')
+    by_source: Dict[str, List] = {}
+    for obj in objects:
+        source = source_for(type(obj))
+        if source is not None and obj.pk is not None:
+            by_source.setdefault(source.entity_type, []).append(obj)
+
+    count = 0
+    with transaction.atomic():
+        for entity_type, batch in by_source.items():
+            source = SOURCES[entity_type]
+            documents = {
+                str(obj.pk): (obj, document_trigrams(source.text(obj))) for obj in batch
+            }
+            existing = {
+                entry.entity_id: entry
+                for entry in entry_model.objects.filter(entity_type=entity_type, entity_id__in=list(documents))
+            }
+            gram_model.objects.filter(entry__in=list(existing.values())).delete()
+
+            created, updated = [], []
+            now = timezone.now()
+            for entity_id, (obj, grams) in documents.items():
+                entry = existing.get(entity_id) or entry_model(entity_type=entity_type, entity_id=entity_id)
+                entry.agency_id = obj.agency_id
+                entry.title = (source.get_title(obj) or '')[:255]
+                entry.subtitle = (source.subtitle(obj) or '')[:255]
+                entry.gram_count = len(grams)
+                entry.updated_at = now
+                (updated if entry.pk else created).append(entry)
+            entry_model.objects.bulk_create(created)
+            entry_model.objects.bulk_update(updated, ['agency', 'title', 'subtitle', 'gram_count', 'updated_at'])
+
+            entries = {entry.entity_id: entry for entry in created + updated}
+            if any(entry.pk is None for entry in created):
+                # Backends that cannot return ids from bulk_create
+                entries = {
+                    entry.entity_id: entry
+                    for entry in entry_model.objects.filter(entity_type=entity_type, entity_id__in=list(documents))
+                }
+            gram_model.objects.bulk_create(
+                [
+                    gram_model(
+                        agency_id=entries[entity_id].agency_id,
+                        gram=gram,
+                        entry=entries[entity_id],
+                        entry_size=len(grams),
+                    )
+                    for entity_id, (_, grams) in documents.items()
+                    for gram in grams
+                ],
+                batch_size=5000,
+            )
+            count += len(documents)
+    return count
+
+
+def remove_objects(model, pks: Sequence) -> int:
+    """Drop the search entries of ``model`` rows ``pks``; return how many."""
+    source = source_for(model)
+    if source is None or not pks:
+        return 0
+    entries = SearchEntry.objects.filter(entity_type=source.entity_type, entity_id__in=[str(pk) for pk in pks])
+    SearchGram.objects.filter(entry__in=entries).delete()
+    deleted, _ = entries.delete()
+    return deleted
+
+
+def rebuild(agency_id=None, entity_types: Optional[Sequence[str]] = None, batch_size: int = 1000,
+            registry=None) -> Dict[str, int]:
+    """Re-index every row (of one agency, if given); return counts per entity type."""
+    registry = registry or apps
+    entry_model = registry.get_model('search', 'SearchEntry')
+    gram_model = registry.get_model('search', 'SearchGram')
+    counts = {}
+    for entity_type in entity_types or SOURCES:
+        source = SOURCES[entity_type]
+        stale = entry_model.objects.filter(entity_type=entity_type)
+        rows = registry.get_model(source.model_label).objects.order_by('pk')
+        if agency_id is not None:
+            stale = stale.filter(agency_id=agency_id)
+            rows = rows.filter(agency_id=agency_id)
+        with transaction.atomic():
+            gram_model.objects.filter(entry__in=stale).delete()
+            stale.delete()
+        counts[entity_type] = 0
+        batch = []
+        for obj in rows.iterator(chunk_size=batch_size):
+            batch.append(obj)
+            if len(batch) == batch_size:
+                counts[entity_type] += index_objects(batch, registry)
+                batch = []
+        counts[entity_type] += index_objects(batch, registry)
+    return counts
+
+
+# Queries
+
+def gram_frequencies(agency_id, grams: Sequence[str]) -> Dict[str, int]:
+    """
+    How many of the agency's entries contain each gram, counted up to ``FREQUENCY_CAP``.
+
+    Only the order matters, so counts are cached for ``FREQUENCY_CACHE_TIMEOUT``;
+    zeros are not, since a gram no entry had could be in the next one saved.
+    """
+    config = get_search_config()
+    keys = {gram: f"search:df:{agency_id}:{gram.replace(' ', '_')}" for gram in grams}
+    cached = cache.get_many(list(keys.values()))
+    frequencies = {gram: cached[key] for gram, key in keys.items() if key in cached}
+    missing = [gram for gram in grams if gram not in frequencies]
+    if missing:
+        probes = ' UNION ALL '.join(
+            f'SELECT %s, (SELECT COUNT(*) FROM (SELECT 1 FROM "{GRAM_TABLE}" '
+            'WHERE "agency_id" = %s AND "gram" = %s LIMIT %s) AS postings)'
+            for _ in missing
+        )
+        params = [value for gram in missing for value in (gram, agency_id, gram, config['FREQUENCY_CAP'])]
+        with connection.cursor() as cursor:
+            cursor.execute(probes, params)
+            counted = dict(cursor.fetchall())
+        frequencies.update(counted)
+        cache.set_many(
+            {keys[gram]: count for gram, count in counted.items() if count},
+            config['FREQUENCY_CACHE_TIMEOUT']
+        )
+    return frequencies
+
+
+def search(agency_id, query: str, entity_types: Optional[Sequence[str]] = None,
+           limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """The agency's best matches for ``query`` across all (or ``entity_types``) entities."""
+    config = get_search_config()
+    limit = min(limit or config['DEFAULT_LIMIT'], config['MAX_LIMIT'])
+    grams = sorted(query_trigrams(query))
+    if not grams:
+        return []
+    required = max(1, math.ceil(len(grams) * config['MIN_COVERAGE']))
+
+    # Grams no entry has cannot help, so an entry with `required` of the
+    # query's grams has one of any `needed` of those that occur. Candidates come
+    # from the rarest of them, and common grams only cost a seek per candidate.
+    frequencies = gram_frequencies(agency_id, grams)
+    present = sorted((gram for gram in grams if frequencies[gram]), key=lambda gram: frequencies[gram])
+    needed = len(present) - required + 1
+    if needed < 1:
+        return []
+    budget = config['MAX_CANDIDATES']
+
+    # The type filter goes into the candidate query, ahead of any LIMIT
+    type_join = type_filter = ''
+    type_params: List[Any] = []
+    if entity_types:
+        type_join = f'INNER JOIN "{ENTRY_TABLE}" t ON t."id" = p."entry_id"'
+        type_filter = f'AND t."entity_type" IN ({", ".join(["%s"] * len(entity_types))})'
+        type_params = list(entity_types)
+    posting = (
+        f'SELECT p."entry_id" FROM "{GRAM_TABLE}" p {type_join} '
+        f'WHERE p."agency_id" = %s AND p."gram" = %s {type_filter}'
+    )
+    if sum(frequencies[gram] for gram in present[:needed]) < budget:
+        candidates = ' UNION '.join([posting] * needed)
+        candidate_params = [value for gram in present[:needed] for value in (agency_id, gram, *type_params)]
+    else:
+        # Too common to score every candidate: keep the shortest entries with
+        # the two rarest grams, read in order from the postings index. Exact
+        # and near-exact matches are short, so they are among them.
+        candidates = posting
+        candidate_params = [agency_id, present[0], *type_params]
+        if len(present) > 1:
+            candidates += (
+                f' AND EXISTS (SELECT 1 FROM "{GRAM_TABLE}" q '
+                'WHERE q."entry_id" = p."entry_id" AND q."gram" = %s)'
+            )
+            candidate_params.append(present[1])
+        candidates += ' ORDER BY p."entry_size", p."entry_id" LIMIT %s'
+        candidate_params.append(budget)
+
+    gram_placeholders = ', '.join(['%s'] * len(grams))
+    sql = f"""
+        SELECT "entity_type", "entity_id", "title", "subtitle", "hits" FROM (
+            SELECT e."entity_type", e."entity_id", e."title", e."subtitle", e."gram_count",
+                (SELECT COUNT(*) FROM "{GRAM_TABLE}" g
+                 WHERE g."entry_id" = candidates."entry_id" AND g."gram" IN ({gram_placeholders})) AS "hits"
+            FROM ({candidates}) AS candidates
+            INNER JOIN "{ENTRY_TABLE}" e ON e."id" = candidates."entry_id"
+            WHERE e."agency_id" = %s
+        ) AS matches
+        WHERE "hits" >= %s
+        ORDER BY "hits" DESC, CAST("hits" AS REAL) / "gram_count" DESC, "title"
+        LIMIT %s
+    """
+    params = [*grams, *candidate_params, agency_id, required, limit]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    return [
+        {
+            'type': entity_type,
+            'id': entity_id,
+            'title': title,
+            'subtitle': subtitle,
+            'score': round(hits / len(grams), 3),
+        }
+        for entity_type, entity_id, title, subtitle, hits in rows
+    ]
@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from agencies.models import Agency
+from search.index import SOURCES, rebuild
+
+
+class Command(BaseCommand):
+    """
+    Management command to rebuild the global search index.
+
+    Usage:
+        python manage.py rebuild_global_search
+        python manage.py rebuild_global_search --agency <id> --types promoter,venue
+
+    Needed after bulk changes that bypass model signals (queryset update()
+    or bulk_create() on searched fields) or a restore from backup.
+    """
+
+    help = 'Rebuild the global search index of artists, promoters, venues, contacts and bookings'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--agency',
+            type=str,
+            help='Only rebuild this agency ID',
+        )
+
+        parser.add_argument(
+            '--types',
+            type=str,
+            default=','.join(SOURCES),
+            help=f'Comma-separated entity types to rebuild (default: {",".join(SOURCES)})',
+        )
+
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows indexed per batch (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        types = [name.strip() for name in options['types'].split(',') if name.strip()]
+        unknown = sorted(set(types) - set(SOURCES))
+        if unknown or not types:
+            raise CommandError(f'Unknown types: {", ".join(unknown)}; choose from {", ".join(SOURCES)}')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        agency_id = options.get('agency')
+        if agency_id:
+            try:
+                if not Agency.objects.filter(id=agency_id).exists():
+                    raise CommandError(f'Agency not found: {agency_id}')
+            except ValueError:
+                raise CommandError(f'Invalid agency ID: {agency_id}')
+
+        counts = rebuild(agency_id=agency_id, entity_types=types, batch_size=options['batch_size'])
+        for entity_type, count in counts.items():
+            self.stdout.write(f'  {entity_type}: {count}')
+        self.stdout.write(self.style.SUCCESS(f'\n✓ Indexed {sum(counts.values())} record(s)\n'))
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.4 on 2026-10-19 01:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('agencies', '0002_alter_agency_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity_type', models.CharField(choices=[('artist', 'Artist'), ('promoter', 'Promoter'), ('venue', 'Venue'), ('contact', 'Contact'), ('booking', 'Booking')], max_length=16)),
+                ('entity_id', models.CharField(max_length=64)),
+                ('title', models.CharField(max_length=255)),
+                ('subtitle', models.CharField(blank=True, max_length=255)),
+                ('gram_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('agency', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_entries', to='agencies.agency')),
+            ],
+            options={
+                'verbose_name': 'Search Entry',
+                'verbose_name_plural': 'Search Entries',
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchGram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gram', models.CharField(max_length=3)),
+                ('agency', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='agencies.agency')),
+                ('entry', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='grams', to='search.searchentry')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='searchentry',
+            constraint=models.UniqueConstraint(fields=('entity_type', 'entity_id'), name='search_entry_entity_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='searchgram',
+            index=models.Index(fields=['agency', 'gram', 'entry'], name='search_gram_lookup_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='searchgram',
+            index=models.Index(fields=['entry', 'gram'], name='search_gram_entry_idx'),
+        ),
+    ]
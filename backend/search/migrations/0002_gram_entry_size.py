@@ -0,0 +1,37 @@
+# Generated by Django 5.2.4 on 2026-10-19 02:09
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_entry_sizes(apps, schema_editor):
+    SearchEntry = apps.get_model('search', 'SearchEntry')
+    SearchGram = apps.get_model('search', 'SearchGram')
+    SearchGram.objects.update(
+        entry_size=Subquery(SearchEntry.objects.filter(pk=OuterRef('entry')).values('gram_count')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agencies', '0002_alter_agency_options_and_more'),
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='searchgram',
+            name='search_gram_lookup_idx',
+        ),
+        migrations.AddField(
+            model_name='searchgram',
+            name='entry_size',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(copy_entry_sizes, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='searchgram',
+            index=models.Index(fields=['agency', 'gram', 'entry_size', 'entry'], name='search_gram_postings_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-19 02:30
+
+from django.db import migrations
+
+
+def backfill(apps, schema_editor):
+    # Index the rows that existed before the search app was installed
+    from search.index import rebuild
+    rebuild(registry=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_gram_entry_size'),
+        ('artists', '0004_artist_name_prefix_index'),
+        ('promoters', '0002_promoter_name_prefix_index'),
+        ('venues', '0003_venue_name_prefix_index'),
+        ('contacts', '0004_contact_name_prefix_index'),
+        ('bookings', '0003_booking_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
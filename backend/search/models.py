@@ -0,0 +1,78 @@
+from django.db import models
+
+from agencies.models import Agency
+
+
+class SearchEntry(models.Model):
+    """
+    One artist, promoter, venue, contact or booking in the global search index.
+
+    Holds what a result shows (``title``, ``subtitle``); the text itself is
+    indexed as trigrams in ``SearchGram``. See search/index.py.
+    """
+
+    class EntityType(models.TextChoices):
+        ARTIST = 'artist', 'Artist'
+        PROMOTER = 'promoter', 'Promoter'
+        VENUE = 'venue', 'Venue'
+        CONTACT = 'contact', 'Contact'
+        BOOKING = 'booking', 'Booking'
+
+    # Derived from the entities themselves, which already bump the version
+    tracks_data_version = False
+
+    agency = models.ForeignKey(
+        Agency,
+        on_delete=models.CASCADE,
+        related_name='search_entries'
+    )
+    entity_type = models.CharField(max_length=16, choices=EntityType.choices)
+    entity_id = models.CharField(max_length=64)
+    title = models.CharField(max_length=255)
+    subtitle = models.CharField(max_length=255, blank=True)
+    gram_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Search Entry'
+        verbose_name_plural = 'Search Entries'
+        constraints = [
+            models.UniqueConstraint(fields=['entity_type', 'entity_id'], name='search_entry_entity_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_entity_type_display()}: {self.title}"
+
+
+class SearchGram(models.Model):
+    """A trigram of a ``SearchEntry``'s text; one row per distinct trigram."""
+
+    tracks_data_version = False
+
+    # Repeated from the entry so lookups stay inside one agency's postings
+    agency = models.ForeignKey(
+        Agency,
+        on_delete=models.CASCADE,
+        db_index=False,
+        related_name='+'
+    )
+    gram = models.CharField(max_length=3)
+    entry = models.ForeignKey(
+        SearchEntry,
+        on_delete=models.CASCADE,
+        db_index=False,
+        related_name='grams'
+    )
+    # The entry's gram_count, repeated so postings can be read shortest entry first
+    entry_size = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Postings: the agency's entries containing a gram, shortest first
+            models.Index(fields=['agency', 'gram', 'entry_size', 'entry'], name='search_gram_postings_idx'),
+            # Scoring: which of the query's grams a candidate entry has
+            models.Index(fields=['entry', 'gram'], name='search_gram_entry_idx'),
+        ]
+
+    def __str__(self):
+        return self.gram
@@ -0,0 +1,20 @@
+# search/signals.py
+
+from django.db.models.signals import post_delete, post_save
+
+from .index import SOURCES, index_objects, remove_objects
+
+
+def index_instance(sender, instance, **kwargs):
+    """Re-index a saved artist, promoter, venue, contact or booking."""
+    index_objects([instance])
+
+
+def unindex_instance(sender, instance, **kwargs):
+    """Drop a deleted entity from the search index."""
+    remove_objects(sender, [instance.pk])
+
+
+for source in SOURCES.values():
+    post_save.connect(index_instance, sender=source.model_label, dispatch_uid=f'search_index_{source.entity_type}')
+    post_delete.connect(unindex_instance, sender=source.model_label, dispatch_uid=f'search_unindex_{source.entity_type}')
@@ -0,0 +1,167 @@
+import uuid
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from agencies.models import Agency
+from agencies.versioning import update_and_bump
+from authentication.models import User
+from bookings.models import Booking
+from venues.models import Venue
+
+from . import autocomplete as autocomplete_module
+from .autocomplete import PrefixIndex, autocomplete
+from .index import index_objects, rebuild, search
+from .models import SearchEntry
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'search-tests'}},
+    GLOBAL_SEARCH={'MAX_CANDIDATES': 100},
+)
+class GlobalSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        owner = User.objects.create(username='owner', email='owner@example.com')
+        self.agency = Agency.objects.create(name='Agency', owner=owner, timezone='UTC', slug='agency')
+
+    def venue(self, name, city='Lisbon'):
+        return Venue.objects.create(
+            agency=self.agency, venue_name=name, venue_address='Street 1',
+            venue_city=city, venue_country='PT', capacity=500,
+        )
+
+    def bookings(self, count, event_name):
+        Booking.objects.bulk_create([
+            Booking(
+                agency=self.agency,
+                booking_date=timezone.now() + timedelta(days=index),
+                booking_reference=f'BK-{index:05d}',
+                event_name=f'{event_name} {index}',
+                location_city='Lisbon',
+                location_country='PT',
+                venue_id=str(uuid.uuid4()),
+                venue_capacity=500,
+                artist_id=str(uuid.uuid4()),
+                promoter_id=str(uuid.uuid4()),
+            )
+            for index in range(count)
+        ])
+        index_objects(Booking.objects.filter(agency=self.agency))
+
+    def titles(self, query, **options):
+        return [result['title'] for result in search(self.agency.id, query, **options)]
+
+    def test_tolerates_typos_and_matches_the_last_word_as_a_prefix(self):
+        self.venue('Coliseu dos Recreios')
+        self.venue('Altice Arena')
+        self.assertEqual(self.titles('coliseu recreio')[0], 'Coliseu dos Recreios')
+        self.assertEqual(self.titles('colseu')[0], 'Coliseu dos Recreios')
+        self.assertEqual(self.titles('altice ar'), ['Altice Arena'])
+
+    def test_exact_match_is_found_among_too_many_common_candidates(self):
+        # More bookings mention Lisbon than a search scores, and all of them
+        # were indexed before the venue
+        self.bookings(300, 'Lisbon Festival')
+        self.venue('Lisbon')
+
+        self.assertEqual(self.titles('lisbon')[0], 'Lisbon')
+        self.assertEqual(self.titles('lisbon', limit=50)[0], 'Lisbon')
+        self.assertEqual(self.titles('lisbon', entity_types=['venue']), ['Lisbon'])
+
+    def test_type_filter_applies_before_candidates_are_cut(self):
+        self.bookings(300, 'Lisbon Festival')
+        venues = [self.venue(f'Lisbon Hall {index}') for index in range(5)]
+
+        results = search(self.agency.id, 'lisbon', entity_types=['venue'], limit=10)
+        self.assertEqual({result['id'] for result in results}, {str(venue.pk) for venue in venues})
+
+    def test_rare_query_scores_every_candidate(self):
+        self.bookings(300, 'Lisbon Festival')
+        self.venue('Paradise Garage')
+        self.assertEqual(self.titles('paradise'), ['Paradise Garage'])
+        self.assertEqual(self.titles('festival 120')[0], 'Lisbon Festival 120')
+
+    def test_migration_backfill_indexes_existing_rows(self):
+        self.venue('Coliseu dos Recreios')
+        self.bookings(3, 'Summer Tour')
+        SearchEntry.objects.all().delete()
+        self.assertEqual(self.titles('coliseu'), [])
+
+        state = MigrationLoader(connection).project_state(('search', '0003_backfill_entries'))
+        counts = rebuild(registry=state.apps)
+        self.assertEqual((counts['venue'], counts['booking']), (1, 3))
+        results = search(self.agency.id, 'coliseu')
+        self.assertEqual((results[0]['title'], results[0]['subtitle']), ('Coliseu dos Recreios', 'Lisbon, PT'))
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'autocomplete-tests'}},
+    AUTOCOMPLETE={'MAX_INDEXES': 2},
+)
+class AutocompleteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        autocomplete_module._indexes.clear()
+        self.addCleanup(autocomplete_module._indexes.clear)
+        owner = User.objects.create(username='owner', email='owner@example.com')
+        self.agency = Agency.objects.create(name='Agency', owner=owner, timezone='UTC', slug='agency')
+
+    def venue(self, name):
+        return Venue.objects.create(
+            agency=self.agency, venue_name=name, venue_address='Street 1',
+            venue_city='Lisbon', venue_country='PT', capacity=500,
+        )
+
+    def names(self, query, entity_type='venue', limit=None):
+        return [result['name'] for result in autocomplete(self.agency.id, entity_type, query, limit=limit)]
+
+    def test_name_prefixes_come_before_later_words_and_extra_fields(self):
+        index = PrefixIndex([
+            (1, 'Recreios Bar', ()),
+            (2, 'Coliseu dos Recreios', ()),
+            (3, 'Lisboa Live', ('Recife Promotions',)),
+            (4, 'Récita', ('Recital Hall',)),
+            (5, 'Altice Arena', ()),
+        ])
+
+        self.assertEqual(
+            [result['name'] for result in index.lookup('REC', limit=10)],
+            ['Récita', 'Recreios Bar', 'Lisboa Live', 'Coliseu dos Recreios'],
+        )
+        self.assertEqual([result['id'] for result in index.lookup('rec', limit=2)], ['4', '1'])
+        self.assertEqual(index.lookup('dos rec', limit=10), [{'id': '2', 'name': 'Coliseu dos Recreios'}])
+        self.assertEqual(len(index.lookup('', limit=10)), 5)
+
+    def test_index_is_rebuilt_after_the_data_version_changes(self):
+        venue = self.venue('Coliseu dos Recreios')
+        self.assertEqual(self.names('coli'), ['Coliseu dos Recreios'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names('coli'), ['Coliseu dos Recreios'])
+
+        # Queryset updates send no signals; update_and_bump keeps the index fresh
+        with self.captureOnCommitCallbacks(execute=True):
+            update_and_bump(Venue.objects.filter(pk=venue.pk), venue_name='Altice Arena')
+
+        self.assertEqual(self.names('coli'), [])
+        self.assertEqual(self.names('alt'), ['Altice Arena'])
+
+    def test_least_recently_used_index_is_evicted(self):
+        self.venue('Altice Arena')
+        self.names('a', 'venue')
+        self.names('a', 'artist')
+        self.names('a', 'venue')
+        self.names('a', 'promoter')
+
+        self.assertEqual(
+            list(autocomplete_module._indexes),
+            [(self.agency.id, 'venue'), (self.agency.id, 'promoter')],
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names('a', 'venue'), ['Altice Arena'])
+        with self.assertNumQueries(1):
+            self.names('a', 'artist')
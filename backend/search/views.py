@@ -0,0 +1,125 @@
+# search/views.py
+
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .autocomplete import PICKERS, autocomplete, get_autocomplete_config
+from .index import SOURCES, get_search_config, search
+
+
+class SearchView(APIView):
+    """
+    Search across the agency's artists, promoters, venues, contacts and bookings.
+
+    GET /api/v1/search/?q=lisbon returns the best matches of every type as
+    one ranked list, tolerating typos ("lisbn") and matching the last word
+    as a prefix. See search/index.py.
+
+    Query Parameters:
+    - q: Search text (required)
+    - types: Comma-separated subset of artist, promoter, venue, contact, booking
+    - limit: Number of results (default 20, at most GLOBAL_SEARCH['MAX_LIMIT'])
+    """
+
+    permission_classes = [IsAuthenticated]
+    throttle_costs = {'get': 2}
+
+    def get(self, request):
+        if not hasattr(request.user, 'profile'):
+            return Response(
+                {'error': 'User has no agency profile'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {'error': 'q parameter is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        requested = request.query_params.get('types')
+        types = [name.strip() for name in requested.split(',') if name.strip()] if requested else None
+        unknown = [name for name in types or [] if name not in SOURCES]
+        if unknown:
+            return Response(
+                {'error': f"Unknown types: {', '.join(unknown)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        config = get_search_config()
+        try:
+            limit = int(request.query_params.get('limit', config['DEFAULT_LIMIT']))
+        except ValueError:
+            return Response(
+                {'error': 'limit must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if limit < 1:
+            return Response(
+                {'error': 'limit must be at least 1'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        results = search(request.user.profile.agency_id, query, entity_types=types, limit=limit)
+        return Response({
+            'query': query,
+            'count': len(results),
+            'results': results,
+        })
+
+
+class AutocompleteView(APIView):
+    """
+    Typeahead for the entity pickers of the booking form.
+
+    GET /api/v1/autocomplete/?type=venue&q=coli returns id/name pairs of the
+    agency's venues whose name, or a later word of it, starts with "coli".
+    Served from an in-memory prefix index without querying the database
+    (see search/autocomplete.py); an empty q lists names alphabetically.
+
+    Query Parameters:
+    - type: One of artist, promoter, venue, contact (required)
+    - q: Typed prefix
+    - limit: Number of results (default 10, at most AUTOCOMPLETE['MAX_LIMIT'])
+    """
+
+    permission_classes = [IsAuthenticated]
+    throttle_costs = {'get': 1}
+
+    def get(self, request):
+        if not hasattr(request.user, 'profile'):
+            return Response(
+                {'error': 'User has no agency profile'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        entity_type = request.query_params.get('type', '')
+        if entity_type not in PICKERS:
+            return Response(
+                {'error': f"type must be one of: {', '.join(PICKERS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        config = get_autocomplete_config()
+        try:
+            limit = int(request.query_params.get('limit', config['DEFAULT_LIMIT']))
+        except ValueError:
+            return Response(
+                {'error': 'limit must be an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if limit < 1:
+            return Response(
+                {'error': 'limit must be at least 1'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        agency_id = request.user.profile.agency_id
+        results = autocomplete(agency_id, entity_type, request.query_params.get('q', ''), limit=limit)
+        return Response({
+            'type': entity_type,
+            'results': results,
+        })
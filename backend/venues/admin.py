@@ -2,6 +2,7 @@
 
 from django.contrib import admin
 from django.utils.html import format_html
+from agencies.versioning import update_and_bump
 from .models import Venue
 
 
@@ -21,7 +22,7 @@ class VenueAdmin(admin.ModelAdmin):
         'venue_name', 'venue_city', 'venue_address', 'contact_name', 'contact_email'
     ]
     readonly_fields = [
-        'id', 'created_at', 'updated_at', 'created_by', 'updated_by'
+        'id', 'geohash', 'created_at', 'updated_at', 'created_by', 'updated_by'
     ]
     
     fieldsets = (
@@ -31,6 +32,10 @@ class VenueAdmin(admin.ModelAdmin):
                 'venue_address', 'venue_city', 'venue_zipcode', 'venue_country'
             )
         }),
+        ('Location', {
+            'fields': ('latitude', 'longitude', 'geohash'),
+            'classes': ('collapse',)
+        }),
         ('Technical Information', {
             'fields': ('tech_specs', 'stage_dimensions', 'sound_system', 'lighting_system'),
             'classes': ('collapse',)
@@ -153,48 +158,48 @@ class VenueAdmin(admin.ModelAdmin):
     
     def mark_active(self, request, queryset):
         """Mark selected venues as active."""
-        updated = queryset.update(is_active=True)
+        updated = update_and_bump(queryset, is_active=True)
         self.message_user(request, f'{updated} venues marked as active.')
     mark_active.short_description = "✅ Mark selected venues as active"
     
     def mark_inactive(self, request, queryset):
         """Mark selected venues as inactive."""
-        updated = queryset.update(is_active=False)
+        updated = update_and_bump(queryset, is_active=False)
         self.message_user(request, f'{updated} venues marked as inactive.')
     mark_inactive.short_description = "❌ Mark selected venues as inactive"
     
     def enable_parking(self, request, queryset):
         """Enable parking for selected venues."""
-        updated = queryset.update(has_parking=True)
+        updated = update_and_bump(queryset, has_parking=True)
         self.message_user(request, f'{updated} venues updated - parking enabled.')
     enable_parking.short_description = "🅿️ Enable parking for selected venues"
     
     def disable_parking(self, request, queryset):
         """Disable parking for selected venues."""
-        updated = queryset.update(has_parking=False)
+        updated = update_and_bump(queryset, has_parking=False)
         self.message_user(request, f'{updated} venues updated - parking disabled.')
     disable_parking.short_description = "🚫 Disable parking for selected venues"
     
     def enable_catering(self, request, queryset):
         """Enable catering for selected venues."""
-        updated = queryset.update(has_catering=True)
+        updated = update_and_bump(queryset, has_catering=True)
         self.message_user(request, f'{updated} venues updated - catering enabled.')
     enable_catering.short_description = "🍽️ Enable catering for selected venues"
     
     def disable_catering(self, request, queryset):
         """Disable catering for selected venues."""
-        updated = queryset.update(has_catering=False)
+        updated = update_and_bump(queryset, has_catering=False)
         self.message_user(request, f'{updated} venues updated - catering disabled.')
     disable_catering.short_description = "🚫 Disable catering for selected venues"
     
     def mark_accessible(self, request, queryset):
         """Mark selected venues as wheelchair accessible."""
-        updated = queryset.update(is_accessible=True)
+        updated = update_and_bump(queryset, is_accessible=True)
         self.message_user(request, f'{updated} venues marked as wheelchair accessible.')
     mark_accessible.short_description = "♿ Mark selected venues as accessible"
     
     def mark_not_accessible(self, request, queryset):
         """Mark selected venues as not wheelchair accessible."""
-        updated = queryset.update(is_accessible=False)
+        updated = update_and_bump(queryset, is_accessible=False)
         self.message_user(request, f'{updated} venues marked as not accessible.')
     mark_not_accessible.short_description = "🚫 Mark selected venues as not accessible"
\ No newline at end of file
@@ -0,0 +1,293 @@
+# venues/gazetteer.py
+
+"""
+Offline city-centroid gazetteer used to backfill venue coordinates.
+
+Centroids are approximate (city centre, two decimals); they are good enough
+to place a venue for radius searches but not for navigation. Lookups are by
+country code and a normalized city name, so accents, case and punctuation
+do not matter.
+"""
+
+import re
+import unicodedata
+from typing import Dict, Optional, Tuple
+
+_NON_WORD = re.compile(r'[^\w\s]')
+
+# (country code, city) -> (latitude, longitude)
+CITY_CENTROIDS: Dict[Tuple[str, str], Tuple[float, float]] = {
+    # United Kingdom & Ireland
+    ('GB', 'London'): (51.51, -0.13),
+    ('GB', 'Manchester'): (53.48, -2.24),
+    ('GB', 'Birmingham'): (52.49, -1.89),
+    ('GB', 'Liverpool'): (53.41, -2.98),
+    ('GB', 'Leeds'): (53.80, -1.55),
+    ('GB', 'Sheffield'): (53.38, -1.47),
+    ('GB', 'Bristol'): (51.45, -2.59),
+    ('GB', 'Newcastle upon Tyne'): (54.98, -1.61),
+    ('GB', 'Nottingham'): (52.95, -1.15),
+    ('GB', 'Brighton'): (50.82, -0.14),
+    ('GB', 'Glasgow'): (55.86, -4.25),
+    ('GB', 'Edinburgh'): (55.95, -3.19),
+    ('GB', 'Cardiff'): (51.48, -3.18),
+    ('GB', 'Belfast'): (54.60, -5.93),
+    ('IE', 'Dublin'): (53.35, -6.26),
+    ('IE', 'Cork'): (51.90, -8.47),
+    # Germany, Austria, Switzerland
+    ('DE', 'Berlin'): (52.52, 13.40),
+    ('DE', 'Hamburg'): (53.55, 9.99),
+    ('DE', 'Munich'): (48.14, 11.58),
+    ('DE', 'Cologne'): (50.94, 6.96),
+    ('DE', 'Frankfurt'): (50.11, 8.68),
+    ('DE', 'Stuttgart'): (48.78, 9.18),
+    ('DE', 'Dusseldorf'): (51.23, 6.77),
+    ('DE', 'Leipzig'): (51.34, 12.37),
+    ('DE', 'Dresden'): (51.05, 13.74),
+    ('DE', 'Hanover'): (52.37, 9.73),
+    ('DE', 'Nuremberg'): (49.45, 11.08),
+    ('DE', 'Bremen'): (53.08, 8.80),
+    ('DE', 'Essen'): (51.46, 7.01),
+    ('DE', 'Dortmund'): (51.51, 7.47),
+    ('DE', 'Mannheim'): (49.49, 8.47),
+    ('AT', 'Vienna'): (48.21, 16.37),
+    ('AT', 'Graz'): (47.07, 15.44),
+    ('AT', 'Salzburg'): (47.81, 13.04),
+    ('AT', 'Innsbruck'): (47.27, 11.40),
+    ('CH', 'Zurich'): (47.38, 8.54),
+    ('CH', 'Geneva'): (46.20, 6.14),
+    ('CH', 'Basel'): (47.56, 7.59),
+    ('CH', 'Bern'): (46.95, 7.45),
+    ('CH', 'Lausanne'): (46.52, 6.63),
+    # Benelux
+    ('NL', 'Amsterdam'): (52.37, 4.90),
+    ('NL', 'Rotterdam'): (51.92, 4.48),
+    ('NL', 'Utrecht'): (52.09, 5.12),
+    ('NL', 'The Hague'): (52.08, 4.30),
+    ('NL', 'Eindhoven'): (51.44, 5.48),
+    ('NL', 'Groningen'): (53.22, 6.57),
+    ('BE', 'Brussels'): (50.85, 4.35),
+    ('BE', 'Antwerp'): (51.22, 4.40),
+    ('BE', 'Ghent'): (51.05, 3.72),
+    ('BE', 'Liege'): (50.63, 5.57),
+    ('LU', 'Luxembourg'): (49.61, 6.13),
+    # France
+    ('FR', 'Paris'): (48.86, 2.35),
+    ('FR', 'Lyon'): (45.76, 4.84),
+    ('FR', 'Marseille'): (43.30, 5.37),
+    ('FR', 'Toulouse'): (43.60, 1.44),
+    ('FR', 'Nice'): (43.70, 7.27),
+    ('FR', 'Nantes'): (47.22, -1.55),
+    ('FR', 'Bordeaux'): (44.84, -0.58),
+    ('FR', 'Lille'): (50.63, 3.06),
+    ('FR', 'Strasbourg'): (48.57, 7.75),
+    ('FR', 'Montpellier'): (43.61, 3.88),
+    ('FR', 'Rennes'): (48.11, -1.68),
+    # Southern Europe
+    ('ES', 'Madrid'): (40.42, -3.70),
+    ('ES', 'Barcelona'): (41.39, 2.17),
+    ('ES', 'Valencia'): (39.47, -0.38),
+    ('ES', 'Seville'): (37.39, -5.98),
+    ('ES', 'Bilbao'): (43.26, -2.93),
+    ('ES', 'Malaga'): (36.72, -4.42),
+    ('ES', 'Ibiza'): (38.91, 1.43),
+    ('ES', 'Palma'): (39.57, 2.65),
+    ('PT', 'Lisbon'): (38.72, -9.14),
+    ('PT', 'Porto'): (41.15, -8.61),
+    ('IT', 'Rome'): (41.90, 12.50),
+    ('IT', 'Milan'): (45.46, 9.19),
+    ('IT', 'Naples'): (40.85, 14.27),
+    ('IT', 'Turin'): (45.07, 7.69),
+    ('IT', 'Bologna'): (44.49, 11.34),
+    ('IT', 'Florence'): (43.77, 11.26),
+    ('IT', 'Venice'): (45.44, 12.32),
+    ('GR', 'Athens'): (37.98, 23.73),
+    ('GR', 'Thessaloniki'): (40.64, 22.94),
+    ('MT', 'Valletta'): (35.90, 14.51),
+    ('HR', 'Zagreb'): (45.81, 15.98),
+    ('HR', 'Split'): (43.51, 16.44),
+    ('SI', 'Ljubljana'): (46.06, 14.51),
+    ('RS', 'Belgrade'): (44.79, 20.45),
+    # Nordics & Baltics
+    ('DK', 'Copenhagen'): (55.68, 12.57),
+    ('DK', 'Aarhus'): (56.16, 10.20),
+    ('SE', 'Stockholm'): (59.33, 18.07),
+    ('SE', 'Gothenburg'): (57.71, 11.97),
+    ('SE', 'Malmo'): (55.60, 13.00),
+    ('NO', 'Oslo'): (59.91, 10.75),
+    ('NO', 'Bergen'): (60.39, 5.32),
+    ('FI', 'Helsinki'): (60.17, 24.94),
+    ('IS', 'Reykjavik'): (64.15, -21.94),
+    ('EE', 'Tallinn'): (59.44, 24.75),
+    ('LV', 'Riga'): (56.95, 24.11),
+    ('LT', 'Vilnius'): (54.69, 25.28),
+    # Central & Eastern Europe
+    ('PL', 'Warsaw'): (52.23, 21.01),
+    ('PL', 'Krakow'): (50.06, 19.94),
+    ('PL', 'Wroclaw'): (51.11, 17.04),
+    ('PL', 'Gdansk'): (54.35, 18.65),
+    ('CZ', 'Prague'): (50.08, 14.44),
+    ('CZ', 'Brno'): (49.20, 16.61),
+    ('SK', 'Bratislava'): (48.15, 17.11),
+    ('HU', 'Budapest'): (47.50, 19.04),
+    ('RO', 'Bucharest'): (44.43, 26.10),
+    ('RO', 'Cluj-Napoca'): (46.77, 23.59),
+    ('BG', 'Sofia'): (42.70, 23.32),
+    ('UA', 'Kyiv'): (50.45, 30.52),
+    ('TR', 'Istanbul'): (41.01, 28.98),
+    # North America
+    ('US', 'New York'): (40.71, -74.01),
+    ('US', 'Brooklyn'): (40.68, -73.94),
+    ('US', 'Los Angeles'): (34.05, -118.24),
+    ('US', 'Chicago'): (41.88, -87.63),
+    ('US', 'Houston'): (29.76, -95.37),
+    ('US', 'Austin'): (30.27, -97.74),
+    ('US', 'Dallas'): (32.78, -96.80),
+    ('US', 'Miami'): (25.76, -80.19),
+    ('US', 'Atlanta'): (33.75, -84.39),
+    ('US', 'Nashville'): (36.16, -86.78),
+    ('US', 'New Orleans'): (29.95, -90.07),
+    ('US', 'Denver'): (39.74, -104.99),
+    ('US', 'Las Vegas'): (36.17, -115.14),
+    ('US', 'Phoenix'): (33.45, -112.07),
+    ('US', 'San Diego'): (32.72, -117.16),
+    ('US', 'San Francisco'): (37.77, -122.42),
+    ('US', 'Oakland'): (37.80, -122.27),
+    ('US', 'Seattle'): (47.61, -122.33),
+    ('US', 'Portland'): (45.52, -122.68),
+    ('US', 'Boston'): (42.36, -71.06),
+    ('US', 'Philadelphia'): (39.95, -75.17),
+    ('US', 'Washington'): (38.91, -77.04),
+    ('US', 'Detroit'): (42.33, -83.05),
+    ('US', 'Minneapolis'): (44.98, -93.27),
+    ('CA', 'Toronto'): (43.65, -79.38),
+    ('CA', 'Montreal'): (45.50, -73.57),
+    ('CA', 'Vancouver'): (49.28, -123.12),
+    ('CA', 'Calgary'): (51.05, -114.07),
+    ('CA', 'Ottawa'): (45.42, -75.70),
+    ('MX', 'Mexico City'): (19.43, -99.13),
+    ('MX', 'Guadalajara'): (20.66, -103.35),
+    ('MX', 'Monterrey'): (25.69, -100.32),
+    ('MX', 'Tulum'): (20.21, -87.47),
+    # Latin America
+    ('BR', 'Sao Paulo'): (-23.55, -46.63),
+    ('BR', 'Rio de Janeiro'): (-22.91, -43.17),
+    ('AR', 'Buenos Aires'): (-34.60, -58.38),
+    ('CL', 'Santiago'): (-33.45, -70.67),
+    ('CO', 'Bogota'): (4.71, -74.07),
+    ('CO', 'Medellin'): (6.24, -75.58),
+    ('PE', 'Lima'): (-12.05, -77.04),
+    # Asia-Pacific
+    ('JP', 'Tokyo'): (35.68, 139.69),
+    ('JP', 'Osaka'): (34.69, 135.50),
+    ('KR', 'Seoul'): (37.57, 126.98),
+    ('CN', 'Shanghai'): (31.23, 121.47),
+    ('CN', 'Beijing'): (39.90, 116.41),
+    ('HK', 'Hong Kong'): (22.32, 114.17),
+    ('TW', 'Taipei'): (25.03, 121.57),
+    ('SG', 'Singapore'): (1.35, 103.82),
+    ('TH', 'Bangkok'): (13.76, 100.50),
+    ('ID', 'Jakarta'): (-6.21, 106.85),
+    ('ID', 'Bali'): (-8.41, 115.19),
+    ('PH', 'Manila'): (14.60, 120.98),
+    ('IN', 'Mumbai'): (19.08, 72.88),
+    ('IN', 'Delhi'): (28.70, 77.10),
+    ('IN', 'Bengaluru'): (12.97, 77.59),
+    ('IN', 'Goa'): (15.50, 73.83),
+    ('AU', 'Sydney'): (-33.87, 151.21),
+    ('AU', 'Melbourne'): (-37.81, 144.96),
+    ('AU', 'Brisbane'): (-27.47, 153.03),
+    ('AU', 'Perth'): (-31.95, 115.86),
+    ('AU', 'Adelaide'): (-34.93, 138.60),
+    ('NZ', 'Auckland'): (-36.85, 174.76),
+    ('NZ', 'Wellington'): (-41.29, 174.78),
+    # Middle East & Africa
+    ('AE', 'Dubai'): (25.20, 55.27),
+    ('AE', 'Abu Dhabi'): (24.45, 54.38),
+    ('IL', 'Tel Aviv'): (32.09, 34.78),
+    ('LB', 'Beirut'): (33.89, 35.50),
+    ('EG', 'Cairo'): (30.04, 31.24),
+    ('MA', 'Marrakesh'): (31.63, -8.01),
+    ('ZA', 'Johannesburg'): (-26.20, 28.05),
+    ('ZA', 'Cape Town'): (-33.92, 18.42),
+    ('NG', 'Lagos'): (6.52, 3.38),
+    ('KE', 'Nairobi'): (-1.29, 36.82),
+}
+
+# Alternative spellings, mapped onto the names above
+CITY_ALIASES: Dict[Tuple[str, str], str] = {
+    ('DE', 'Munchen'): 'Munich',
+    ('DE', 'Koln'): 'Cologne',
+    ('DE', 'Frankfurt am Main'): 'Frankfurt',
+    ('DE', 'Hannover'): 'Hanover',
+    ('DE', 'Nurnberg'): 'Nuremberg',
+    ('AT', 'Wien'): 'Vienna',
+    ('CH', 'Geneve'): 'Geneva',
+    ('CH', 'Zuerich'): 'Zurich',
+    ('NL', 'Den Haag'): 'The Hague',
+    ('BE', 'Bruxelles'): 'Brussels',
+    ('BE', 'Brussel'): 'Brussels',
+    ('BE', 'Antwerpen'): 'Antwerp',
+    ('BE', 'Gent'): 'Ghent',
+    ('ES', 'Sevilla'): 'Seville',
+    ('ES', 'Eivissa'): 'Ibiza',
+    ('ES', 'Palma de Mallorca'): 'Palma',
+    ('PT', 'Lisboa'): 'Lisbon',
+    ('IT', 'Roma'): 'Rome',
+    ('IT', 'Milano'): 'Milan',
+    ('IT', 'Napoli'): 'Naples',
+    ('IT', 'Torino'): 'Turin',
+    ('IT', 'Firenze'): 'Florence',
+    ('IT', 'Venezia'): 'Venice',
+    ('GR', 'Athina'): 'Athens',
+    ('DK', 'Kobenhavn'): 'Copenhagen',
+    ('SE', 'Goteborg'): 'Gothenburg',
+    ('PL', 'Warszawa'): 'Warsaw',
+    ('CZ', 'Praha'): 'Prague',
+    ('UA', 'Kiev'): 'Kyiv',
+    ('US', 'New York City'): 'New York',
+    ('US', 'NYC'): 'New York',
+    ('US', 'LA'): 'Los Angeles',
+    ('US', 'San Fransisco'): 'San Francisco',
+    ('US', 'Washington DC'): 'Washington',
+    ('US', 'Washington D C'): 'Washington',
+    ('CA', 'Montréal'): 'Montreal',
+    ('MX', 'Ciudad de Mexico'): 'Mexico City',
+    ('MX', 'CDMX'): 'Mexico City',
+    ('IN', 'Bangalore'): 'Bengaluru',
+    ('IN', 'New Delhi'): 'Delhi',
+    ('IN', 'Bombay'): 'Mumbai',
+    ('MA', 'Marrakech'): 'Marrakesh',
+}
+
+
+def normalize_city(name: str) -> str:
+    """Lowercase, strip accents and punctuation, and collapse whitespace."""
+    name = unicodedata.normalize('NFKD', name or '')
+    name = ''.join(ch for ch in name if not unicodedata.combining(ch))
+    return ' '.join(_NON_WORD.sub(' ', name.casefold()).split())
+
+
+def _build_index() -> Dict[Tuple[str, str], Tuple[float, float]]:
+    index = {(country, normalize_city(city)): point for (country, city), point in CITY_CENTROIDS.items()}
+    for (country, alias), city in CITY_ALIASES.items():
+        index[(country, normalize_city(alias))] = CITY_CENTROIDS[(country, city)]
+    return index
+
+
+_INDEX = _build_index()
+
+
+def lookup_city(city: str, country: Optional[str] = None) -> Optional[Tuple[float, float]]:
+    """
+    Return ``(latitude, longitude)`` for a city, or None if unknown.
+
+    Without a country the match must be unambiguous across countries.
+    """
+    key = normalize_city(city)
+    if not key:
+        return None
+    if country:
+        return _INDEX.get((str(country).upper(), key))
+    matches = {point for (_, name), point in _INDEX.items() if name == key}
+    return matches.pop() if len(matches) == 1 else None
@@ -0,0 +1,113 @@
+# venues/geo.py
+
+"""
+Geographic helpers for venue coordinates.
+
+Nearby searches run in two steps, both in SQL: a bounding box on the
+indexed ``latitude``/``longitude`` columns narrows the candidates, then a
+haversine distance annotation ranks them, so only the requested page of
+venues is ever loaded.
+"""
+
+import math
+from typing import List, Tuple
+
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import Expression
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+
+EARTH_RADIUS_KM = 6371.0088
+# The box is widened slightly so rounding never drops a venue on the circle's edge
+BOUNDING_BOX_MARGIN = 1.001
+
+GEOHASH_PRECISION = 8
+_GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Encode a coordinate as a geohash; shared prefixes mean nearby cells."""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value, bounds = (longitude, lng_range) if even else (latitude, lat_range)
+        mid = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            bounds[0] = mid
+        else:
+            bounds[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, List[Tuple[float, float]]]:
+    """
+    Return ``(min_lat, max_lat, lng_ranges)`` enclosing the search circle.
+
+    Uses the same sphere as ``haversine_km``, so every point within
+    ``radius_km`` of the centre lies inside the box. ``lng_ranges`` has two
+    entries when the box crosses the antimeridian and spans every longitude
+    when it reaches a pole.
+    """
+    angle = radius_km / EARTH_RADIUS_KM * BOUNDING_BOX_MARGIN
+    d_lat = math.degrees(angle)
+    min_lat, max_lat = latitude - d_lat, latitude + d_lat
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), [(-180.0, 180.0)]
+
+    # The circle's widest longitude is asin(sin(angle) / cos(latitude)) away,
+    # a little more than angle / cos(latitude) far from the equator
+    ratio = math.sin(angle) / math.cos(math.radians(latitude))
+    if ratio >= 1:
+        return min_lat, max_lat, [(-180.0, 180.0)]
+    d_lng = math.degrees(math.asin(ratio))
+
+    min_lng, max_lng = longitude - d_lng, longitude + d_lng
+    if min_lng < -180:
+        return min_lat, max_lat, [(min_lng + 360, 180.0), (-180.0, max_lng)]
+    if max_lng > 180:
+        return min_lat, max_lat, [(min_lng, 180.0), (-180.0, max_lng - 360)]
+    return min_lat, max_lat, [(min_lng, max_lng)]
+
+
+def bounding_box_q(latitude: float, longitude: float, radius_km: float) -> Q:
+    """Filter on the indexed coordinate columns for the search circle's box."""
+    min_lat, max_lat, lng_ranges = bounding_box(latitude, longitude, radius_km)
+    lng_q = Q()
+    for low, high in lng_ranges:
+        lng_q |= Q(longitude__gte=low, longitude__lte=high)
+    return Q(latitude__gte=min_lat, latitude__lte=max_lat) & lng_q
+
+
+def distance_km_expression(latitude: float, longitude: float) -> Expression:
+    """Haversine distance in km from a point to each row's coordinates."""
+    phi = math.radians(latitude)
+    row_phi = Radians(F('latitude'))
+    half_d_phi = (row_phi - Value(phi)) / Value(2.0)
+    half_d_lambda = (Radians(F('longitude')) - Value(math.radians(longitude))) / Value(2.0)
+    a = (
+        Power(Sin(half_d_phi), 2) +
+        Value(math.cos(phi)) * Cos(row_phi) * Power(Sin(half_d_lambda), 2)
+    )
+    # Rounding can push ``a`` just past 1, outside ASIN's domain
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Least(Sqrt(a), Value(1.0)), output_field=FloatField())
@@ -0,0 +1,94 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from agencies.versioning import bump_data_version
+from venues.gazetteer import lookup_city
+from venues.geo import geohash_encode
+from venues.models import Venue
+
+
+class Command(BaseCommand):
+    """
+    Management command to fill in missing venue coordinates from the offline
+    city-centroid gazetteer (venues/gazetteer.py).
+    
+    Usage:
+        python manage.py backfill_venue_coordinates [--agency ID] [--dry-run]
+    
+    Venues that already have coordinates are left alone. Coordinates are the
+    city's centre, so distances to backfilled venues are approximate.
+    """
+    
+    help = 'Fill in missing venue coordinates from city centroids'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would be updated without making changes',
+        )
+        parser.add_argument(
+            '--agency',
+            type=str,
+            help='Filter by specific agency ID',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Maximum number of venues per UPDATE',
+        )
+    
+    def handle(self, *args, **options):
+        """Execute the command."""
+        dry_run = options['dry_run']
+        batch_size = options['batch_size']
+        
+        queryset = Venue.objects.filter(latitude__isnull=True).order_by()
+        if options.get('agency'):
+            queryset = queryset.filter(agency_id=options['agency'])
+            self.stdout.write(f"Filtering by agency: {options['agency']}")
+        
+        rows = queryset.values_list('id', 'agency_id', 'venue_city', 'venue_country')
+        # Every venue in a city gets the same centroid, so group them by point
+        by_point = {}
+        agencies = set()
+        unmatched = {}
+        for venue_id, agency_id, city, country in rows.iterator(chunk_size=batch_size):
+            point = lookup_city(city, country)
+            if point:
+                by_point.setdefault(point, []).append(venue_id)
+                agencies.add(agency_id)
+            else:
+                key = (city, country)
+                unmatched[key] = unmatched.get(key, 0) + 1
+        
+        matched = sum(len(ids) for ids in by_point.values())
+        self.stdout.write(f'Found {matched} venue(s) in {len(by_point)} known cities')
+        if unmatched:
+            self.stdout.write(
+                self.style.WARNING(f'{sum(unmatched.values())} venue(s) in unknown cities:')
+            )
+            for (city, country), count in sorted(unmatched.items(), key=lambda item: -item[1])[:20]:
+                self.stdout.write(f'  - {city} ({country}): {count}')
+        
+        if dry_run:
+            self.stdout.write(self.style.NOTICE('\n=== DRY RUN MODE - No changes will be made ===\n'))
+            return
+        
+        updated = 0
+        for (lat, lng), ids in by_point.items():
+            geohash = geohash_encode(lat, lng)
+            for start in range(0, len(ids), batch_size):
+                with transaction.atomic():
+                    # latitude__isnull guards against coordinates set since the scan
+                    updated += Venue.objects.filter(
+                        id__in=ids[start:start + batch_size],
+                        latitude__isnull=True
+                    ).update(latitude=lat, longitude=lng, geohash=geohash)
+        
+        # update() does not send post_save
+        for agency_id in agencies:
+            bump_data_version(agency_id)
+        
+        self.stdout.write(self.style.SUCCESS(f'\n✓ Updated {updated} venue(s)\n'))
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.4 on 2026-10-19 01:03
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agencies', '0002_alter_agency_options_and_more'),
+        ('venues', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venue',
+            name='geohash',
+            field=models.CharField(blank=True, editable=False, help_text='Geohash of the coordinates; shared prefixes mean nearby venues', max_length=12),
+        ),
+        migrations.AddField(
+            model_name='venue',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-90), django.core.validators.MaxValueValidator(90)]),
+        ),
+        migrations.AddField(
+            model_name='venue',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-180), django.core.validators.MaxValueValidator(180)]),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['agency', 'latitude', 'longitude'], name='venues_venu_agency__ffcca8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['agency', 'geohash'], name='venues_venu_agency__dab0bd_idx'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 5.2.4 on 2026-10-19 02:10
+
+from django.db import migrations
+
+from config.autocomplete import prefix_search_indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venues', '0002_venue_coordinates'),
+    ]
+
+    operations = [
+        prefix_search_indexes('venues_venue', ['venue_name']),
+    ]
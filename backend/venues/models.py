@@ -2,10 +2,11 @@
 
 import uuid
 from django.db import models
-from django.core.validators import MinValueValidator
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django_countries.fields import CountryField
 from agencies.models import Agency, UserProfile
 from config.models import TimestampedModel
+from .geo import geohash_encode
 
 
 class Venue(TimestampedModel):
@@ -41,6 +42,24 @@ class Venue(TimestampedModel):
     venue_zipcode = models.CharField(max_length=20, blank=True)
     venue_country = CountryField()
     
+    # Coordinates, optional; see venues/geo.py and the backfill_venue_coordinates command
+    latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)]
+    )
+    longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)]
+    )
+    geohash = models.CharField(
+        max_length=12,
+        blank=True,
+        editable=False,
+        help_text="Geohash of the coordinates; shared prefixes mean nearby venues"
+    )
+    
     # Venue details
     venue_type = models.CharField(
         max_length=20,
@@ -98,6 +117,8 @@ class Venue(TimestampedModel):
             models.Index(fields=['agency', 'venue_city']),
             models.Index(fields=['agency', 'venue_type']),
             models.Index(fields=['agency', 'capacity']),
+            models.Index(fields=['agency', 'latitude', 'longitude']),
+            models.Index(fields=['agency', 'geohash']),
             models.Index(fields=['is_active']),
             models.Index(fields=['created_at']),
         ]
@@ -107,4 +128,19 @@ class Venue(TimestampedModel):
         verbose_name_plural = 'Venues'
     
     def __str__(self):
-        return f"{self.venue_name} - {self.venue_city}"
\ No newline at end of file
+        return f"{self.venue_name} - {self.venue_city}"
+    
+    def save(self, *args, **kwargs):
+        """Keep ``geohash`` in step with the coordinates."""
+        self.geohash = self.compute_geohash()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'geohash'}
+        super().save(*args, **kwargs)
+    
+    @property
+    def has_coordinates(self):
+        return self.latitude is not None and self.longitude is not None
+    
+    def compute_geohash(self):
+        return geohash_encode(self.latitude, self.longitude) if self.has_coordinates else ''
@@ -32,6 +32,7 @@ class VenueSerializer(CountryFieldMixin, serializers.ModelSerializer):
         fields = [
             'id', 'venue_name', 'venue_address', 'venue_city', 
             'venue_zipcode', 'venue_country', 'country_name',
+            'latitude', 'longitude', 'geohash',
             'venue_type', 'capacity', 'capacity_category',
             'tech_specs', 'stage_dimensions', 'sound_system', 'lighting_system',
             'has_parking', 'has_catering', 'is_accessible',
@@ -44,7 +45,7 @@ class VenueSerializer(CountryFieldMixin, serializers.ModelSerializer):
         ]
         read_only_fields = [
             'id', 'created_at', 'updated_at', 'display_name', 'full_address',
-            'capacity_category', 'created_by_name', 'updated_by_name'
+            'capacity_category', 'geohash', 'created_by_name', 'updated_by_name'
         ]
     
     def get_display_name(self, obj):
@@ -126,6 +127,14 @@ class VenueSerializer(CountryFieldMixin, serializers.ModelSerializer):
                 "At least one contact method (email, phone, or website) must be provided."
             )
         
+        # Coordinates are set and cleared as a pair
+        latitude = data.get('latitude', getattr(self.instance, 'latitude', None))
+        longitude = data.get('longitude', getattr(self.instance, 'longitude', None))
+        if (latitude is None) != (longitude is None):
+            raise serializers.ValidationError(
+                "Latitude and longitude must be provided together."
+            )
+        
         # Validate venue name uniqueness within agency and city
         venue_name = data.get('venue_name')
         venue_city = data.get('venue_city')
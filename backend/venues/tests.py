@@ -1,3 +1,213 @@
-from django.test import TestCase
+import math
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from agencies.models import Agency, UserProfile
+from agencies.versioning import get_data_version
+from authentication.models import User
+from config.grouping import DEFAULT_GROUP_PAGE_SIZE
+
+from .geo import EARTH_RADIUS_KM, bounding_box, haversine_km
+from .models import Venue
+
+
+def destination(latitude, longitude, bearing, distance_km):
+    """The point ``distance_km`` from a start point along ``bearing`` degrees."""
+    angle = distance_km / EARTH_RADIUS_KM
+    phi, theta = math.radians(latitude), math.radians(bearing)
+    phi2 = math.asin(math.sin(phi) * math.cos(angle) + math.cos(phi) * math.sin(angle) * math.cos(theta))
+    lambda2 = math.radians(longitude) + math.atan2(
+        math.sin(theta) * math.sin(angle) * math.cos(phi),
+        math.cos(angle) - math.sin(phi) * math.sin(phi2),
+    )
+    return math.degrees(phi2), (math.degrees(lambda2) + 540) % 360 - 180
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'venue-tests'},
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'venue-tests-shared'},
+})
+class VenueViewTestCase(TestCase):
+    def setUp(self):
+        user = User.objects.create(username='owner', email='owner@example.com')
+        self.agency = Agency.objects.create(name='Agency', owner=user, timezone='UTC', slug='agency')
+        UserProfile.objects.create(user=user, agency=self.agency, role='agency_owner')
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def venue(self, name, **fields):
+        fields.setdefault('venue_country', 'PT')
+        fields.setdefault('capacity', 500)
+        return Venue.objects.create(
+            agency=self.agency, venue_name=name, venue_address='Street 1', venue_city='Lisbon', **fields
+        )
+
+
+class VenueBulkStatusTests(VenueViewTestCase):
+    def test_bulk_status_change_bumps_the_data_version(self):
+        venue = self.venue('Hall')
+        version = get_data_version(self.agency.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                '/api/v1/venues/bulk_update_status/',
+                {'venue_ids': [str(venue.pk)], 'is_active': False},
+                format='json',
+            )
+
+        self.assertEqual(response.json()['updated_count'], 1)
+        self.assertFalse(Venue.objects.get(pk=venue.pk).is_active)
+        self.assertNotEqual(get_data_version(self.agency.pk), version)
+
+
+class BoundingBoxTests(SimpleTestCase):
+    def test_box_holds_every_point_on_the_circle(self):
+        for latitude, longitude in [(0, 0), (38.7, -9.1), (64.1, -21.9), (-33.9, 151.2), (10, 179.9)]:
+            min_lat, max_lat, lng_ranges = bounding_box(latitude, longitude, 100)
+            for bearing in range(0, 360, 5):
+                lat, lng = destination(latitude, longitude, bearing, 100)
+                self.assertTrue(min_lat <= lat <= max_lat, (latitude, longitude, bearing))
+                self.assertTrue(any(low <= lng <= high for low, high in lng_ranges), (latitude, longitude, bearing))
+
+
+class VenueNearbyTests(VenueViewTestCase):
+    def nearby(self, latitude, longitude, radius_km):
+        response = self.client.get('/api/v1/venues/nearby/', {'lat': latitude, 'lng': longitude, 'radius_km': radius_km})
+        self.assertEqual(response.status_code, 200)
+        return [venue['venue_name'] for venue in response.json()['venues']]
+
+    def test_venues_just_inside_the_radius_are_found(self):
+        for bearing in (0, 90, 180, 270):
+            for name, distance in (('inside', 99.95), ('outside', 100.05)):
+                lat, lng = destination(64.1, -21.9, bearing, distance)
+                self.venue(f'{name} {bearing}', latitude=lat, longitude=lng)
+
+        found = self.nearby(64.1, -21.9, 100)
+        self.assertCountEqual(found, [f'inside {bearing}' for bearing in (0, 90, 180, 270)])
+        for venue in Venue.objects.filter(venue_name__in=found):
+            self.assertLessEqual(haversine_km(64.1, -21.9, venue.latitude, venue.longitude), 100)
+
+
+def members(groups, items_key):
+    """Grouped-endpoint output reduced to the pre-pagination shape, with member ids."""
+    return {
+        key: {
+            **{field: group[field] for field in ('label', 'count') if field in group},
+            items_key: [item['id'] for item in group[items_key]],
+        }
+        for key, group in groups.items()
+    }
+
+
+class VenueGroupingTests(VenueViewTestCase):
+    def setUp(self):
+        super().setUp()
+        rows = [
+            ('Arena', 'arena', 10000, 'PT', True, True),
+            ('Bar', 'bar', 120, 'ES', False, False),
+            ('Club A', 'club', 499, 'PT', True, False),
+            ('Club B', 'club', 500, 'FR', False, True),
+            ('Festival', 'festival', 9999, 'ES', True, True),
+            ('Theater', 'theater', 1999, 'PT', False, False),
+            ('Warehouse', 'warehouse', 2000, 'PT', True, False),
+        ]
+        for name, venue_type, capacity, country, parking, active in rows:
+            self.venue(name, venue_type=venue_type, capacity=capacity, venue_country=country,
+                       has_parking=parking, is_active=active)
+        owner = User.objects.create(username='other', email='other@example.com')
+        other = Agency.objects.create(name='Other', owner=owner, timezone='UTC', slug='other')
+        Venue.objects.create(agency=other, venue_name='Elsewhere', venue_address='-', venue_city='Paris',
+                             venue_country='FR', capacity=100)
+        self.venues = list(Venue.objects.filter(agency=self.agency).order_by('venue_name'))
+
+    def get(self, endpoint, **params):
+        response = self.client.get(f'/api/v1/venues/{endpoint}/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def capacity_category(self, venue):
+        if venue.capacity < 500:
+            return 'small'
+        if venue.capacity < 2000:
+            return 'medium'
+        if venue.capacity < 10000:
+            return 'large'
+        return 'massive'
+
+    def test_by_type_matches_grouping_in_python(self):
+        expected = {
+            value: {
+                'label': label,
+                'count': len([v for v in self.venues if v.venue_type == value]),
+                'venues': [str(v.pk) for v in self.venues if v.venue_type == value],
+            }
+            for value, label in Venue.VenueType.choices
+        }
+        self.assertEqual(members(self.get('by_type'), 'venues'), expected)
+
+    def test_by_capacity_matches_grouping_in_python(self):
+        labels = {'small': 'Small (< 500)', 'medium': 'Medium (500-2000)',
+                  'large': 'Large (2000-10000)', 'massive': 'Massive (10000+)'}
+        expected = {
+            key: {
+                'label': label,
+                'count': len([v for v in self.venues if self.capacity_category(v) == key]),
+                'venues': [str(v.pk) for v in self.venues if self.capacity_category(v) == key],
+            }
+            for key, label in labels.items()
+        }
+        groups = self.get('by_capacity')
+        self.assertEqual(members(groups, 'venues'), expected)
+        self.assertEqual({(g['offset'], g['next_offset']) for g in groups.values()}, {(0, None)})
+
+    def test_by_country_matches_grouping_in_python(self):
+        expected = {}
+        for venue in self.venues:
+            group = expected.setdefault(str(venue.venue_country.name), {'count': 0, 'venues': []})
+            group['count'] += 1
+            group['venues'].append(str(venue.pk))
+        groups = self.get('by_country')
+        self.assertEqual(members(groups, 'venues'), expected)
+        self.assertEqual(list(groups), ['France', 'Portugal', 'Spain'])
+        self.assertEqual(groups['Portugal']['code'], 'PT')
+
+    def test_grouped_members_are_paginated(self):
+        for index in range(DEFAULT_GROUP_PAGE_SIZE + 5):
+            self.venue(f'Small {index:02d}', capacity=10)
+        small = [v.pk for v in Venue.objects.filter(agency=self.agency, capacity__lt=500).order_by('venue_name')]
+
+        first = self.get('by_capacity')['small']
+        self.assertEqual((first['count'], first['offset'], first['next_offset']),
+                         (len(small), 0, DEFAULT_GROUP_PAGE_SIZE))
+        second = self.get('by_capacity', offset=first['next_offset'])['small']
+        self.assertEqual(second['next_offset'], None)
+        self.assertEqual([item['id'] for item in first['venues'] + second['venues']], [str(pk) for pk in small])
+
+        counts_only = self.get('by_country', members='false')
+        portugal = Venue.objects.filter(agency=self.agency, venue_country='PT').count()
+        self.assertEqual(counts_only['Portugal'], {'code': 'PT', 'count': portugal})
+        self.assertEqual(self.get('by_country', limit=1)['Portugal']['next_offset'], 1)
+
+    def test_dashboard_stats_match_separate_counts(self):
+        venues = self.venues
+        expected = {
+            'total_venues': len(venues),
+            'active_venues': len([v for v in venues if v.is_active]),
+            'inactive_venues': len([v for v in venues if not v.is_active]),
+            'type_breakdown': {
+                value: {'label': label, 'count': len([v for v in venues if v.venue_type == value])}
+                for value, label in Venue.VenueType.choices
+            },
+            'capacity_breakdown': {
+                key: len([v for v in venues if self.capacity_category(v) == key])
+                for key in ('small', 'medium', 'large', 'massive')
+            },
+            'features_breakdown': {
+                'has_parking': len([v for v in venues if v.has_parking]),
+                'has_catering': 0,
+                'is_accessible': 0,
+            },
+            'recent_additions': len(venues),
+        }
+        self.assertEqual(self.get('dashboard_stats'), expected)
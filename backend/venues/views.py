@@ -6,18 +6,35 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import ValidationError
-from django.db.models import QuerySet, Q, Count
+from django.db.models import QuerySet, Q, Count, Case, When, Value, CharField
 from django.db import transaction
 from django_filters import rest_framework as django_filters
 from typing import Any, Dict
-from datetime import datetime, timedelta
 
 from .models import Venue
+from agencies.versioning import bump_data_version
+from config.stats import Breakdown, Recent, compute_stats
+from config.grouping import group_by_choices, group_by_country, parse_group_limit, parse_group_page
 from .serializers import VenueSerializer
+from .gazetteer import lookup_city
+from .geo import bounding_box_q, distance_km_expression
 from rest_framework.permissions import IsAuthenticated
 
 logger = logging.getLogger(__name__)
 
+# Capacity buckets as (key, label, condition), checked in order
+CAPACITY_CATEGORIES = [
+    ('small', 'Small (< 500)', Q(capacity__lt=500)),
+    ('medium', 'Medium (500-2000)', Q(capacity__gte=500, capacity__lt=2000)),
+    ('large', 'Large (2000-10000)', Q(capacity__gte=2000, capacity__lt=10000)),
+    ('massive', 'Massive (10000+)', Q(capacity__gte=10000)),
+]
+
+DEFAULT_NEARBY_RADIUS_KM = 50
+MAX_NEARBY_RADIUS_KM = 2000
+DEFAULT_NEARBY_LIMIT = 50
+MAX_NEARBY_LIMIT = 500
+
 
 class VenueFilter(django_filters.FilterSet):
     """Filter set for the Venue model."""
@@ -33,6 +50,8 @@ class VenueFilter(django_filters.FilterSet):
     has_email = django_filters.BooleanFilter(method='filter_has_email')
     has_phone = django_filters.BooleanFilter(method='filter_has_phone')
     has_website = django_filters.BooleanFilter(method='filter_has_website')
+    has_coordinates = django_filters.BooleanFilter(field_name='latitude', lookup_expr='isnull', exclude=True)
+    geohash = django_filters.CharFilter(field_name='geohash', lookup_expr='startswith')
     
     class Meta:
         model = Venue
@@ -112,6 +131,15 @@ class VenueQueryMixin:
             return 'large'
         else:
             return 'massive'
+    
+    def with_capacity_category(self, queryset: QuerySet) -> QuerySet:
+        """Annotate ``capacity_category`` in SQL, matching get_capacity_category."""
+        return queryset.annotate(
+            capacity_category=Case(
+                *[When(condition, then=Value(key)) for key, _label, condition in CAPACITY_CATEGORIES],
+                output_field=CharField()
+            )
+        )
 
 
 class VenueViewSet(VenueQueryMixin, viewsets.ModelViewSet):
@@ -129,6 +157,23 @@ class VenueViewSet(VenueQueryMixin, viewsets.ModelViewSet):
     ordering_fields = ['venue_name', 'venue_city', 'capacity', 'created_at', 'venue_type']
     ordering = ['venue_name']
     
+    # Metrics for dashboard_stats, computed in a single aggregate query
+    dashboard_stats_spec = {
+        'total_venues': Q(),
+        'active_venues': Q(is_active=True),
+        'inactive_venues': Q(is_active=False),
+        'type_breakdown': Breakdown('venue_type', Venue.VenueType.choices),
+        'capacity_breakdown': {
+            key: condition for key, _label, condition in CAPACITY_CATEGORIES
+        },
+        'features_breakdown': {
+            'has_parking': Q(has_parking=True),
+            'has_catering': Q(has_catering=True),
+            'is_accessible': Q(is_accessible=True),
+        },
+        'recent_additions': Recent(days=30),
+    }
+    
     def get_queryset(self) -> QuerySet:
         """Get the queryset filtered by the user's agency with optimized joins."""
         return self.get_venue_queryset()
@@ -278,11 +323,14 @@ class VenueViewSet(VenueQueryMixin, viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        agency_id = request.user.profile.agency_id
         with transaction.atomic():
             updated_count = Venue.objects.filter(
                 id__in=venue_ids,
-                agency=request.user.profile.agency
+                agency_id=agency_id
             ).update(is_active=is_active)
+            # update() sends no post_save, so bump the version ourselves
+            transaction.on_commit(lambda: bump_data_version(agency_id))
         
         return Response({
             'message': f'Updated {updated_count} venues',
@@ -305,109 +353,140 @@ class VenueViewSet(VenueQueryMixin, viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def by_type(self, request):
-        """Get venues grouped by type."""
-        queryset = self.get_queryset()
-        
-        type_groups = {}
-        for choice in Venue.VenueType.choices:
-            venue_type = choice[0]
-            type_queryset = queryset.filter(venue_type=venue_type)
-            type_groups[venue_type] = {
-                'label': choice[1],
-                'count': type_queryset.count(),
-                'venues': self.get_serializer(type_queryset, many=True).data
-            }
+        """Get venues grouped by type, with an optional per-group ``limit``."""
+        groups = group_by_choices(
+            self.get_queryset(),
+            'venue_type',
+            Venue.VenueType.choices,
+            lambda rows: self.get_serializer(rows, many=True).data,
+            items_key='venues',
+            limit=parse_group_limit(request)
+        )
         
-        return Response(type_groups)
+        return Response(groups)
     
     @action(detail=False, methods=['get'])
-    def by_capacity(self, request):
-        """Get venues grouped by capacity category."""
-        queryset = self.get_queryset()
+    def nearby(self, request):
+        """
+        Get venues within a radius of a point, nearest first.
         
-        capacity_groups = {
-            'small': {'label': 'Small (< 500)', 'venues': []},
-            'medium': {'label': 'Medium (500-2000)', 'venues': []},
-            'large': {'label': 'Large (2000-10000)', 'venues': []},
-            'massive': {'label': 'Massive (10000+)', 'venues': []}
-        }
+        Query Parameters:
+        - lat, lng: Centre point; or
+        - city (and optionally country): Centre at a known city's centroid
+        - radius_km: Search radius (default: 50)
+        - limit: Maximum number of venues (default: 50, max: 500)
+        - Any venue filter, e.g. capacity_min=1000&venue_type=club
         
-        for venue in queryset:
-            category = self.get_capacity_category(venue)
-            capacity_groups[category]['venues'].append(
-                self.get_serializer(venue).data
+        Venues without coordinates are never returned.
+        """
+        params = request.query_params
+        try:
+            if params.get('lat') not in (None, '') or params.get('lng') not in (None, ''):
+                latitude, longitude = float(params['lat']), float(params['lng'])
+            elif params.get('city'):
+                point = lookup_city(params['city'], params.get('country'))
+                if point is None:
+                    return Response(
+                        {'error': f"Unknown city: {params['city']}"},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                latitude, longitude = point
+            else:
+                return Response(
+                    {'error': 'lat and lng, or city, are required'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            radius_km = float(params.get('radius_km', DEFAULT_NEARBY_RADIUS_KM))
+            limit = min(int(params.get('limit', DEFAULT_NEARBY_LIMIT)), MAX_NEARBY_LIMIT)
+        except (KeyError, ValueError):
+            return Response(
+                {'error': 'lat, lng and radius_km must be numbers and limit an integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            return Response(
+                {'error': 'lat must be within [-90, 90] and lng within [-180, 180]'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not (0 < radius_km <= MAX_NEARBY_RADIUS_KM) or limit < 1:
+            return Response(
+                {'error': f'radius_km must be within (0, {MAX_NEARBY_RADIUS_KM}] and limit positive'},
+                status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Add counts
-        for category in capacity_groups:
-            capacity_groups[category]['count'] = len(capacity_groups[category]['venues'])
+        # The bounding box uses the coordinate index; the distance only ranks what is left
+        queryset = (
+            self.filter_queryset(self.get_queryset())
+            .filter(bounding_box_q(latitude, longitude, radius_km))
+            .annotate(distance_km=distance_km_expression(latitude, longitude))
+            .filter(distance_km__lte=radius_km)
+            .order_by('distance_km', 'venue_name')
+        )[:limit]
         
-        return Response(capacity_groups)
+        venues = list(queryset)
+        results = self.get_serializer(venues, many=True).data
+        for venue, item in zip(venues, results):
+            item['distance_km'] = round(venue.distance_km, 2)
+        
+        return Response({
+            'origin': {'lat': latitude, 'lng': longitude},
+            'radius_km': radius_km,
+            'count': len(results),
+            'venues': results
+        })
     
     @action(detail=False, methods=['get'])
-    def by_country(self, request):
-        """Get venues grouped by country."""
-        queryset = self.get_queryset()
+    def by_capacity(self, request):
+        """
+        Get venues grouped by capacity category.
         
-        # Group by country
-        countries = {}
-        for venue in queryset:
-            country = str(venue.venue_country.name) if venue.venue_country else 'Unknown'
-            if country not in countries:
-                countries[country] = []
-            countries[country].append(venue)
+        Members are paginated per group: each group holds at most ``?limit=``
+        venues (default 25, ``DEFAULT_GROUP_PAGE_SIZE``) from ``?offset=``
+        (default 0), and reports ``offset`` and ``next_offset``, the offset
+        of its next page or null on the last one. ``?members=false`` returns
+        counts only.
+        """
+        include_members, limit, offset = parse_group_page(request)
+        groups = group_by_choices(
+            self.with_capacity_category(self.get_queryset()),
+            'capacity_category',
+            [(key, label) for key, label, _condition in CAPACITY_CATEGORIES],
+            lambda rows: self.get_serializer(rows, many=True).data,
+            items_key='venues',
+            limit=limit,
+            offset=offset,
+            include_members=include_members,
+            paginated=True
+        )
+        
+        return Response(groups)
+    
+    @action(detail=False, methods=['get'])
+    def by_country(self, request):
+        """
+        Get venues grouped by country.
         
-        country_data = {}
-        for country, venues in countries.items():
-            country_data[country] = {
-                'count': len(venues),
-                'venues': self.get_serializer(venues, many=True).data
-            }
+        Members are paginated per group: each group holds at most ``?limit=``
+        venues (default 25, ``DEFAULT_GROUP_PAGE_SIZE``) from ``?offset=``
+        (default 0), and reports ``offset`` and ``next_offset``, the offset
+        of its next page or null on the last one. ``?members=false`` returns
+        counts only.
+        """
+        include_members, limit, offset = parse_group_page(request)
+        groups = group_by_country(
+            self.get_queryset(),
+            'venue_country',
+            lambda rows: self.get_serializer(rows, many=True).data,
+            items_key='venues',
+            limit=limit,
+            offset=offset,
+            include_members=include_members
+        )
         
-        return Response(country_data)
+        return Response(groups)
     
     @action(detail=False, methods=['get'])
     def dashboard_stats(self, request):
         """Get venue statistics for dashboard."""
-        queryset = self.get_queryset()
-        
-        total_venues = queryset.count()
-        active_venues = queryset.filter(is_active=True).count()
-        inactive_venues = total_venues - active_venues
-        
-        # Group by type
-        type_breakdown = {}
-        for choice in Venue.VenueType.choices:
-            type_breakdown[choice[0]] = {
-                'label': choice[1],
-                'count': queryset.filter(venue_type=choice[0]).count()
-            }
-        
-        # Capacity breakdown
-        capacity_breakdown = {
-            'small': queryset.filter(capacity__lt=500).count(),
-            'medium': queryset.filter(capacity__gte=500, capacity__lt=2000).count(),
-            'large': queryset.filter(capacity__gte=2000, capacity__lt=10000).count(),
-            'massive': queryset.filter(capacity__gte=10000).count()
-        }
-        
-        # Features breakdown
-        features_breakdown = {
-            'has_parking': queryset.filter(has_parking=True).count(),
-            'has_catering': queryset.filter(has_catering=True).count(),
-            'is_accessible': queryset.filter(is_accessible=True).count()
-        }
-        
-        # Recent additions
-        last_30_days = datetime.now() - timedelta(days=30)
-        recent_additions = queryset.filter(created_at__gte=last_30_days).count()
-        
-        return Response({
-            'total_venues': total_venues,
-            'active_venues': active_venues,
-            'inactive_venues': inactive_venues,
-            'type_breakdown': type_breakdown,
-            'capacity_breakdown': capacity_breakdown,
-            'features_breakdown': features_breakdown,
-            'recent_additions': recent_additions
-        })
\ No newline at end of file
+        return Response(compute_stats(self.get_queryset(), self.dashboard_stats_spec))
\ No newline at end of file